@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import subprocess
 
+from signal_watcher import SignalSubscriber
+
 class AutonomousExecutionEngine:
     def __init__(self):
         # Bulletproof ASCII enforcement
@@ -26,6 +28,7 @@ class AutonomousExecutionEngine:
         self.execution_log = Path("AUTONOMOUS_EXECUTIONS.json")
         self.last_signal_timestamp = None
         self.autonomous_active = True
+        self.signal_feed = SignalSubscriber(str(self.signal_file))
         
         # Critical system parameters
         self.risk_per_trade = 0.0055  # 0.55% religiously enforced
@@ -41,35 +44,8 @@ class AutonomousExecutionEngine:
         print(f"[{timestamp}] AUTONOMOUS: {ascii_message}")
     
     def read_signal_bulletproof(self):
-        """Bulletproof signal reading with encoding fixes"""
-        try:
-            if not self.signal_file.exists():
-                return None
-            
-            # Read as binary first
-            with open(self.signal_file, 'rb') as f:
-                raw_content = f.read()
-            
-            # Handle UTF-16LE with null bytes (Windows MQL5 format)
-            try:
-                content_str = raw_content.decode('utf-16le', errors='ignore')
-            except:
-                content_str = raw_content.decode('utf-8', errors='ignore')
-            
-            # Clean all non-ASCII garbage
-            import re
-            content_str = content_str.replace('\x00', '')  # Remove null bytes
-            content_str = re.sub(r'[^\x20-\x7E{}",:\[\]]', '', content_str)  # Keep only ASCII + JSON chars
-            content_str = re.sub(r'\s+', ' ', content_str).strip()  # Normalize whitespace
-            
-            if not content_str:
-                return None
-                
-            return json.loads(content_str)
-            
-        except Exception as e:
-            self.ascii_print(f"Signal read error: {str(e)[:100]}")
-            return None
+        """Latest parsed signal from the shared signal watcher (no disk read)"""
+        return self.signal_feed.current()
     
     def validate_critical_signal(self, signal):
         """Critical signal validation for autonomous execution"""
@@ -290,7 +266,8 @@ class AutonomousExecutionEngine:
                 if current_time.hour == 0 and current_time.minute == 0:
                     self.daily_trade_count = 0
                 
-                time.sleep(3)  # 3-second monitoring cycle
+                # 3-second monitoring cycle, cut short by a new signal
+                self.signal_feed.wait(timeout=3)
                 
             except KeyboardInterrupt:
                 self.ascii_print("AUTONOMOUS SYSTEM STOPPED BY USER")
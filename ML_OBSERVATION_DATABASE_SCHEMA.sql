@@ -652,6 +652,23 @@ CREATE INDEX IF NOT EXISTS idx_violations_metric_severity ON spc_violations(metr
 CREATE INDEX IF NOT EXISTS idx_predictions_model_time ON ml_predictions(model_name, prediction_timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_dashboard_category_time ON dashboard_metrics(metric_category, calculation_timestamp DESC);
 
+-- Time-window filters used by the dashboard and Pareto collectors
+-- (src/utils/dashboard_read_model.py creates these too, and installs the
+-- per-minute dashboard rollups and the triggers that maintain them)
+CREATE INDEX IF NOT EXISTS idx_process_capability_measurement_timestamp ON process_capability(measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_process_capability_phase_name_measurement_timestamp ON process_capability(phase_name, measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_spc_violations_detection_timestamp ON spc_violations(detection_timestamp);
+CREATE INDEX IF NOT EXISTS idx_spc_violations_phase_name_resolved_detection_timestamp ON spc_violations(phase_name, resolved, detection_timestamp);
+CREATE INDEX IF NOT EXISTS idx_early_warning_alerts_alert_timestamp ON early_warning_alerts(alert_timestamp);
+CREATE INDEX IF NOT EXISTS idx_early_warning_alerts_resolved_alert_timestamp ON early_warning_alerts(resolved, alert_timestamp);
+CREATE INDEX IF NOT EXISTS idx_mt5_journal_data_event_timestamp ON mt5_journal_data(event_timestamp);
+CREATE INDEX IF NOT EXISTS idx_mt5_expert_data_event_timestamp ON mt5_expert_data(event_timestamp);
+CREATE INDEX IF NOT EXISTS idx_m5_bos_quality_metrics_measurement_timestamp ON m5_bos_quality_metrics(measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_m1_break_quality_metrics_measurement_timestamp ON m1_break_quality_metrics(measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_m1_retest_quality_metrics_measurement_timestamp ON m1_retest_quality_metrics(measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_ylipip_quality_metrics_measurement_timestamp ON ylipip_quality_metrics(measurement_timestamp);
+CREATE INDEX IF NOT EXISTS idx_spc_control_data_metric_name_measurement_timestamp ON spc_control_data(metric_name, measurement_timestamp);
+
 -- ========================================
 -- INITIAL DATA POPULATION
 -- ========================================
@@ -15,7 +15,7 @@ import json
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional, Tuple, Any
-from collections import defaultdict, Counter
+from collections import Counter
 import logging
 from enum import Enum
 
@@ -41,6 +41,75 @@ class FailureCategory(Enum):
     RISK_MANAGEMENT_FAILURES = "risk_management"
     PLATFORM_ISSUES = "platform_issues"
 
+# Cost and classification tables. The per-event estimators and the SQL
+# expressions in FAILURE_SOURCES are both built from these, so an event
+# is priced the same whether it is aggregated in SQL or in Python
+SPC_VIOLATION_COSTS = {
+    5: 500.0,   # Critical - $500
+    4: 200.0,   # High - $200
+    3: 100.0,   # Medium - $100
+    2: 50.0,    # Low - $50
+    1: 20.0     # Minimal - $20
+}
+SPC_DEFAULT_COST = 100.0
+
+JOURNAL_BASE_COSTS = {
+    5: 800.0,   # Critical
+    4: 400.0,   # High
+    3: 200.0,   # Medium
+    2: 100.0,   # Low
+    1: 50.0     # Minimal
+}
+JOURNAL_DEFAULT_COST = 200.0
+
+JOURNAL_CATEGORY_MULTIPLIERS = {
+    FailureCategory.EXECUTION_FAILURES.value: 2.0,
+    FailureCategory.CONNECTION_ISSUES.value: 1.5,
+    FailureCategory.DATA_QUALITY_ISSUES.value: 1.3,
+    FailureCategory.TIMING_ISSUES.value: 1.2,
+    FailureCategory.PLATFORM_ISSUES.value: 1.0
+}
+
+# Checked in order: the first category with a keyword in the message wins
+JOURNAL_KEYWORDS = [
+    (FailureCategory.CONNECTION_ISSUES.value, ('connection', 'disconnect', 'network', 'server')),
+    (FailureCategory.EXECUTION_FAILURES.value, ('execution', 'order', 'trade', 'position')),
+    (FailureCategory.DATA_QUALITY_ISSUES.value, ('data', 'price', 'tick', 'quote')),
+    (FailureCategory.TIMING_ISSUES.value, ('timeout', 'delay', 'slow')),
+]
+
+EA_CRITICAL_ERRORS = (1, 2, 3, 4)
+EA_TRADE_ERRORS = (130, 131, 132, 133)
+EA_SLOW_EXECUTION_MS = 5000
+
+EA_ERROR_COSTS = {
+    1: 1000.0,    # No error (but failed)
+    2: 1200.0,    # Common error
+    3: 800.0,     # Invalid trade request
+    4: 1500.0,    # Trade server busy
+    130: 2000.0,  # Invalid stops
+    131: 1800.0,  # Invalid trade volume
+    132: 1600.0,  # Market closed
+    133: 1400.0,  # Trade disabled
+}
+EA_DEFAULT_COST = 500.0
+
+ALERT_CATEGORIES = {
+    'CAPABILITY_DECLINE': FailureCategory.SIGNAL_FAILURES.value,
+    'TREND_REVERSAL': FailureCategory.SIGNAL_FAILURES.value,
+    'THRESHOLD_BREACH': FailureCategory.EXECUTION_FAILURES.value,
+    'ANOMALY_DETECTED': FailureCategory.DATA_QUALITY_ISSUES.value
+}
+
+ALERT_COSTS = {
+    5: 600.0,   # Critical alert
+    4: 300.0,   # High alert
+    3: 150.0,   # Medium alert
+    2: 75.0,    # Low alert
+    1: 25.0     # Minimal alert
+}
+ALERT_DEFAULT_COST = 150.0
+
 @dataclass
 class FailureEvent:
     """Individual failure event data structure"""
@@ -83,12 +152,225 @@ class ParetoAnalysisResult:
     level: int  # Pareto drilling level (1, 2, 3)
     parent_category: Optional[str] = None
 
+def _sql_literal(value: Any) -> str:
+    return f"'{value}'" if isinstance(value, str) else repr(value)
+
+def _sql_case(expr: str, mapping: Dict[Any, Any], default: Any) -> str:
+    """SQL equivalent of mapping.get(expr, default)"""
+    whens = " ".join(f"WHEN {_sql_literal(key)} THEN {_sql_literal(value)}" for key, value in mapping.items())
+    return f"(CASE {expr} {whens} ELSE {_sql_literal(default)} END)"
+
+def _sql_time(moment: datetime) -> str:
+    """Timestamp in the form datetime('now', ...) produces, for parameterized bounds"""
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+_BUCKET_HOUR = "strftime('%Y-%m-%d %H:00:00', {})"
+
+_JOURNAL_MESSAGE = "LOWER(COALESCE({row}message, ''))"
+_JOURNAL_CATEGORY = "(CASE {} ELSE {} END)".format(
+    " ".join(
+        "WHEN " + " OR ".join(f"instr({_JOURNAL_MESSAGE}, {_sql_literal(word)}) > 0" for word in words)
+        + f" THEN {_sql_literal(category)}"
+        for category, words in JOURNAL_KEYWORDS
+    ),
+    _sql_literal(FailureCategory.PLATFORM_ISSUES.value)
+)
+
+@dataclass(frozen=True)
+class FailureSource:
+    """
+    A failure table described as SQL expressions
+
+    The expressions mirror the _collect_* readers and the cost/impact
+    estimators. They are templates over the table's columns with a {row}
+    prefix: '' when aggregating the table, 'NEW.' in its bucket trigger.
+    """
+    table: str
+    timestamp: str
+    columns: Tuple[str, ...]
+    condition: str
+    category: str
+    subcategory: str
+    failure_type: str
+    severity: str
+    impact: str
+    cost: str
+
+    def sql(self, row: str = '') -> Dict[str, str]:
+        fields = ('timestamp', 'condition', 'category', 'subcategory', 'failure_type', 'severity', 'impact', 'cost')
+        return {field: getattr(self, field).format(row=row) for field in fields}
+
+    def _aggregates(self, e: Dict[str, str]) -> str:
+        return (f"COUNT(*), TOTAL({e['impact']}), TOTAL({e['cost']}), "
+                f"TOTAL(({e['severity']}) * ({e['impact']}))")
+
+    def aggregate_sql(self, window: str) -> str:
+        """Failure totals per (category, subcategory, failure_type); `window` may use {ts}"""
+        e = self.sql()
+        return f"""
+        SELECT {e['category']}, COALESCE({e['subcategory']}, ''), COALESCE({e['failure_type']}, ''),
+               {self._aggregates(e)}
+        FROM {self.table}
+        WHERE {window.format(ts=e['timestamp'])} AND ({e['condition']})
+        GROUP BY 1, 2, 3
+        """
+
+    def backfill_sql(self) -> str:
+        e = self.sql()
+        hour = _BUCKET_HOUR.format(e['timestamp'])
+        return f"""
+        INSERT INTO pareto_failure_buckets
+        SELECT {hour} AS bucket_hour, '{self.table}', {e['category']},
+               COALESCE({e['subcategory']}, ''), COALESCE({e['failure_type']}, ''),
+               {self._aggregates(e)}
+        FROM {self.table}
+        WHERE bucket_hour IS NOT NULL AND ({e['condition']})
+        GROUP BY 1, 3, 4, 5
+        """
+
+    def trigger_sql(self) -> str:
+        e = self.sql('NEW.')
+        hour = _BUCKET_HOUR.format(e['timestamp'])
+        return f"""CREATE TRIGGER pareto_bucket_{self.table}
+AFTER INSERT ON {self.table}
+WHEN {hour} IS NOT NULL AND ({e['condition']})
+BEGIN
+    INSERT INTO pareto_failure_buckets VALUES (
+        {hour}, '{self.table}', {e['category']},
+        COALESCE({e['subcategory']}, ''), COALESCE({e['failure_type']}, ''), 1,
+        COALESCE({e['impact']}, 0), COALESCE({e['cost']}, 0),
+        COALESCE(({e['severity']}) * ({e['impact']}), 0))
+    ON CONFLICT (bucket_hour, source, category, subcategory, failure_type) DO UPDATE SET
+        failures = failures + 1,
+        impact_sum = impact_sum + excluded.impact_sum,
+        cost_sum = cost_sum + excluded.cost_sum,
+        severity_weighted_sum = severity_weighted_sum + excluded.severity_weighted_sum;
+END"""
+
+FAILURE_SOURCES = [
+    FailureSource(
+        table='spc_violations',
+        timestamp='{row}detection_timestamp',
+        columns=('detection_timestamp', 'violation_type', 'severity_level', 'data_point_value'),
+        condition='1',
+        category=_sql_literal(FailureCategory.SIGNAL_FAILURES.value),
+        subcategory="'spc_violation'",
+        failure_type='{row}violation_type',
+        severity='{row}severity_level',
+        impact='{row}severity_level * 10 + COALESCE(ABS({row}data_point_value) * 0.1, 0)',
+        cost=_sql_case('{row}severity_level', SPC_VIOLATION_COSTS, SPC_DEFAULT_COST)
+    ),
+    FailureSource(
+        table='mt5_journal_data',
+        timestamp='{row}event_timestamp',
+        columns=('event_timestamp', 'event_type', 'event_category', 'severity_level', 'message'),
+        condition="{row}event_category IN ('ERROR', 'WARNING')",
+        category=_JOURNAL_CATEGORY,
+        subcategory='{row}event_type',
+        failure_type='{row}event_category',
+        severity='{row}severity_level',
+        impact='{row}severity_level * 15',
+        cost=(_sql_case('{row}severity_level', JOURNAL_BASE_COSTS, JOURNAL_DEFAULT_COST) + ' * '
+              + _sql_case(_JOURNAL_CATEGORY, JOURNAL_CATEGORY_MULTIPLIERS, 1.0))
+    ),
+    FailureSource(
+        table='mt5_expert_data',
+        timestamp='{row}event_timestamp',
+        columns=('event_timestamp', 'event_type', 'execution_time_ms', 'success_flag', 'error_code'),
+        condition="{row}success_flag = 0 OR {row}event_type = 'ERROR'",
+        category=_sql_literal(FailureCategory.EXECUTION_FAILURES.value),
+        subcategory="'ea_failure'",
+        failure_type='{row}event_type',
+        severity=(f"(CASE WHEN {{row}}error_code IN {EA_CRITICAL_ERRORS} THEN 5 "
+                  f"WHEN {{row}}error_code IN {EA_TRADE_ERRORS} THEN 4 "
+                  f"WHEN {{row}}execution_time_ms > {EA_SLOW_EXECUTION_MS} THEN 3 ELSE 2 END)"),
+        impact='(CASE WHEN {row}success_flag THEN 0 ELSE 50 END) + COALESCE({row}execution_time_ms / 1000.0 * 5, 0)',
+        cost=_sql_case('{row}error_code', EA_ERROR_COSTS, EA_DEFAULT_COST)
+    ),
+    FailureSource(
+        table='early_warning_alerts',
+        timestamp='{row}alert_timestamp',
+        columns=('alert_timestamp', 'alert_type', 'severity_level', 'deviation_magnitude'),
+        condition='1',
+        category=_sql_case('{row}alert_type', ALERT_CATEGORIES, FailureCategory.PLATFORM_ISSUES.value),
+        subcategory="'early_warning'",
+        failure_type='{row}alert_type',
+        severity='{row}severity_level',
+        impact='COALESCE({row}deviation_magnitude * 20, 0) + {row}severity_level * 10',
+        cost=_sql_case('{row}severity_level', ALERT_COSTS, ALERT_DEFAULT_COST)
+    ),
+]
+
+BUCKET_DDL = """
+CREATE TABLE IF NOT EXISTS pareto_failure_buckets (
+    bucket_hour TEXT NOT NULL,      -- 'YYYY-MM-DD HH:00:00', UTC
+    source TEXT NOT NULL,           -- failure table
+    category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    failure_type TEXT NOT NULL,     -- '' when the source row has none
+    failures INTEGER NOT NULL,
+    impact_sum REAL NOT NULL,
+    cost_sum REAL NOT NULL,
+    severity_weighted_sum REAL NOT NULL,
+    PRIMARY KEY (bucket_hour, source, category, subcategory, failure_type)
+) WITHOUT ROWID;
+"""
+
+BUCKET_QUERY = """
+SELECT category, subcategory, failure_type,
+       SUM(failures), SUM(impact_sum), SUM(cost_sum), SUM(severity_weighted_sum)
+FROM pareto_failure_buckets
+WHERE bucket_hour >= ? AND source = ?
+GROUP BY category, subcategory, failure_type
+"""
+
+def install_failure_buckets(conn: sqlite3.Connection) -> List[str]:
+    """
+    Create the hourly failure buckets and a trigger per failure source (idempotent)
+
+    A source's buckets are backfilled from its table in the transaction
+    that creates its trigger, and rebuilt whenever the trigger SQL changes
+    (for instance after a cost table is edited). Returns the tables that
+    feed the buckets; sources whose table is missing are skipped.
+    """
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    triggers = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall())
+
+    installed = []
+    script = ["BEGIN IMMEDIATE;", BUCKET_DDL]
+    for source in FAILURE_SOURCES:
+        if source.table not in tables:
+            continue
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({source.table})")}
+        if not set(source.columns) <= columns:
+            logger.warning(f"{source.table} lacks columns {sorted(set(source.columns) - columns)}; not bucketed")
+            continue
+        installed.append(source.table)
+        timestamp = source.columns[0]
+        script.append(f"CREATE INDEX IF NOT EXISTS idx_{source.table}_{timestamp} ON {source.table}({timestamp});")
+
+        trigger = source.trigger_sql()
+        name = f"pareto_bucket_{source.table}"
+        if triggers.get(name) == trigger:
+            continue
+        script += [
+            f"DROP TRIGGER IF EXISTS {name};",
+            f"DELETE FROM pareto_failure_buckets WHERE source = '{source.table}';",
+            trigger + ";",
+            source.backfill_sql() + ";",
+        ]
+        logger.info(f"Pareto failure buckets built from {source.table}")
+    script.append("COMMIT;")
+    conn.executescript("\n".join(script))
+    return installed
+
 class NestedParetoAnalyzer:
     """Advanced Pareto analyzer with nested drilling capability"""
     
     def __init__(self, db_path: str = "ml_observation_system.db"):
         self.db_path = db_path
         self.failure_events = []
+        self.bucket_sources: List[str] = []
         self.pareto_thresholds = {
             1: 0.80,   # Level 1: 80% (traditional Pareto)
             2: 0.64,   # Level 2: 64% (80% of 80%)
@@ -104,6 +386,7 @@ class NestedParetoAnalyzer:
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='pareto_analysis'")
                 if not cursor.fetchone():
                     logger.warning("Pareto analysis tables not found. Please run the database schema script first.")
+                self.bucket_sources = install_failure_buckets(conn)
         except Exception as e:
             logger.error(f"Database initialization error: {e}")
     
@@ -144,11 +427,11 @@ class NestedParetoAnalyzer:
         SELECT detection_timestamp, metric_name, violation_type, violation_description,
                severity_level, data_point_value, phase_name, symbol
         FROM spc_violations 
-        WHERE detection_timestamp >= datetime('now', '-{} hours')
-        """.format(hours_back)
+        WHERE detection_timestamp >= datetime('now', ?)
+        """
         
         try:
-            cursor = conn.execute(query)
+            cursor = conn.execute(query, (f'-{hours_back} hours',))
             for row in cursor.fetchall():
                 failures.append(FailureEvent(
                     timestamp=datetime.fromisoformat(row[0]),
@@ -175,12 +458,12 @@ class NestedParetoAnalyzer:
         SELECT event_timestamp, event_type, event_category, severity_level, 
                message, symbol, raw_data
         FROM mt5_journal_data 
-        WHERE event_timestamp >= datetime('now', '-{} hours')
+        WHERE event_timestamp >= datetime('now', ?)
         AND event_category IN ('ERROR', 'WARNING')
-        """.format(hours_back)
+        """
         
         try:
-            cursor = conn.execute(query)
+            cursor = conn.execute(query, (f'-{hours_back} hours',))
             for row in cursor.fetchall():
                 category = self._classify_journal_failure(row[1], row[4])  # event_type, message
                 
@@ -208,12 +491,12 @@ class NestedParetoAnalyzer:
         SELECT event_timestamp, expert_name, event_type, symbol, 
                execution_time_ms, success_flag, error_code, error_message
         FROM mt5_expert_data 
-        WHERE event_timestamp >= datetime('now', '-{} hours')
+        WHERE event_timestamp >= datetime('now', ?)
         AND (success_flag = 0 OR event_type = 'ERROR')
-        """.format(hours_back)
+        """
         
         try:
-            cursor = conn.execute(query)
+            cursor = conn.execute(query, (f'-{hours_back} hours',))
             for row in cursor.fetchall():
                 failures.append(FailureEvent(
                     timestamp=datetime.fromisoformat(row[0]),
@@ -239,11 +522,11 @@ class NestedParetoAnalyzer:
         SELECT alert_timestamp, alert_type, severity_level, metric_name,
                current_value, threshold_value, deviation_magnitude, phase_name, symbol
         FROM early_warning_alerts 
-        WHERE alert_timestamp >= datetime('now', '-{} hours')
-        """.format(hours_back)
+        WHERE alert_timestamp >= datetime('now', ?)
+        """
         
         try:
-            cursor = conn.execute(query)
+            cursor = conn.execute(query, (f'-{hours_back} hours',))
             for row in cursor.fetchall():
                 failures.append(FailureEvent(
                     timestamp=datetime.fromisoformat(row[0]),
@@ -262,87 +545,143 @@ class NestedParetoAnalyzer:
             
         return failures
     
+    def aggregate_failures(self, hours_back: int = 24,
+                           now: Optional[datetime] = None) -> Dict[Tuple[str, str, Optional[str]], List[float]]:
+        """
+        Failure count, impact, cost and severity-weighted sums per
+        (category, subcategory, failure_type) over the last `hours_back` hours
+
+        Whole hours are merged from the hourly buckets; only the partial
+        hour at the start of the window is grouped from the raw table.
+        Sources without buckets are grouped from the raw table in full.
+        """
+        now = now or datetime.utcnow()
+        start = now - timedelta(hours=hours_back)
+        next_hour = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        start_bound, hour_bound = _sql_time(start), _sql_time(next_hour)
+        totals: Dict[Tuple[str, str, Optional[str]], List[float]] = {}
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                for source in FAILURE_SOURCES:
+                    if source.table not in tables:
+                        continue
+                    try:
+                        if source.table in self.bucket_sources:
+                            rows = conn.execute(source.aggregate_sql("{ts} >= ? AND {ts} < ?"),
+                                                (start_bound, hour_bound)).fetchall()
+                            rows += conn.execute(BUCKET_QUERY, (hour_bound, source.table)).fetchall()
+                        else:
+                            rows = conn.execute(source.aggregate_sql("{ts} >= ?"), (start_bound,)).fetchall()
+                    except sqlite3.Error as e:
+                        logger.error(f"Error aggregating {source.table} failures: {e}")
+                        continue
+                    
+                    for category, subcategory, failure_type, *values in rows:
+                        group = totals.setdefault((category, subcategory, failure_type or None), [0, 0.0, 0.0, 0.0])
+                        for i, value in enumerate(values):
+                            group[i] += value
+                            
+        except Exception as e:
+            logger.error(f"Error aggregating failure data: {e}")
+            
+        return totals
+    
     def perform_nested_pareto_analysis(self, hours_back: int = 24, max_levels: int = 3) -> Dict[str, ParetoAnalysisResult]:
         """Perform comprehensive nested Pareto analysis"""
-        # Collect failure data
-        failure_events = self.collect_failure_data(hours_back)
+        # Failure totals at the finest level; every Pareto level is a rollup of these
+        failure_totals = self.aggregate_failures(hours_back)
         
-        if not failure_events:
+        if not failure_totals:
             logger.warning("No failure events found for Pareto analysis")
             return {}
         
         results = {}
         
         # Level 1: Primary category analysis (80/20)
-        level1_result = self._perform_pareto_analysis(
-            failure_events, 
-            grouping_field='category',
+        level1_result = self._rank_pareto_groups(
+            self._rollup_failure_totals(failure_totals, ()),
             level=1,
-            threshold=self.pareto_thresholds[1]
+            threshold=self.pareto_thresholds[1],
+            hours_back=hours_back
         )
         results['level_1_categories'] = level1_result
         
         # Level 2: Subcategory analysis for vital few categories (64/16)
+        level2_results = {}
         if max_levels >= 2:
             for vital_item in level1_result.vital_few_items:
-                category_failures = [f for f in failure_events if f.category == vital_item.name]
-                if category_failures:
-                    level2_result = self._perform_pareto_analysis(
-                        category_failures,
-                        grouping_field='subcategory',
+                groups = self._rollup_failure_totals(failure_totals, (vital_item.name,))
+                if groups:
+                    level2_result = self._rank_pareto_groups(
+                        groups,
                         level=2,
                         threshold=self.pareto_thresholds[2],
-                        parent_category=vital_item.name
+                        parent_category=vital_item.name,
+                        hours_back=hours_back
                     )
+                    level2_results[vital_item.name] = level2_result
                     results[f'level_2_{vital_item.name}'] = level2_result
         
         # Level 3: Failure type analysis for vital few subcategories (51.2/12.8)
         if max_levels >= 3:
-            for key, level2_result in results.items():
-                if key.startswith('level_2_'):
-                    parent_category = key.replace('level_2_', '')
-                    for vital_subitem in level2_result.vital_few_items:
-                        subcat_failures = [f for f in failure_events 
-                                         if f.category == parent_category and f.subcategory == vital_subitem.name]
-                        if subcat_failures:
-                            level3_result = self._perform_pareto_analysis(
-                                subcat_failures,
-                                grouping_field='failure_type',
-                                level=3,
-                                threshold=self.pareto_thresholds[3],
-                                parent_category=f"{parent_category}_{vital_subitem.name}"
-                            )
-                            results[f'level_3_{parent_category}_{vital_subitem.name}'] = level3_result
+            for parent_category, level2_result in level2_results.items():
+                for vital_subitem in level2_result.vital_few_items:
+                    groups = self._rollup_failure_totals(failure_totals, (parent_category, vital_subitem.name))
+                    if groups:
+                        level3_result = self._rank_pareto_groups(
+                            groups,
+                            level=3,
+                            threshold=self.pareto_thresholds[3],
+                            parent_category=f"{parent_category}_{vital_subitem.name}",
+                            hours_back=hours_back
+                        )
+                        results[f'level_3_{parent_category}_{vital_subitem.name}'] = level3_result
         
         # Store results in database
         self._store_pareto_results(results, hours_back)
         
         return results
     
+    def _rollup_failure_totals(self, failure_totals: Dict[Tuple[str, str, Optional[str]], List[float]],
+                               parent: Tuple[str, ...]) -> Dict[Any, List[float]]:
+        """Sum the totals under `parent` by the next key level (category, subcategory, failure_type)"""
+        depth = len(parent)
+        groups: Dict[Any, List[float]] = {}
+        for key, values in failure_totals.items():
+            if key[:depth] == parent:
+                group = groups.setdefault(key[depth], [0, 0.0, 0.0, 0.0])
+                for i, value in enumerate(values):
+                    group[i] += value
+        return groups
+    
     def _perform_pareto_analysis(self, failure_events: List[FailureEvent], grouping_field: str,
                                 level: int, threshold: float, parent_category: Optional[str] = None) -> ParetoAnalysisResult:
         """Perform Pareto analysis on failure events"""
         
         # Group failures by specified field
-        failure_groups = defaultdict(list)
+        groups: Dict[Any, List[float]] = {}
         for failure in failure_events:
-            key = getattr(failure, grouping_field)
-            failure_groups[key].append(failure)
+            group = groups.setdefault(getattr(failure, grouping_field), [0, 0.0, 0.0, 0.0])
+            group[0] += 1
+            group[1] += failure.impact_score
+            group[2] += failure.cost_estimate
+            # Severity-weighted count for better prioritization
+            group[3] += failure.severity * failure.impact_score
+        
+        return self._rank_pareto_groups(groups, level, threshold, parent_category)
+    
+    def _rank_pareto_groups(self, groups: Dict[Any, List[float]], level: int, threshold: float,
+                            parent_category: Optional[str] = None, hours_back: int = 24) -> ParetoAnalysisResult:
+        """Rank [count, impact, cost, severity-weighted] group totals into a Pareto result"""
         
         # Calculate metrics for each group
         pareto_items = []
-        total_failures = len(failure_events)
-        total_impact = sum(f.impact_score for f in failure_events)
-        total_cost = sum(f.cost_estimate for f in failure_events)
+        total_failures = sum(values[0] for values in groups.values())
         
-        for group_name, group_failures in failure_groups.items():
-            count = len(group_failures)
+        for group_name, (count, impact_score, cost_of_poor_quality, severity_weighted_count) in groups.items():
             percentage = (count / total_failures) * 100 if total_failures > 0 else 0
-            impact_score = sum(f.impact_score for f in group_failures)
-            cost_of_poor_quality = sum(f.cost_estimate for f in group_failures)
-            
-            # Severity-weighted count for better prioritization
-            severity_weighted_count = sum(f.severity * f.impact_score for f in group_failures)
             
             pareto_items.append(ParetoItem(
                 name=group_name,
@@ -377,7 +716,7 @@ class NestedParetoAnalyzer:
         
         return ParetoAnalysisResult(
             analysis_timestamp=datetime.utcnow(),
-            analysis_period_hours=24,  # Default to 24 hours
+            analysis_period_hours=hours_back,
             total_failures=total_failures,
             pareto_items=pareto_items,
             vital_few_threshold=threshold,
@@ -457,29 +796,16 @@ class NestedParetoAnalyzer:
     
     def _estimate_spc_violation_cost(self, severity: int) -> float:
         """Estimate cost of SPC violations"""
-        cost_matrix = {
-            5: 500.0,   # Critical - $500
-            4: 200.0,   # High - $200
-            3: 100.0,   # Medium - $100
-            2: 50.0,    # Low - $50
-            1: 20.0     # Minimal - $20
-        }
-        return cost_matrix.get(severity, 100.0)
+        return SPC_VIOLATION_COSTS.get(severity, SPC_DEFAULT_COST)
     
     def _classify_journal_failure(self, event_type: str, message: str) -> str:
         """Classify journal failures by category"""
         message_lower = message.lower() if message else ""
         
-        if any(word in message_lower for word in ['connection', 'disconnect', 'network', 'server']):
-            return FailureCategory.CONNECTION_ISSUES.value
-        elif any(word in message_lower for word in ['execution', 'order', 'trade', 'position']):
-            return FailureCategory.EXECUTION_FAILURES.value
-        elif any(word in message_lower for word in ['data', 'price', 'tick', 'quote']):
-            return FailureCategory.DATA_QUALITY_ISSUES.value
-        elif any(word in message_lower for word in ['timeout', 'delay', 'slow']):
-            return FailureCategory.TIMING_ISSUES.value
-        else:
-            return FailureCategory.PLATFORM_ISSUES.value
+        for category, words in JOURNAL_KEYWORDS:
+            if any(word in message_lower for word in words):
+                return category
+        return FailureCategory.PLATFORM_ISSUES.value
     
     def _calculate_journal_impact(self, severity: int) -> float:
         """Calculate impact score for journal events"""
@@ -487,32 +813,20 @@ class NestedParetoAnalyzer:
     
     def _estimate_journal_cost(self, severity: int, category: str) -> float:
         """Estimate cost of journal failures"""
-        base_cost = {
-            5: 800.0,   # Critical
-            4: 400.0,   # High
-            3: 200.0,   # Medium
-            2: 100.0,   # Low
-            1: 50.0     # Minimal
-        }.get(severity, 200.0)
+        base_cost = JOURNAL_BASE_COSTS.get(severity, JOURNAL_DEFAULT_COST)
         
         # Category multiplier
-        category_multiplier = {
-            FailureCategory.EXECUTION_FAILURES.value: 2.0,
-            FailureCategory.CONNECTION_ISSUES.value: 1.5,
-            FailureCategory.DATA_QUALITY_ISSUES.value: 1.3,
-            FailureCategory.TIMING_ISSUES.value: 1.2,
-            FailureCategory.PLATFORM_ISSUES.value: 1.0
-        }.get(category, 1.0)
+        category_multiplier = JOURNAL_CATEGORY_MULTIPLIERS.get(category, 1.0)
         
         return base_cost * category_multiplier
     
     def _determine_ea_severity(self, error_code: int, execution_time: int) -> int:
         """Determine EA failure severity"""
-        if error_code in [1, 2, 3, 4]:  # Critical errors
+        if error_code in EA_CRITICAL_ERRORS:  # Critical errors
             return 5
-        elif error_code in [130, 131, 132, 133]:  # Trade errors
+        elif error_code in EA_TRADE_ERRORS:  # Trade errors
             return 4
-        elif execution_time and execution_time > 5000:  # > 5 seconds
+        elif execution_time and execution_time > EA_SLOW_EXECUTION_MS:  # > 5 seconds
             return 3
         else:
             return 2
@@ -525,27 +839,11 @@ class NestedParetoAnalyzer:
     
     def _estimate_ea_failure_cost(self, error_code: int) -> float:
         """Estimate EA failure cost"""
-        cost_matrix = {
-            1: 1000.0,    # No error (but failed)
-            2: 1200.0,    # Common error
-            3: 800.0,     # Invalid trade request
-            4: 1500.0,    # Trade server busy
-            130: 2000.0,  # Invalid stops
-            131: 1800.0,  # Invalid trade volume
-            132: 1600.0,  # Market closed
-            133: 1400.0,  # Trade disabled
-        }
-        return cost_matrix.get(error_code, 500.0)
+        return EA_ERROR_COSTS.get(error_code, EA_DEFAULT_COST)
     
     def _classify_alert_failure(self, alert_type: str) -> str:
         """Classify alert failures by category"""
-        alert_classification = {
-            'CAPABILITY_DECLINE': FailureCategory.SIGNAL_FAILURES.value,
-            'TREND_REVERSAL': FailureCategory.SIGNAL_FAILURES.value,
-            'THRESHOLD_BREACH': FailureCategory.EXECUTION_FAILURES.value,
-            'ANOMALY_DETECTED': FailureCategory.DATA_QUALITY_ISSUES.value
-        }
-        return alert_classification.get(alert_type, FailureCategory.PLATFORM_ISSUES.value)
+        return ALERT_CATEGORIES.get(alert_type, FailureCategory.PLATFORM_ISSUES.value)
     
     def _calculate_alert_impact(self, deviation_magnitude: float, severity: int) -> float:
         """Calculate alert failure impact"""
@@ -555,13 +853,7 @@ class NestedParetoAnalyzer:
     
     def _estimate_alert_cost(self, severity: int) -> float:
         """Estimate alert failure cost"""
-        return {
-            5: 600.0,   # Critical alert
-            4: 300.0,   # High alert
-            3: 150.0,   # Medium alert
-            2: 75.0,    # Low alert
-            1: 25.0     # Minimal alert
-        }.get(severity, 150.0)
+        return ALERT_COSTS.get(severity, ALERT_DEFAULT_COST)
     
     def _assess_implementation_difficulty(self, root_cause: str) -> str:
         """Assess implementation difficulty for fixing root cause"""
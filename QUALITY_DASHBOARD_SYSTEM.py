@@ -15,7 +15,6 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-import sqlite3
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
@@ -30,6 +29,7 @@ from enum import Enum
 from SPC_CONTROL_CHARTS_IMPLEMENTATION import TradingPhaseControlCharts, ViolationType
 from PARETO_ANALYSIS_FRAMEWORK import NestedParetoAnalyzer
 from QFD_MATRIX_IMPLEMENTATION import QFDHouseOfQuality
+from src.utils.dashboard_read_model import DashboardReadModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -102,6 +102,9 @@ class QualityDashboardSystem:
         self.warning_threshold = 2.5
         self.critical_threshold = 2.0
         
+        # Per-minute rollups, refreshed from a change watermark
+        self.read_model = DashboardReadModel(db_path, cpk_threshold=self.warning_threshold)
+        
         # Initialize dashboard state
         self.dashboard_data = {}
         self.last_update = None
@@ -129,6 +132,9 @@ class QualityDashboardSystem:
         try:
             current_time = datetime.utcnow()
             
+            # Pull rollup changes since the last refresh
+            self.read_model.refresh(current_time)
+            
             # Collect overall metrics
             overall_metrics = self._get_overall_quality_metrics()
             
@@ -170,49 +176,43 @@ class QualityDashboardSystem:
     def _get_overall_quality_metrics(self) -> DashboardMetrics:
         """Get overall system quality metrics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Get latest capability measurements
-                cursor = conn.execute("""
-                    SELECT AVG(cp_value), AVG(cpk_value), AVG(sigma_level), COUNT(*)
-                    FROM process_capability 
-                    WHERE measurement_timestamp >= datetime('now', '-1 hour')
-                """)
-                row = cursor.fetchone()
-                
-                if row and row[0]:
-                    avg_cp = row[0]
-                    avg_cpk = row[1]
-                    avg_sigma = row[2]
-                    measurement_count = row[3]
-                else:
-                    # Default values if no recent data
-                    avg_cp = 2.85
-                    avg_cpk = 2.72
-                    avg_sigma = 5.22
-                    measurement_count = 0
-                
-                # Get control status
-                control_status = self.control_charts.get_overall_control_status()
-                
-                # Calculate quality grade
-                quality_grade = self._determine_quality_grade(avg_cpk)
-                
-                # Calculate target achievement
-                target_achievement = min(avg_cpk / self.target_cpk, 1.0)
-                
-                return DashboardMetrics(
-                    timestamp=datetime.utcnow(),
-                    overall_cp=avg_cp,
-                    overall_cpk=avg_cpk,
-                    sigma_level=avg_sigma,
-                    quality_grade=quality_grade,
-                    processes_in_control=control_status['in_control_count'],
-                    total_processes=control_status['total_charts'],
-                    control_percentage=control_status['control_percentage'],
-                    active_violations=control_status['active_violations'],
-                    target_achievement=target_achievement
-                )
-                
+            # Get latest capability measurements
+            summary = self.read_model.capability(minutes=60)
+            
+            if summary['cp']:
+                avg_cp = summary['cp']
+                avg_cpk = summary['cpk']
+                avg_sigma = summary['sigma_level']
+                measurement_count = summary['measurements']
+            else:
+                # Default values if no recent data
+                avg_cp = 2.85
+                avg_cpk = 2.72
+                avg_sigma = 5.22
+                measurement_count = 0
+            
+            # Get control status
+            control_status = self.control_charts.get_overall_control_status()
+            
+            # Calculate quality grade
+            quality_grade = self._determine_quality_grade(avg_cpk)
+            
+            # Calculate target achievement
+            target_achievement = min(avg_cpk / self.target_cpk, 1.0)
+            
+            return DashboardMetrics(
+                timestamp=datetime.utcnow(),
+                overall_cp=avg_cp,
+                overall_cpk=avg_cpk,
+                sigma_level=avg_sigma,
+                quality_grade=quality_grade,
+                processes_in_control=control_status['in_control_count'],
+                total_processes=control_status['total_charts'],
+                control_percentage=control_status['control_percentage'],
+                active_violations=control_status['active_violations'],
+                target_achievement=target_achievement
+            )
+            
         except Exception as e:
             logger.error(f"Error getting overall metrics: {e}")
             return self._get_default_metrics()
@@ -224,60 +224,44 @@ class QualityDashboardSystem:
         phases = ['M5_BOS_DETECTION', 'M1_BREAK_IDENTIFICATION', 'M1_RETEST_VALIDATION', 'YLIPIP_ENTRY_TRIGGER']
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for phase in phases:
-                    cursor = conn.execute("""
-                        SELECT AVG(cp_value), AVG(cpk_value), AVG(sigma_level), 
-                               COUNT(CASE WHEN cpk_value >= ? THEN 1 END) as in_control_count,
-                               COUNT(*) as total_count
-                        FROM process_capability 
-                        WHERE phase_name = ? AND measurement_timestamp >= datetime('now', '-1 hour')
-                    """, (self.warning_threshold, phase))
-                    
-                    row = cursor.fetchone()
-                    
-                    if row and row[0]:
-                        cp_value = row[0]
-                        cpk_value = row[1]
-                        sigma_level = row[2]
-                        in_control = row[4] > 0 and (row[3] / row[4]) >= 0.8  # 80% threshold
-                    else:
-                        # Default values based on phase
-                        cp_value = 2.9 if 'M5' in phase else 3.1 if 'BREAK' in phase else 2.8 if 'RETEST' in phase else 3.0
-                        cpk_value = cp_value - 0.1
-                        sigma_level = cpk_value + 3.0
-                        in_control = cpk_value >= self.warning_threshold
-                    
-                    # Get violation count
-                    cursor = conn.execute("""
-                        SELECT COUNT(*), MAX(detection_timestamp)
-                        FROM spc_violations 
-                        WHERE phase_name = ? AND detection_timestamp >= datetime('now', '-24 hours')
-                        AND resolved = 0
-                    """, (phase,))
-                    
-                    violation_row = cursor.fetchone()
-                    violations_count = violation_row[0] if violation_row else 0
-                    last_violation = datetime.fromisoformat(violation_row[1]) if violation_row and violation_row[1] else None
-                    
-                    # Determine trend direction (simplified)
-                    trend_direction = "STABLE"
-                    if cpk_value >= self.target_cpk:
-                        trend_direction = "IMPROVING"
-                    elif cpk_value < self.critical_threshold:
-                        trend_direction = "DEGRADING"
-                    
-                    phase_metrics.append(PhaseMetrics(
-                        phase_name=phase,
-                        cp_value=cp_value,
-                        cpk_value=cpk_value,
-                        sigma_level=sigma_level,
-                        in_control=in_control,
-                        violations_count=violations_count,
-                        last_violation=last_violation,
-                        trend_direction=trend_direction
-                    ))
-                    
+            for phase in phases:
+                summary = self.read_model.capability(minutes=60, phase_name=phase)
+                
+                if summary['cp']:
+                    cp_value = summary['cp']
+                    cpk_value = summary['cpk']
+                    sigma_level = summary['sigma_level']
+                    total_count = summary['measurements']
+                    in_control = total_count > 0 and (summary['cpk_ok_count'] / total_count) >= 0.8  # 80% threshold
+                else:
+                    # Default values based on phase
+                    cp_value = 2.9 if 'M5' in phase else 3.1 if 'BREAK' in phase else 2.8 if 'RETEST' in phase else 3.0
+                    cpk_value = cp_value - 0.1
+                    sigma_level = cpk_value + 3.0
+                    in_control = cpk_value >= self.warning_threshold
+                
+                # Get violation count
+                violations_count = self.read_model.open_violations(phase, hours=24)
+                last_violation = self.read_model.last_open_violation(phase, hours=24) if violations_count else None
+                
+                # Determine trend direction (simplified)
+                trend_direction = "STABLE"
+                if cpk_value >= self.target_cpk:
+                    trend_direction = "IMPROVING"
+                elif cpk_value < self.critical_threshold:
+                    trend_direction = "DEGRADING"
+                
+                phase_metrics.append(PhaseMetrics(
+                    phase_name=phase,
+                    cp_value=cp_value,
+                    cpk_value=cpk_value,
+                    sigma_level=sigma_level,
+                    in_control=in_control,
+                    violations_count=violations_count,
+                    last_violation=last_violation,
+                    trend_direction=trend_direction
+                ))
+                
         except Exception as e:
             logger.error(f"Error getting phase metrics: {e}")
             
@@ -292,26 +276,7 @@ class QualityDashboardSystem:
         violations = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT detection_timestamp, metric_name, violation_type, 
-                           violation_description, severity_level, phase_name, resolved
-                    FROM spc_violations 
-                    WHERE detection_timestamp >= datetime('now', '-24 hours')
-                    ORDER BY detection_timestamp DESC
-                    LIMIT 20
-                """)
-                
-                for row in cursor.fetchall():
-                    violations.append({
-                        'timestamp': datetime.fromisoformat(row[0]),
-                        'metric': row[1],
-                        'type': row[2],
-                        'description': row[3],
-                        'severity': row[4],
-                        'phase': row[5],
-                        'resolved': bool(row[6])
-                    })
+            violations = self.read_model.recent_violations(hours=24, limit=20)
                     
         except Exception as e:
             logger.error(f"Error getting violations: {e}")
@@ -418,53 +383,11 @@ class QualityDashboardSystem:
     def _get_trend_data(self) -> Dict[str, Any]:
         """Get trend data for charts"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Get Cpk trend over last 24 hours
-                cursor = conn.execute("""
-                    SELECT 
-                        datetime(measurement_timestamp, 'localtime') as timestamp,
-                        AVG(cpk_value) as avg_cpk,
-                        AVG(cp_value) as avg_cp,
-                        COUNT(*) as measurement_count
-                    FROM process_capability 
-                    WHERE measurement_timestamp >= datetime('now', '-24 hours')
-                    GROUP BY datetime(measurement_timestamp, 'localtime', 'start of hour')
-                    ORDER BY timestamp
-                """)
-                
-                cpk_trend = []
-                for row in cursor.fetchall():
-                    cpk_trend.append({
-                        'timestamp': row[0],
-                        'cpk': row[1],
-                        'cp': row[2],
-                        'count': row[3]
-                    })
-                
-                # Get violation trend
-                cursor = conn.execute("""
-                    SELECT 
-                        datetime(detection_timestamp, 'localtime', 'start of hour') as hour,
-                        COUNT(*) as violation_count,
-                        AVG(severity_level) as avg_severity
-                    FROM spc_violations 
-                    WHERE detection_timestamp >= datetime('now', '-24 hours')
-                    GROUP BY hour
-                    ORDER BY hour
-                """)
-                
-                violation_trend = []
-                for row in cursor.fetchall():
-                    violation_trend.append({
-                        'timestamp': row[0],
-                        'count': row[1],
-                        'severity': row[2]
-                    })
-                
-                return {
-                    'cpk_trend': cpk_trend,
-                    'violation_trend': violation_trend
-                }
+            # Hourly Cpk and violation trends over the last 24 hours
+            return {
+                'cpk_trend': self.read_model.cpk_trend(hours=24),
+                'violation_trend': self.read_model.violation_trend(hours=24)
+            }
                 
         except Exception as e:
             logger.error(f"Error getting trend data: {e}")
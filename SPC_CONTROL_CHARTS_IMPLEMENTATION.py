@@ -9,6 +9,7 @@ Owner: LeanSixSigmaMasterBlackBelt Agent
 Target: Six Sigma Quality Achievement (3.4 defects per million)
 """
 
+import math
 import numpy as np
 import sqlite3
 import json
@@ -20,6 +21,8 @@ from enum import Enum
 import warnings
 import logging
 
+from src.utils.write_behind import WriteBehindWriter
+
 # Configure logging for quality monitoring
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -56,6 +59,181 @@ class ViolationResult:
     description: str
     recommended_action: str
 
+# Violation bitmask bits returned by WesternElectricRules.update (bit n-1 = rule n)
+RULE_BITS = {rule: 1 << i for i, rule in enumerate(ViolationType)}
+_POPCOUNT = tuple(bin(i).count('1') for i in range(32))
+
+class WesternElectricRules:
+    """
+    Streaming Western Electric rule engine
+
+    Every rule is an O(1) state machine fed one point at a time: run counters
+    for rules 2, 3, 7 and 8, per-parity runs of local extrema for rule 4 and
+    3/5-point zone bitmasks for rules 5 and 6. A point is classified against
+    the limits in force when it arrives; with unchanged limits the flagged
+    points are exactly those of the batch `_check_rule_*` methods.
+    """
+
+    def __init__(self):
+        self._limits = None
+        self.reset()
+
+    def reset(self):
+        """Forget all run state (limits are kept)"""
+        self.count = 0
+        self._prev = None
+        self._prev2 = None
+        self._above = None
+        self._side_run = 0
+        self._up_run = 0
+        self._down_run = 0
+        self._extremum_runs = [0, 0]
+        self._zone2_bits = 0
+        self._zone1_bits = 0
+        self._within_run = 0
+        self._beyond_run = 0
+
+    def set_limits(self, limits: ControlLimits):
+        """Derive the zone boundaries (same arithmetic as the batch rules)"""
+        cl = limits.center_line
+        ucl = limits.upper_control_limit
+        lcl = limits.lower_control_limit
+        self._limits = limits
+        self._cl, self._ucl, self._lcl = cl, ucl, lcl
+        self._two_sigma_upper = cl + 2 * (ucl - cl) / 3
+        self._two_sigma_lower = cl - 2 * (cl - lcl) / 3
+        self._one_sigma_upper = cl + (ucl - cl) / 3
+        self._one_sigma_lower = cl - (cl - lcl) / 3
+
+    def update(self, value: float, limits: ControlLimits = None) -> int:
+        """Feed the next point; returns a RULE_BITS mask of rules it violates"""
+        if limits is not None and limits is not self._limits:
+            self.set_limits(limits)
+
+        n = self.count
+        self.count = n + 1
+        mask = 0
+
+        # Rule 1: beyond 3-sigma
+        if value > self._ucl or value < self._lcl:
+            mask |= 1
+
+        # Rule 2: nine on the same side (on the centerline counts as below)
+        above = value > self._cl
+        if above == self._above:
+            self._side_run += 1
+        else:
+            self._above = above
+            self._side_run = 1
+        if self._side_run >= 9:
+            mask |= 2
+
+        prev = self._prev
+        if prev is not None:
+            # Rule 3: five strict steps in one direction = six trending points
+            if value > prev:
+                self._up_run += 1
+                self._down_run = 0
+            elif value < prev:
+                self._down_run += 1
+                self._up_run = 0
+            else:
+                self._up_run = self._down_run = 0
+            if self._up_run >= 5 or self._down_run >= 5:
+                mask |= 4
+
+            # Rule 4: the batch rule requires the points at odd offsets 1..11 of
+            # a 14-point window to be strict local extrema. prev's status is
+            # known now; six in a row at stride 2 ending at n-2 completes it.
+            prev2 = self._prev2
+            if prev2 is not None:
+                runs = self._extremum_runs
+                slot = (n - 1) & 1
+                if (prev2 < prev > value) or (prev2 > prev < value):
+                    runs[slot] += 1
+                else:
+                    runs[slot] = 0
+                if runs[slot ^ 1] >= 6:
+                    mask |= 8
+
+        # Rule 5: two of three beyond 2-sigma
+        zone2 = value > self._two_sigma_upper or value < self._two_sigma_lower
+        self._zone2_bits = ((self._zone2_bits << 1) | zone2) & 0b111
+        if n >= 2 and _POPCOUNT[self._zone2_bits] >= 2:
+            mask |= 16
+
+        # Rule 6: four of five beyond 1-sigma
+        beyond = value > self._one_sigma_upper or value < self._one_sigma_lower
+        self._zone1_bits = ((self._zone1_bits << 1) | beyond) & 0b11111
+        if n >= 4 and _POPCOUNT[self._zone1_bits] >= 4:
+            mask |= 32
+
+        # Rule 7: fifteen within 1-sigma / Rule 8: eight beyond 1-sigma
+        if self._one_sigma_lower <= value <= self._one_sigma_upper:
+            self._within_run += 1
+            if self._within_run >= 15:
+                mask |= 64
+        else:
+            self._within_run = 0
+        if beyond:
+            self._beyond_run += 1
+            if self._beyond_run >= 8:
+                mask |= 128
+        else:
+            self._beyond_run = 0
+
+        self._prev2 = prev
+        self._prev = value
+        return mask
+
+    def scan(self, values, limits: ControlLimits) -> List[Tuple[int, int]]:
+        """Feed a sequence; returns (offset, mask) for every violating point"""
+        update = self.update
+        self.set_limits(limits)
+        return [(i, mask) for i, mask in enumerate(map(update, values)) if mask]
+
+    def violations(self, mask: int, value: float, point_index: int) -> List[ViolationResult]:
+        """Expand a mask for the latest point into ViolationResults"""
+        results = []
+        for rule, bit in RULE_BITS.items():
+            if mask & bit:
+                severity, description, action = self._describe(rule, value)
+                results.append(ViolationResult(
+                    violation_type=rule,
+                    point_index=point_index,
+                    value=value,
+                    severity=severity,
+                    description=description,
+                    recommended_action=action
+                ))
+        return results
+
+    def _describe(self, rule: ViolationType, value: float) -> Tuple[int, str, str]:
+        """Severity, description and action matching the batch rule checks"""
+        if rule is ViolationType.RULE_1:
+            return (5, f"Point {value:.3f} beyond control limits [{self._lcl:.3f}, {self._ucl:.3f}]",
+                    "IMMEDIATE_INVESTIGATION_REQUIRED")
+        if rule is ViolationType.RULE_2:
+            side = 'above' if self._above else 'below'
+            return 4, f"Nine consecutive points {side} centerline", "PROCESS_SHIFT_INVESTIGATION"
+        if rule is ViolationType.RULE_3:
+            trend = 'increasing' if self._up_run >= 5 else 'decreasing'
+            return 3, f"Six consecutive {trend} points detected", "TREND_ANALYSIS_REQUIRED"
+        if rule is ViolationType.RULE_4:
+            return (2, "Fourteen consecutive alternating points detected",
+                    "SYSTEMATIC_VARIATION_INVESTIGATION")
+        if rule is ViolationType.RULE_5:
+            return (3, "Two of three consecutive points beyond 2-sigma limits",
+                    "PROCESS_CAPABILITY_REVIEW")
+        if rule is ViolationType.RULE_6:
+            return (3, "Four of five consecutive points beyond 1-sigma limits",
+                    "PROCESS_VARIATION_ANALYSIS")
+        if rule is ViolationType.RULE_7:
+            return (2, "Fifteen consecutive points within 1-sigma (possible over-control)",
+                    "OVER_CONTROL_INVESTIGATION")
+        return (3, "Eight consecutive points beyond 1-sigma from centerline",
+                "PROCESS_CENTERING_ADJUSTMENT")
+
 class BaseControlChart:
     """Base class for all control charts with common functionality"""
     
@@ -66,6 +244,7 @@ class BaseControlChart:
         self.control_limits = None
         self.violations = []
         self.last_update = None
+        self.rule_engine = WesternElectricRules()
         
     def add_data_point(self, value: float, timestamp: datetime = None) -> Dict[str, Any]:
         """Add new data point and check for violations"""
@@ -100,12 +279,23 @@ class BaseControlChart:
         raise NotImplementedError("Subclasses must implement update_control_limits")
     
     def check_violations(self) -> List[ViolationResult]:
-        """Check for Western Electric rule violations"""
+        """Check the newest point against the Western Electric rules (streaming, O(1))"""
+        if not self.control_limits or not self.data_points:
+            return []
+            
+        value = self.data_points[-1]['value']
+        mask = self.rule_engine.update(value, self.control_limits)
+        if not mask:
+            return []
+        return self.rule_engine.violations(mask, value, len(self.data_points) - 1)
+    
+    def check_violations_batch(self, window: int = 50) -> List[ViolationResult]:
+        """Re-evaluate all rules over the last `window` points with the current limits"""
         if not self.control_limits or len(self.data_points) < 9:
             return []
             
         violations = []
-        values = [dp['value'] for dp in list(self.data_points)[-50:]]  # Check last 50 points
+        values = [dp['value'] for dp in list(self.data_points)[-window:]]
         
         # Rule 1: Single point beyond control limits
         violations.extend(self._check_rule_1(values))
@@ -361,6 +551,11 @@ class XBarRChart(BaseControlChart):
         self.x_bar_values = deque(maxlen=200)
         self.r_values = deque(maxlen=200)
         
+        # Running sums over the x_bar/r windows (re-summed exactly once per window length)
+        self._x_bar_sum = 0.0
+        self._r_sum = 0.0
+        self._sums_age = 0
+        
         # Constants for control chart calculations
         self.constants = {
             2: {'A2': 1.880, 'D3': 0, 'D4': 3.267},
@@ -382,8 +577,8 @@ class XBarRChart(BaseControlChart):
         if timestamp is None:
             timestamp = datetime.utcnow()
             
-        x_bar = np.mean(values)
-        r_value = np.max(values) - np.min(values)
+        x_bar = sum(values) / len(values)
+        r_value = max(values) - min(values)
         
         self.subgroups.append({
             'values': values,
@@ -392,8 +587,19 @@ class XBarRChart(BaseControlChart):
             'timestamp': timestamp
         })
         
+        if len(self.x_bar_values) == self.x_bar_values.maxlen:
+            self._x_bar_sum -= self.x_bar_values[0]
+            self._r_sum -= self.r_values[0]
         self.x_bar_values.append(x_bar)
         self.r_values.append(r_value)
+        self._x_bar_sum += x_bar
+        self._r_sum += r_value
+        self._sums_age += 1
+        if self._sums_age >= self.x_bar_values.maxlen:
+            # Bound floating-point drift of the running sums
+            self._x_bar_sum = math.fsum(self.x_bar_values)
+            self._r_sum = math.fsum(self.r_values)
+            self._sums_age = 0
         
         # Update control limits
         if len(self.subgroups) >= 25:
@@ -422,8 +628,8 @@ class XBarRChart(BaseControlChart):
         constants = self.constants.get(self.sample_size, self.constants[5])
         A2, D3, D4 = constants['A2'], constants['D3'], constants['D4']
         
-        x_double_bar = np.mean(list(self.x_bar_values))
-        r_bar = np.mean(list(self.r_values))
+        x_double_bar = self._x_bar_sum / len(self.x_bar_values)
+        r_bar = self._r_sum / len(self.r_values)
         
         # X-bar chart limits
         self.x_bar_limits = ControlLimits(
@@ -447,55 +653,36 @@ class XBarRChart(BaseControlChart):
         self.control_limits = self.x_bar_limits
     
     def _check_x_bar_violations(self) -> List[ViolationResult]:
-        """Check violations for X-bar chart"""
-        if not hasattr(self, 'x_bar_limits') or len(self.x_bar_values) < 9:
+        """Check the newest X-bar against the Western Electric rules (streaming)"""
+        if not hasattr(self, 'x_bar_limits'):
             return []
             
-        # Temporarily set control limits to X-bar limits for violation checking
-        original_limits = self.control_limits
-        self.control_limits = self.x_bar_limits
-        
-        values = list(self.x_bar_values)[-50:]  # Last 50 X-bar values
-        violations = []
-        
-        # Check all Western Electric rules for X-bar chart
-        violations.extend(self._check_rule_1(values))
-        violations.extend(self._check_rule_2(values))
-        violations.extend(self._check_rule_3(values))
-        violations.extend(self._check_rule_4(values))
-        violations.extend(self._check_rule_5(values))
-        violations.extend(self._check_rule_6(values))
-        violations.extend(self._check_rule_7(values))
-        violations.extend(self._check_rule_8(values))
-        
-        # Restore original limits
-        self.control_limits = original_limits
-        
-        return violations
+        x_bar = self.x_bar_values[-1]
+        mask = self.rule_engine.update(x_bar, self.x_bar_limits)
+        if not mask:
+            return []
+        return self.rule_engine.violations(mask, x_bar, len(self.x_bar_values) - 1)
     
     def _check_r_violations(self) -> List[ViolationResult]:
-        """Check violations for R chart"""
-        if not hasattr(self, 'r_limits') or len(self.r_values) < 9:
+        """Check the newest range against the R chart limits"""
+        if not hasattr(self, 'r_limits'):
             return []
             
-        violations = []
-        r_values = list(self.r_values)[-50:]  # Last 50 R values
+        r_value = self.r_values[-1]
         ucl = self.r_limits.upper_control_limit
         lcl = self.r_limits.lower_control_limit
         
         # Rule 1 for R chart (most critical for range charts)
-        for i, r_value in enumerate(r_values):
-            if r_value > ucl or r_value < lcl:
-                violations.append(ViolationResult(
-                    violation_type=ViolationType.RULE_1,
-                    point_index=len(self.r_values) - len(r_values) + i,
-                    value=r_value,
-                    severity=5,  # Critical
-                    description=f"R-chart point {r_value:.3f} beyond control limits [{lcl:.3f}, {ucl:.3f}]",
-                    recommended_action="PROCESS_VARIATION_INVESTIGATION"
-                ))
-                
-        return violations
+        if lcl <= r_value <= ucl:
+            return []
+        return [ViolationResult(
+            violation_type=ViolationType.RULE_1,
+            point_index=len(self.r_values) - 1,
+            value=r_value,
+            severity=5,  # Critical
+            description=f"R-chart point {r_value:.3f} beyond control limits [{lcl:.3f}, {ucl:.3f}]",
+            recommended_action="PROCESS_VARIATION_INVESTIGATION"
+        )]
 
 class PChart(BaseControlChart):
     """p-Chart for proportion of defective items"""
@@ -504,6 +691,8 @@ class PChart(BaseControlChart):
         super().__init__(metric_name, 1)
         self.target_sample_size = target_sample_size
         self.sample_data = deque(maxlen=200)
+        self._total_defective = 0
+        self._total_items = 0
         
     def add_sample(self, total_items: int, defective_items: int, timestamp: datetime = None) -> Dict[str, Any]:
         """Add sample data for p-chart"""
@@ -519,7 +708,13 @@ class PChart(BaseControlChart):
             'timestamp': timestamp
         }
         
+        if len(self.sample_data) == self.sample_data.maxlen:
+            evicted = self.sample_data[0]
+            self._total_defective -= evicted['defective_items']
+            self._total_items -= evicted['total_items']
         self.sample_data.append(sample)
+        self._total_defective += defective_items
+        self._total_items += total_items
         
         # Update control limits
         if len(self.sample_data) >= 25:
@@ -544,8 +739,8 @@ class PChart(BaseControlChart):
             return
             
         # Calculate p-bar (average proportion)
-        total_defective = sum(s['defective_items'] for s in self.sample_data)
-        total_items = sum(s['total_items'] for s in self.sample_data)
+        total_defective = self._total_defective
+        total_items = self._total_items
         p_bar = total_defective / total_items if total_items > 0 else 0
         
         # Use target sample size for standard control limits
@@ -576,29 +771,25 @@ class PChart(BaseControlChart):
         }
     
     def _check_p_violations(self) -> List[ViolationResult]:
-        """Check violations for p-chart with variable sample sizes"""
-        if not self.control_limits or len(self.sample_data) < 9:
+        """Check the newest sample against its variable-size control limits"""
+        if not self.control_limits or not self.sample_data:
             return []
             
-        violations = []
-        recent_samples = list(self.sample_data)[-50:]  # Last 50 samples
+        sample = self.sample_data[-1]
+        limits = self._get_variable_control_limits(sample['total_items'])
+        proportion = sample['proportion']
         
-        for i, sample in enumerate(recent_samples):
-            limits = self._get_variable_control_limits(sample['total_items'])
-            proportion = sample['proportion']
-            
-            # Rule 1: Beyond control limits
-            if proportion > limits['upper_control_limit'] or proportion < limits['lower_control_limit']:
-                violations.append(ViolationResult(
-                    violation_type=ViolationType.RULE_1,
-                    point_index=len(self.sample_data) - len(recent_samples) + i,
-                    value=proportion,
-                    severity=5,  # Critical
-                    description=f"Proportion {proportion:.3f} beyond control limits [{limits['lower_control_limit']:.3f}, {limits['upper_control_limit']:.3f}]",
-                    recommended_action="PROCESS_INVESTIGATION_REQUIRED"
-                ))
-                
-        return violations
+        # Rule 1: Beyond control limits
+        if limits['lower_control_limit'] <= proportion <= limits['upper_control_limit']:
+            return []
+        return [ViolationResult(
+            violation_type=ViolationType.RULE_1,
+            point_index=len(self.sample_data) - 1,
+            value=proportion,
+            severity=5,  # Critical
+            description=f"Proportion {proportion:.3f} beyond control limits [{limits['lower_control_limit']:.3f}, {limits['upper_control_limit']:.3f}]",
+            recommended_action="PROCESS_INVESTIGATION_REQUIRED"
+        )]
 
 class CUSUMChart(BaseControlChart):
     """CUSUM Chart for detecting small shifts in process mean"""
@@ -826,11 +1017,16 @@ class EWMAChart(BaseControlChart):
 class TradingPhaseControlCharts:
     """Comprehensive control chart system for all four trading phases"""
     
-    def __init__(self, db_path: str = "ml_observation_system.db"):
+    def __init__(self, db_path: str = "ml_observation_system.db",
+                 flush_interval: float = 0.25, sync_interval_ms: Optional[int] = 1000):
         self.db_path = db_path
         self.charts = self._initialize_charts()
         self._init_database()
         
+        # Batched write-behind persistence (WAL, one transaction per flush)
+        self.writer = WriteBehindWriter(db_path, flush_interval=flush_interval,
+                                        sync_interval_ms=sync_interval_ms, name="spc-writer")
+        
     def _initialize_charts(self) -> Dict[str, BaseControlChart]:
         """Initialize all control charts for trading phases"""
         return {
@@ -1010,52 +1206,61 @@ class TradingPhaseControlCharts:
         return results
     
     def _store_spc_data(self, phase_name: str, results: Dict[str, Any], timestamp: datetime):
-        """Store SPC data in database"""
+        """Queue SPC data for the write-behind writer"""
+        # Bound as text, as sqlite3's default datetime adapter would store it
+        timestamp = (timestamp or datetime.utcnow()).isoformat(sep=' ')
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for metric_name, result in results.items():
-                    # Store control data
-                    conn.execute("""
-                        INSERT INTO spc_control_data 
-                        (measurement_timestamp, metric_name, chart_type, sample_values, 
-                         x_bar, r_value, p_value, cusum_value, ewma_value, phase_name, raw_data)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            for metric_name, result in results.items():
+                # Store control data
+                self.writer.execute("""
+                    INSERT INTO spc_control_data 
+                    (measurement_timestamp, metric_name, chart_type, sample_values, 
+                     x_bar, r_value, p_value, cusum_value, ewma_value, phase_name, raw_data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    timestamp,
+                    metric_name,
+                    self._get_chart_type(metric_name),
+                    json.dumps(result.get('values', [])),
+                    result.get('x_bar'),
+                    result.get('r_value'),
+                    result.get('proportion'),
+                    result.get('cusum_high'),
+                    result.get('ewma_value'),
+                    phase_name,
+                    json.dumps(result, default=str)
+                ))
+                
+                # Store violations if any
+                violations = result.get('violations', [])
+                for violation in violations:
+                    self.writer.execute("""
+                        INSERT INTO spc_violations
+                        (detection_timestamp, metric_name, chart_type, violation_type,
+                         violation_description, severity_level, data_point_value, phase_name)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         timestamp,
                         metric_name,
                         self._get_chart_type(metric_name),
-                        json.dumps(result.get('values', [])),
-                        result.get('x_bar'),
-                        result.get('r_value'),
-                        result.get('proportion'),
-                        result.get('cusum_high'),
-                        result.get('ewma_value'),
-                        phase_name,
-                        json.dumps(result)
+                        violation['violation_type'].name,
+                        violation['description'],
+                        violation['severity'],
+                        violation['value'],
+                        phase_name
                     ))
                     
-                    # Store violations if any
-                    violations = result.get('violations', [])
-                    for violation in violations:
-                        conn.execute("""
-                            INSERT INTO spc_violations
-                            (detection_timestamp, metric_name, chart_type, violation_type,
-                             violation_description, severity_level, data_point_value, phase_name)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            timestamp,
-                            metric_name,
-                            self._get_chart_type(metric_name),
-                            violation['violation_type'],
-                            violation['description'],
-                            violation['severity'],
-                            violation['value'],
-                            phase_name
-                        ))
-                        
         except Exception as e:
             logger.error(f"Error storing SPC data: {e}")
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued SPC rows are committed"""
+        return self.writer.flush(timeout)
+    
+    def close(self):
+        """Flush queued SPC rows and stop the writer"""
+        self.writer.close()
+    
     def _get_chart_type(self, metric_name: str) -> str:
         """Get chart type for a metric"""
         chart = self.charts.get(metric_name)
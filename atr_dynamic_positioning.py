@@ -4,11 +4,13 @@ MIKROBOT_FASTVERSION.md Implementation
 Account: 95244786
 """
 import MetaTrader5 as mt5
-import numpy as np
 from datetime import datetime, timedelta
 import json
 from pathlib import Path
 
+from src.mikrobot_v2.utils.atr_engine import shared_atr_engine
+from symbol_specs import get_registry
+
 class ATRDynamicPositioning:
     """
     ATR-based dynamic position sizing according to MIKROBOT_FASTVERSION.md
@@ -17,7 +19,8 @@ class ATRDynamicPositioning:
     - Dynamic lot calculation based on ATR setup box
     """
     
-    def __init__(self):
+    def __init__(self, specs=None):
+        self.specs = specs or get_registry()
         self.risk_percent = 0.55  # Fixed risk per trade
         self.min_atr_pips = 4
         self.max_atr_pips = 15
@@ -43,57 +46,23 @@ class ATRDynamicPositioning:
         return False
     
     def calculate_m1_atr(self, symbol, period=14):
-        """Calculate M1 ATR for dynamic positioning"""
-        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, period + 1)
-        if rates is None or len(rates) < period:
-            return None
-            
-        # Calculate True Range
-        highs = rates['high'][1:]
-        lows = rates['low'][1:]
-        prev_closes = rates['close'][:-1]
-        
-        tr1 = highs - lows
-        tr2 = np.abs(highs - prev_closes)
-        tr3 = np.abs(lows - prev_closes)
-        
-        true_ranges = np.maximum(tr1, np.maximum(tr2, tr3))
-        atr = np.mean(true_ranges)
-        
-        return atr
+        """Calculate M1 ATR for dynamic positioning (shared series, refetched only when a bar closes)"""
+        return shared_atr_engine(period).get(
+            symbol, "M1", lambda count: mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, count))
     
     def get_pip_value(self, symbol):
-        """Get pip value for different asset classes"""
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
+        """Get pip size for symbol from the shared symbol table"""
+        try:
+            return self.specs.pip(symbol)
+        except KeyError:
             return None
-            
-        # Different pip values for different asset classes
-        if "JPY" in symbol:
-            pip_value = 0.01  # JPY pairs
-        elif symbol.startswith("XAU") or symbol.startswith("XAG"):
-            pip_value = 0.1   # Metals
-        elif symbol.startswith("BTC") or symbol.startswith("ETH"):
-            pip_value = 1.0   # Major crypto
-        elif symbol in ["BCHUSD", "LTCUSD", "XRPUSD", "ADAUSD", "DOTUSD"]:
-            pip_value = 0.1   # CFD_CRYPTO - Other cryptos  
-        elif any(index in symbol for index in ["SPX", "NAS", "DAX", "FTSE"]):
-            pip_value = 1.0   # Indices
-        elif any(energy in symbol for energy in ["CRUDE", "BRENT", "NGAS"]):
-            pip_value = 0.01  # Energies
-        else:
-            pip_value = 0.0001  # Standard forex
-            
-        return pip_value
     
     def convert_atr_to_pips(self, symbol, atr_value):
         """Convert ATR value to pips based on symbol type"""
-        pip_value = self.get_pip_value(symbol)
-        if pip_value is None:
+        try:
+            return self.specs.price_to_pips(symbol, atr_value)
+        except KeyError:
             return None
-            
-        atr_pips = atr_value / pip_value
-        return atr_pips
     
     def validate_atr_range(self, symbol):
         """Validate ATR is within 4-15 pip range"""
@@ -117,18 +86,14 @@ class ATRDynamicPositioning:
         if self.account_balance == 0:
             return None, "Account balance not available"
             
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
+        if self.get_pip_value(symbol) is None:
             return None, "Symbol info not available"
             
         # Calculate risk amount in account currency
         risk_amount = (self.risk_percent / 100) * self.account_balance
         
-        # Get tick value (how much 1 pip is worth per lot)
-        tick_value = symbol_info.trade_tick_value
-        pip_value = self.get_pip_value(symbol)
-        
-        if tick_value == 0 or pip_value == 0:
+        # How much 1 pip is worth per lot
+        if self.specs.pip_value_per_lot(symbol) == 0:
             return None, "Cannot calculate pip value"
             
         # Calculate lot size - Special handling for CFD_CRYPTO
@@ -143,23 +108,18 @@ class ATRDynamicPositioning:
                 lot_size = base_lot * 0.5
             else:  # Under $50k
                 lot_size = base_lot * 0.25
+            lot_size = self.specs.round_lots(symbol, lot_size)
         else:
-            # Standard calculation for other assets
-            pip_value_per_lot = tick_value / symbol_info.trade_tick_size * pip_value
-            lot_size = risk_amount / (sl_distance_pips * pip_value_per_lot)
-        
-        # Round to symbol's volume step
-        volume_step = symbol_info.volume_step
-        lot_size = round(lot_size / volume_step) * volume_step
-        
-        # Check min/max volume
-        if lot_size < symbol_info.volume_min:
-            lot_size = symbol_info.volume_min
-        elif lot_size > symbol_info.volume_max:
-            lot_size = symbol_info.volume_max
+            # Standard calculation, rounded to the volume step and clamped to min/max volume
+            lot_size = self.specs.value_to_lots(symbol, risk_amount, sl_distance_pips)
             
         return lot_size, f"Dynamic lot: {lot_size} (Risk: {self.risk_percent}%)"
     
+    def calculate_portfolio_lot_sizes(self, symbols, sl_distance_pips):
+        """Lot sizes for many symbols at the same risk in one vectorized call"""
+        risk_amount = (self.risk_percent / 100) * self.account_balance
+        return self.specs.value_to_lots(self.specs.ids(symbols), risk_amount, sl_distance_pips)
+    
     def create_atr_setup_signal(self, symbol, trade_type):
         """Create ATR-based setup signal for trading"""
         # Validate ATR range
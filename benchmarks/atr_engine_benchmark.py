@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+ATR Engine Benchmark
+Sizing calls that fetch 16 bars and recompute a 14-period ATR every time, as
+the sizers did, against reads from the shared incremental engine, and a
+per-symbol loop against batch_atr() over one (symbols x bars) array
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.utils.atr_engine import ATREngine, batch_atr
+
+PERIOD = 14
+BARS = 500
+CALLS = 10_000
+UNIVERSE = (10, 100, 1000)
+START = 1_704_067_200
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8')])
+
+
+def synthetic_rates(bars, rng):
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars) * 60
+    rates['close'] = 1.1 + np.cumsum(rng.normal(0, 1e-4, bars))
+    rates['high'] = rates['close'] + rng.uniform(0, 2e-4, bars)
+    rates['low'] = rates['close'] - rng.uniform(0, 2e-4, bars)
+    return rates
+
+
+def recompute_atr(rates):
+    """The old calculate_m1_atr: list of true ranges over the last fetch"""
+    trs = [max(h - l, abs(h - pc), abs(l - pc))
+           for h, l, pc in zip(rates['high'][1:], rates['low'][1:], rates['close'][:-1])]
+    return float(np.mean(trs[-PERIOD:]))
+
+
+def main():
+    """Run the ATR engine benchmark"""
+    rng = np.random.default_rng(7)
+    rates = synthetic_rates(BARS, rng)
+
+    print(f"\n{'='*72}")
+    print(f"SIZING READS ({CALLS:,} calls, one new M1 bar every 20 calls)")
+    print(f"{'='*72}")
+
+    fetches = 0
+
+    def fetch_until(end):
+        def fetch(count):
+            nonlocal fetches
+            fetches += 1
+            return rates[max(0, end - count):end]
+        return fetch
+
+    start = time.perf_counter()
+    for call in range(CALLS):
+        end = PERIOD + 2 + (call // 20) % (BARS - PERIOD - 2)
+        recompute_atr(rates[end - PERIOD - 2:end - 1])
+    recompute_s = time.perf_counter() - start
+
+    engine = ATREngine(period=PERIOD)
+    start = time.perf_counter()
+    for call in range(CALLS):
+        end = PERIOD + 2 + (call // 20) % (BARS - PERIOD - 2)
+        now = float(rates['time'][end - 1]) + 1
+        engine.get('EURUSD', 'M1', fetch_until(end), now)
+    engine_s = time.perf_counter() - start
+
+    print(f"   {'fetch + recompute':<24}{recompute_s / CALLS * 1e6:>10.2f} us/call{CALLS:>10,} fetches")
+    print(f"   {'engine read':<24}{engine_s / CALLS * 1e6:>10.2f} us/call{fetches:>10,} fetches")
+
+    print(f"\n{'='*72}")
+    print(f"SEEDING ATR FOR A UNIVERSE ({PERIOD + 1} bars per symbol)")
+    print(f"{'='*72}")
+    print(f"   {'symbols':>10}{'loop ms':>14}{'batch ms':>14}{'speedup':>10}")
+
+    for size in UNIVERSE:
+        universe = [synthetic_rates(PERIOD + 1, rng) for _ in range(size)]
+        highs, lows, closes = (np.stack([r[field] for r in universe]) for field in ('high', 'low', 'close'))
+
+        start = time.perf_counter()
+        expected = [recompute_atr(r) for r in universe]
+        loop_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        atrs = batch_atr(highs, lows, closes, PERIOD)
+        batch_ms = (time.perf_counter() - start) * 1e3
+
+        assert np.allclose(atrs, expected)
+        print(f"   {size:>10,}{loop_ms:>14.3f}{batch_ms:>14.3f}{loop_ms / batch_ms:>9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Candle Archive Benchmark
+Loading a year of M1 bars for 54 symbols from the memory-mapped archive
+vs parsing the same history from CSV with pandas
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.candle_archive import CandleArchive, RATES_DTYPE
+
+SYMBOLS = 54
+YEAR_OF_M1 = 525_600
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+RANGE_QUERIES = 10_000
+
+
+def synthetic_rates(bars: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars, dtype=np.int64) * 60
+    rates['close'] = 1.085 + np.cumsum(rng.normal(0, 1e-4, bars))
+    rates['open'] = np.roll(rates['close'], 1)
+    rates['high'] = np.maximum(rates['open'], rates['close']) + 5e-5
+    rates['low'] = np.minimum(rates['open'], rates['close']) - 5e-5
+    rates['tick_volume'] = rng.integers(50, 500, bars)
+    rates['spread'] = 12
+    return rates
+
+
+def main():
+    """Run the candle archive benchmark"""
+    symbols = [f"SYM{i:02d}" for i in range(SYMBOLS)]
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, 'candles')
+        archive = CandleArchive(root)
+        start = time.perf_counter()
+        for seed, symbol in enumerate(symbols):
+            archive.append(symbol, 'M1', synthetic_rates(YEAR_OF_M1, seed))
+        build_s = time.perf_counter() - start
+
+        csv_path = os.path.join(directory, 'SYM00_M1.csv')
+        frame = pd.DataFrame(synthetic_rates(YEAR_OF_M1, 0))
+        frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        frame.to_csv(csv_path, index=False)
+
+        print(f"\n{'='*72}")
+        print(f"CANDLE ARCHIVE ({SYMBOLS} symbols x {YEAR_OF_M1:,} M1 bars, "
+              f"{SYMBOLS * YEAR_OF_M1 * RATES_DTYPE.itemsize / 2**30:.2f} GiB)")
+        print(f"{'='*72}")
+        print(f"   archive build (append):            {build_s:>9.2f} s")
+
+        start = time.perf_counter()
+        pd.read_csv(csv_path, parse_dates=['time'])
+        csv_s = time.perf_counter() - start
+        print(f"   pandas read_csv, 1 symbol:         {csv_s * 1e3:>9.0f} ms")
+        print(f"   pandas read_csv, {SYMBOLS} symbols (est): {csv_s * SYMBOLS:>9.1f} s")
+
+        start = time.perf_counter()
+        fresh = CandleArchive(root)
+        history = fresh.load(symbols, 'M1')
+        open_s = time.perf_counter() - start
+        assert sum(len(bars) for bars in history.values()) == SYMBOLS * YEAR_OF_M1
+        print(f"   archive open + load, {SYMBOLS} symbols:  {open_s * 1e3:>9.1f} ms (zero-copy views)")
+
+        start = time.perf_counter()
+        total = sum(float(bars['close'].sum()) for bars in history.values())
+        scan_s = time.perf_counter() - start
+        print(f"   first full scan of every close:    {scan_s * 1e3:>9.1f} ms (page cache, {total:.0f})")
+
+        rng = np.random.default_rng(1)
+        days = rng.integers(0, 364, RANGE_QUERIES)
+        picks = rng.integers(0, SYMBOLS, RANGE_QUERIES)
+        start = time.perf_counter()
+        for day, pick in zip(days, picks):
+            lo = START + int(day) * 86400
+            fresh.range(symbols[pick], 'M1', lo, lo + 86399)
+        query_s = time.perf_counter() - start
+        print(f"   one-day range query:               {query_s / RANGE_QUERIES * 1e6:>9.1f} us/query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Capability Engine Benchmark
+One tick of Cp/Cpk for every tracked quality metric: a deque append and a
+statistics.mean/stdev pass over the 100-sample window per metric, as the
+monitors did, against one vectorized CapabilityEngine update and capability
+evaluation for all metrics
+"""
+
+import sys
+import os
+import statistics
+import time
+from collections import deque
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.capability_engine import CapabilityEngine
+
+WINDOW = 100
+METRICS = (10, 100, 1000)
+TICKS = 50
+LSL, USL = 0.0, 100.0
+
+
+def legacy_tick(windows, values):
+    results = []
+    for window, value in zip(windows, values):
+        window.append(value)
+        mean = statistics.mean(window)
+        std = statistics.stdev(window)
+        results.append(((USL - LSL) / (6 * std), min(USL - mean, mean - LSL) / (3 * std)))
+    return results
+
+
+def engine_tick(engine, ids, values):
+    engine.update(ids, values)
+    return engine.capability()
+
+
+def main():
+    """Run the capability engine benchmark"""
+    rng = np.random.default_rng(11)
+
+    print(f"\n{'='*72}")
+    print(f"CP/CPK FOR ALL METRICS PER TICK ({WINDOW}-sample windows, mean of {TICKS} ticks)")
+    print(f"{'='*72}")
+    print(f"   {'metrics':>10}{'statistics ms':>16}{'engine ms':>14}{'speedup':>10}")
+
+    for size in METRICS:
+        warmup = rng.normal(50, 5, (WINDOW, size))
+        ticks = rng.normal(50, 5, (TICKS, size))
+
+        windows = [deque(warmup[:, i], maxlen=WINDOW) for i in range(size)]
+        engine = CapabilityEngine(window=WINDOW, capacity=size)
+        ids = np.array([engine.add_metric(f"metric_{i}", LSL, USL) for i in range(size)])
+        for row in warmup:
+            engine.update(ids, row)
+
+        start = time.perf_counter()
+        for row in ticks:
+            expected = legacy_tick(windows, row)
+        legacy_ms = (time.perf_counter() - start) / TICKS * 1e3
+
+        start = time.perf_counter()
+        for row in ticks:
+            table = engine_tick(engine, ids, row)
+        engine_ms = (time.perf_counter() - start) / TICKS * 1e3
+
+        assert np.allclose(table.cp, [cp for cp, _ in expected])
+        assert np.allclose(table.cpk, [cpk for _, cpk in expected])
+        print(f"   {size:>10,}{legacy_ms:>16.3f}{engine_ms:>14.3f}{legacy_ms / engine_ms:>9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
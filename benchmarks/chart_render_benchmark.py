@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Chart Rendering Benchmark
+Per-chart render latency, artist count and event-loop stall for a
+200-candle chart: the legacy per-candle pyplot loop vs ChartRenderService
+(vectorized collections inline, and in the pre-warmed process pool)
+"""
+
+import asyncio
+import io
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.patches import Rectangle
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.charts.render_service import ChartSpec, ChartRenderService
+
+CANDLES = 200
+CHARTS = 10
+
+
+def synthetic_candles(count: int = CANDLES, seed: int = 4) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 6, 9, 0)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, count))
+    opens = np.roll(closes, 1)
+    opens[0] = closes[0]
+    return {
+        'times': [start + timedelta(minutes=i) for i in range(count)],
+        'opens': opens,
+        'highs': np.maximum(opens, closes) + np.abs(rng.normal(0, 5e-5, count)),
+        'lows': np.minimum(opens, closes) - np.abs(rng.normal(0, 5e-5, count)),
+        'closes': closes,
+        'volumes': rng.integers(50, 300, count),
+    }
+
+
+def legacy_render(data: Dict[str, Any]) -> int:
+    """The pre-service drawing loop (ChartGenerator.generate_lightning_bolt_chart)"""
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), gridspec_kw={'height_ratios': [3, 1]})
+    for i in range(len(data['times'])):
+        time_ = data['times'][i]
+        open_price, high = data['opens'][i], data['highs'][i]
+        low, close = data['lows'][i], data['closes'][i]
+        color = '#00ff88' if close > open_price else '#ff4444'
+        ax1.plot([time_, time_], [low, high], color='#666666', linewidth=1)
+        rect = Rectangle((mdates.date2num(time_) - 0.0003, min(open_price, close)),
+                         0.0006, abs(close - open_price), facecolor=color, edgecolor=color)
+        ax1.add_patch(rect)
+    ax2.bar(data['times'], data['volumes'], color='#4488ff', alpha=0.6, width=0.0008)
+    plt.tight_layout()
+    artists = len(ax1.get_children()) + len(ax2.get_children())
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    plt.close()
+    return artists
+
+
+def spec_for(data: Dict[str, Any]) -> ChartSpec:
+    return ChartSpec('EURUSD', 'EURUSD M1', data['times'], data['opens'], data['highs'],
+                     data['lows'], data['closes'], volumes=data['volumes'], preset='standard')
+
+
+async def measure_stall(render: Callable[[], Any]) -> Dict[str, float]:
+    """Run `render` CHARTS times on the loop while a 1 ms heartbeat measures stalls"""
+    gaps: List[float] = []
+    running = True
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append((now - last) * 1000)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    latencies = []
+    for _ in range(CHARTS):
+        start = time.perf_counter()
+        result = render()
+        if asyncio.iscoroutine(result):
+            await result
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)  # let the heartbeat observe any blocking render
+    running = False
+    await beat
+    return {'latency_ms': float(np.median(latencies)), 'max_stall_ms': max(gaps) if gaps else 0.0}
+
+
+def main():
+    """Run the chart rendering benchmark"""
+    data = synthetic_candles()
+    spec = spec_for(data)
+
+    print(f"\n{'='*72}")
+    print(f"CHART RENDERING ({CANDLES} candles, 12x8 in @ 150 dpi, median of {CHARTS})")
+    print(f"{'='*72}")
+    print(f"   {'mode':<28} {'artists':>8} {'latency ms':>11} {'max loop stall ms':>18}")
+
+    artists = legacy_render(data)
+    legacy = asyncio.run(measure_stall(lambda: legacy_render(data)))
+    print(f"   {'legacy pyplot loop':<28} {artists:>8} {legacy['latency_ms']:>11.0f} "
+          f"{legacy['max_stall_ms']:>18.0f}")
+
+    inline = ChartRenderService(mode='inline')
+    artists = inline.render_sync(spec).artists
+    inline_stats = asyncio.run(measure_stall(lambda: inline.render_sync(spec)))
+    print(f"   {'service inline (vectorized)':<28} {artists:>8} {inline_stats['latency_ms']:>11.0f} "
+          f"{inline_stats['max_stall_ms']:>18.0f}")
+
+    pool = ChartRenderService(workers=2, mode='process')
+    pool.start()
+    try:
+        pool_stats = asyncio.run(measure_stall(lambda: pool.render(spec)))
+        print(f"   {'service process pool':<28} {artists:>8} {pool_stats['latency_ms']:>11.0f} "
+              f"{pool_stats['max_stall_ms']:>18.0f}")
+        print(f"\n   service stats: {pool.get_stats()}")
+    finally:
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Benchmark
+Fresh-interpreter wall time and peak RSS for importing the v2 package, the
+Lightning Bolt strategy and the main trading engine, time-to-first-scan:
+process start until the first analyze_symbol() has returned on a replay
+connector, and time-to-first-decision: process start until a warm-started
+U-Cell pipeline has decided on its first signal. Each target also gets an -X importtime profile of its slowest
+imports. Use --json to keep the figures for tracking between releases.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.utils.import_profile import profile_import
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+RUNS = 5
+
+# Each child prints its own peak RSS (KB). VmHWM starts fresh at exec, whereas
+# ru_maxrss carries over the parent's peak through fork.
+_RSS = """
+try:
+    print(next(l.split()[1] for l in open('/proc/self/status') if l.startswith('VmHWM')))
+except OSError:
+    import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+FIRST_SCAN = '''
+import asyncio
+import numpy as np
+from mikrobot_v2.core.replay_connector import ReplayConnector
+from mikrobot_v2.strategies.lightning_bolt import LightningBoltStrategy
+
+rates = np.zeros(3 * 24 * 60, dtype=[('time', '<i8'), ('open', '<f8'), ('high', '<f8'),
+                                     ('low', '<f8'), ('close', '<f8'), ('tick_volume', '<u8')])
+rates['time'] = 1_704_067_200 + np.arange(len(rates)) * 60
+rates['close'] = 1.085 + np.cumsum(np.random.default_rng(0).normal(0, 1.5e-4, len(rates)))
+rates['open'] = np.r_[rates['close'][0], rates['close'][:-1]]
+rates['high'] = np.maximum(rates['open'], rates['close']) + 5e-5
+rates['low'] = np.minimum(rates['open'], rates['close']) - 5e-5
+connector = ReplayConnector({'EURUSD': rates})
+while connector.advance():
+    pass
+strategy = LightningBoltStrategy(connector, clock=connector.clock)
+strategy.notifications_enabled = False
+asyncio.run(strategy.analyze_symbol('EURUSD'))
+'''
+
+FIRST_DECISION = '''
+import asyncio
+from datetime import datetime
+from core.u_cells.artifacts import warm_start
+from core.u_cells.orchestrator import UCellOrchestrator
+
+warm_start()
+signal = {
+    'symbol': 'EURUSD', 'timeframe': 'M5', 'pattern_type': 'M5_BOS', 'direction': 'BUY',
+    'price_levels': {'entry': 1.0877, 'stop_loss': 1.0852, 'take_profit': 1.0927, 'current_price': 1.0877,
+                     'previous_high': 1.0850, 'previous_low': 1.0820, 'structure_break_level': 1.0852},
+    'volume': {'current_volume': 3000, 'avg_volume_20': 1000},
+    'momentum': {'momentum_score': 0.9, 'rsi': 62, 'macd_signal': 0.8},
+    'risk_percent': 0.01, 'timestamp': datetime.utcnow().isoformat(),
+}
+asyncio.run(UCellOrchestrator().process_signal(signal))
+'''
+
+TARGETS = {
+    'python (empty)': 'pass',
+    'import mikrobot_v2': 'import mikrobot_v2',
+    'import lightning_bolt': 'import mikrobot_v2.strategies.lightning_bolt',
+    'import main_trading_engine': 'import mikrobot_v2.main_trading_engine',
+    'first scan': FIRST_SCAN,
+    'first decision': FIRST_DECISION,
+}
+
+# Subsystems that should stay out of a scan-only process
+HEAVY = ('pandas', 'matplotlib', 'aiohttp', 'tensorflow', 'sklearn', 'MetaTrader5')
+
+
+def run_child(code: str) -> Dict[str, float]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', f"{code}\n{_RSS}"],
+                               capture_output=True, text=True, env=env, cwd=SRC)
+    wall = time.perf_counter() - start
+    if completed.returncode:
+        return {'error': (completed.stderr.strip().splitlines() or ['failed'])[-1]}
+    return {'wall_ms': wall * 1000, 'peak_rss_mb': int(completed.stdout.split()[-1]) / 1024}
+
+
+def measure(name: str, code: str, runs: int) -> Dict:
+    samples = [run_child(code) for _ in range(runs)]
+    failed = [s['error'] for s in samples if 'error' in s]
+    if failed:
+        return {'target': name, 'error': failed[0]}
+    profile = profile_import(name, code=code, path=[SRC])
+    return {
+        'target': name,
+        'wall_ms_median': statistics.median(s['wall_ms'] for s in samples),
+        'wall_ms_min': min(s['wall_ms'] for s in samples),
+        'peak_rss_mb': statistics.median(s['peak_rss_mb'] for s in samples),
+        'import_ms': profile.total_us / 1000,
+        'modules': profile.modules,
+        'heavy_loaded': [package for package in HEAVY if profile.includes(package)],
+        'top_imports': [(r.module, round(r.cumulative_us / 1000, 1)) for r in profile.top(5)],
+    }
+
+
+def main(argv=None):
+    """Run the cold-start benchmark"""
+    parser = argparse.ArgumentParser(description='Cold-start and time-to-first-scan benchmark')
+    parser.add_argument('--runs', type=int, default=RUNS, help='fresh processes per target')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON')
+    args = parser.parse_args(argv)
+
+    print(f"\n{'='*72}")
+    print(f"COLD START (median of {args.runs} fresh interpreters)")
+    print(f"{'='*72}")
+    print(f"   {'target':<28} {'wall ms':>9} {'imports ms':>11} {'modules':>8} {'RSS MB':>8}")
+
+    results: List[Dict] = []
+    for name, code in TARGETS.items():
+        result = measure(name, code, args.runs)
+        results.append(result)
+        if 'error' in result:
+            print(f"   {name:<28} failed: {result['error']}")
+            continue
+        print(f"   {name:<28} {result['wall_ms_median']:>9,.0f} {result['import_ms']:>11,.0f} "
+              f"{result['modules']:>8,} {result['peak_rss_mb']:>8,.1f}")
+
+    print("\n   Heavy subsystems loaded / slowest imports (cumulative ms):")
+    for result in results[1:]:
+        if 'error' in result:
+            continue
+        heavy = ', '.join(result['heavy_loaded']) or 'none'
+        top = ', '.join(f"{module} {ms:,.0f}" for module, ms in result['top_imports'][:3])
+        print(f"   {result['target']:<28} heavy: {heavy}")
+        print(f"   {'':<28} {top}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+        print(f"\n   Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Dashboard Read Model Benchmark
+Cost of one dashboard refresh as the raw observation tables grow: the
+per-refresh aggregate queries QualityDashboardSystem used to run against
+process_capability and spc_violations, against DashboardReadModel.refresh()
+plus the in-memory window queries that replaced them
+"""
+
+import sys
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.dashboard_read_model import DashboardReadModel, install
+
+SIZES = (10_000, 100_000, 1_000_000)
+PHASES = ('M5_BOS_DETECTION', 'M1_BREAK_IDENTIFICATION', 'M1_RETEST_VALIDATION', 'YLIPIP_ENTRY_TRIGGER')
+NEW_ROWS_PER_REFRESH = 20
+REFRESHES = 20
+
+DDL = """
+CREATE TABLE process_capability (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measurement_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    cp_value REAL, cpk_value REAL, sigma_level REAL,
+    phase_name TEXT
+);
+CREATE TABLE spc_violations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    detection_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    violation_type TEXT,
+    violation_description TEXT,
+    severity_level INTEGER,
+    phase_name TEXT,
+    resolved BOOLEAN DEFAULT FALSE
+);
+"""
+
+# The queries _collect_dashboard_data ran on every refresh before the read model
+LEGACY_QUERIES = [
+    ("""SELECT AVG(cp_value), AVG(cpk_value), AVG(sigma_level), COUNT(*)
+        FROM process_capability WHERE measurement_timestamp >= datetime('now', '-1 hour')""", ()),
+] + [
+    q for phase in PHASES for q in (
+        ("""SELECT AVG(cp_value), AVG(cpk_value), AVG(sigma_level),
+                   COUNT(CASE WHEN cpk_value >= ? THEN 1 END), COUNT(*)
+            FROM process_capability
+            WHERE phase_name = ? AND measurement_timestamp >= datetime('now', '-1 hour')""", (2.5, phase)),
+        ("""SELECT COUNT(*), MAX(detection_timestamp) FROM spc_violations
+            WHERE phase_name = ? AND detection_timestamp >= datetime('now', '-24 hours') AND resolved = 0""",
+         (phase,)),
+    )
+] + [
+    ("""SELECT detection_timestamp, metric_name, violation_type, violation_description,
+               severity_level, phase_name, resolved
+        FROM spc_violations WHERE detection_timestamp >= datetime('now', '-24 hours')
+        ORDER BY detection_timestamp DESC LIMIT 20""", ()),
+    ("""SELECT datetime(measurement_timestamp, 'localtime'), AVG(cpk_value), AVG(cp_value), COUNT(*)
+        FROM process_capability WHERE measurement_timestamp >= datetime('now', '-24 hours')
+        GROUP BY datetime(measurement_timestamp, 'localtime', 'start of hour')""", ()),
+    ("""SELECT datetime(detection_timestamp, 'localtime', 'start of hour') AS hour,
+               COUNT(*), AVG(severity_level)
+        FROM spc_violations WHERE detection_timestamp >= datetime('now', '-24 hours')
+        GROUP BY hour""", ()),
+]
+
+
+def capability_rows(count, now, spread_minutes):
+    for _ in range(count):
+        moment = now - timedelta(minutes=random.random() * spread_minutes)
+        cpk = random.gauss(2.7, 0.3)
+        yield (moment.isoformat(sep=' '), 'latency', cpk + 0.1, cpk, cpk * 3, random.choice(PHASES))
+
+
+def violation_rows(count, now, spread_minutes):
+    for _ in range(count):
+        moment = now - timedelta(minutes=random.random() * spread_minutes)
+        yield (moment.isoformat(sep=' '), 'latency', 'RULE_1', 'Point beyond 3 sigma',
+               random.randint(1, 5), random.choice(PHASES), random.random() < 0.7)
+
+
+def insert(conn, capability, violations):
+    conn.executemany("""
+        INSERT INTO process_capability (measurement_timestamp, metric_name, cp_value, cpk_value, sigma_level, phase_name)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, capability)
+    conn.executemany("""
+        INSERT INTO spc_violations (detection_timestamp, metric_name, violation_type, violation_description,
+                                    severity_level, phase_name, resolved)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, violations)
+
+
+def build(path, size, now):
+    """Raw tables with `size` capability rows over 24h and a tenth as many violations"""
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DDL)
+        insert(conn, capability_rows(size, now, 24 * 60), violation_rows(size // 10, now, 24 * 60))
+
+
+def legacy_refresh(conn):
+    for sql, params in LEGACY_QUERIES:
+        conn.execute(sql, params).fetchall()
+
+
+def read_model_refresh(model, now):
+    model.refresh(now)
+    model.capability(minutes=60, now=now)
+    for phase in PHASES:
+        model.capability(minutes=60, phase_name=phase, now=now)
+        if model.open_violations(phase, hours=24, now=now):
+            model.last_open_violation(phase, hours=24)
+    model.recent_violations(hours=24, limit=20)
+    model.cpk_trend(hours=24, now=now)
+    model.violation_trend(hours=24, now=now)
+
+
+def timed_refreshes(path, refresh):
+    """Mean ms per refresh, with a few new rows written before each one"""
+    elapsed = 0.0
+    with sqlite3.connect(path) as writer:
+        for _ in range(REFRESHES):
+            now = datetime.utcnow()
+            insert(writer, capability_rows(NEW_ROWS_PER_REFRESH, now, 1), violation_rows(1, now, 1))
+            writer.commit()
+            start = time.perf_counter()
+            refresh(now)
+            elapsed += time.perf_counter() - start
+    return elapsed / REFRESHES * 1e3
+
+
+def main():
+    """Run the dashboard read model benchmark"""
+    random.seed(7)
+    print(f"\n{'='*72}")
+    print(f"DASHBOARD REFRESH ({NEW_ROWS_PER_REFRESH} new rows per refresh, mean of {REFRESHES} refreshes)")
+    print(f"{'='*72}")
+    print(f"   {'raw rows':>10}{'legacy ms':>12}{'+ indexes ms':>14}{'read model ms':>15}"
+          f"{'install s':>11}{'first load ms':>15}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"observations_{size}.db")
+            build(path, size, datetime.utcnow())
+
+            # As shipped: the schema's inline INDEX clauses never created anything
+            with sqlite3.connect(path) as conn:
+                legacy_ms = timed_refreshes(path, lambda _now: legacy_refresh(conn))
+                start = time.perf_counter()
+                install(conn)
+                install_s = time.perf_counter() - start
+                indexed_ms = timed_refreshes(path, lambda _now: legacy_refresh(conn))
+
+            model = DashboardReadModel(path)
+            start = time.perf_counter()
+            model.refresh()
+            first_ms = (time.perf_counter() - start) * 1e3
+            model_ms = timed_refreshes(path, lambda moment: read_model_refresh(model, moment))
+            model.close()
+
+            print(f"   {size:>10,}{legacy_ms:>12.2f}{indexed_ms:>14.2f}{model_ms:>15.3f}"
+                  f"{install_s:>11.1f}{first_ms:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
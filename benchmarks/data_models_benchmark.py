@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Data Model Footprint Benchmark
+Compares bytes per tick and construction throughput of the legacy
+TickData/OHLCVData dataclasses against slotted records and columnar batches
+"""
+
+import gc
+import sys
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, Any
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.data_ingestion.data_models import TickData, OHLCVData, AssetType
+from src.core.data_ingestion.batch_models import (
+    TickRecord, BarRecord, TickBatch, BarBatch, datetime_to_us
+)
+
+TICK_COUNT = 100_000
+
+
+def measure(label: str, count: int, build: Callable[[], Any]) -> Dict[str, float]:
+    """Measure retained bytes per item and items/second for a builder"""
+    gc.collect()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    del built
+
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+
+    result = {
+        'bytes_per_item': retained / count,
+        'items_per_second': count / elapsed if elapsed > 0 else float('inf'),
+    }
+    print(f"   {label:<28} {result['bytes_per_item']:>8.1f} B/item "
+          f"{result['items_per_second']:>14,.0f} items/s")
+    return result
+
+
+def run_tick_benchmark(count: int = TICK_COUNT) -> Dict[str, Dict[str, float]]:
+    """Benchmark tick containers"""
+    rng = np.random.default_rng(7)
+    base = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    bids = 1.1 + np.cumsum(rng.normal(0, 1e-5, count))
+    asks = bids + 0.00012
+    bid_list = bids.tolist()
+    ask_list = asks.tolist()
+    stamps = [base + timedelta(milliseconds=i * 250) for i in range(count)]
+    stamps_us = [datetime_to_us(ts) for ts in stamps]
+
+    print(f"\n{'='*60}")
+    print(f"TICK CONTAINERS ({count:,} ticks)")
+    print(f"{'='*60}")
+
+    results = {
+        'TickData': measure('TickData (dataclass)', count, lambda: [
+            TickData(stamps[i], 'EURUSD', bid_list[i], ask_list[i], ask_list[i] - bid_list[i])
+            for i in range(count)
+        ]),
+        'TickRecord': measure('TickRecord (slots)', count, lambda: [
+            TickRecord(stamps_us[i], 'EURUSD', bid_list[i], ask_list[i], ask_list[i] - bid_list[i])
+            for i in range(count)
+        ]),
+        'TickBatch': measure('TickBatch (columnar)', count, lambda: TickBatch.from_arrays(
+            'EURUSD', np.asarray(stamps_us, dtype=np.int64), bids, asks
+        )),
+    }
+    return results
+
+
+def run_bar_benchmark(count: int = TICK_COUNT) -> Dict[str, Dict[str, float]]:
+    """Benchmark OHLCV containers"""
+    rng = np.random.default_rng(11)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, count))
+    open_ = np.roll(close, 1)
+    high = np.maximum(open_, close) + 5e-5
+    low = np.minimum(open_, close) - 5e-5
+    times = 1_736_121_600 + np.arange(count, dtype=np.int64) * 60
+    rates = np.zeros(count, dtype=[
+        ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+        ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')
+    ])
+    rates['time'], rates['open'], rates['high'] = times, open_, high
+    rates['low'], rates['close'], rates['tick_volume'] = low, close, 100
+    rows = rates.tolist()
+
+    print(f"\n{'='*60}")
+    print(f"OHLCV CONTAINERS ({count:,} bars)")
+    print(f"{'='*60}")
+
+    results = {
+        'OHLCVData': measure('OHLCVData (dataclass)', count, lambda: [
+            OHLCVData(datetime.fromtimestamp(r[0], tz=timezone.utc), 'EURUSD',
+                      r[1], r[2], r[3], r[4], float(r[5]), '1m', AssetType.FOREX)
+            for r in rows
+        ]),
+        'BarRecord': measure('BarRecord (slots)', count, lambda: [
+            BarRecord(r[0] * 1_000_000, 'EURUSD', r[1], r[2], r[3], r[4], float(r[5]), '1m')
+            for r in rows
+        ]),
+        'BarBatch': measure('BarBatch (columnar)', count, lambda: BarBatch.from_mt5_rates(
+            'EURUSD', '1m', rates
+        )),
+    }
+    return results
+
+
+def main():
+    """Run the footprint benchmark"""
+    ticks = run_tick_benchmark()
+    bars = run_bar_benchmark()
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    for legacy, batch, results in (('TickData', 'TickBatch', ticks), ('OHLCVData', 'BarBatch', bars)):
+        memory_ratio = results[legacy]['bytes_per_item'] / results[batch]['bytes_per_item']
+        speed_ratio = results[batch]['items_per_second'] / results[legacy]['items_per_second']
+        print(f"   {batch} vs {legacy}: {memory_ratio:.1f}x smaller, {speed_ratio:.1f}x faster to build")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
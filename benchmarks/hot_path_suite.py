@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmark Suite
+Drives the real trading components with synthetic data and records
+ops/sec, p50/p99 latency and peak traced memory per hot path. Results can
+be saved as a JSON baseline and later runs compared against it; the
+compare mode exits non-zero when a metric regresses beyond the threshold.
+
+    python benchmarks/hot_path_suite.py
+    python benchmarks/hot_path_suite.py --save baseline.json
+    python benchmarks/hot_path_suite.py --compare baseline.json --threshold 0.15 --metrics ops_per_sec p50_ms
+    python benchmarks/hot_path_suite.py --only data_validator mcp_signal_flow --scale 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+WARMUP_FRACTION = 0.1
+MEMORY_OPS = 200       # ops replayed under tracemalloc (kept apart from the timed pass)
+DEFAULT_THRESHOLD = 0.10
+
+_DEVNULL = open(os.devnull, 'w')  # SignalProcessor prints every signal it handles
+
+# metric -> True when a larger value is better
+METRICS = {
+    'ops_per_sec': True,
+    'p50_ms': False,
+    'p99_ms': False,
+    'peak_kb': False,
+}
+
+Op = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+@dataclass
+class CaseResult:
+    """Measured figures for one hot path"""
+    name: str
+    ops: int
+    items_per_op: int
+    ops_per_sec: float
+    items_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_kb: float
+
+
+@dataclass
+class Regression:
+    """A metric that moved the wrong way by more than the threshold"""
+    case: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # relative change, positive = worse
+
+
+@dataclass
+class HotPath:
+    """
+    One benchmark case
+
+    `build` is an async factory returning (op, cleanup). It is called once
+    for the timed pass and once more for the memory pass so the two never
+    share warmed caches or queues.
+    """
+    name: str
+    description: str
+    build: Callable[[], Awaitable[Tuple[Op, Optional[Callable[[], None]]]]]
+    ops: int
+    items_per_op: int = 1
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def synthetic_rates(bars: int, seed: int = 0, base: float = 1.085) -> np.ndarray:
+    """Random-walk M1 rates in the MT5 copy_rates layout"""
+    from src.utils.candle_archive import RATES_DTYPE
+
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars, dtype=np.int64) * 60
+    rates['close'] = base + np.cumsum(rng.normal(0, 1.5e-4, bars))
+    rates['open'] = np.r_[rates['close'][0], rates['close'][:-1]]
+    wick = np.abs(rng.normal(0, 8e-5, bars))
+    rates['high'] = np.maximum(rates['open'], rates['close']) + wick
+    rates['low'] = np.minimum(rates['open'], rates['close']) - wick
+    rates['tick_volume'] = rng.integers(50, 500, bars)
+    return rates
+
+
+def synthetic_candles(count: int, seed: int = 0, timeframe: str = 'M5') -> list:
+    from src.mikrobot_v2.core.mt5_direct_connector import Candle
+
+    rates = synthetic_rates(count, seed)
+    return [
+        Candle(symbol='EURUSD', timeframe=timeframe,
+               time=datetime.fromtimestamp(int(row['time']), timezone.utc),
+               open=float(row['open']), high=float(row['high']), low=float(row['low']),
+               close=float(row['close']), volume=int(row['tick_volume']))
+        for row in rates
+    ]
+
+
+def synthetic_ticks(count: int, seed: int = 5) -> list:
+    """Fresh EURUSD ticks spread over the last few seconds"""
+    from src.core.data_ingestion.data_models import TickData
+
+    rng = np.random.default_rng(seed)
+    bid = 1.1 + np.cumsum(rng.normal(0, 2e-5, count))
+    now = datetime.now(timezone.utc)
+    return [
+        TickData(timestamp=now - timedelta(microseconds=int((count - i) * 100)),
+                 symbol='EURUSD', bid=float(b), ask=float(b) + 0.00012, spread=0.00012,
+                 volume=1.0, sequence_number=i)
+        for i, b in enumerate(bid)
+    ]
+
+
+def u_cell_signal() -> Dict[str, Any]:
+    """A clean 25-pip M5 BOS that passes U1-U3"""
+    return {
+        'symbol': 'EURUSD',
+        'timeframe': 'M5',
+        'pattern_type': 'M5_BOS',
+        'direction': 'BUY',
+        'price_levels': {
+            'entry': 1.0877,
+            'stop_loss': 1.0852,
+            'take_profit': 1.0927,
+            'current_price': 1.0877,
+            'previous_high': 1.0850,
+            'previous_low': 1.0820,
+            'structure_break_level': 1.0852,
+        },
+        'volume': {'current_volume': 3000, 'avg_volume_20': 1000},
+        'momentum': {'momentum_score': 0.9, 'rsi': 62, 'macd_signal': 0.8},
+        'market_data': {'current_session': 'london', 'volatility_level': 'medium',
+                        'news_risk': 'normal', 'trend_strength': 0.8},
+        'risk_percent': 0.01,
+        'timestamp': datetime.utcnow().isoformat(),
+    }
+
+
+def mt5_signal_payload() -> Dict[str, Any]:
+    return {
+        'symbol': 'EURUSD',
+        'trade_direction': 'BULL',
+        'timestamp': datetime.now().isoformat(),
+        'current_price': 1.0851,
+        'strategy': 'MIKROBOT_FASTVERSION_4PHASE',
+        'phase_4_ylipip': {'target': 1.0853, 'current': 1.0854, 'triggered': True},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+async def build_structure_analyzer():
+    """identify_structure_levels + detect_trend_direction on 250 M5 candles"""
+    from src.mikrobot_v2.strategies.lightning_bolt import StructureAnalyzer
+
+    analyzer = StructureAnalyzer()
+    # 250 candles: the 50-bar lookback needs more than 100 bars to scan anything
+    candles = synthetic_candles(250, seed=1)
+
+    def op():
+        analyzer.identify_structure_levels(candles)
+        analyzer.detect_trend_direction(candles)
+
+    return op, None
+
+
+async def build_atr_calculate():
+    """ATRPositionSizer.calculate_atr (cold cache) over replayed H1 history"""
+    from src.mikrobot_v2.core.replay_connector import ReplayConnector
+    from src.mikrobot_v2.utils.atr_position_sizer import ATRPositionSizer
+
+    connector = ReplayConnector({'EURUSD': synthetic_rates(3 * 24 * 60, seed=2)})
+    while connector.advance():
+        pass
+    sizer = ATRPositionSizer(connector)
+
+    async def op():
+        sizer.atr_engine.clear()
+        await sizer.calculate_atr('EURUSD', 'H1')
+
+    return op, None
+
+
+async def build_ingestion_ticks():
+    """DataIngestionEngine: ingest_tick_data, dequeue, validate and dispatch one tick"""
+    from src.core.data_ingestion.data_ingestion_engine import DataIngestionEngine
+
+    engine = DataIngestionEngine(max_workers=1)
+    engine.register_callback(lambda data: None)
+    ticks = itertools.cycle(synthetic_ticks(20_000))
+
+    async def op():
+        engine.ingest_tick_data(next(ticks))
+        _, _, data = engine.message_queue.get_nowait()
+        await engine._process_market_data(data)
+
+    return op, lambda: engine.executor.shutdown(wait=False)
+
+
+async def build_ingestion_tick_batch():
+    """DataIngestionEngine: one 1,000-tick TickBatch through queue, batch validation and dispatch"""
+    from src.core.data_ingestion.batch_models import TickBatch, datetime_to_us
+    from src.core.data_ingestion.data_ingestion_engine import DataIngestionEngine
+
+    engine = DataIngestionEngine(max_workers=1)
+    engine.register_batch_callback(lambda batch: None)
+    rng = np.random.default_rng(6)
+    now_us = datetime_to_us(datetime.now(timezone.utc))
+    times = now_us - 5_000_000 + np.arange(1_000, dtype=np.int64) * 4_000
+    bid = 1.1 + np.cumsum(rng.normal(0, 2e-5, 1_000))
+    batch = TickBatch.from_arrays('EURUSD', times, bid, bid + 0.00012, first_sequence=0)
+
+    async def op():
+        engine.ingest_tick_batch(batch)
+        _, _, data = engine.message_queue.get_nowait()
+        await engine._process_batch(data)
+
+    return op, lambda: engine.executor.shutdown(wait=False)
+
+
+async def build_data_validator():
+    """DataValidator.validate on single tick messages"""
+    from src.core.data_ingestion.data_models import MarketData
+    from src.core.data_ingestion.data_validator import DataValidator
+
+    validator = DataValidator()
+    messages = itertools.cycle([MarketData(timestamp=tick.timestamp, symbol=tick.symbol, tick_data=tick)
+                     for tick in synthetic_ticks(20_000, seed=7)])
+
+    async def op():
+        await validator.validate(next(messages))
+
+    return op, None
+
+
+async def build_ucell_process_signal():
+    """UCellOrchestrator.process_signal: U1-U3 in full, U4 stops without an MT5 connection"""
+    from src.core.u_cells.orchestrator import UCellOrchestrator
+
+    orchestrator = UCellOrchestrator()
+    signal = u_cell_signal()
+
+    async def op():
+        await orchestrator.process_signal(dict(signal))
+
+    return op, None
+
+
+async def build_mcp_signal_flow():
+    """MCPv2Controller: SIGNAL -> ML_VALIDATION -> EXECUTION_REQUEST round trip"""
+    import uuid
+
+    from src.mikrobot_v2.orchestration.mcp_v2_controller import (
+        AgentType, MCPMessage, MCPv2Controller, MessageType
+    )
+
+    controller = MCPv2Controller()
+
+    async def ml_agent(payload):
+        return {'validation_score': 0.9}
+
+    async def execution_agent(payload):
+        return {'retcode': 10009}
+
+    controller.register_agent('ml_validation_agent', AgentType.ML_VALIDATION, ml_agent)
+    controller.register_agent('execution_agent', AgentType.EXECUTION, execution_agent)
+    payload = {
+        'symbol': 'EURUSD', 'direction': 'BULLISH', 'entry_price': 1.0851,
+        'stop_loss': 1.0831, 'take_profit': 1.0891, 'ylipip_offset': 0.00006,
+        'confidence': 0.82, 'phase': 4, 'timestamp': datetime.now().isoformat(),
+    }
+
+    async def drain():
+        # process_messages() without its idle sleep
+        while controller.message_queue:
+            message = controller.message_queue.pop(0)
+            if message.type == MessageType.ML_VALIDATION and 'validation_score' not in message.payload:
+                # the ML agent answers the validation request
+                result = await ml_agent(message.payload)
+                message.payload = {**message.payload, **result}
+            await controller._process_single_message(message)
+
+    async def op():
+        await controller.send_message(MCPMessage(
+            id=str(uuid.uuid4()), type=MessageType.SIGNAL, sender='lightning_bolt',
+            recipient='mcp_controller', payload=payload, timestamp=datetime.now(), priority=1
+        ))
+        await drain()
+
+    return op, None
+
+
+def _signal_file(directory: str) -> str:
+    from src.utils.encoding_utils import ASCIIFileManager
+
+    path = os.path.join(directory, 'mikrobot_4phase_signal.json')
+    ASCIIFileManager.write_mt5_signal_file(path, mt5_signal_payload())
+    return path
+
+
+async def build_signal_file_read():
+    """SignalProcessor.process_signal on a UTF-16LE MT5 signal file (uncached read)"""
+    from src.core.signal_processor import SignalProcessor
+
+    directory = tempfile.TemporaryDirectory()
+    path = _signal_file(directory.name)
+    processor = SignalProcessor()
+
+    async def op():
+        with contextlib.redirect_stdout(_DEVNULL):
+            await processor.process_signal(path)
+
+    return op, directory.cleanup
+
+
+async def build_signal_current_read():
+    """SignalProcessor.read_current_signal (LRU-cached file read + processing)"""
+    from pathlib import Path
+
+    from src.core.signal_processor import SignalProcessor
+
+    directory = tempfile.TemporaryDirectory()
+    processor = SignalProcessor()
+    processor.signal_paths['primary'] = Path(_signal_file(directory.name))
+
+    async def op():
+        with contextlib.redirect_stdout(_DEVNULL):
+            await processor.read_current_signal()
+
+    return op, directory.cleanup
+
+
+HOT_PATHS: List[HotPath] = [
+    HotPath('structure_analyzer', build_structure_analyzer.__doc__, build_structure_analyzer, 500),
+    HotPath('atr_calculate', build_atr_calculate.__doc__, build_atr_calculate, 1_000),
+    HotPath('ingestion_ticks', build_ingestion_ticks.__doc__, build_ingestion_ticks, 5_000),
+    HotPath('ingestion_tick_batch', build_ingestion_tick_batch.__doc__, build_ingestion_tick_batch,
+            300, items_per_op=1_000),
+    HotPath('data_validator', build_data_validator.__doc__, build_data_validator, 5_000),
+    HotPath('ucell_process_signal', build_ucell_process_signal.__doc__, build_ucell_process_signal, 1_000),
+    HotPath('mcp_signal_flow', build_mcp_signal_flow.__doc__, build_mcp_signal_flow, 2_000),
+    HotPath('signal_file_read', build_signal_file_read.__doc__, build_signal_file_read, 2_000),
+    HotPath('signal_current_read', build_signal_current_read.__doc__, build_signal_current_read, 2_000),
+]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def _call(op: Op):
+    result = op()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def _time_ops(op: Op, ops: int) -> np.ndarray:
+    latencies = np.empty(ops)
+    for i in range(ops):
+        start = time.perf_counter()
+        await _call(op)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+async def measure(case: HotPath, scale: float = 1.0) -> CaseResult:
+    """Time `case` op by op, then replay a short run under tracemalloc for peak memory"""
+    ops = max(int(case.ops * scale), 10)
+
+    op, cleanup = await case.build()
+    try:
+        for _ in range(max(int(ops * WARMUP_FRACTION), 1)):
+            await _call(op)
+        latencies = await _time_ops(op, ops)
+    finally:
+        if cleanup:
+            cleanup()
+
+    op, cleanup = await case.build()
+    try:
+        await _call(op)
+        tracemalloc.start()
+        await _time_ops(op, min(ops, MEMORY_OPS))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if cleanup:
+            cleanup()
+
+    total = float(latencies.sum())
+    ops_per_sec = ops / total if total else 0.0
+    return CaseResult(
+        name=case.name,
+        ops=ops,
+        items_per_op=case.items_per_op,
+        ops_per_sec=ops_per_sec,
+        items_per_sec=ops_per_sec * case.items_per_op,
+        p50_ms=float(np.percentile(latencies, 50) * 1000),
+        p99_ms=float(np.percentile(latencies, 99) * 1000),
+        peak_kb=peak / 1024,
+    )
+
+
+async def run_suite(cases: List[HotPath], scale: float = 1.0) -> List[CaseResult]:
+    results = []
+    for case in cases:
+        try:
+            results.append(await measure(case, scale))
+        except ImportError as e:
+            print(f"   {case.name:<22} skipped: {e}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def save_baseline(path: str, results: List[CaseResult]):
+    document = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': {result.name: asdict(result) for result in results},
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_results(baseline: Dict[str, Dict[str, float]], results: List[CaseResult],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    metrics: Optional[List[str]] = None) -> List[Regression]:
+    """Metrics that got worse than the baseline by more than `threshold` (relative)"""
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous:
+            continue
+        for metric in metrics or METRICS:
+            higher_is_better = METRICS[metric]
+            before, after = previous.get(metric), getattr(result, metric)
+            if not before:
+                continue
+            change = (before - after) / before if higher_is_better else (after - before) / before
+            if change > threshold:
+                regressions.append(Regression(result.name, metric, before, after, change))
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_results(results: List[CaseResult]):
+    print(f"   {'case':<22} {'ops/s':>11} {'items/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>9}")
+    for r in results:
+        print(f"   {r.name:<22} {r.ops_per_sec:>11,.0f} {r.items_per_sec:>12,.0f} "
+              f"{r.p50_ms:>9.3f} {r.p99_ms:>9.3f} {r.peak_kb:>9,.1f}")
+
+
+def print_comparison(baseline: Dict[str, Dict[str, float]], results: List[CaseResult],
+                     regressions: List[Regression], threshold: float):
+    flagged = {(r.case, r.metric) for r in regressions}
+    print(f"\n   {'case':<22} {'metric':<12} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous:
+            print(f"   {result.name:<22} (not in baseline)")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = previous.get(metric, 0.0), getattr(result, metric)
+            change = (after - before) / before * 100 if before else 0.0
+            mark = '  REGRESSION' if (result.name, metric) in flagged else ''
+            print(f"   {result.name:<22} {metric:<12} {before:>12,.3f} {after:>12,.3f} {change:>+7.1f}%{mark}")
+    print(f"\n   {len(regressions)} regression(s) beyond {threshold:.0%}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--only', nargs='+', metavar='CASE', help='run only these cases')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every case op count')
+    parser.add_argument('--save', metavar='PATH', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change counted as a regression (default 0.10)')
+    parser.add_argument('--metrics', nargs='+', choices=sorted(METRICS),
+                        help='metrics checked in compare mode (default: all)')
+    parser.add_argument('--list', action='store_true', help='list cases and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the hot path benchmark suite"""
+    args = parse_args(argv)
+    if args.list:
+        for case in HOT_PATHS:
+            print(f"{case.name:<22} {case.description}")
+        return 0
+
+    cases = HOT_PATHS
+    if args.only:
+        unknown = set(args.only) - {case.name for case in HOT_PATHS}
+        if unknown:
+            print(f"Unknown case(s): {', '.join(sorted(unknown))}")
+            return 2
+        cases = [case for case in HOT_PATHS if case.name in args.only]
+
+    logging.disable(logging.WARNING)
+    print(f"\n{'='*72}")
+    print(f"HOT PATH SUITE ({len(cases)} cases, scale {args.scale:g})")
+    print(f"{'='*72}")
+    results = asyncio.run(run_suite(cases, args.scale))
+    print_results(results)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\n   Baseline written to {args.save}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        regressions = compare_results(baseline, results, args.threshold, args.metrics)
+        print_comparison(baseline, results, regressions, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
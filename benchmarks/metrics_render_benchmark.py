@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Metrics Render Benchmark
+Prometheus scrape time of the metrics registry at 10k series: the first
+(cold) render, a render after 1% of the series changed and an idle render,
+plus the per-update cost of a bound child against the string-key bookkeeping
+MetricsCollector used before
+"""
+
+import sys
+import os
+import random
+import statistics
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.metrics_registry import MetricsRegistry
+
+SERIES = 10_000
+SYMBOLS = [f"SYM{i:03d}" for i in range(100)]
+SCRAPES = 50
+COLD_RUNS = 7
+UPDATES = 1_000_000
+TARGET_MS = 10.0
+
+
+def build_registry():
+    """60 counter, 30 gauge and 10 histogram families, 100 symbols each"""
+    registry = MetricsRegistry()
+    children = []
+    for i in range(60):
+        family = registry.counter(f"mikrobot_bench_events_{i}_total", "Benchmark counter", ['symbol'])
+        children += [family.labels(symbol) for symbol in SYMBOLS]
+    for i in range(30):
+        family = registry.gauge(f"mikrobot_bench_level_{i}", "Benchmark gauge", ['symbol'])
+        children += [family.labels(symbol) for symbol in SYMBOLS]
+    for i in range(10):
+        family = registry.histogram(f"mikrobot_bench_latency_{i}_ms", "Benchmark histogram", ['symbol'])
+        children += [family.labels(symbol) for symbol in SYMBOLS]
+    for child in children:
+        update(child, 1.0)
+    return registry, children
+
+
+def update(child, value):
+    if hasattr(child, 'observe'):
+        child.observe(value)
+    elif hasattr(child, 'set'):
+        child.set(value)
+    else:
+        child.inc(value)
+
+
+def timed_ms(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Run the metrics render benchmark"""
+    rng = random.Random(0)
+
+    # Cold render: first scrape of a freshly built registry (median of several)
+    cold = []
+    for _ in range(COLD_RUNS):
+        registry, children = build_registry()
+        text, cold_ms = timed_ms(registry.render)
+        cold.append(cold_ms)
+    assert len(children) == SERIES
+    cold_ms = statistics.median(cold)
+
+    print(f"\n{'='*72}")
+    print(f"METRICS RENDER ({SERIES:,} series)")
+    print(f"{'='*72}")
+
+    lines = text.count('\n')
+
+    changed = max(1, SERIES // 100)
+    warm = []
+    for scrape in range(SCRAPES):
+        for child in rng.sample(children, changed):
+            update(child, rng.uniform(0.1, 50.0))
+        warm.append(timed_ms(registry.render)[1])
+    idle = [timed_ms(registry.render)[1] for _ in range(SCRAPES)]
+
+    warm_ms = statistics.median(warm)
+    print(f"   exposition: {lines:,} lines, {len(text) / 1024:,.0f} KB")
+    print(f"   cold render (median):   {cold_ms:>8.2f} ms  (max {max(cold):.2f} ms)")
+    print(f"   1% changed (median):    {warm_ms:>8.2f} ms  (max {max(warm):.2f} ms)")
+    print(f"   idle (median):          {statistics.median(idle):>8.2f} ms")
+
+    # Recording cost: bound child vs the old per-call key string
+    child = children[0]
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        child.inc()
+    bound_ns = (time.perf_counter() - start) / UPDATES * 1e9
+
+    counters = {}
+    name, tags = 'mikrobot.bench.events', {'symbol': 'SYM000', 'source': 'mt5'}
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        metric_key = f"{name}:{':'.join(f'{k}={v}' for k, v in tags.items())}"
+        counters[metric_key] = counters.get(metric_key, 0) + 1
+    keyed_ns = (time.perf_counter() - start) / UPDATES * 1e9
+
+    print(f"\n   Update cost ({UPDATES:,} increments)")
+    print(f"   bound child inc():      {bound_ns:>8.0f} ns")
+    print(f"   string key + dict:      {keyed_ns:>8.0f} ns")
+
+    met = cold_ms < TARGET_MS and warm_ms < TARGET_MS
+    print(f"\n   Scrape target < {TARGET_MS:.0f} ms cold and with 1% churn: {'met' if met else 'MISSED'}")
+    return 0 if met else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
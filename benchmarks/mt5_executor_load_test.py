@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+MT5 Executor Service Load Test
+Drives the executor's HTTP API at rising concurrency against a fake
+MetaTrader5 module and reports accepted orders/s, latency, admission
+rejections and whether MT5 was ever entered from two threads at once
+
+The service runs in its own process with a LatencyMT5 module standing in
+for the terminal (every order_send takes ORDER_MS). For contrast, the
+legacy model, where each request thread calls MT5 inline, is replayed
+against the same fake to count overlapping calls.
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import os
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.bridge.mt5_service import MT5Service, create_app
+
+ORDER_MS = 1.0
+ORDERS_PER_LEVEL = 2_000
+CONCURRENCY = (1, 16, 64, 512)
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'USDCAD', 'USDCHF', 'NZDUSD', 'XAUUSD']
+
+
+class LatencyMT5(types.ModuleType):
+    """
+    Fake MetaTrader5 module with a fixed order latency
+
+    Records every calling thread and counts calls that overlap another
+    call in progress, which the real module does not tolerate.
+    """
+
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    TRADE_ACTION_DEAL, ORDER_TIME_GTC, ORDER_FILLING_IOC = 1, 0, 1
+    TRADE_RETCODE_DONE = 10009
+
+    def __init__(self, order_ms: float = ORDER_MS):
+        super().__init__('MetaTrader5')
+        self.order_s = order_ms / 1000
+        self.threads = set()
+        self.overlaps = 0
+        self.orders = 0
+        self._busy = threading.Lock()
+
+    def _enter(self):
+        self.threads.add(threading.get_ident())
+        if not self._busy.acquire(blocking=False):
+            self.overlaps += 1
+            return False
+        return True
+
+    def _call(self, value=None, delay: float = 0.0):
+        owned = self._enter()
+        try:
+            if delay:
+                time.sleep(delay)
+            return value
+        finally:
+            if owned:
+                self._busy.release()
+
+    def initialize(self):
+        return self._call(True)
+
+    def login(self, account, password, server):
+        return self._call(True)
+
+    def shutdown(self):
+        return self._call()
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def account_info(self):
+        return self._call(types.SimpleNamespace(login=1, balance=10_000.0, equity=10_000.0,
+                                                margin=0.0, server='Fake'))
+
+    def positions_get(self):
+        return self._call(())
+
+    def symbol_info_tick(self, symbol):
+        return self._call(types.SimpleNamespace(bid=1.1000, ask=1.1002))
+
+    def order_send(self, request):
+        self.orders += 1
+        return self._call(types.SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, order=self.orders,
+                                                deal=self.orders, volume=request['volume'],
+                                                price=request['price'], comment='done'),
+                          delay=self.order_s)
+
+    def report(self) -> Dict[str, Any]:
+        return {'threads': len(self.threads), 'overlaps': self.overlaps, 'orders': self.orders}
+
+
+def signal(i: int) -> Dict:
+    return {'symbol': SYMBOLS[i % len(SYMBOLS)], 'action': 'BUY', 'volume': 0.01, 'signal_id': f"LB_{i}"}
+
+
+def serve_executor(port_queue):
+    """Executor process: MT5Service on a fake terminal behind the HTTP app"""
+    fake = LatencyMT5()
+
+    async def run():
+        service = MT5Service(fake, account=1, password='x', server='Fake')
+        service.start()
+
+        async def fake_report(request):
+            return web.json_response(fake.report())
+
+        app = create_app(service)
+        app.router.add_get('/fake_mt5', fake_report)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.sleep(3600)  # keep serving until terminated
+
+    asyncio.run(run())
+
+
+async def run_level(url: str, concurrency: int) -> Dict[str, Any]:
+    """ORDERS_PER_LEVEL orders from `concurrency` clients over keep-alive connections"""
+    latencies, statuses = [], []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(f"{url}/stats") as response:
+            before = (await response.json())['executor']
+        next_order = iter(range(ORDERS_PER_LEVEL))
+
+        async def client():
+            for i in next_order:
+                started = time.perf_counter()
+                async with session.post(f"{url}/execute", json=signal(i)) as response:
+                    await response.read()
+                    statuses.append(response.status)
+                    if response.status == 200:
+                        latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        async with session.get(f"{url}/stats") as response:
+            after = (await response.json())['executor']
+
+    ms = np.array(latencies) * 1000
+    result = {
+        'concurrency': concurrency,
+        'accepted_per_s': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(ms, 50)) if len(ms) else float('nan'),
+        'p99_ms': float(np.percentile(ms, 99)) if len(ms) else float('nan'),
+        'rejected': statuses.count(503),
+        'expired': after['expired'] - before['expired'],
+        'max_depth': after['max_depth'],
+    }
+    print(f"   {concurrency:>6} {result['accepted_per_s']:>10,.0f} {result['p50_ms']:>8.2f} "
+          f"{result['p99_ms']:>8.2f} {result['rejected']:>8,} {result['expired']:>7,} {result['max_depth']:>9,}")
+    return result
+
+
+async def run_load(port: int):
+    url = f"http://127.0.0.1:{port}"
+    for concurrency in CONCURRENCY:
+        await run_level(url, concurrency)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url}/fake_mt5") as response:
+            return await response.json()
+
+
+def legacy_inline(threads: int = 16) -> Dict[str, Any]:
+    """Each request thread calls MT5 itself, as under a threaded dev server"""
+    fake = LatencyMT5()
+
+    def execute(i):
+        tick = fake.symbol_info_tick(signal(i)['symbol'])
+        fake.order_send({'volume': 0.01, 'price': tick.ask})
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(execute, range(ORDERS_PER_LEVEL // 4)))
+    return fake.report()
+
+
+def main():
+    """Run the MT5 executor load test"""
+    port_queue = multiprocessing.Queue()
+    executor = multiprocessing.Process(target=serve_executor, args=(port_queue,), daemon=True)
+    executor.start()
+    try:
+        port = port_queue.get()
+        print(f"\n{'='*72}")
+        print(f"EXECUTOR SERVICE ({ORDERS_PER_LEVEL:,} orders per level, {len(SYMBOLS)} symbols, "
+              f"fake order_send {ORDER_MS:.1f} ms)")
+        print(f"{'='*72}")
+        print(f"   {'conc':>6} {'accepted/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'rejected':>8} "
+              f"{'expired':>7} {'max depth':>9}")
+        fake = asyncio.run(run_load(port))
+        print(f"   MT5 calling threads: {fake['threads']}, overlapping calls: {fake['overlaps']}, "
+              f"orders filled: {fake['orders']:,}")
+    finally:
+        executor.terminate()
+        executor.join()
+
+    legacy = legacy_inline()
+    print(f"\n{'='*72}")
+    print("LEGACY INLINE EXECUTION (16 request threads calling MT5 directly)")
+    print(f"{'='*72}")
+    print(f"   MT5 calling threads: {legacy['threads']}, overlapping calls: {legacy['overlaps']:,} "
+          f"({legacy['orders']:,} orders)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+MT5 Tick Polling Benchmark
+Measures CPU per subscribed symbol and tick-capture completeness of
+ForexDataConnector polling against a scripted fake MT5 tick source
+
+Compares the legacy fixed 1 ms loop with adaptive polling, with and without
+copy_ticks_from backfill. No terminal is needed: a ScriptedMT5 module is
+installed as `MetaTrader5` before the connector is imported.
+"""
+
+import sys
+import os
+import time
+import types
+import threading
+from datetime import datetime
+from typing import Dict, Any
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+TICK_FIELDS = [('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+               ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'),
+               ('volume_real', '<f8')]
+
+
+class ScriptedMT5(types.ModuleType):
+    """
+    Fake MetaTrader5 module replaying a pre-generated tick schedule
+
+    symbol_info_tick() returns the newest scripted tick at the current wall
+    clock, exactly like the terminal's "last quote" semantics, and
+    copy_ticks_from() returns the scripted history.
+    """
+
+    COPY_TICKS_ALL = 1
+    TIMEFRAME_M1, TIMEFRAME_M5, TIMEFRAME_M15, TIMEFRAME_M30 = 1, 5, 15, 30
+    TIMEFRAME_H1, TIMEFRAME_H4, TIMEFRAME_D1 = 16385, 16388, 16408
+    TIMEFRAME_W1, TIMEFRAME_MN1 = 32769, 49153
+
+    def __init__(self):
+        super().__init__('MetaTrader5')
+        self.schedules: Dict[str, np.ndarray] = {}
+        self.start_msc = 0
+        self.calls = 0
+
+    def load(self, symbols, duration_s: float, ticks_per_second: float, seed: int = 1):
+        """Script Poisson tick arrivals (with bursts) for each symbol"""
+        rng = np.random.default_rng(seed)
+        self.start_msc = int(time.time() * 1000)
+        for symbol in symbols:
+            count = rng.poisson(ticks_per_second * duration_s)
+            offsets = np.sort(rng.uniform(0, duration_s * 1000, count)).astype(np.int64)
+            # Bursts: a few clusters of ticks 1-3 ms apart
+            for centre in rng.uniform(0, duration_s * 1000, 5).astype(np.int64):
+                offsets = np.concatenate([offsets, centre + np.arange(0, 40, 2)])
+            offsets = np.unique(offsets)
+            ticks = np.zeros(len(offsets), dtype=TICK_FIELDS)
+            ticks['time_msc'] = self.start_msc + offsets
+            ticks['time'] = ticks['time_msc'] // 1000
+            ticks['bid'] = 1.1 + np.cumsum(rng.normal(0, 1e-5, len(offsets)))
+            ticks['ask'] = ticks['bid'] + 0.0001
+            self.schedules[symbol] = ticks
+
+    def _visible(self, symbol: str) -> np.ndarray:
+        ticks = self.schedules[symbol]
+        now_msc = int(time.time() * 1000)
+        return ticks[:np.searchsorted(ticks['time_msc'], now_msc, side='right')]
+
+    def symbol_info_tick(self, symbol: str):
+        self.calls += 1
+        visible = self._visible(symbol)
+        if not len(visible):
+            return None
+        row = visible[-1]
+        return types.SimpleNamespace(time=int(row['time']), time_msc=int(row['time_msc']),
+                                     bid=float(row['bid']), ask=float(row['ask']),
+                                     volume=int(row['volume']))
+
+    def copy_ticks_from(self, symbol: str, date_from, count: int, flags: int):
+        self.calls += 1
+        visible = self._visible(symbol)
+        from_msc = int(date_from.timestamp() * 1000) if isinstance(date_from, datetime) else int(date_from) * 1000
+        start = np.searchsorted(visible['time_msc'], from_msc, side='left')
+        return visible[start:start + count]
+
+
+fake_mt5 = sys.modules.get('MetaTrader5')
+if not isinstance(fake_mt5, ScriptedMT5):
+    fake_mt5 = ScriptedMT5()
+    sys.modules['MetaTrader5'] = fake_mt5
+
+from src.core.data_ingestion import forex_connector
+from src.core.data_ingestion.forex_connector import ForexDataConnector
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'USDCAD',
+           'EURJPY', 'GBPJPY', 'NZDUSD', 'USDCHF', 'EURGBP']
+DURATION_S = 5.0
+TICKS_PER_SECOND = 4.0
+
+
+def legacy_tick_processor(connector: ForexDataConnector):
+    """The pre-adaptive loop: every symbol, every 1 ms, no dedup"""
+    mt5 = forex_connector.mt5
+    while not connector.stop_event.is_set():
+        for symbol in list(connector.symbol_subscriptions.keys()):
+            tick = mt5.symbol_info_tick(symbol)
+            if tick:
+                try:
+                    connector.tick_queue.put_nowait({'symbol': symbol, 'time_msc': tick.time_msc})
+                except Exception:
+                    pass
+        time.sleep(0.001)
+
+
+def run_mode(label: str, target, connector: ForexDataConnector) -> Dict[str, Any]:
+    """Run one polling mode against the scripted source"""
+    fake_mt5.load(SYMBOLS, DURATION_S, TICKS_PER_SECOND)
+    fake_mt5.calls = 0
+    connector.symbol_subscriptions = {symbol: True for symbol in SYMBOLS}
+    connector.stop_event.clear()
+
+    captured: Dict[str, set] = {symbol: set() for symbol in SYMBOLS}
+    drained = 0
+    cpu_start = time.process_time()
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+
+    deadline = time.perf_counter() + DURATION_S
+    while time.perf_counter() < deadline:
+        for tick in connector.get_pending_ticks(10_000):
+            captured[tick['symbol']].add(tick['time_msc'])
+            drained += 1
+        time.sleep(0.01)
+    connector.stop_event.set()
+    thread.join()
+    for tick in connector.get_pending_ticks(1_000_000):
+        captured[tick['symbol']].add(tick['time_msc'])
+        drained += 1
+    cpu = time.process_time() - cpu_start
+
+    end_msc = fake_mt5.start_msc + int(DURATION_S * 1000)
+    scripted = sum(int(np.count_nonzero(fake_mt5.schedules[s]['time_msc'] <= end_msc)) for s in SYMBOLS)
+    unique = sum(len(v) for v in captured.values())
+    result = {
+        'cpu_ms_per_symbol_second': cpu * 1000 / len(SYMBOLS) / DURATION_S,
+        'mt5_calls': fake_mt5.calls,
+        'queued_ticks': drained,
+        'duplicates': drained - unique,
+        'completeness': unique / scripted if scripted else 1.0,
+    }
+    print(f"   {label:<22} {result['cpu_ms_per_symbol_second']:>8.2f} "
+          f"{result['mt5_calls']:>10,} {result['duplicates']:>10,} {result['completeness']:>11.1%}")
+    return result
+
+
+def main():
+    """Run the polling benchmark"""
+    print(f"\n{'='*72}")
+    print(f"MT5 TICK POLLING ({len(SYMBOLS)} symbols, {DURATION_S:.0f}s, "
+          f"~{TICKS_PER_SECOND:.0f} ticks/s/symbol + bursts)")
+    print(f"{'='*72}")
+    print(f"   {'mode':<22} {'cpu ms/sym/s':>8} {'mt5 calls':>10} {'duplicates':>10} {'completeness':>11}")
+
+    legacy = ForexDataConnector()
+    run_mode('legacy 1ms loop', lambda: legacy_tick_processor(legacy), legacy)
+
+    adaptive = ForexDataConnector()
+    run_mode('adaptive', adaptive._tick_processor, adaptive)
+
+    backfill = ForexDataConnector(use_tick_backfill=True)
+    run_mode('adaptive + backfill', backfill._tick_processor, backfill)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Mac -> Windows Order Bridge Benchmark
+Order round-trip latency and orders/s with both ends on localhost
+
+The executor runs in its own process with a fake MT5 fill, so only the
+transport is measured. Four paths are compared:
+
+- per-order HTTP: a new aiohttp session per order and a blocking
+  confirmation POST (new connection) before the executor replies, as the
+  bridge used to do
+- keep-alive HTTP: one session, confirmations queued in the background
+- order channel, one order at a time
+- order channel, PIPELINE orders in flight
+"""
+
+import asyncio
+import json
+import multiprocessing
+import sys
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.bridge.order_channel import ConfirmationSender, OrderChannelClient, OrderChannelServer
+
+ORDERS = 2_000
+PIPELINE = 32
+
+
+class ConfirmationWebhook(BaseHTTPRequestHandler):
+    """Stands in for the Mac's Django confirmation view"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = b'{"status": "confirmed"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def fake_fill(signal: Dict) -> Dict:
+    return {'success': True, 'ticket': signal['n'], 'price': 1.0850, 'symbol': signal['symbol']}
+
+
+def confirmation(signal: Dict) -> Dict:
+    return {'signal_id': signal['signal_id'], 'ticket': signal['n'], 'status': 'EXECUTED'}
+
+
+def serve_executor(port_queue):
+    """Executor process: HTTP endpoints, the order channel and a local webhook"""
+    webhook = ThreadingHTTPServer(('127.0.0.1', 0), ConfirmationWebhook)
+    threading.Thread(target=webhook.serve_forever, daemon=True).start()
+    webhook_url = f"http://127.0.0.1:{webhook.server_address[1]}/confirm"
+
+    def post_confirmation(payload):
+        request = urllib.request.Request(webhook_url, data=json.dumps(payload).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+    def execute_blocking_confirmation(signal):
+        result = fake_fill(signal)
+        post_confirmation(confirmation(signal))
+        return result
+
+    sender = ConfirmationSender(post_confirmation, maxsize=ORDERS)
+    worker = threading.Lock()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        def execute_on_channel(signal):
+            result = fake_fill(signal)
+            channel.publish_confirmation(confirmation(signal))
+            return result
+
+        channel = OrderChannelServer(execute_on_channel)
+
+        async def per_order(request):
+            signal = await request.json()
+            return web.json_response(await loop.run_in_executor(None, execute_blocking_confirmation, signal))
+
+        async def keep_alive(request):
+            signal = await request.json()
+            with worker:
+                result = fake_fill(signal)
+            sender.submit(confirmation(signal))
+            return web.json_response(result)
+
+        app = channel.app()
+        app.router.add_post('/execute_sync', per_order)
+        app.router.add_post('/execute', keep_alive)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.sleep(3600)  # keep serving until terminated
+
+    asyncio.run(run())
+
+
+def orders(count: int) -> List[Dict]:
+    return [{'n': i, 'symbol': 'EURUSD', 'action': 'BUY', 'volume': 0.01, 'signal_id': f"LB_{i}"}
+            for i in range(count)]
+
+
+async def bench_per_order_http(port: int, signals: List[Dict]) -> List[float]:
+    latencies = []
+    for signal in signals:
+        started = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"http://127.0.0.1:{port}/execute_sync", json=signal,
+                                    timeout=aiohttp.ClientTimeout(total=10)) as response:
+                await response.json()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def bench_keep_alive_http(port: int, signals: List[Dict]) -> List[float]:
+    latencies = []
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+        for signal in signals:
+            started = time.perf_counter()
+            async with session.post(f"http://127.0.0.1:{port}/execute", json=signal) as response:
+                await response.json()
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def bench_channel(port: int, signals: List[Dict], in_flight: int) -> List[float]:
+    confirmations = []
+    client = OrderChannelClient(f"ws://127.0.0.1:{port}/orders", on_confirmation=confirmations.append)
+    await client.connect()
+    latencies = []
+    gate = asyncio.Semaphore(in_flight)
+
+    async def send(signal):
+        async with gate:
+            started = time.perf_counter()
+            await client.send_order(signal)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(send(signal) for signal in signals))
+    deadline = time.perf_counter() + 5
+    while len(confirmations) < len(signals) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    await client.close()
+    assert len(confirmations) == len(signals), "confirmations lost"
+    return latencies
+
+
+def report(label: str, latencies: List[float], elapsed: float):
+    ms = np.array(latencies) * 1000
+    print(f"   {label:<28} {np.percentile(ms, 50):>8.3f} {np.percentile(ms, 99):>8.3f} "
+          f"{len(ms) / elapsed:>10,.0f}")
+
+
+def main():
+    """Run the order bridge benchmark"""
+    port_queue = multiprocessing.Queue()
+    executor = multiprocessing.Process(target=serve_executor, args=(port_queue,), daemon=True)
+    executor.start()
+    try:
+        port = port_queue.get()
+        signals = orders(ORDERS)
+
+        print(f"\n{'='*72}")
+        print(f"ORDER ROUND TRIP ({ORDERS:,} orders, executor in a separate local process)")
+        print(f"{'='*72}")
+        print(f"   {'path':<28} {'p50 ms':>8} {'p99 ms':>8} {'orders/s':>10}")
+
+        cases = [
+            ('per-order HTTP + sync conf', lambda: bench_per_order_http(port, signals)),
+            ('keep-alive HTTP', lambda: bench_keep_alive_http(port, signals)),
+            ('order channel', lambda: bench_channel(port, signals, 1)),
+            (f"order channel x{PIPELINE}", lambda: bench_channel(port, signals, PIPELINE)),
+        ]
+        for label, case in cases:
+            asyncio.run(case())  # warm up connections and code paths
+            started = time.perf_counter()
+            latencies = asyncio.run(case())
+            report(label, latencies, time.perf_counter() - started)
+    finally:
+        executor.terminate()
+        executor.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Pareto Aggregation Benchmark
+Nested Pareto analysis over 24 hours and 30 days of failures: rebuilding
+a FailureEvent per row and regrouping in Python at every level, against
+the SQL GROUP BY over the hourly failure buckets
+"""
+
+import sys
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PARETO_ANALYSIS_FRAMEWORK import NestedParetoAnalyzer
+
+SIZES = (10_000, 100_000)
+WINDOWS = (24, 30 * 24)
+ROUNDS = 3
+
+DDL = """
+CREATE TABLE spc_violations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, detection_timestamp TIMESTAMP NOT NULL, metric_name TEXT NOT NULL,
+    violation_type TEXT, violation_description TEXT, severity_level INTEGER, data_point_value REAL,
+    symbol TEXT, phase_name TEXT
+);
+CREATE TABLE mt5_journal_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, event_timestamp TIMESTAMP NOT NULL, event_type TEXT NOT NULL,
+    event_category TEXT, severity_level INTEGER, message TEXT, symbol TEXT, raw_data TEXT
+);
+CREATE TABLE mt5_expert_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, event_timestamp TIMESTAMP NOT NULL, expert_name TEXT NOT NULL,
+    event_type TEXT, symbol TEXT, execution_time_ms INTEGER, success_flag BOOLEAN, error_code INTEGER,
+    error_message TEXT
+);
+CREATE TABLE early_warning_alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, alert_timestamp TIMESTAMP NOT NULL, alert_type TEXT,
+    severity_level INTEGER, metric_name TEXT NOT NULL, current_value REAL, threshold_value REAL,
+    deviation_magnitude REAL, phase_name TEXT, symbol TEXT
+);
+"""
+
+
+def build(path, rows_per_source, now):
+    """Failures spread evenly over the last 30 days"""
+    def ts():
+        return (now - timedelta(hours=random.random() * 30 * 24)).isoformat(sep=' ')
+
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DDL)
+        conn.executemany("""
+            INSERT INTO spc_violations (detection_timestamp, metric_name, violation_type, violation_description,
+                                        severity_level, data_point_value, symbol, phase_name)
+            VALUES (?, 'latency', ?, 'rule', ?, ?, 'EURUSD', 'M5_BOS_DETECTION')
+        """, [(ts(), f'RULE_{random.randint(1, 8)}', random.randint(1, 5), random.gauss(0, 20))
+              for _ in range(rows_per_source)])
+        conn.executemany("""
+            INSERT INTO mt5_journal_data (event_timestamp, event_type, event_category, severity_level, message)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(ts(), random.choice(['TERMINAL', 'TRADE', 'NETWORK']), random.choice(['ERROR', 'WARNING']),
+               random.randint(1, 5), random.choice(['Connection lost', 'Order rejected', 'Bad tick', 'Slow reply']))
+              for _ in range(rows_per_source)])
+        conn.executemany("""
+            INSERT INTO mt5_expert_data (event_timestamp, expert_name, event_type, execution_time_ms,
+                                         success_flag, error_code)
+            VALUES (?, 'Mikrobot', 'ERROR', ?, 0, ?)
+        """, [(ts(), random.randint(10, 8000), random.choice([2, 4, 130, 131, 10004]))
+              for _ in range(rows_per_source)])
+        conn.executemany("""
+            INSERT INTO early_warning_alerts (alert_timestamp, alert_type, severity_level, metric_name,
+                                              deviation_magnitude)
+            VALUES (?, ?, ?, 'cpk', ?)
+        """, [(ts(), random.choice(['CAPABILITY_DECLINE', 'TREND_REVERSAL', 'THRESHOLD_BREACH', 'ANOMALY_DETECTED']),
+               random.randint(1, 5), random.random() * 2) for _ in range(rows_per_source)])
+
+
+def per_event_analysis(analyzer, hours_back):
+    """The nested analysis as it ran before: events rebuilt and regrouped at each level"""
+    events = analyzer.collect_failure_data(hours_back)
+    level1 = analyzer._perform_pareto_analysis(events, 'category', 1, 0.80)
+    for item in level1.vital_few_items:
+        subset = [e for e in events if e.category == item.name]
+        level2 = analyzer._perform_pareto_analysis(subset, 'subcategory', 2, 0.64)
+        for subitem in level2.vital_few_items:
+            analyzer._perform_pareto_analysis(
+                [e for e in subset if e.subcategory == subitem.name], 'failure_type', 3, 0.512)
+    return level1.total_failures
+
+
+def aggregated_analysis(analyzer, hours_back):
+    totals = analyzer.aggregate_failures(hours_back)
+    return sum(values[0] for values in totals.values())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1e3, result
+
+
+def main():
+    """Run the Pareto aggregation benchmark"""
+    random.seed(11)
+    print(f"\n{'='*72}")
+    print(f"NESTED PARETO ANALYSIS (4 failure sources, 30 days of rows, mean of {ROUNDS} runs)")
+    print(f"{'='*72}")
+    print(f"   {'rows/source':>12}{'window h':>10}{'failures':>10}{'per-event ms':>15}{'buckets ms':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"failures_{size}.db")
+            build(path, size, datetime.utcnow())
+            analyzer = NestedParetoAnalyzer(path)
+            for hours_back in WINDOWS:
+                legacy_ms, legacy_count = timed(per_event_analysis, analyzer, hours_back)
+                bucket_ms, bucket_count = timed(aggregated_analysis, analyzer, hours_back)
+                assert bucket_count == legacy_count
+                print(f"   {size:>12,}{hours_back:>10}{bucket_count:>10,}{legacy_ms:>15.1f}{bucket_ms:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Replay Backtest Benchmark
+LightningBoltStrategy over months of synthetic M1 bars on the replay
+connector: bars/second, trades and P&L, plus a repeat run to confirm the
+result is deterministic
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mikrobot_v2.core.replay_connector import ReplayConnector, ReplayConfig
+from src.mikrobot_v2.replay_engine import ReplayEngine
+
+MONTHS = 3
+BARS = MONTHS * 30 * 24 * 60
+SYMBOLS = ('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD')
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8')])
+
+
+def synthetic_rates(bars: int, seed: int, base: float) -> np.ndarray:
+    """Random walk with slowly switching drift so structure breaks occur"""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 4e-5, bars // 720 + 1), 720)[:bars]
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars, dtype=np.int64) * 60
+    rates['close'] = base * (1 + np.cumsum(drift + rng.normal(0, 1.5e-4, bars)))
+    rates['open'] = np.r_[rates['close'][0], rates['close'][:-1]]
+    wick = np.abs(rng.normal(0, 8e-5, bars)) * base
+    rates['high'] = np.maximum(rates['open'], rates['close']) + wick
+    rates['low'] = np.minimum(rates['open'], rates['close']) - wick
+    rates['tick_volume'] = rng.integers(50, 500, bars)
+    return rates
+
+
+def replay():
+    data = {symbol: synthetic_rates(BARS, seed, 150.0 if symbol.endswith('JPY') else 1.1)
+            for seed, symbol in enumerate(SYMBOLS)}
+    connector = ReplayConnector(data, ReplayConfig(spread_pips=0.8, slippage_pips=0.3, seed=42))
+    return asyncio.run(ReplayEngine(connector, warmup_steps=1500).run())
+
+
+def main():
+    """Run the replay backtest benchmark"""
+    logging.disable(logging.INFO)
+    print(f"\n{'='*72}")
+    print(f"REPLAY BACKTEST ({len(SYMBOLS)} symbols x {BARS:,} M1 bars, ~{MONTHS} months)")
+    print(f"{'='*72}")
+
+    first = replay()
+    summary = first.summary()
+    print(f"   wall time:        {first.wall_seconds:>10.1f} s")
+    print(f"   throughput:       {first.bars_per_second:>10,.0f} bars/s "
+          f"({first.analyses / first.wall_seconds:,.0f} analyze_symbol calls/s)")
+    print(f"   signals/trades:   {first.signals:>10} / {summary['trades']}")
+    print(f"   net P&L:          {summary['net_profit']:>10,.2f} (win rate {summary['win_rate']:.1%}, "
+          f"max drawdown {summary['max_drawdown']:,.2f})")
+
+    second = replay().summary()
+    for key in ('wall_seconds', 'bars_per_second'):
+        summary.pop(key)
+        second.pop(key)
+    print(f"   repeat run identical: {summary == second}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
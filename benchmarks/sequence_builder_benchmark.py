@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+LSTM Sequence Builder Benchmark
+Build time and peak RSS for 1M-row inputs: the copying window loop that
+prepare_sequences used vs SequenceWindows (dense arrays and streamed batches)
+"""
+
+import sys
+import os
+import resource
+import subprocess
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+ROWS = 1_000_000
+FEATURES = 8
+SEQUENCE_LENGTH = 30
+BATCH_SIZE = 1024
+SYMBOLS = 4
+
+
+def make_inputs():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(ROWS, FEATURES))
+    targets = (rng.random(ROWS) > 0.7).astype(float)
+    groups = np.repeat(np.arange(SYMBOLS), ROWS // SYMBOLS)
+    return data, targets, groups
+
+
+def copying_loop(data, targets, groups):
+    X, y = [], []
+    for i in range(SEQUENCE_LENGTH, len(data)):
+        X.append(data[i - SEQUENCE_LENGTH:i])
+        y.append(targets[i])
+    X = np.array(X)
+    y = np.array(y)
+    return len(X)
+
+
+def dense_arrays(data, targets, groups):
+    from sequence_builder import SequenceWindows
+    X, y = SequenceWindows(data, targets, SEQUENCE_LENGTH, groups=groups).to_arrays()
+    return len(X)
+
+
+def streamed_batches(data, targets, groups):
+    from sequence_builder import SequenceWindows
+    windows = SequenceWindows(data, targets, SEQUENCE_LENGTH, groups=groups)
+    samples = 0
+    for X, y in windows.batches(BATCH_SIZE, shuffle=True, seed=0):
+        samples += len(X)
+    return samples
+
+
+MODES = {
+    'copying loop (before)': copying_loop,
+    'SequenceWindows.to_arrays': dense_arrays,
+    'SequenceWindows.batches': streamed_batches,
+}
+
+
+def run_mode(name: str) -> None:
+    """Child process: build one mode and report seconds, peak RSS delta and samples"""
+    inputs = make_inputs()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    samples = MODES[name](*inputs)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed} {(peak - baseline) / 1024} {peak / 1024} {samples}")
+
+
+def main():
+    """Run the sequence builder benchmark"""
+    if len(sys.argv) > 2 and sys.argv[1] == '--mode':
+        run_mode(sys.argv[2])
+        return 0
+
+    window_mb = ROWS * SEQUENCE_LENGTH * FEATURES * 8 / 2**20
+    print(f"\n{'='*72}")
+    print(f"LSTM SEQUENCES ({ROWS:,} rows x {FEATURES} features, length {SEQUENCE_LENGTH}, "
+          f"{SYMBOLS} symbols)")
+    print(f"{'='*72}")
+    print(f"   dense windows would occupy {window_mb:,.0f} MB")
+    print(f"   {'builder':<28} {'seconds':>9} {'peak RSS +MB':>13} {'peak RSS MB':>12} {'samples':>10}")
+    for name in MODES:
+        output = subprocess.run([sys.executable, __file__, '--mode', name],
+                                capture_output=True, text=True, check=True).stdout.split()
+        elapsed, delta, peak, samples = float(output[0]), float(output[1]), float(output[2]), int(output[3])
+        print(f"   {name:<28} {elapsed:>9.2f} {delta:>13,.0f} {peak:>12,.0f} {samples:>10,}")
+    print(f"\n   copying loop ignores symbol boundaries; batches shuffled, {BATCH_SIZE} per batch")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Signal Codec Benchmark
+Decode throughput over the signal corpus in tests/data/signals for the
+regex-based readers the codec replaced and for signal_codec, plus the cost
+of following a file while the EA is still writing it
+"""
+
+import sys
+import os
+import json
+import re
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from encoding_utils import UnicodeReplacer
+from signal_codec import IncrementalSignalDecoder, decode_signal
+
+CORPUS = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data', 'signals')
+ROUNDS = 2_000
+CHUNK = 64
+
+
+def legacy_ascii_file_manager(raw):
+    """ASCIIFileManager.read_mt5_signal_file before the codec"""
+    text = raw.decode('utf-16le', errors='ignore').replace('\x00', '')
+    return json.loads(re.sub(r'[^\x20-\x7E]', '', text))
+
+
+def legacy_orchestrator(raw):
+    """MCPTradingOrchestrator.read_signal_file before the codec"""
+    if raw.startswith(b'\xff\xfe'):
+        text = raw.decode('utf-16le', errors='ignore')
+    else:
+        text = raw.decode('utf-8', errors='ignore')
+    text = re.sub(r'[^\x20-\x7E{}":,.-]', '', text.replace('\x00', ''))
+    return json.loads(text)
+
+
+def legacy_replace_unicode(text):
+    """UnicodeReplacer.replace_unicode before it dropped the per-character join"""
+    for char, replacement in UnicodeReplacer.UNICODE_MAP.items():
+        text = text.replace(char, replacement)
+    return ''.join(char for char in text if ord(char) < 128)
+
+
+def load_corpus():
+    with open(os.path.join(CORPUS, 'MANIFEST.json')) as f:
+        manifest = json.load(f)
+    corpus = []
+    for name in sorted(manifest):
+        with open(os.path.join(CORPUS, name), 'rb') as f:
+            corpus.append((name, f.read()))
+    return corpus
+
+
+def throughput(decode, samples):
+    """(MB/s, decodes/s, signals decoded per pass)"""
+    decoded = 0
+    for raw in samples:
+        try:
+            decoded += decode(raw) is not None
+        except ValueError:
+            pass
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for raw in samples:
+            try:
+                decode(raw)
+            except ValueError:
+                pass
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(len(raw) for raw in samples) * ROUNDS
+    return total_bytes / elapsed / 1e6, len(samples) * ROUNDS / elapsed, decoded
+
+
+def follow_growing_file(raw, incremental):
+    """Decode attempts while a file grows CHUNK bytes at a time"""
+    decoder = IncrementalSignalDecoder()
+    for end in range(CHUNK, len(raw) + CHUNK, CHUNK):
+        if incremental:
+            data = decoder.feed(raw[end - CHUNK:end])
+        else:
+            data = decode_signal(raw[:end])
+        if data is not None:
+            return data
+    return None
+
+
+def main():
+    """Run the signal codec benchmark"""
+    corpus = load_corpus()
+    samples = [raw for _, raw in corpus]
+    ea_samples = [raw for name, raw in corpus if name.startswith('ea_4phase_utf16le')]
+
+    print(f"\n{'='*72}")
+    print(f"SIGNAL DECODE ({len(samples)} corpus files, {sum(map(len, samples)):,} bytes, {ROUNDS:,} rounds)")
+    print(f"{'='*72}")
+    print(f"   {'decoder':<28}{'MB/s':>10}{'decodes/s':>14}{'decoded':>10}")
+    for label, decode, subset in [
+        ('legacy ASCIIFileManager', legacy_ascii_file_manager, samples),
+        ('legacy orchestrator', legacy_orchestrator, samples),
+        ('signal_codec', decode_signal, samples),
+        ('legacy (EA UTF-16LE only)', legacy_ascii_file_manager, ea_samples),
+        ('signal_codec (EA UTF-16LE)', decode_signal, ea_samples),
+    ]:
+        mb_s, per_s, decoded = throughput(decode, subset)
+        print(f"   {label:<28}{mb_s:>10.1f}{per_s:>14,.0f}{decoded:>7}/{len(subset)}")
+
+    text = ("Trade executed ✅ profit \U0001F4B0 target \U0001F3AF → EURJPY " * 20)
+    for label, replace in [('loop + join', legacy_replace_unicode), ('replace + encode', UnicodeReplacer.replace_unicode)]:
+        assert replace(text) == legacy_replace_unicode(text)
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            replace(text)
+        us = (time.perf_counter() - start) / ROUNDS * 1e6
+        print(f"   replace_unicode {label:<18}{us:>10.1f} us per {len(text):,} chars")
+
+    raw = dict(corpus)['ea_4phase_utf16le_bom.json']
+    print(f"\n   Following a {len(raw):,} byte signal written {CHUNK} bytes at a time")
+    for label, incremental in [('re-decode whole file', False), ('incremental decoder', True)]:
+        assert follow_growing_file(raw, incremental) == decode_signal(raw)
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            follow_growing_file(raw, incremental)
+        us = (time.perf_counter() - start) / ROUNDS * 1e6
+        print(f"   {label:<28}{us:>10.1f} us per signal")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
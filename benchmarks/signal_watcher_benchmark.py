@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Signal Watcher Benchmark
+Pickup latency and disk reads for the five executors that used to poll the
+EA signal file on their own timers (1, 1, 3, 5 and 5 s) versus one shared
+watcher pushing to five subscribers
+"""
+
+import sys
+import os
+import json
+import random
+import re
+import statistics
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from signal_watcher import DEFAULT_ADDRESS, SignalSubscriber, SignalWatcherServer
+
+LEGACY_INTERVALS = (1.0, 1.0, 3.0, 5.0, 5.0)
+SIGNALS = 40
+IDLE_SECONDS = 3.0
+
+SIGNAL = {
+    "symbol": "EURJPY", "timestamp": "2025.08.05 08:30:00", "trade_direction": "BEAR",
+    "current_price": 171.234, "ylipip_trigger": 0.60,
+    "phase_1_m5_bos": {"time": "2025.08.05 08:25", "price": 171.30, "direction": "BEAR"},
+    "phase_2_m1_break": {"time": "2025.08.05 08:27", "price": 171.27},
+    "phase_3_m1_retest": {"time": "2025.08.05 08:28", "price": 171.28},
+    "phase_4_ylipip": {"target": 171.22, "current": 171.234, "triggered": True},
+}
+
+
+def write_signal(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-16le') as f:
+        f.write('﻿' + json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def legacy_read(path):
+    """What each executor did on every tick"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    text = content.decode('utf-16le', errors='ignore').replace('\x00', '')
+    text = re.sub(r'[^\x20-\x7E{}":,.\-\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return json.loads(text)
+
+
+def main():
+    """Run the signal watcher benchmark"""
+    workdir = tempfile.mkdtemp(prefix='signal_watcher_bench_')
+    path = os.path.join(workdir, 'mikrobot_4phase_signal.json')
+    address = os.path.join(workdir, 'watcher.sock') if isinstance(DEFAULT_ADDRESS, str) else ('127.0.0.1', 47152)
+    write_signal(path, SIGNAL)
+
+    print(f"\n{'='*72}")
+    print("SIGNAL FILE PICKUP (5 executors)")
+    print(f"{'='*72}")
+
+    # Legacy: independent polling; latency is half an interval on average
+    start = time.perf_counter()
+    for _ in range(200):
+        legacy_read(path)
+    read_us = (time.perf_counter() - start) / 200 * 1e6
+    reads_per_min = sum(60 / interval for interval in LEGACY_INTERVALS)
+    print("   Independent polling")
+    print(f"   reads + decodes / min:  {reads_per_min:>10,.0f}  ({read_us:,.0f} us each)")
+    print(f"   mean pickup latency:    {statistics.mean(i / 2 for i in LEGACY_INTERVALS) * 1000:>10,.0f} ms"
+          f"  (worst {max(LEGACY_INTERVALS) * 1000:,.0f} ms)")
+
+    with SignalWatcherServer([path], address) as server:
+        subscribers = [SignalSubscriber(path, address) for _ in LEGACY_INTERVALS]
+        for subscriber in subscribers:
+            subscriber.wait(timeout=2)
+
+        # Jittered gaps so writes do not phase-lock with the poll interval
+        rng = random.Random(0)
+        latencies = []
+        for i in range(SIGNALS):
+            written = time.perf_counter()
+            write_signal(path, dict(SIGNAL, timestamp=f"2025.08.05 09:{i:02d}:00"))
+            for subscriber in subscribers:
+                if subscriber.wait(timeout=2) is None:
+                    raise RuntimeError("Signal was not delivered")
+                latencies.append((time.perf_counter() - written) * 1000)
+            time.sleep(rng.uniform(0.005, 0.05))
+        duplicates = sum(subscriber.wait(timeout=0) is not None for subscriber in subscribers)
+
+        before = dict(server.watchers[0].stats)
+        time.sleep(IDLE_SECONDS)
+        idle_reads = server.watchers[0].stats['reads'] - before['reads']
+        stats = server.stats()['files'][server.watchers[0].path]
+        modes = {subscriber.mode for subscriber in subscribers}
+        for subscriber in subscribers:
+            subscriber.close()
+
+    latencies.sort()
+    print("\n   Shared watcher")
+    print(f"   subscribers:            {len(subscribers):>10} ({', '.join(sorted(modes))})")
+    print(f"   pickup latency p50:     {statistics.median(latencies):>10.1f} ms")
+    print(f"   pickup latency p99:     {latencies[int(len(latencies) * 0.99) - 1]:>10.1f} ms")
+    print(f"   file reads:             {stats['reads']:>10} for {SIGNALS + 1} signals "
+          f"({stats['polls']:,} stat polls)")
+    print(f"   reads while idle:       {idle_reads:>10} in {IDLE_SECONDS:.0f} s")
+    print(f"   duplicate deliveries:   {duplicates:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SQLite Write-Behind Benchmark
+Rows/second for per-point commits (the old observation-writer pattern)
+vs WriteBehindWriter at each durability setting, plus the SPC
+TradingPhaseControlCharts end to end
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.write_behind import WriteBehindWriter
+
+ROWS = 20_000
+LEGACY_ROWS = 2_000  # per-commit modes are too slow for the full count
+
+DDL = """
+CREATE TABLE IF NOT EXISTS spc_control_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measurement_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    chart_type TEXT NOT NULL,
+    sample_values TEXT NOT NULL,
+    x_bar REAL, r_value REAL, p_value REAL, cusum_value REAL, ewma_value REAL,
+    phase_name TEXT,
+    raw_data TEXT
+);
+CREATE TABLE IF NOT EXISTS spc_violations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    detection_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    chart_type TEXT NOT NULL,
+    violation_type TEXT,
+    violation_description TEXT,
+    severity_level INTEGER,
+    data_point_value REAL,
+    phase_name TEXT
+);
+"""
+
+INSERT = """
+    INSERT INTO spc_control_data
+    (measurement_timestamp, metric_name, chart_type, sample_values,
+     x_bar, r_value, p_value, cusum_value, ewma_value, phase_name, raw_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def fresh_db(directory: str, name: str) -> str:
+    path = os.path.join(directory, f"{name}.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DDL)
+    return path
+
+
+def row(i: int):
+    return (datetime.utcnow().isoformat(sep=' '), 'detection_latency', 'XBAR_R', '[]',
+            450.0 + i % 50, 12.0, None, None, None, 'M5_BOS_DETECTION', '{}')
+
+
+def connect_per_row(path: str, rows: int) -> float:
+    """Old pattern: open, insert, commit, close for every point"""
+    start = time.perf_counter()
+    for i in range(rows):
+        with sqlite3.connect(path) as conn:
+            conn.execute(INSERT, row(i))
+        conn.close()
+    return rows / (time.perf_counter() - start)
+
+
+def commit_per_row(path: str, rows: int) -> float:
+    """Persistent connection, still one commit (fsync) per point"""
+    conn = sqlite3.connect(path)
+    start = time.perf_counter()
+    for i in range(rows):
+        conn.execute(INSERT, row(i))
+        conn.commit()
+    rate = rows / (time.perf_counter() - start)
+    conn.close()
+    return rate
+
+
+def write_behind(path: str, rows: int, sync_interval_ms) -> dict:
+    writer = WriteBehindWriter(path, sync_interval_ms=sync_interval_ms)
+    start = time.perf_counter()
+    worst_enqueue = 0.0
+    for i in range(rows):
+        t = time.perf_counter()
+        writer.execute(INSERT, row(i))
+        worst_enqueue = max(worst_enqueue, time.perf_counter() - t)
+    enqueue_rate = rows / (time.perf_counter() - start)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    stats = writer.get_stats()
+    return {
+        'enqueue_rate': enqueue_rate,
+        'durable_rate': rows / elapsed,
+        'worst_enqueue_us': worst_enqueue * 1e6,
+        'batches': stats['batches'],
+        'syncs': stats['syncs'],
+        'failed': stats['failed_rows']
+    }
+
+
+def spc_end_to_end(path: str, updates: int) -> float:
+    from SPC_CONTROL_CHARTS_IMPLEMENTATION import TradingPhaseControlCharts
+    charts = TradingPhaseControlCharts(db_path=path)
+    start = time.perf_counter()
+    for i in range(updates):
+        charts.update_m5_bos_metrics(
+            detection_accuracy=0.92,
+            detection_latency_values=[450 + i % 7, 520, 380, 490, 410],
+            false_positive_rate=0.06,
+            total_detections=100,
+            false_positives=6 + i % 3
+        )
+    charts.close()
+    elapsed = time.perf_counter() - start
+    with sqlite3.connect(path) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM spc_control_data").fetchone()[0]
+    return stored / elapsed
+
+
+def main():
+    """Run the write-behind benchmark"""
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"\n{'='*72}")
+        print(f"SQLITE PERSISTENCE ({ROWS:,} rows, on-disk temp database)")
+        print(f"{'='*72}")
+        print(f"   {'mode':<38} {'rows/s':>12}")
+        print(f"   {'connect + commit per row':<38} "
+              f"{connect_per_row(fresh_db(directory, 'legacy'), LEGACY_ROWS):>12,.0f}")
+        print(f"   {'persistent connection, commit per row':<38} "
+              f"{commit_per_row(fresh_db(directory, 'persistent'), LEGACY_ROWS):>12,.0f}")
+
+        print(f"\n   {'write-behind (sync_interval_ms)':<38} {'enqueue/s':>12} {'durable/s':>12} "
+              f"{'worst enqueue us':>17} {'batches':>8} {'syncs':>6}")
+        for label, sync_ms in (("0 (fsync every batch)", 0), ("1000", 1000), ("None (auto-checkpoint)", None)):
+            result = write_behind(fresh_db(directory, f"wb_{sync_ms}"), ROWS, sync_ms)
+            print(f"   {label:<38} {result['enqueue_rate']:>12,.0f} {result['durable_rate']:>12,.0f} "
+                  f"{result['worst_enqueue_us']:>17.0f} {result['batches']:>8} {result['syncs']:>6}")
+
+        rate = spc_end_to_end(fresh_db(directory, 'spc'), 2_000)
+        print(f"\n   TradingPhaseControlCharts.update_m5_bos_metrics: {rate:,.0f} stored rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
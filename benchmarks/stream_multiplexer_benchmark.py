@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+WebSocket Stream Multiplexer Load Test
+Replays Binance 24hrTicker frames from a local websocket server at
+10k-100k msgs/s through StreamMultiplexer and reports throughput,
+per-subscriber drops and reconnect/resubscribe behaviour
+
+The server runs in its own process so the client side is measured alone.
+Frames are synthesized in the exact Binance wire format unless a file of
+recorded frames (one JSON frame per line) is given as the first argument.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import sys
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+import numpy as np
+import websockets
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.data_ingestion.data_models import TickData, AssetType, DataSource, DataQuality
+from src.core.data_ingestion.stream_multiplexer import (
+    StreamMultiplexer, parse_ticker_extract, parse_ticker_json, orjson, ALL_SYMBOLS
+)
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT', 'ADAUSDT', 'ETHBTC', 'LTCBTC']
+RATES = (10_000, 50_000, 100_000)
+DURATION_S = 2.0
+FRAME_COUNT = 20_000
+DISCONNECT_AFTER = 5_000   # the server drops the first connection after this many frames
+
+
+def synthetic_frames(count: int, seed: int = 9) -> List[str]:
+    """Binance 24hrTicker frames with a random walk per symbol"""
+    rng = np.random.default_rng(seed)
+    prices = {symbol: 100.0 * (i + 1) for i, symbol in enumerate(SYMBOLS)}
+    event_ms = int(time.time() * 1000)
+    frames = []
+    for i in range(count):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        prices[symbol] *= 1 + rng.normal(0, 1e-4)
+        price = prices[symbol]
+        event_ms += 1
+        frames.append(json.dumps({
+            "e": "24hrTicker", "E": event_ms, "s": symbol,
+            "p": "0.10", "P": "0.100", "w": f"{price:.4f}", "x": f"{price:.4f}",
+            "c": f"{price:.4f}", "Q": "0.010", "b": f"{price * 0.9999:.4f}", "B": "1.5",
+            "a": f"{price * 1.0001:.4f}", "A": "2.0", "o": f"{price:.4f}",
+            "h": f"{price * 1.01:.4f}", "l": f"{price * 0.99:.4f}", "v": "12345.678",
+            "q": "98765.43", "O": event_ms - 86_400_000, "C": event_ms,
+            "F": 1, "L": 1000 + i, "n": 1000 + i
+        }, separators=(',', ':')))
+    return frames
+
+
+def load_frames() -> List[str]:
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding='utf-8') as handle:
+            return [line.strip() for line in handle if line.strip()]
+    return synthetic_frames(FRAME_COUNT)
+
+
+def legacy_parse(frame: str) -> TickData:
+    """The pre-multiplexer path: json.loads into a dict, then TickData"""
+    data = json.loads(frame)
+    last_price = float(data['c'])
+    spread_estimate = last_price * 0.001
+    return TickData(
+        timestamp=datetime.fromtimestamp(int(data['E']) / 1000, tz=timezone.utc),
+        symbol=data['s'], bid=last_price - spread_estimate / 2,
+        ask=last_price + spread_estimate / 2, spread=spread_estimate,
+        volume=float(data['v']), asset_type=AssetType.CRYPTO, source=DataSource.BINANCE,
+        quality=DataQuality.EXCELLENT, latency_ms=1.0
+    )
+
+
+def bench_parsers(frames: List[str]) -> Dict[str, float]:
+    """Frames/second per parser on the raw frame text"""
+    parsers = {'json.loads + TickData': legacy_parse, 'extractor': parse_ticker_extract}
+    if orjson is not None:
+        parsers['orjson'] = parse_ticker_json
+    results = {}
+    for label, parser in parsers.items():
+        start = time.perf_counter()
+        for frame in frames:
+            parser(frame)
+        results[label] = len(frames) / (time.perf_counter() - start)
+        print(f"   {label:<22} {results[label]:>14,.0f} frames/s")
+    return results
+
+
+class ReplayServer:
+    """Local websocket server replaying frames at a target rate"""
+
+    def __init__(self, frames: List[str], rate: int, duration_s: float):
+        self.frames = frames
+        self.rate = rate
+        self.duration_s = duration_s
+        self.connections = 0
+        self.subscribe_messages: List[Dict[str, Any]] = []
+        self.sent = 0
+        self.done = asyncio.Event()
+
+    async def handler(self, websocket, *args):
+        self.connections += 1
+        first_connection = self.connections == 1
+        subscribed = asyncio.Event()
+        reader = asyncio.create_task(self._read_control(websocket, subscribed))
+        try:
+            # Wait for the client's (re)subscribe before replaying
+            await subscribed.wait()
+            start = time.perf_counter()
+            sent_here = 0
+            index = self.sent
+            while time.perf_counter() - start < self.duration_s:
+                due = int((time.perf_counter() - start) * self.rate) - sent_here
+                for _ in range(due):
+                    await websocket.send(self.frames[index % len(self.frames)])
+                    index += 1
+                    sent_here += 1
+                    self.sent += 1
+                    if first_connection and self.sent == DISCONNECT_AFTER:
+                        return
+                await asyncio.sleep(0.001)
+            self.done.set()
+            await websocket.wait_closed()
+        finally:
+            reader.cancel()
+
+    async def _read_control(self, websocket, subscribed: asyncio.Event):
+        async for message in websocket:
+            request = json.loads(message)
+            if request.get('method') == 'SUBSCRIBE':
+                self.subscribe_messages.append(request)
+                subscribed.set()
+
+
+def serve_replay(frames: List[str], rate: int, port_queue, result_queue):
+    """Server process: replay until done, then report what was sent"""
+
+    async def run():
+        server = ReplayServer(frames, rate, DURATION_S)
+        async with websockets.serve(server.handler, '127.0.0.1', 0, max_queue=None) as ws_server:
+            port_queue.put(ws_server.sockets[0].getsockname()[1])
+            await server.done.wait()
+            result_queue.put({'sent': server.sent, 'connections': server.connections,
+                              'subscribe_messages': server.subscribe_messages})
+            await asyncio.sleep(3600)  # keep serving until terminated
+
+    asyncio.run(run())
+
+
+async def run_rate(rate: int, port: int, result_queue) -> Dict[str, Any]:
+    """Replay at `rate` msgs/s to one fast, one per-symbol and one slow consumer"""
+    multiplexer = StreamMultiplexer(f"ws://127.0.0.1:{port}", reconnect_delay=0.05)
+    fast = await multiplexer.subscribe(ALL_SYMBOLS, maxsize=100_000)
+    btc = await multiplexer.subscribe('BTCUSDT', maxsize=100_000)
+    slow = await multiplexer.subscribe(ALL_SYMBOLS, maxsize=256)
+    for symbol in SYMBOLS:
+        await multiplexer.subscribe(symbol, maxsize=16)  # idle consumers
+
+    counts = {'fast': 0, 'btc': 0, 'slow': 0}
+
+    async def consume(name, subscription, delay):
+        async for _record in subscription:
+            counts[name] += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    consumers = [
+        asyncio.create_task(consume('fast', fast, 0)),
+        asyncio.create_task(consume('btc', btc, 0)),
+        asyncio.create_task(consume('slow', slow, 0.001)),
+    ]
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    await multiplexer.start()
+    # The first connection is cut after DISCONNECT_AFTER frames; the second
+    # replays for the full duration after resubscribing
+    server_result = await asyncio.to_thread(result_queue.get)
+    deadline = time.perf_counter() + 5
+    while multiplexer.stats['frames'] < server_result['sent'] and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    stats = multiplexer.get_stats()
+    await multiplexer.stop()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+    subscribed_streams = {p for m in server_result['subscribe_messages'] for p in m['params']}
+    result = {
+        'rate': rate,
+        'sent': server_result['sent'],
+        'received': stats['frames'],
+        'received_per_s': stats['frames'] / elapsed,
+        'client_cpu_us_per_frame': cpu * 1e6 / max(stats['frames'], 1),
+        'parse_errors': stats['parse_errors'],
+        'fast_dropped': fast.dropped,
+        'slow_dropped': slow.dropped,
+        'btc_received': counts['btc'],
+        'reconnects': stats['reconnects'],
+        'resubscribed_all': subscribed_streams == {f"{s.lower()}@ticker" for s in SYMBOLS}
+                            and len(server_result['subscribe_messages']) == 2,
+    }
+    print(f"   {rate:>8,} {result['sent']:>9,} {result['received']:>9,} "
+          f"{result['received_per_s']:>10,.0f} {result['client_cpu_us_per_frame']:>8.1f} "
+          f"{result['fast_dropped']:>7,} {result['slow_dropped']:>8,} {result['reconnects']:>6} "
+          f"{'yes' if result['resubscribed_all'] else 'NO':>6}")
+    return result
+
+
+def main():
+    """Run the multiplexer load test"""
+    frames = load_frames()
+
+    print(f"\n{'='*72}")
+    print(f"FRAME PARSING ({len(frames):,} frames)")
+    print(f"{'='*72}")
+    bench_parsers(frames)
+
+    print(f"\n{'='*72}")
+    print(f"LOCAL REPLAY ({DURATION_S:.0f}s per rate, {len(SYMBOLS)} symbols, "
+          f"disconnect after {DISCONNECT_AFTER:,} frames)")
+    print(f"{'='*72}")
+    print(f"   {'target/s':>8} {'sent':>9} {'received':>9} {'recv/s':>10} {'cpu us':>8} "
+          f"{'fast dr':>7} {'slow drop':>8} {'reconn':>6} {'resub':>6}")
+    for rate in RATES:
+        port_queue, result_queue = multiprocessing.Queue(), multiprocessing.Queue()
+        server = multiprocessing.Process(target=serve_replay,
+                                         args=(frames, rate, port_queue, result_queue), daemon=True)
+        server.start()
+        try:
+            asyncio.run(run_rate(rate, port_queue.get(), result_queue))
+        finally:
+            server.terminate()
+            server.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
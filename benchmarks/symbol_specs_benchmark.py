@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Symbol Specs Benchmark
+Sizing a portfolio of ATR stops: classifying each symbol by string matching
+and recomputing its pip size on every call, as the sizers did, against
+scalar registry lookups and one vectorized registry call over symbol ids
+"""
+
+import sys
+import os
+import random
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from symbol_specs import ASSET_CLASSIFICATIONS, SymbolSpecRegistry, classify_symbol, pip_multiplier
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data', 'symbol_specs.json')
+PORTFOLIOS = (10, 100, 1000, 10_000)
+ROUNDS = 20
+RISK_AMOUNT = 550.0
+
+
+def legacy_lots(snapshot, symbols, atr_values):
+    """Per-symbol list scans, pattern matching and symbol_info reads"""
+    lots = []
+    for symbol, atr in zip(symbols, atr_values):
+        spec = snapshot[symbol]
+        asset_class = next((name for name, config in ASSET_CLASSIFICATIONS.items()
+                            if symbol in config['symbols']), None) or classify_symbol(symbol)
+        pip = spec['point'] * pip_multiplier(symbol, asset_class, spec['digits'])
+        pips = atr / pip
+        pip_value = spec['trade_tick_value'] / spec['trade_tick_size'] * pip
+        lot = round(RISK_AMOUNT / (pips * pip_value) / spec['volume_step']) * spec['volume_step']
+        lots.append(min(max(lot, spec['volume_min']), spec['volume_max']))
+    return np.array(lots)
+
+
+def scalar_lots(specs, symbols, atr_values):
+    return np.array([specs.value_to_lots(symbol, RISK_AMOUNT, specs.price_to_pips(symbol, atr))
+                     for symbol, atr in zip(symbols, atr_values)])
+
+
+def vectorized_lots(specs, ids, atr_values):
+    return specs.value_to_lots(ids, RISK_AMOUNT, specs.price_to_pips(ids, atr_values))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1e3, result
+
+
+def main():
+    """Run the symbol specs benchmark"""
+    random.seed(5)
+    specs = SymbolSpecRegistry.from_snapshot(SNAPSHOT)
+    snapshot = {symbol: specs.spec(symbol) for symbol in specs.names}
+
+    print(f"\n{'='*72}")
+    print(f"PORTFOLIO LOT SIZING ({len(specs)} symbols, mean of {ROUNDS} runs)")
+    print(f"{'='*72}")
+    print(f"   {'positions':>10}{'per-call ms':>14}{'registry ms':>14}{'vectorized ms':>16}{'speedup':>10}")
+
+    for size in PORTFOLIOS:
+        symbols = [random.choice(specs.names) for _ in range(size)]
+        ids = specs.ids(symbols)
+        atr_values = specs.pips_to_price(ids, np.random.uniform(4, 15, size))
+
+        legacy_ms, expected = timed(legacy_lots, snapshot, symbols, atr_values)
+        scalar_ms, scalar = timed(scalar_lots, specs, symbols, atr_values)
+        vector_ms, lots = timed(vectorized_lots, specs, ids, atr_values)
+        assert np.allclose(lots, expected) and np.allclose(scalar, expected)
+        print(f"   {size:>10,}{legacy_ms:>14.3f}{scalar_ms:>14.3f}{vector_ms:>16.3f}{legacy_ms / vector_ms:>9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Vectorized BOS Feature Engine
+Array implementation of BOSPredictionModel's feature set
+
+Every rolling feature is computed for a whole (symbols x bars) block at once:
+means from NaN-aware cumulative sums, slopes from the closed-form
+least-squares sums, and extremes, standard deviations and percentile ranks
+from chunked `sliding_window_view` reductions. Output matches the pandas
+`rolling(...).apply` implementation within floating-point tolerance.
+"""
+
+from typing import Callable, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows reduced per chunk in sliding_window_view passes (bounds temporaries)
+WINDOW_CHUNK = 1 << 15
+
+LAGS = (1, 2, 3, 5, 10)
+
+
+def _pad_front(values: np.ndarray, window: int) -> np.ndarray:
+    """Align per-window results with their last bar; the first window-1 bars are NaN"""
+    out = np.full(values.shape[:-1] + (values.shape[-1] + window - 1,), np.nan)
+    out[..., window - 1:] = values
+    return out
+
+
+def _window_reduce(x: np.ndarray, window: int, reduce: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Apply reduce(windows) -> (..., n_windows) over chunks of the time axis"""
+    count = x.shape[-1] - window + 1
+    if count <= 0:
+        return np.full(x.shape, np.nan)
+    out = np.empty(x.shape[:-1] + (count,))
+    for start in range(0, count, WINDOW_CHUNK):
+        stop = min(start + WINDOW_CHUNK, count)
+        windows = sliding_window_view(x[..., start:stop + window - 1], window, axis=-1)
+        out[..., start:stop] = reduce(windows)
+    return _pad_front(out, window)
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean from cumulative sums; NaN wherever the window holds a NaN"""
+    if x.shape[-1] < window:
+        return np.full(x.shape, np.nan)
+    missing = np.isnan(x)
+    # Offset by a reference value to keep the running sum small (less cancellation)
+    reference = np.nanmin(x, axis=-1, keepdims=True) if missing.any() else x[..., :1]
+    shifted = np.where(missing, 0.0, x - reference)
+
+    zero = np.zeros(x.shape[:-1] + (1,))
+    sums = np.concatenate([zero, np.cumsum(shifted, axis=-1)], axis=-1)
+    gaps = np.concatenate([zero, np.cumsum(missing, axis=-1)], axis=-1)
+    window_sum = sums[..., window:] - sums[..., :-window]
+    window_gaps = gaps[..., window:] - gaps[..., :-window]
+
+    means = window_sum / window + reference
+    means[window_gaps > 0] = np.nan
+    return _pad_front(means, window)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1), two-pass per window for stability"""
+    return _window_reduce(x, window, lambda w: np.std(w, axis=-1, ddof=1))
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    return _window_reduce(x, window, lambda w: np.max(w, axis=-1))
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    return _window_reduce(x, window, lambda w: np.min(w, axis=-1))
+
+
+def rolling_slope(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Least-squares slope against 0..window-1 (np.polyfit(range(n), y, 1)[0])
+
+    slope = (nΣxy - ΣxΣy) / (nΣx² - (Σx)²). Σx and Σx² are constants, and with
+    x centred Σ(x - x̄) = 0 removes the Σy term, so each window reduces to
+    one dot product with fixed weights.
+    """
+    positions = np.arange(window, dtype=float)
+    centred = positions - positions.mean()
+    weights = centred / np.dot(centred, centred)
+    return _window_reduce(x, window, lambda w: w @ weights)
+
+
+def rolling_rank_pct(x: np.ndarray, window: int) -> np.ndarray:
+    """Percentile rank of each bar within its trailing window (pandas rank(pct=True), average ties)"""
+    def reduce(w):
+        last = w[..., -1:]
+        less = np.count_nonzero(w < last, axis=-1)
+        equal = np.count_nonzero(w == last, axis=-1)
+        ranks = (less + (equal + 1) / 2) / window
+        ranks[np.isnan(w).any(axis=-1)] = np.nan
+        return ranks
+    return _window_reduce(x, window, reduce)
+
+
+def rolling_count(mask: np.ndarray, window: int) -> np.ndarray:
+    """Number of True values in each trailing window"""
+    zero = np.zeros(mask.shape[:-1] + (1,), dtype=np.int64)
+    sums = np.concatenate([zero, np.cumsum(mask, axis=-1, dtype=np.int64)], axis=-1)
+    return _pad_front((sums[..., window:] - sums[..., :-window]).astype(float), window)
+
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    out[..., periods:] = x[..., :-periods]
+    return out
+
+
+def fill_forward(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along the time axis, then zero the leading ones (in place when possible)"""
+    missing = np.isnan(x)
+    if not missing.any():
+        return x
+    first_valid = np.argmax(~missing, axis=-1)
+    first_valid[missing.all(axis=-1)] = x.shape[-1]
+    if (missing.sum(axis=-1) == first_valid).all():
+        # Only rolling warm-up NaNs: nothing to carry forward
+        x[missing] = 0.0
+        return x
+    positions = np.where(missing, 0, np.arange(x.shape[-1]))
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    filled = np.take_along_axis(x, positions, axis=-1)
+    filled[np.isnan(filled)] = 0.0
+    return filled
+
+
+def _ewm(x: np.ndarray, span: int) -> np.ndarray:
+    """pandas ewm(span).mean() (adjust=True) along the time axis of a 2-D block"""
+    return pd.DataFrame(x.T).ewm(span=span).mean().to_numpy().T
+
+
+def compute_features(price: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Numeric BOS features for a (symbols x bars) block of prices and volumes
+
+    Returns arrays of the same shape keyed by feature name, in the column
+    order of BOSPredictionModel.extract_comprehensive_features (time
+    features excepted), with lag features appended and NaNs forward-filled
+    then zeroed as in the final frame.
+    """
+    price = np.atleast_2d(np.asarray(price, dtype=float))
+    volume = np.atleast_2d(np.asarray(volume, dtype=float))
+    f: Dict[str, np.ndarray] = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # === PRICE FEATURES ===
+        prev_price = _shift(price, 1)
+        f['price_change'] = price / prev_price - 1
+        f['price_change_abs'] = np.abs(f['price_change'])
+        f['volatility'] = rolling_std(f['price_change'], 20)
+        price_9 = _shift(price, 9)
+        f['momentum'] = (price - price_9) / price_9
+        f['price_acceleration'] = f['momentum'] - _shift(f['momentum'], 1)
+        f['price_percentile'] = rolling_rank_pct(price, 50)
+        f['price_z_score'] = (price - rolling_mean(price, 50)) / rolling_std(price, 50)
+
+        # === VOLUME FEATURES ===
+        f['volume_sma'] = rolling_mean(volume, 20)
+        f['volume_ratio'] = volume / f['volume_sma']
+        f['volume_spike'] = (volume > f['volume_sma'] * 2).astype(int)
+        f['volume_trend'] = rolling_slope(volume, 10)
+
+        # === TECHNICAL INDICATORS ===
+        delta = price - prev_price
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+        f['rsi'] = 100 - (100 / (1 + gain / loss))
+
+        f['macd'] = _ewm(price, 12) - _ewm(price, 26)
+        f['macd_signal'] = _ewm(f['macd'], 9)
+        f['macd_histogram'] = f['macd'] - f['macd_signal']
+
+        bb_sma = rolling_mean(price, 20)
+        bb_std = rolling_std(price, 20)
+        f['bb_upper'] = bb_sma + (bb_std * 2)
+        f['bb_lower'] = bb_sma - (bb_std * 2)
+        f['bb_position'] = (price - bb_sma) / (bb_std * 2)
+        f['bb_squeeze'] = (f['bb_upper'] - f['bb_lower']) / price
+
+        # === BOS-SPECIFIC FEATURES ===
+        f['high_20'] = rolling_max(price, 20)
+        f['low_20'] = rolling_min(price, 20)
+        f['breakout_strength'] = np.maximum(
+            (price - f['high_20']) / price,
+            (f['low_20'] - price) / price
+        )
+        f['resistance_distance'] = (f['high_20'] - price) / price
+        f['support_distance'] = (price - f['low_20']) / price
+
+        # Up-moves among the 4 steps of a 5-bar window
+        rises = np.zeros(price.shape, dtype=bool)
+        rises[..., 1:] = price[..., 1:] > price[..., :-1]
+        higher = rolling_count(rises, 4)
+        higher[..., :4] = np.nan
+        f['consecutive_higher_highs'] = higher
+        f['consecutive_higher_lows'] = higher.copy()
+
+        # === CROSS-TIMEFRAME FEATURES ===
+        f['m5_trend'] = rolling_slope(price, 5)
+        f['m1_volatility'] = rolling_std(f['price_change'], 5)
+        f['m5_volume_profile'] = rolling_mean(volume, 5)
+
+    # === LAG FEATURES ===
+    for lag in LAGS:
+        f[f'price_change_lag_{lag}'] = _shift(f['price_change'], lag)
+        f[f'volume_ratio_lag_{lag}'] = _shift(f['volume_ratio'], lag)
+        f[f'momentum_lag_{lag}'] = _shift(f['momentum'], lag)
+
+    return {name: fill_forward(values) if values.dtype.kind == 'f' else values
+            for name, values in f.items()}
+
+
+def _assemble(data: pd.DataFrame, numeric: Dict[str, np.ndarray], row: int) -> pd.DataFrame:
+    """Build one symbol's feature frame (same columns/order as the pandas version)"""
+    timestamps = data['timestamp'].dt
+    hour = timestamps.hour.to_numpy()
+    time_features = {
+        'hour': hour,
+        'day_of_week': timestamps.dayofweek.to_numpy(),
+        'is_active_session': ((hour >= 8) & (hour <= 17)).astype(int),
+        'session_start': (hour == 8).astype(int),
+        'session_end': (hour == 17).astype(int),
+    }
+
+    source = data.ffill().fillna(0) if data.isna().to_numpy().any() else data
+    columns = {name: source[name].to_numpy() for name in data.columns}
+    for name, values in numeric.items():
+        if name == 'm5_trend':
+            columns.update(time_features)
+        columns[name] = values[row]
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+
+def extract_features(data: pd.DataFrame) -> pd.DataFrame:
+    """Feature frame for one symbol (columns: timestamp, price, volume, ...)"""
+    numeric = compute_features(data['price'].to_numpy(), data['volume'].to_numpy())
+    return _assemble(data, numeric, 0)
+
+
+def extract_features_multi(frames: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Feature frames for many symbols in one pass
+
+    Symbols with the same number of bars are stacked into one block so each
+    rolling feature is a single vectorized call over all of them.
+    """
+    by_length: Dict[int, list] = {}
+    for symbol, data in frames.items():
+        by_length.setdefault(len(data), []).append(symbol)
+
+    results = {}
+    for symbols in by_length.values():
+        price = np.stack([frames[s]['price'].to_numpy(dtype=float) for s in symbols])
+        volume = np.stack([frames[s]['volume'].to_numpy(dtype=float) for s in symbols])
+        numeric = compute_features(price, volume)
+        for row, symbol in enumerate(symbols):
+            results[symbol] = _assemble(frames[symbol], numeric, row)
+    return {symbol: results[symbol] for symbol in frames}
@@ -16,6 +16,8 @@ from typing import Dict, Any, List, Tuple
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from bos_feature_engine import extract_features
+
 class BOSPredictionModel:
     """
     Production-ready BOS Signal Prediction Model
@@ -184,6 +186,15 @@ class BOSPredictionModel:
         
         print("Extracting comprehensive feature set...")
         
+        features = extract_features(data)
+        
+        print(f"Extracted {len(features.columns)} comprehensive features")
+        
+        return features
+    
+    def _extract_features_pandas(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Reference pandas implementation of the feature set (slow; used to verify the vectorized engine)"""
+        
         features = data.copy()
         
         # === PRICE FEATURES ===
@@ -267,9 +278,7 @@ class BOSPredictionModel:
             features[f'momentum_lag_{lag}'] = features['momentum'].shift(lag)
         
         # Fill missing values
-        features = features.fillna(method='ffill').fillna(0)
-        
-        print(f"Extracted {len(features.columns)} comprehensive features")
+        features = features.ffill().fillna(0)
         
         return features
     
@@ -5,13 +5,12 @@ Real-time monitoring and execution of all 4-phase signals with YLIPIP triggers
 """
 
 import sys
-import json
-import re
 import time
 import MetaTrader5 as mt5
 from datetime import datetime
 import threading
-import os
+
+from signal_watcher import SignalSubscriber
 
 # ASCII-only output enforcement
 sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
@@ -27,6 +26,7 @@ class FourPhaseExecutor:
         self.signal_path = r"C:\Users\HP\AppData\Roaming\MetaQuotes\Terminal\Common\Files\mikrobot_4phase_signal.json"
         self.last_processed = {}
         self.running = True
+        self.signal_feed = SignalSubscriber(self.signal_path)
         
         # Initialize MT5
         if not mt5.initialize():
@@ -36,31 +36,8 @@ class FourPhaseExecutor:
         ascii_print("=== CONTINUOUS 4-PHASE EXECUTOR STARTED ===")
         
     def read_signal_file(self):
-        """Read and parse the signal file with proper encoding"""
-        try:
-            if not os.path.exists(self.signal_path):
-                return None
-                
-            with open(self.signal_path, 'rb') as f:
-                content = f.read()
-            
-            # Handle UTF-16LE encoding with null bytes
-            content_str = content.decode('utf-16le', errors='ignore').replace('\x00', '')
-            content_str = re.sub(r'[^\x20-\x7E{}":,.\-\s]', '', content_str)
-            
-            # Clean up extra spaces in JSON
-            content_str = re.sub(r'\s+', ' ', content_str)
-            content_str = content_str.strip()
-            
-            if not content_str:
-                return None
-                
-            signal_data = json.loads(content_str)
-            return signal_data
-            
-        except Exception as e:
-            ascii_print(f"WARNING: Error reading signal file: {e}")
-            return None
+        """Latest parsed signal from the shared signal watcher (no disk read)"""
+        return self.signal_feed.current()
 
     def calculate_position_size(self, account_balance, symbol):
         """Calculate position size using 0.55% risk and dynamic ATR"""
@@ -185,11 +162,10 @@ class FourPhaseExecutor:
         
         while self.running:
             try:
-                signal = self.read_signal_file()
-                if signal:
-                    self.process_signal(signal)
-                
-                time.sleep(1)  # Check every second
+                # Wakes as soon as the watcher publishes a new signal
+                event = self.signal_feed.wait(timeout=1)
+                if event:
+                    self.process_signal(event.data)
                 
             except KeyboardInterrupt:
                 ascii_print("Stopping signal monitor...")
@@ -199,6 +175,7 @@ class FourPhaseExecutor:
                 ascii_print(f"Monitor error: {e}")
                 time.sleep(5)
         
+        self.signal_feed.close()
         mt5.shutdown()
         ascii_print("Signal monitor stopped")
 
@@ -16,6 +16,8 @@ import json
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sequence_builder import SequenceWindows
+
 # TensorFlow imports (with fallback handling)
 try:
     import tensorflow as tf
@@ -31,7 +33,6 @@ except ImportError:
 # Scikit-learn imports (with fallback handling)
 try:
     from sklearn.preprocessing import StandardScaler, MinMaxScaler
-    from sklearn.model_selection import train_test_split
     from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
     from sklearn.ensemble import RandomForestClassifier
     SKLEARN_AVAILABLE = True
@@ -138,6 +139,30 @@ class TensorFlowFeaturePipeline:
         
         return data
     
+    def load_archived_data(self, archive_root: str, symbol: str, timeframe: str = 'M1',
+                           start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Load bars from a local CandleArchive in the generate_synthetic_data layout"""
+        
+        from src.utils.candle_archive import CandleArchive
+        
+        bars = CandleArchive(archive_root).range(
+            symbol, timeframe, start, end,
+            fields=('time', 'open', 'high', 'low', 'close', 'tick_volume')
+        )
+        data = pd.DataFrame({
+            'timestamp': pd.to_datetime(bars['time'], unit='s'),
+            'open': bars['open'],
+            'high': bars['high'],
+            'low': bars['low'],
+            'close': bars['close'],
+            'volume': bars['tick_volume'].astype(float)
+        })
+        data['bos_signal'] = self._generate_synthetic_bos_signals(data)
+        
+        print(f"Loaded {len(data)} archived {symbol} {timeframe} bars")
+        
+        return data
+    
     def _generate_synthetic_bos_signals(self, data: pd.DataFrame) -> np.ndarray:
         """Generate synthetic BOS signals based on price action"""
         
@@ -228,16 +253,37 @@ class TensorFlowFeaturePipeline:
         return features
     
     def prepare_sequences(self, features: pd.DataFrame, sequence_length: int = 60) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare sequences for LSTM training"""
+        """Prepare dense (X, y) sequence arrays
+        
+        Materializes every window; meant for small diagnostics. Training
+        streams batches from prepare_sequence_windows() instead.
+        """
         
         print(f"Preparing sequences with length {sequence_length}...")
         
+        windows = self.prepare_sequence_windows(features, sequence_length)
+        X, y = windows.to_arrays()
+        
+        print(f"Created sequences - X shape: {X.shape}, y shape: {y.shape}")
+        print(f"Positive samples: {y.sum()} ({y.mean()*100:.1f}%)")
+        
+        return X, y
+    
+    def prepare_sequence_windows(self, features: pd.DataFrame, sequence_length: int = 60,
+                                 symbol_column: str = 'symbol') -> SequenceWindows:
+        """Scale features and return lazy LSTM windows (no per-window copies)
+        
+        Use windows.batches() or windows.as_tf_dataset() to stream training
+        batches instead of materializing every window. When the frame has a
+        `symbol_column`, windows never span two symbols.
+        """
+        
         # Select feature columns (exclude non-numeric and target)
         feature_cols = [col for col in features.columns if col not in 
                        ['timestamp', 'bos_signal'] and features[col].dtype in ['float64', 'int64']]
         
         # Handle missing values
-        feature_data = features[feature_cols].fillna(method='ffill').fillna(0)
+        feature_data = features[feature_cols].ffill().fillna(0)
         target_data = features['bos_signal'].values
         
         # Store feature columns
@@ -252,20 +298,8 @@ class TensorFlowFeaturePipeline:
             self.scaler = {'mean': feature_data.mean().values, 'std': feature_data.std().values}
             feature_data_scaled = (feature_data.values - self.scaler['mean']) / self.scaler['std']
         
-        # Create sequences
-        X, y = [], []
-        
-        for i in range(sequence_length, len(feature_data_scaled)):
-            X.append(feature_data_scaled[i-sequence_length:i])
-            y.append(target_data[i])
-        
-        X = np.array(X)
-        y = np.array(y)
-        
-        print(f"Created sequences - X shape: {X.shape}, y shape: {y.shape}")
-        print(f"Positive samples: {y.sum()} ({y.mean()*100:.1f}%)")
-        
-        return X, y
+        groups = features[symbol_column].to_numpy() if symbol_column in features.columns else None
+        return SequenceWindows(feature_data_scaled, target_data, sequence_length, groups=groups)
     
     def create_lstm_model(self, input_shape: Tuple[int, int]) -> Any:
         """Create LSTM model for BOS prediction"""
@@ -322,27 +356,26 @@ class TensorFlowFeaturePipeline:
             'accuracy': 0.0
         }
     
-    def train_model(self, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
-        """Train the LSTM model"""
+    def train_model(self, windows: SequenceWindows, test_fraction: float = 0.2) -> Dict[str, Any]:
+        """Train the LSTM model on streamed sequence windows
+        
+        Samples are split chronologically into train, validation
+        (model_config['validation_split'] of train) and test windows, all
+        sharing one feature matrix; fit() and evaluate() read batches from
+        windows.as_tf_dataset() so the full sample tensor is never built.
+        """
         
         print("Training model...")
         
-        # Split data
-        if SKLEARN_AVAILABLE:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-        else:
-            # Simple split
-            split_idx = int(0.8 * len(X))
-            X_train, X_test = X[:split_idx], X[split_idx:]
-            y_train, y_test = y[:split_idx], y[split_idx:]
+        train, test = windows.split(1 - test_fraction)
+        fit_windows, val_windows = train.split(1 - self.model_config['validation_split'])
+        batch_size = self.model_config['batch_size']
         
-        print(f"Training set: {X_train.shape[0]} samples")
-        print(f"Test set: {X_test.shape[0]} samples")
+        print(f"Training set: {len(train)} samples")
+        print(f"Test set: {len(test)} samples")
         
         # Create model
-        self.model = self.create_lstm_model((X_train.shape[1], X_train.shape[2]))
+        self.model = self.create_lstm_model(windows.shape[1:])
         
         if TENSORFLOW_AVAILABLE and hasattr(self.model, 'fit'):
             # Train TensorFlow model
@@ -352,16 +385,16 @@ class TensorFlowFeaturePipeline:
             ]
             
             history = self.model.fit(
-                X_train, y_train,
+                fit_windows.as_tf_dataset(batch_size, shuffle=True),
+                validation_data=val_windows.as_tf_dataset(batch_size),
                 epochs=self.model_config['epochs'],
-                batch_size=self.model_config['batch_size'],
-                validation_split=self.model_config['validation_split'],
                 callbacks=callbacks,
                 verbose=1
             )
             
             # Evaluate model
-            test_loss, test_accuracy, test_precision, test_recall = self.model.evaluate(X_test, y_test, verbose=0)
+            test_loss, test_accuracy, test_precision, test_recall = self.model.evaluate(
+                test.as_tf_dataset(batch_size), verbose=0)
             
             training_results = {
                 'test_accuracy': test_accuracy,
@@ -520,15 +553,15 @@ async def test_tensorflow_pipeline():
         print("PASS: Technical features extracted")
         
         # Prepare sequences
-        X, y = pipeline.prepare_sequences(features, sequence_length=30)
+        windows = pipeline.prepare_sequence_windows(features, sequence_length=30)
         print("PASS: Sequences prepared")
         
         # Train model
-        training_results = pipeline.train_model(X, y)
+        training_results = pipeline.train_model(windows)
         print("PASS: Model training completed")
         
         # Test prediction
-        sample_data = X[0:1]  # First sequence
+        sample_data, _ = windows.take(slice(0, 1))  # First sequence
         prediction = pipeline.predict_bos_signal(sample_data)
         print("PASS: Prediction completed")
         print(f"  Signal: {prediction['signal']}")
@@ -7,7 +7,6 @@ ASCII-only file operations with proper MT5 UTF-16LE support
 
 import sys
 import json
-import re
 import os
 from typing import Any, Dict, Optional, Union
 from datetime import datetime
@@ -62,17 +61,13 @@ class ASCIIFileManager:
     @staticmethod
     def read_mt5_signal_file(filepath: str) -> Optional[Dict[str, Any]]:
         """Read MT5 signal file with proper UTF-16LE handling"""
+        # Imported here: signal_codec builds on UnicodeReplacer from this module
+        from signal_codec import read_signal_file
         try:
-            with open(filepath, 'rb') as f:
-                content = f.read()
-            
-            # Handle UTF-16LE with null bytes - convert to clean ASCII
-            content_str = content.decode('utf-16le', errors='ignore').replace('\x00', '')
-            
-            # Strip ALL non-ASCII characters except basic JSON chars
-            content_str = re.sub(r'[^\x20-\x7E]', '', content_str)
-            
-            return json.loads(content_str)
+            signal_data = read_signal_file(filepath)
+            if signal_data is None:
+                ASCIIFileManager.ascii_print(f"Signal read error: {filepath} is empty or incomplete")
+            return signal_data
         except Exception as e:
             ASCIIFileManager.ascii_print(f"Signal read error: {str(e)}")
             return None
@@ -176,12 +171,13 @@ class UnicodeReplacer:
     def replace_unicode(text: str) -> str:
         """Replace Unicode characters with ASCII equivalents"""
         result = str(text)
+        if result.isascii():
+            return result
         for unicode_char, ascii_replacement in UnicodeReplacer.UNICODE_MAP.items():
             result = result.replace(unicode_char, ascii_replacement)
         
         # Remove any remaining non-ASCII characters
-        result = ''.join(char for char in result if ord(char) < 128)
-        return result
+        return result.encode('ascii', 'ignore').decode('ascii')
 
 def initialize_encoding_system():
     """Initialize the encoding system for the current session"""
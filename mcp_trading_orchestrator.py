@@ -4,16 +4,17 @@ MCP Trading Orchestrator - Central Coordination System
 Coordinates Hansei validation + MT5 execution + Signal monitoring with fail-safes
 """
 import asyncio
-import json
 import MetaTrader5 as mt5
 import sys
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import re
 import time
 
+from signal_codec import read_signal_file
+from signal_watcher import SignalSubscriber
+
 # ASCII-only encoding enforcement
 sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
 
@@ -134,21 +135,10 @@ class MCPTradingOrchestrator:
     def read_signal_file(self, file_path: Path) -> Optional[Dict]:
         """Read signal file with Unicode handling"""
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-                
-            # Handle UTF-16LE encoding with null bytes
-            if content.startswith(b'\xff\xfe'):
-                content_str = content.decode('utf-16le', errors='ignore')
-            else:
-                content_str = content.decode('utf-8', errors='ignore')
-                
-            # Remove null bytes and non-ASCII characters
-            content_str = content_str.replace('\x00', '')
-            content_str = re.sub(r'[^\x20-\x7E{}":,.-]', '', content_str)
-            
-            # Parse JSON
-            signal_data = json.loads(content_str)
+            # UTF-16LE with BOM from the EA, UTF-8 from Python writers
+            signal_data = read_signal_file(file_path)
+            if signal_data is None:
+                raise ValueError("empty or incomplete signal")
             return signal_data
             
         except Exception as e:
@@ -300,44 +290,37 @@ class MCPTradingOrchestrator:
         ascii_print("=== STARTING CONTINUOUS SIGNAL MONITORING ===")
         self.monitoring_active = True
         
-        last_processed = {}
+        # include_errors: an undecodable signal file still trips the corruption fail-safe
+        signal_feed = SignalSubscriber(str(self.signal_dir / "mikrobot_4phase_signal.json"),
+                                       include_errors=True)
         
         while self.monitoring_active:
             try:
-                # Check all signal files
-                for signal_file in self.signal_dir.glob("mikrobot_4phase_signal.json"):
-                    file_mtime = signal_file.stat().st_mtime
-                    
-                    # Skip if file hasn't changed
-                    if signal_file in last_processed and last_processed[signal_file] >= file_mtime:
-                        continue
-                        
-                    ascii_print(f"New signal detected: {signal_file.name}")
+                # Pushed by the shared signal watcher; each signal is returned once
+                event = await asyncio.to_thread(signal_feed.wait, 1.0)
+                
+                if event and event.data is None:
+                    logger.error(f"Failed to read signal file {event.path}: {event.error}")
+                    self.fail_safe_triggers['signal_corruption'] = True
+                elif event:
+                    ascii_print(f"New signal detected: {Path(event.path).name} (seq {event.seq})")
                     
-                    # Read and validate signal
-                    signal_data = self.read_signal_file(signal_file)
-                    if not signal_data:
-                        continue
-                        
                     # Execute trade if validation passes
-                    success, message, ticket = self.execute_trade(signal_data)
+                    success, message, ticket = self.execute_trade(event.data)
                     
                     if success:
                         ascii_print(f"SUCCESS: Trade executed - Ticket {ticket}")
                     else:
                         ascii_print(f"FAILED: {message}")
-                        
-                    last_processed[signal_file] = file_mtime
                     
                 # Check fail-safes
                 await self._check_fail_safes()
                 
-                # Wait before next check
-                await asyncio.sleep(1)  # Check every second
-                
             except Exception as e:
                 logger.error(f"Error in signal monitoring: {e}")
                 await asyncio.sleep(5)  # Wait longer on error
+        
+        signal_feed.close()
                 
     async def _check_fail_safes(self):
         """Check and handle fail-safe conditions"""
@@ -7,11 +7,11 @@ ASCII-ONLY, religiously compliant with all standards
 
 import MetaTrader5 as mt5
 import json
-import re
 import time
 import sys
 from datetime import datetime, timedelta
-import os
+
+from signal_watcher import SignalSubscriber
 
 class MikrobotBigPlanMonitor:
     def __init__(self):
@@ -21,6 +21,7 @@ class MikrobotBigPlanMonitor:
         self.signal_file = 'C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files/mikrobot_4phase_signal.json'
         self.last_signal_processed = None
         self.monitoring_active = True
+        self.signal_feed = SignalSubscriber(self.signal_file)
         self.compliance_log = []
         
         # MIKROBOT_FASTVERSION.md Big Plan requirements
@@ -40,22 +41,8 @@ class MikrobotBigPlanMonitor:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] {ascii_text}")
     
     def read_signal_safe(self):
-        """Read signal with bulletproof ASCII handling"""
-        try:
-            if not os.path.exists(self.signal_file):
-                return None
-                
-            with open(self.signal_file, 'rb') as f:
-                content = f.read()
-            
-            # Handle UTF-16LE with null bytes
-            content_str = content.decode('utf-16le', errors='ignore').replace('\x00', '')
-            content_str = re.sub(r'[^\x20-\x7E]', '', content_str)
-            
-            return json.loads(content_str)
-        except Exception as e:
-            self.ascii_print(f"Signal read error: {str(e)}")
-            return None
+        """Latest parsed signal from the shared signal watcher (no disk read)"""
+        return self.signal_feed.current()
     
     def validate_big_plan_compliance(self, signal):
         """Validate signal against MIKROBOT_FASTVERSION.md Big Plan"""
@@ -278,7 +265,8 @@ class MikrobotBigPlanMonitor:
                     self.ascii_print(f"24/7 Monitor active - Cycle {cycle_count}")
                     self.ascii_print("Big Plan compliance maintained")
                 
-                time.sleep(5)  # Check every 5 seconds
+                # Check every 5 seconds, or as soon as a new signal arrives
+                self.signal_feed.wait(timeout=5)
                 
             except KeyboardInterrupt:
                 self.ascii_print("Monitoring stopped by user")
@@ -14,10 +14,13 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from signal_watcher import SignalSubscriber
+
 class MikrobotBackgroundService:
     def __init__(self):
         self.signal_file = Path("C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files/mikrobot_4phase_signal.json")
         self.last_signal_timestamp = None
+        self.signal_feed = SignalSubscriber(str(self.signal_file))
         self.trade_log = []
         self.service_start_time = datetime.now()
         
@@ -50,18 +53,10 @@ class MikrobotBackgroundService:
     def read_ea_signal(self):
         """Read and validate EA signal"""
         try:
-            if not self.signal_file.exists():
+            # Parsed once by the shared signal watcher; no disk read here
+            signal_data = self.signal_feed.current()
+            if not signal_data:
                 return None
-                
-            with open(self.signal_file, 'r', encoding='utf-16-le') as f:
-                content = f.read()
-                
-            # Clean Unicode issues
-            import re
-            content = re.sub(r'\x00', '', content)
-            content = re.sub(r' +', ' ', content)
-            
-            signal_data = json.loads(content)
             
             # Check if new signal
             if signal_data.get('timestamp') == self.last_signal_timestamp:
@@ -229,13 +224,15 @@ class MikrobotBackgroundService:
                     self.log_message(f"Service running for {runtime}")
                     cycle_count = 0  # Reset counter
                 
-                time.sleep(5)  # 5-second monitoring cycle
+                # 5-second monitoring cycle, cut short by a new signal
+                self.signal_feed.wait(timeout=5)
                 
         except KeyboardInterrupt:
             self.log_message("Service stopped by user")
         except Exception as e:
             self.log_message(f"Service error: {e}")
         finally:
+            self.signal_feed.close()
             mt5.shutdown()
             self.log_message("MT5 connection closed")
             
@@ -10,11 +10,14 @@ Implements MIKROBOT_FASTVERSION.md compliant position sizing
 """
 
 import MetaTrader5 as mt5
-import numpy as np
 from datetime import datetime, timedelta
 
+from src.mikrobot_v2.utils.atr_engine import shared_atr_engine
+from symbol_specs import get_registry
+
 class MikrobotPositionSizer:
-    def __init__(self):
+    def __init__(self, specs=None):
+        self.specs = specs or get_registry()
         self.risk_per_trade_percent = 0.55  # 0.55% per MIKROBOT_FASTVERSION.md
         self.min_atr_pips = 4   # Minimum ATR in pips
         self.max_atr_pips = 15  # Maximum ATR in pips
@@ -27,48 +30,19 @@ class MikrobotPositionSizer:
         return account_info.balance
     
     def calculate_m1_atr(self, symbol, periods=14):
-        """Calculate M1 ATR for the symbol"""
-        # Get M1 data for ATR calculation
-        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, periods + 1)
-        if rates is None or len(rates) < periods:
+        """Calculate M1 ATR for the symbol (shared series, refetched only when a bar closes)"""
+        atr = shared_atr_engine(periods).get(
+            symbol, "M1", lambda count: mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, count))
+        if atr is None:
             raise Exception(f"Cannot get M1 data for {symbol}")
-        
-        # Calculate True Range for each period
-        true_ranges = []
-        for i in range(1, len(rates)):
-            high = rates[i]['high']
-            low = rates[i]['low']
-            prev_close = rates[i-1]['close']
-            
-            tr = max(
-                high - low,                    # Current high - low
-                abs(high - prev_close),        # Current high - previous close
-                abs(low - prev_close)          # Current low - previous close
-            )
-            true_ranges.append(tr)
-        
-        # Calculate ATR (Average True Range)
-        atr = np.mean(true_ranges)
         return atr
     
     def convert_atr_to_pips(self, symbol, atr_value):
         """Convert ATR value to pips based on symbol type"""
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
+        try:
+            return self.specs.price_to_pips(symbol, atr_value)
+        except KeyError:
             raise Exception(f"Cannot get symbol info for {symbol}")
-        
-        # Symbol-specific pip conversion
-        if 'JPY' in symbol:
-            # JPY pairs: 1 pip = 0.01
-            pips = atr_value / 0.01
-        elif symbol.startswith('_'):
-            # CFD stocks: 1 pip = 1.0 (points)
-            pips = atr_value / 1.0
-        else:
-            # Major pairs: 1 pip = 0.0001
-            pips = atr_value / 0.0001
-            
-        return pips
     
     def validate_atr_range(self, symbol):
         """Validate ATR is within 4-15 pips range"""
@@ -134,23 +108,12 @@ class MikrobotPositionSizer:
         
         current_price = (tick.ask + tick.bid) / 2
         
-        # Calculate pip value (USD per pip per lot)
-        if 'JPY' in symbol:
-            # JPY pairs: $1 per pip per 0.01 lot, so $100 per pip per lot
-            usd_per_pip_per_lot = 100
-            sl_pips = atr_pips
-        elif symbol.startswith('_'):
-            # CFD stocks: Contract size varies, use point value
-            contract_size = getattr(symbol_info, 'trade_contract_size', 1.0)
-            usd_per_pip_per_lot = contract_size * symbol_info.point
-            sl_pips = atr_pips
-        else:
-            # Major pairs: ~$10 per pip per lot (varies by currency)
-            if 'USD' in symbol:
-                usd_per_pip_per_lot = 10  # Approximate for USD pairs
-            else:
-                usd_per_pip_per_lot = 10  # Default approximation
-            sl_pips = atr_pips
+        # Pip value (account currency per pip per lot) from tick value and size
+        usd_per_pip_per_lot = self.specs.pip_value_per_lot(symbol)
+        if usd_per_pip_per_lot == 0:
+            print(f"ERROR: Cannot get pip value for {symbol}")
+            return None
+        sl_pips = atr_pips
         
         # Calculate total SL risk in USD per lot
         sl_risk_per_lot = sl_pips * usd_per_pip_per_lot
@@ -159,14 +122,8 @@ class MikrobotPositionSizer:
         # Position_size = Risk_amount / SL_risk_per_lot
         optimal_lot_size = risk_amount / sl_risk_per_lot
         
-        # Step 6: Apply broker constraints
-        min_lot = getattr(symbol_info, 'volume_min', 0.01)
-        max_lot = getattr(symbol_info, 'volume_max', 100.0)
-        lot_step = getattr(symbol_info, 'volume_step', 0.01)
-        
-        # Round to valid lot size
-        final_lot_size = max(min_lot, min(optimal_lot_size, max_lot))
-        final_lot_size = round(final_lot_size / lot_step) * lot_step
+        # Step 6: Apply broker constraints (volume step and min/max lot)
+        final_lot_size = self.specs.round_lots(symbol, optimal_lot_size)
         
         # Calculate actual risk with final lot size
         actual_risk = final_lot_size * sl_risk_per_lot
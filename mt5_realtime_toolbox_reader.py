@@ -23,6 +23,8 @@ from dataclasses import dataclass, asdict
 import queue
 import logging
 
+from src.utils.write_behind import WriteBehindWriter
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -85,6 +87,10 @@ class MT5ToolboxMonitor:
         self.db_path = "mt5_toolbox_data.db"
         self.init_database()
         
+        # Snapshots are queued and committed in batches (WAL, fsync at most once a second)
+        self.writer = WriteBehindWriter(self.db_path, flush_interval=1.0, sync_interval_ms=1000,
+                                        name="toolbox-writer")
+        
     def init_database(self):
         """Initialize SQLite database for storing toolbox data"""
         try:
@@ -378,60 +384,53 @@ class MT5ToolboxMonitor:
         return trades
     
     def save_to_database(self, entries: List[JournalEntry], experts: Dict[str, ExpertStatus], trades: List[TradeInfo]):
-        """Save data to database"""
+        """Queue data for the write-behind writer"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Save journal entries
-                for entry in entries:
-                    cursor.execute('''
-                        INSERT INTO journal_entries (timestamp, level, source, message, details)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        entry.timestamp.isoformat(),
-                        entry.level,
-                        entry.source,
-                        entry.message,
-                        json.dumps(entry.details, ensure_ascii=True) if entry.details else None
-                    ))
-                
-                # Save expert statuses
-                for expert in experts.values():
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO expert_status 
-                        (timestamp, name, symbol, status, parameters, performance, errors)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        datetime.now().isoformat(),
-                        expert.name,
-                        expert.symbol,
-                        expert.status,
-                        json.dumps(expert.parameters, ensure_ascii=True),
-                        json.dumps(expert.performance, ensure_ascii=True),
-                        json.dumps(expert.errors, ensure_ascii=True)
-                    ))
-                
-                # Save trades
-                for trade in trades:
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO trades 
-                        (ticket, timestamp, symbol, type, volume, open_price, current_price, profit, comment, magic)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        trade.ticket,
-                        trade.timestamp.isoformat(),
-                        trade.symbol,
-                        trade.type,
-                        trade.volume,
-                        trade.open_price,
-                        trade.current_price,
-                        trade.profit,
-                        trade.comment,
-                        trade.magic
-                    ))
-                
-                conn.commit()
+            # Save journal entries
+            self.writer.executemany('''
+                INSERT INTO journal_entries (timestamp, level, source, message, details)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(
+                entry.timestamp.isoformat(),
+                entry.level,
+                entry.source,
+                entry.message,
+                json.dumps(entry.details, ensure_ascii=True) if entry.details else None
+            ) for entry in entries])
+            
+            # Save expert statuses
+            now = datetime.now().isoformat()
+            self.writer.executemany('''
+                INSERT OR REPLACE INTO expert_status 
+                (timestamp, name, symbol, status, parameters, performance, errors)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                now,
+                expert.name,
+                expert.symbol,
+                expert.status,
+                json.dumps(expert.parameters, ensure_ascii=True),
+                json.dumps(expert.performance, ensure_ascii=True),
+                json.dumps(expert.errors, ensure_ascii=True)
+            ) for expert in experts.values()])
+            
+            # Save trades
+            self.writer.executemany('''
+                INSERT OR REPLACE INTO trades 
+                (ticket, timestamp, symbol, type, volume, open_price, current_price, profit, comment, magic)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                trade.ticket,
+                trade.timestamp.isoformat(),
+                trade.symbol,
+                trade.type,
+                trade.volume,
+                trade.open_price,
+                trade.current_price,
+                trade.profit,
+                trade.comment,
+                trade.magic
+            ) for trade in trades])
                 
         except Exception as e:
             logger.error(f"Database save error: {e}")
@@ -550,6 +549,7 @@ class MT5ToolboxMonitor:
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring = False
+        self.writer.close()  # flush queued snapshots before exit
         mt5.shutdown()
         logger.info("MT5 toolbox monitoring stopped")
     
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Windowed Sequence Builder
+Zero-copy LSTM training windows for TensorFlowFeaturePipeline
+
+Windows are `sliding_window_view` views over one contiguous feature matrix,
+so building them costs O(rows x features) regardless of sequence length.
+Only the valid window start offsets are stored; samples are gathered a batch
+at a time, either through the `batches()` generator or as a `tf.data`
+pipeline. Rows may carry a symbol label, in which case no window crosses
+from one symbol into the next.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def segment_bounds(groups: Optional[np.ndarray], rows: int) -> np.ndarray:
+    """Start offsets of each run of equal group labels, plus the end offset"""
+    if groups is None or rows == 0:
+        return np.array([0, rows], dtype=np.int64)
+    groups = np.asarray(groups)
+    if len(groups) != rows:
+        raise ValueError(f"groups has {len(groups)} labels for {rows} rows")
+    changes = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    return np.concatenate([[0], changes, [rows]]).astype(np.int64)
+
+
+class SequenceWindows:
+    """
+    (samples, sequence_length, features) windows with next-bar targets
+
+    Sample k is features[s:s + sequence_length] labelled with
+    targets[s + sequence_length], where s = starts[k]; this is the layout
+    prepare_sequences has always produced. With `groups`, starts are only
+    taken where the window and its target lie inside one run of equal
+    labels, so rows should be ordered by symbol then time.
+    """
+
+    def __init__(self, features: np.ndarray, targets: np.ndarray, sequence_length: int,
+                 groups: Optional[np.ndarray] = None, dtype=None):
+        if sequence_length < 1:
+            raise ValueError("sequence_length must be positive")
+        features = np.ascontiguousarray(features, dtype=dtype)
+        if features.ndim != 2:
+            raise ValueError("features must be a (rows, features) matrix")
+        targets = np.asarray(targets)
+        if len(targets) != len(features):
+            raise ValueError(f"{len(targets)} targets for {len(features)} feature rows")
+
+        self.sequence_length = sequence_length
+        self.features = features
+        self.targets = targets
+
+        rows = len(features)
+        if rows > sequence_length:
+            # (rows - L + 1, F, L) view -> (.., L, F); no data is copied
+            self.windows = sliding_window_view(features, sequence_length, axis=0).transpose(0, 2, 1)
+        else:
+            self.windows = np.empty((0, sequence_length, features.shape[1]), dtype=features.dtype)
+
+        bounds = segment_bounds(groups, rows)
+        self.starts = np.concatenate([
+            np.arange(start, end - sequence_length, dtype=np.int64)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]) if rows else np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (len(self), self.sequence_length, self.features.shape[1])
+
+    def take(self, indices) -> Tuple[np.ndarray, np.ndarray]:
+        """Materialize the samples at the given positions (one gather, one copy)"""
+        starts = self.starts[indices]
+        return self.windows[starts], self.targets[starts + self.sequence_length]
+
+    def __getitem__(self, index) -> Tuple[np.ndarray, np.ndarray]:
+        return self.take(index)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All samples as dense (X, y) arrays"""
+        return self.take(slice(None))
+
+    def batches(self, batch_size: int = 32, shuffle: bool = False,
+                seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (X, y) batches; only one batch of windows is materialized at a time"""
+        order = np.arange(len(self))
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        for start in range(0, len(order), batch_size):
+            yield self.take(order[start:start + batch_size])
+
+    def split(self, fraction: float) -> Tuple['SequenceWindows', 'SequenceWindows']:
+        """Chronological split of the samples; both halves share the feature matrix"""
+        cut = int(len(self) * fraction)
+        return self._subset(self.starts[:cut]), self._subset(self.starts[cut:])
+
+    def _subset(self, starts: np.ndarray) -> 'SequenceWindows':
+        subset = object.__new__(SequenceWindows)
+        subset.__dict__.update(self.__dict__)
+        subset.starts = starts
+        return subset
+
+    def as_tf_dataset(self, batch_size: int = 32, shuffle: bool = False, seed: Optional[int] = None):
+        """tf.data.Dataset streaming batches from `batches()` (requires TensorFlow)"""
+        import tensorflow as tf
+
+        _, length, width = self.shape
+        signature = (
+            tf.TensorSpec(shape=(None, length, width), dtype=tf.as_dtype(self.features.dtype)),
+            tf.TensorSpec(shape=(None,), dtype=tf.as_dtype(self.targets.dtype)),
+        )
+        return tf.data.Dataset.from_generator(
+            lambda: self.batches(batch_size, shuffle=shuffle, seed=seed),
+            output_signature=signature
+        ).prefetch(tf.data.AUTOTUNE)
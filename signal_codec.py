@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Signal Codec
+Decoding of the JSON signal files written by the EAs
+
+MikrobotStupidv8 opens its signal file with FILE_TXT and no FILE_ANSI, so
+MT5 writes UTF-16LE with a BOM; Python writers produce UTF-8, and older EAs
+BOM-less UTF-16. decode_signal() sniffs the encoding from the BOM (or from
+where the NUL bytes fall), decodes strictly and hands pure-ASCII text
+straight to json.loads. Only when that fails, or the text is not ASCII, does
+the sanitizer run: known symbols are mapped to ASCII words, everything else
+non-ASCII is dropped by the ASCII encode, and one bytes.translate pass with
+a precomputed table turns control whitespace into spaces and deletes NULs
+and other control bytes.
+
+IncrementalSignalDecoder takes the bytes of a file as they are written and
+returns the signal as soon as its top-level object is closed, so a reader
+following a partially written file never re-parses the prefix.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from encoding_utils import UnicodeReplacer
+
+# BOM -> (codec, BOM length); UTF-8 is checked first, its BOM is 3 bytes
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# Control whitespace becomes a space (raw newlines are invalid inside JSON
+# strings); NUL, the remaining C0 controls and DEL are deleted
+_CONTROL_TABLE = bytes.maketrans(b'\t\n\r', b'   ')
+_CONTROL_DELETE = bytes(b for b in range(0x20) if b not in b'\t\n\r') + b'\x7f'
+
+# UnicodeReplacer's mapping, except that curly double quotes become single
+# quotes: an unescaped " inside a JSON string would end it
+_REPLACEMENTS = tuple(
+    (char, replacement.replace('"', "'")) for char, replacement in UnicodeReplacer.UNICODE_MAP.items()
+)
+
+_STRUCTURAL = re.compile(r'[{}"\\]')
+
+_json_decoder = json.JSONDecoder()
+
+
+def sniff_encoding(raw: bytes) -> Tuple[str, int]:
+    """(codec name, BOM length) for the start of a signal file"""
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding, len(bom)
+    # Without a BOM, ASCII JSON in UTF-16 has a NUL in every other byte
+    if len(raw) >= 2:
+        if raw[0] and not raw[1]:
+            return 'utf-16-le', 0
+        if not raw[0] and raw[1]:
+            return 'utf-16-be', 0
+    return 'utf-8', 0
+
+
+def sanitize(text: str) -> bytes:
+    """ASCII JSON bytes: symbols mapped, other non-ASCII and control bytes dropped"""
+    if not text.isascii():
+        # str.replace per entry beats str.translate with a dict table, which
+        # does a dict lookup for every character of the text
+        for char, replacement in _REPLACEMENTS:
+            text = text.replace(char, replacement)
+    return text.encode('ascii', 'ignore').translate(_CONTROL_TABLE, _CONTROL_DELETE)
+
+
+def _as_signal(data: Any) -> Optional[Dict[str, Any]]:
+    return data if isinstance(data, dict) else None
+
+
+def decode_signal_text(text: str) -> Optional[Dict[str, Any]]:
+    """Parse decoded signal text; None for empty, partial or non-object content"""
+    # MQL string buffers can leave NUL padding after the object
+    text = text.rstrip('\x00')
+    if text.isascii():
+        try:
+            return _as_signal(json.loads(text))
+        except ValueError:
+            pass
+    cleaned = sanitize(text).decode('ascii')
+    start = cleaned.find('{')
+    if start < 0:
+        return None
+    try:
+        # raw_decode stops at the end of the object, ignoring padding after it
+        data, _ = _json_decoder.raw_decode(cleaned, start)
+    except ValueError:
+        return None
+    return _as_signal(data)
+
+
+def decode_signal(raw: bytes) -> Optional[Dict[str, Any]]:
+    """Parse the raw bytes of a signal file; None for empty or partially written files"""
+    encoding, bom = sniff_encoding(raw)
+    if bom:
+        raw = raw[bom:]
+    try:
+        text = raw.decode(encoding)
+    except UnicodeDecodeError:
+        text = raw.decode(encoding, errors='ignore')
+    return decode_signal_text(text)
+
+
+def read_signal_file(filepath: str) -> Optional[Dict[str, Any]]:
+    """Read and decode a signal file (OSError propagates)"""
+    with open(filepath, 'rb') as f:
+        return decode_signal(f.read())
+
+
+class IncrementalSignalDecoder:
+    """
+    Decoder for a signal file that is still being written
+
+    feed() takes the bytes appended since the previous call and returns the
+    signal once the top-level JSON object is closed; until then only the new
+    characters are scanned for braces and quotes. After that `done` is set
+    and further input is ignored until reset(). A closed object that still
+    does not parse leaves `done` set and `error` True.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.done = False
+        self.error = False
+        self.bytes_fed = 0
+        self._head = b''
+        self._decoder = None
+        self._text = ''
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> Optional[Dict[str, Any]]:
+        if self.done or not chunk:
+            return None
+        self.bytes_fed += len(chunk)
+        if self._decoder is None:
+            # Hold the first bytes back until the encoding can be sniffed
+            self._head += chunk
+            if len(self._head) < 4:
+                return None
+            encoding, bom = sniff_encoding(self._head)
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors='ignore')
+            chunk, self._head = self._head[bom:], b''
+        self._text += self._decoder.decode(chunk)
+        end = self._scan()
+        if end is None:
+            return None
+        self.done = True
+        data = decode_signal_text(self._text[self._start:end])
+        self.error = data is None
+        return data
+
+    def _scan(self) -> Optional[int]:
+        """Advance over new text; index just past the closing brace, if reached"""
+        text = self._text
+        pos = self._pos
+        while True:
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                self._pos = len(text)
+                return None
+            i = match.start()
+            char = text[i]
+            pos = i + 1
+            if self._in_string:
+                if char == '\\':
+                    if pos == len(text):
+                        # Escape split across chunks; rescan it next time
+                        self._pos = i
+                        return None
+                    pos += 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char == '{':
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char == '}' and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = pos
+                    return pos
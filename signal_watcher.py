@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Signal File Watcher
+One watcher for the EA's 4-phase signal file, pushing parsed signals to
+every executor over a local socket
+
+The watcher stats the file every poll interval and reads it only when
+mtime or size changed; the bytes are hashed so a rewrite with identical
+content is not published again, and each new signal is decoded once.
+Events carry the watcher's epoch and a sequence number, so a subscriber
+never hands the same signal to its executor twice, including the replay of
+the current signal it receives on connect. Content that still cannot be
+decoded one poll after it was written is published as an error event
+(data None), which only subscribers created with include_errors=True see.
+
+    python signal_watcher.py [signal_file ...]      # run the shared daemon
+
+Executors use SignalSubscriber. When no daemon is listening it watches the
+file in its own thread instead (and keeps trying the daemon), so every
+script still runs standalone.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from signal_codec import decode_signal
+
+DEFAULT_SIGNAL_FILE = "C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files/mikrobot_4phase_signal.json"
+
+# Unix-domain socket where available; loopback TCP on Windows
+if hasattr(socket, 'AF_UNIX'):
+    DEFAULT_ADDRESS: Union[str, Tuple[str, int]] = os.path.join(tempfile.gettempdir(), 'mikrobot_signal_watcher.sock')
+else:
+    DEFAULT_ADDRESS = ('127.0.0.1', 47151)
+
+POLL_INTERVAL = 0.02
+RECONNECT_INTERVAL = 5.0
+SEND_TIMEOUT = 1.0
+
+# Kept under its old name for callers of this module
+decode_signal_bytes = decode_signal
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+@dataclass
+class SignalEvent:
+    """A parsed signal as published by one watcher"""
+    epoch: str
+    seq: int
+    path: str
+    digest: str
+    mtime_ns: int
+    size: int
+    detected_at: float
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+    def encode(self) -> bytes:
+        return json.dumps(asdict(self), separators=(',', ':')).encode('ascii') + b'\n'
+
+    @classmethod
+    def decode(cls, line: bytes) -> 'SignalEvent':
+        return cls(**json.loads(line))
+
+
+class SignalFileWatcher:
+    """
+    Change detector for one signal file
+
+    poll() costs a single stat() while the file is unchanged. A changed file
+    is read once; unchanged content (same hash) produces no event. Content
+    that cannot be decoded may be a write in progress: it produces an error
+    event only if the file is still unchanged at the next poll. `latest`
+    is always the last decoded signal.
+    """
+
+    def __init__(self, path: str, epoch: Optional[str] = None):
+        self.path = normalize_path(path)
+        self.epoch = epoch or uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.latest: Optional[SignalEvent] = None
+        self._stat_key: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._undecodable: Optional[str] = None    # digest waiting to be reported
+        self._error_digest: Optional[str] = None   # digest last reported as an error
+        self.stats = {'polls': 0, 'reads': 0, 'events': 0, 'unchanged': 0, 'decode_errors': 0,
+                      'error_events': 0}
+
+    def poll(self) -> Optional[SignalEvent]:
+        self.stats['polls'] += 1
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._stat_key = None
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self._stat_key:
+            return self._report_undecodable(st) if self._undecodable is not None else None
+        self._stat_key = stat_key
+        self._undecodable = None
+
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            self._stat_key = None
+            return None
+        self.stats['reads'] += 1
+
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        if digest == self._digest:
+            self.stats['unchanged'] += 1
+            self._error_digest = None
+            return None
+        data = decode_signal(raw)
+        if data is None:
+            self.stats['decode_errors'] += 1
+            if digest != self._error_digest:
+                self._undecodable = digest
+            return None
+
+        self._digest = digest
+        self._error_digest = None
+        self.seq += 1
+        self.stats['events'] += 1
+        self.latest = SignalEvent(self.epoch, self.seq, self.path, digest,
+                                  st.st_mtime_ns, len(raw), time.time(), data)
+        return self.latest
+
+    def _report_undecodable(self, st: os.stat_result) -> SignalEvent:
+        """The undecodable content has settled: publish it as an error event"""
+        digest, self._undecodable = self._undecodable, None
+        self._error_digest = digest
+        self.seq += 1
+        self.stats['error_events'] += 1
+        return SignalEvent(self.epoch, self.seq, self.path, digest, st.st_mtime_ns, st.st_size,
+                           time.time(), None, error='undecodable signal file')
+
+
+def _family(address) -> int:
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def _connect(address, timeout: float = 0.5) -> Optional[socket.socket]:
+    if isinstance(address, str) and not os.path.exists(address):
+        return None
+    sock = socket.socket(_family(address), socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+class SignalWatcherServer:
+    """
+    The shared watcher daemon
+
+    Polls every watched file on one thread and writes each new event, one
+    JSON line, to all connected subscribers. A subscriber that connects gets
+    the latest event of every file first. A subscriber that cannot take an
+    event within SEND_TIMEOUT is dropped; it reconnects and is resynced from
+    the replay.
+    """
+
+    def __init__(self, paths: Sequence[str] = (DEFAULT_SIGNAL_FILE,), address=None,
+                 poll_interval: float = POLL_INTERVAL):
+        self.address = address if address is not None else DEFAULT_ADDRESS
+        self.poll_interval = poll_interval
+        epoch = uuid.uuid4().hex[:12]
+        self.watchers = [SignalFileWatcher(path, epoch) for path in paths]
+        self._clients: List[socket.socket] = []
+        self._clients_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> 'SignalWatcherServer':
+        probe = _connect(self.address)
+        if probe is not None:
+            probe.close()
+            raise RuntimeError(f"A signal watcher is already listening on {self.address}")
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+        self._listener = socket.socket(_family(self.address), socket.SOCK_STREAM)
+        if not isinstance(self.address, str):
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self.address)
+        if not isinstance(self.address, str):
+            self.address = self._listener.getsockname()[:2]  # resolves port 0
+        self._listener.listen(16)
+        self._listener.settimeout(0.5)
+
+        # Take the current state before anyone connects
+        for watcher in self.watchers:
+            watcher.poll()
+
+        self._threads = [threading.Thread(target=self._accept_loop, name='signal-watcher-accept', daemon=True),
+                         threading.Thread(target=self._watch_loop, name='signal-watcher-poll', daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        with self._clients_lock:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        finally:
+            self.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'subscribers': self.subscriber_count,
+            'files': {watcher.path: dict(watcher.stats, seq=watcher.seq) for watcher in self.watchers},
+        }
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                client, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            client.settimeout(SEND_TIMEOUT)
+            with self._clients_lock:
+                # Under the broadcast lock: an event polled meanwhile is either in the
+                # replay or broadcast to this client after it is added (or both)
+                replay = b''.join(w.latest.encode() for w in self.watchers if w.latest is not None)
+                try:
+                    if replay:
+                        client.sendall(replay)
+                except OSError:
+                    client.close()
+                    continue
+                self._clients.append(client)
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            for watcher in self.watchers:
+                event = watcher.poll()
+                if event is not None:
+                    self._broadcast(event.encode())
+
+    def _broadcast(self, line: bytes):
+        with self._clients_lock:
+            alive = []
+            for client in self._clients:
+                try:
+                    client.sendall(line)
+                    alive.append(client)
+                except OSError:
+                    client.close()
+            self._clients = alive
+
+
+class SignalSubscriber:
+    """
+    Receives signal events for one file
+
+    wait() blocks until a signal this subscriber has not returned before is
+    available (or the timeout passes) and returns its event; current()
+    returns the latest parsed signal without touching the disk. Only the
+    latest signal is kept: the file itself holds one signal at a time.
+    With include_errors=True, wait() also returns error events for
+    undecodable files; current() still returns the last parsed signal.
+    """
+
+    def __init__(self, path: str = DEFAULT_SIGNAL_FILE, address=None, fallback: bool = True,
+                 poll_interval: float = POLL_INTERVAL, reconnect_interval: float = RECONNECT_INTERVAL,
+                 include_errors: bool = False):
+        self.path = normalize_path(path)
+        self.include_errors = include_errors
+        self.address = address if address is not None else DEFAULT_ADDRESS
+        self.fallback = fallback
+        self.poll_interval = poll_interval
+        self.reconnect_interval = reconnect_interval
+        self.mode = 'connecting'
+        self._latest: Optional[SignalEvent] = None
+        self._signal: Optional[SignalEvent] = None   # last event that carried a signal
+        self._delivered: Optional[SignalEvent] = None
+        self._local: Optional[SignalFileWatcher] = None
+        self._cond = threading.Condition()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='signal-subscriber', daemon=True)
+        self._thread.start()
+
+    @property
+    def latest(self) -> Optional[SignalEvent]:
+        return self._latest
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Latest parsed signal, or None before the first one arrives"""
+        event = self._signal
+        return event.data if event is not None else None
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[SignalEvent]:
+        """Next not-yet-returned signal, or None after `timeout` seconds"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._latest is not self._delivered or self._closed.is_set(),
+                                       timeout):
+                return None
+            if self._latest is self._delivered:
+                return None
+            self._delivered = self._latest
+            return self._delivered
+
+    def close(self):
+        self._closed.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _accept(self, event: SignalEvent):
+        """Keep `event` if it is new for this subscriber"""
+        if event.path != self.path:
+            return
+        latest = self._latest
+        if latest is not None and event.epoch == latest.epoch and event.seq <= latest.seq:
+            return
+        if event.error is not None:
+            if not self.include_errors:
+                return
+        # Same content from another epoch (daemon restart, local fallback)
+        elif self._signal is not None and event.digest == self._signal.digest:
+            return
+        with self._cond:
+            self._latest = event
+            if event.error is None:
+                self._signal = event
+            self._cond.notify_all()
+
+    def _run(self):
+        while not self._closed.is_set():
+            sock = _connect(self.address)
+            if sock is not None:
+                self.mode = 'daemon'
+                self._consume(sock)
+                continue
+            if not self.fallback:
+                self.mode = 'disconnected'
+                self._closed.wait(self.reconnect_interval)
+                continue
+            self.mode = 'local'
+            self._watch_locally(time.monotonic() + self.reconnect_interval)
+
+    def _consume(self, sock: socket.socket):
+        buffer = b''
+        sock.settimeout(0.5)
+        try:
+            while not self._closed.is_set():
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    if line:
+                        self._accept(SignalEvent.decode(line))
+        except (OSError, ValueError, TypeError):
+            pass
+        finally:
+            sock.close()
+
+    def _watch_locally(self, until: float):
+        if self._local is None:
+            self._local = SignalFileWatcher(self.path)
+        while not self._closed.is_set() and time.monotonic() < until:
+            event = self._local.poll()
+            if event is not None:
+                self._accept(event)
+            self._closed.wait(self.poll_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Shared EA signal file watcher')
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_SIGNAL_FILE], help='signal files to watch')
+    parser.add_argument('--address', help='Unix socket path, or host:port for TCP')
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, help='stat interval in seconds')
+    args = parser.parse_args(argv)
+
+    address = None
+    if args.address:
+        host, sep, port = args.address.rpartition(':')
+        address = (host, int(port)) if sep and port.isdigit() else args.address
+
+    server = SignalWatcherServer(args.paths, address, args.poll_interval)
+    print(f"Signal watcher on {server.address}: {', '.join(w.path for w in server.watchers)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
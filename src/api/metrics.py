@@ -3,10 +3,13 @@ Metrics and Monitoring Endpoints
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from datetime import datetime
 from typing import Dict, Any
 import logging
 
+from ..core.metrics_registry import CONTENT_TYPE, get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
@@ -41,22 +44,8 @@ async def get_metrics():
 
 @router.get("/prometheus")
 async def prometheus_metrics():
-    """Prometheus-formatted metrics"""
-    metrics = [
-        "# HELP mikrobot_signals_total Total number of trading signals received",
-        "# TYPE mikrobot_signals_total counter",
-        "mikrobot_signals_total 0",
-        "",
-        "# HELP mikrobot_trades_total Total number of executed trades",
-        "# TYPE mikrobot_trades_total counter", 
-        "mikrobot_trades_total 0",
-        "",
-        "# HELP mikrobot_pnl_total Total profit and loss",
-        "# TYPE mikrobot_pnl_total gauge",
-        "mikrobot_pnl_total 0.0"
-    ]
-    
-    return "\n".join(metrics)
+    """Prometheus-formatted metrics from the process-wide metrics registry"""
+    return Response(content=get_metrics_registry().render(), media_type=CONTENT_TYPE)
 
 
 @router.get("/quality")
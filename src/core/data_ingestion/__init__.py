@@ -15,8 +15,10 @@ from .data_models import (
     TickData, OHLCVData, MarketData, AssetType, 
     DataQuality, ValidationResult, DataSource
 )
+from .batch_models import TickRecord, BarRecord, TickBatch, BarBatch
 from .forex_connector import ForexDataConnector
 from .crypto_connector import CryptoDataConnector
+from .stream_multiplexer import StreamMultiplexer, Subscription
 from .indices_connector import IndicesDataConnector
 from .data_validator import DataValidator, DataQualityMonitor
 from .performance_monitor import IngestionPerformanceMonitor
@@ -31,8 +33,14 @@ __all__ = [
     'DataQuality',
     'ValidationResult',
     'DataSource',
+    'TickRecord',
+    'BarRecord',
+    'TickBatch',
+    'BarBatch',
     'ForexDataConnector',
     'CryptoDataConnector', 
+    'StreamMultiplexer',
+    'Subscription',
     'IndicesDataConnector',
     'DataValidator',
     'DataQualityMonitor',
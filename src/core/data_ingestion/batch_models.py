@@ -0,0 +1,580 @@
+"""
+Compact Market Data Containers
+Slotted event records and columnar tick/bar batches for the ingestion layer
+
+The classic TickData/OHLCVData dataclasses carry a per-instance __dict__,
+timezone fix-ups and derived-field logic on every construction. The types in
+this module are the hot-path alternative:
+
+- TickRecord / BarRecord: slotted single-event records with integer
+  microsecond timestamps and no __post_init__ work. They are not declared
+  frozen because frozen dataclasses pay an object.__setattr__ per field;
+  treat them as read-only
+- TickBatch / BarBatch: NumPy structured arrays that connectors can emit and
+  callbacks can consume in bulk
+
+Both convert losslessly to and from the existing TickData/OHLCVData types.
+"""
+
+from typing import Dict, Optional, List, Iterable, Iterator, Sequence, Tuple
+from dataclasses import dataclass
+from enum import IntFlag
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+from .data_models import (
+    TickData, OHLCVData, MarketData, AssetType,
+    DataSource, DataQuality
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Enum <-> uint8 code tables (stable order, append only)
+ASSET_TYPES: Tuple[AssetType, ...] = tuple(AssetType)
+DATA_SOURCES: Tuple[DataSource, ...] = tuple(DataSource)
+DATA_QUALITIES: Tuple[DataQuality, ...] = tuple(DataQuality)
+
+_ASSET_CODES = {member: code for code, member in enumerate(ASSET_TYPES)}
+_SOURCE_CODES = {member: code for code, member in enumerate(DATA_SOURCES)}
+_QUALITY_CODES = {member: code for code, member in enumerate(DATA_QUALITIES)}
+
+# Sentinel for missing integer columns (missing floats are NaN)
+MISSING_INT = -1
+
+TICK_DTYPE = np.dtype([
+    ('time_us', np.int64),        # UTC microseconds since epoch
+    ('symbol_id', np.int32),      # index into batch.symbols
+    ('bid', np.float64),
+    ('ask', np.float64),
+    ('spread', np.float64),
+    ('volume', np.float64),       # NaN when unknown
+    ('latency_ms', np.float64),   # NaN when unknown
+    ('sequence_number', np.int64),  # MISSING_INT when unknown
+    ('asset_type', np.uint8),
+    ('source', np.uint8),
+    ('quality', np.uint8),
+])
+
+BAR_DTYPE = np.dtype([
+    ('time_us', np.int64),
+    ('symbol_id', np.int32),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.float64),
+    ('vwap', np.float64),         # NaN when unknown
+    ('tick_count', np.int64),     # MISSING_INT when unknown
+    ('real_volume', np.float64),  # exchange volume; NaN when unknown
+    ('timeframe_id', np.int16),   # index into batch.timeframes
+    ('asset_type', np.uint8),
+    ('source', np.uint8),
+    ('quality', np.uint8),
+])
+
+
+def datetime_to_us(timestamp: datetime) -> int:
+    """Convert a datetime to integer UTC microseconds (naive = UTC)"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - EPOCH) // ONE_MICROSECOND
+
+
+def us_to_datetime(time_us: int) -> datetime:
+    """Convert integer UTC microseconds to an aware UTC datetime"""
+    return EPOCH + timedelta(microseconds=int(time_us))
+
+
+def _optional_float(value: float) -> Optional[float]:
+    value = float(value)
+    return None if value != value else value
+
+
+def _optional_int(value: int) -> Optional[int]:
+    value = int(value)
+    return None if value == MISSING_INT else value
+
+
+@dataclass(slots=True)
+class TickRecord:
+    """Slotted tick event (no per-instance __dict__, no derived-field work)"""
+    time_us: int
+    symbol: str
+    bid: float
+    ask: float
+    spread: float
+    volume: Optional[float] = None
+    asset_type: AssetType = AssetType.FOREX
+    source: DataSource = DataSource.MT5
+    quality: DataQuality = DataQuality.GOOD
+    latency_ms: Optional[float] = None
+    sequence_number: Optional[int] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Event time as an aware UTC datetime"""
+        return us_to_datetime(self.time_us)
+
+    @property
+    def mid_price(self) -> float:
+        """Calculate mid price"""
+        return (self.bid + self.ask) / 2
+
+    @classmethod
+    def from_tick_data(cls, tick: TickData) -> 'TickRecord':
+        """Build a record from a legacy TickData"""
+        return cls(
+            datetime_to_us(tick.timestamp), tick.symbol, tick.bid, tick.ask,
+            tick.spread, tick.volume, tick.asset_type, tick.source,
+            tick.quality, tick.latency_ms, tick.sequence_number
+        )
+
+    def to_tick_data(self) -> TickData:
+        """Convert to the legacy TickData dataclass"""
+        return TickData(
+            timestamp=self.timestamp,
+            symbol=self.symbol,
+            bid=self.bid,
+            ask=self.ask,
+            spread=self.spread,
+            volume=self.volume,
+            asset_type=self.asset_type,
+            source=self.source,
+            quality=self.quality,
+            latency_ms=self.latency_ms,
+            sequence_number=self.sequence_number
+        )
+
+
+@dataclass(slots=True)
+class BarRecord:
+    """Slotted OHLCV bar (no validation on construction)"""
+    time_us: int
+    symbol: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    timeframe: str
+    asset_type: AssetType = AssetType.FOREX
+    source: DataSource = DataSource.MT5
+    quality: DataQuality = DataQuality.GOOD
+    tick_count: Optional[int] = None
+    vwap: Optional[float] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Bar open time as an aware UTC datetime"""
+        return us_to_datetime(self.time_us)
+
+    @classmethod
+    def from_ohlcv_data(cls, bar: OHLCVData) -> 'BarRecord':
+        """Build a record from a legacy OHLCVData"""
+        return cls(
+            datetime_to_us(bar.timestamp), bar.symbol, bar.open, bar.high,
+            bar.low, bar.close, bar.volume, bar.timeframe, bar.asset_type,
+            bar.source, bar.quality, bar.tick_count, bar.vwap
+        )
+
+    def to_ohlcv_data(self) -> OHLCVData:
+        """Convert to the legacy OHLCVData dataclass"""
+        return OHLCVData(
+            timestamp=self.timestamp,
+            symbol=self.symbol,
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+            timeframe=self.timeframe,
+            asset_type=self.asset_type,
+            source=self.source,
+            quality=self.quality,
+            tick_count=self.tick_count,
+            vwap=self.vwap
+        )
+
+
+class _SymbolTable:
+    """Interns symbol strings into dense integer ids"""
+
+    __slots__ = ('names', 'ids')
+
+    def __init__(self, names: Sequence[str] = ()):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        code = self.ids.get(name)
+        if code is None:
+            code = len(self.names)
+            self.ids[name] = code
+            self.names.append(name)
+        return code
+
+
+class TickBatch:
+    """
+    Columnar block of ticks backed by a NumPy structured array
+
+    A batch may span several symbols; `symbols[row['symbol_id']]` resolves
+    the name. Column access (`batch['bid']`) returns zero-copy views.
+    """
+
+    __slots__ = ('data', 'symbols')
+
+    def __init__(self, data: np.ndarray, symbols: Sequence[str]):
+        if data.dtype != TICK_DTYPE:
+            raise ValueError(f"TickBatch requires TICK_DTYPE, got {data.dtype}")
+        self.data = data
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column storage"""
+        return self.data.nbytes
+
+    @property
+    def mid_price(self) -> np.ndarray:
+        """Vectorized mid price"""
+        return (self.data['bid'] + self.data['ask']) / 2
+
+    @classmethod
+    def empty(cls, size: int = 0, symbols: Sequence[str] = ()) -> 'TickBatch':
+        """Allocate a zeroed batch with `size` rows"""
+        return cls(np.zeros(size, dtype=TICK_DTYPE), symbols)
+
+    @classmethod
+    def from_arrays(cls,
+                    symbol: str,
+                    time_us: np.ndarray,
+                    bid: np.ndarray,
+                    ask: np.ndarray,
+                    volume: Optional[np.ndarray] = None,
+                    asset_type: AssetType = AssetType.FOREX,
+                    source: DataSource = DataSource.MT5,
+                    quality: DataQuality = DataQuality.GOOD,
+                    first_sequence: Optional[int] = None) -> 'TickBatch':
+        """Build a single-symbol batch from column arrays"""
+        data = np.empty(len(time_us), dtype=TICK_DTYPE)
+        data['time_us'] = time_us
+        data['symbol_id'] = 0
+        data['bid'] = bid
+        data['ask'] = ask
+        data['spread'] = data['ask'] - data['bid']
+        data['volume'] = np.nan if volume is None else volume
+        data['latency_ms'] = np.nan
+        if first_sequence is None:
+            data['sequence_number'] = MISSING_INT
+        else:
+            data['sequence_number'] = np.arange(first_sequence, first_sequence + len(data))
+        data['asset_type'] = _ASSET_CODES[asset_type]
+        data['source'] = _SOURCE_CODES[source]
+        data['quality'] = _QUALITY_CODES[quality]
+        return cls(data, (symbol,))
+
+    @classmethod
+    def from_mt5_ticks(cls, symbol: str, ticks: np.ndarray,
+                       asset_type: AssetType = AssetType.FOREX,
+                       quality: DataQuality = DataQuality.GOOD) -> 'TickBatch':
+        """Build a batch from an `mt5.copy_ticks_*` structured array"""
+        if 'time_msc' in ticks.dtype.names:
+            time_us = ticks['time_msc'].astype(np.int64) * 1000
+        else:
+            time_us = ticks['time'].astype(np.int64) * 1_000_000
+        volume = ticks['volume'] if 'volume' in ticks.dtype.names else None
+        return cls.from_arrays(symbol, time_us, ticks['bid'], ticks['ask'], volume,
+                               asset_type, DataSource.MT5, quality)
+
+    @classmethod
+    def from_records(cls, records: Iterable[TickRecord]) -> 'TickBatch':
+        """Pack slotted records into a batch"""
+        table = _SymbolTable()
+        rows = [
+            (r.time_us, table.intern(r.symbol), r.bid, r.ask, r.spread,
+             np.nan if r.volume is None else r.volume,
+             np.nan if r.latency_ms is None else r.latency_ms,
+             MISSING_INT if r.sequence_number is None else r.sequence_number,
+             _ASSET_CODES[r.asset_type], _SOURCE_CODES[r.source],
+             _QUALITY_CODES[r.quality])
+            for r in records
+        ]
+        return cls(np.array(rows, dtype=TICK_DTYPE), table.names)
+
+    @classmethod
+    def from_tick_data(cls, ticks: Iterable[TickData]) -> 'TickBatch':
+        """Pack legacy TickData objects into a batch"""
+        return cls.from_records(TickRecord.from_tick_data(t) for t in ticks)
+
+    @classmethod
+    def concat(cls, batches: Sequence['TickBatch']) -> 'TickBatch':
+        """Concatenate batches, remapping symbol ids onto a merged table"""
+        table = _SymbolTable()
+        parts = []
+        for batch in batches:
+            remap = np.array([table.intern(s) for s in batch.symbols], dtype=np.int32)
+            part = batch.data.copy()
+            if len(remap):
+                part['symbol_id'] = remap[part['symbol_id']]
+            parts.append(part)
+        data = np.concatenate(parts) if parts else np.empty(0, dtype=TICK_DTYPE)
+        return cls(data, table.names)
+
+    def for_symbol(self, symbol: str) -> 'TickBatch':
+        """Rows for one symbol (copy, since selection is a boolean mask)"""
+        try:
+            code = self.symbols.index(symbol)
+        except ValueError:
+            return TickBatch.empty(0, (symbol,))
+        rows = self.data[self.data['symbol_id'] == code]
+        rows['symbol_id'] = 0
+        return TickBatch(rows, (symbol,))
+
+    def split_by_symbol(self) -> Dict[str, 'TickBatch']:
+        """Partition the batch into per-symbol batches"""
+        return {symbol: self.for_symbol(symbol) for symbol in self.symbols}
+
+    def record(self, index: int) -> TickRecord:
+        """Materialize one row as a TickRecord"""
+        row = self.data[index]
+        return TickRecord(
+            int(row['time_us']),
+            self.symbols[row['symbol_id']],
+            float(row['bid']),
+            float(row['ask']),
+            float(row['spread']),
+            _optional_float(row['volume']),
+            ASSET_TYPES[row['asset_type']],
+            DATA_SOURCES[row['source']],
+            DATA_QUALITIES[row['quality']],
+            _optional_float(row['latency_ms']),
+            _optional_int(row['sequence_number'])
+        )
+
+    def iter_records(self) -> Iterator[TickRecord]:
+        """Iterate rows as TickRecords"""
+        for index in range(len(self.data)):
+            yield self.record(index)
+
+    def to_tick_data(self) -> List[TickData]:
+        """Expand into legacy TickData objects (compatibility path)"""
+        return [record.to_tick_data() for record in self.iter_records()]
+
+    def to_market_data(self) -> List[MarketData]:
+        """Expand into MarketData containers for per-tick callbacks"""
+        return [
+            MarketData(
+                symbol=tick.symbol,
+                asset_type=tick.asset_type,
+                source=tick.source,
+                tick_data=tick
+            )
+            for tick in self.to_tick_data()
+        ]
+
+
+class BarBatch:
+    """
+    Columnar block of OHLCV bars backed by a NumPy structured array
+
+    Symbols and timeframes are interned; `symbols[row['symbol_id']]` and
+    `timeframes[row['timeframe_id']]` resolve the names.
+    """
+
+    __slots__ = ('data', 'symbols', 'timeframes')
+
+    def __init__(self, data: np.ndarray, symbols: Sequence[str], timeframes: Sequence[str]):
+        if data.dtype != BAR_DTYPE:
+            raise ValueError(f"BarBatch requires BAR_DTYPE, got {data.dtype}")
+        self.data = data
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+        self.timeframes: Tuple[str, ...] = tuple(timeframes)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column storage"""
+        return self.data.nbytes
+
+    @property
+    def typical_price(self) -> np.ndarray:
+        """Vectorized (high + low + close) / 3"""
+        return (self.data['high'] + self.data['low'] + self.data['close']) / 3
+
+    @classmethod
+    def empty(cls, size: int = 0, symbols: Sequence[str] = (),
+              timeframes: Sequence[str] = ()) -> 'BarBatch':
+        """Allocate a zeroed batch with `size` rows"""
+        return cls(np.zeros(size, dtype=BAR_DTYPE), symbols, timeframes)
+
+    @classmethod
+    def from_mt5_rates(cls, symbol: str, timeframe: str, rates: np.ndarray,
+                       asset_type: AssetType = AssetType.FOREX,
+                       quality: DataQuality = DataQuality.GOOD) -> 'BarBatch':
+        """Build a batch from an `mt5.copy_rates_*` structured array"""
+        data = np.empty(len(rates), dtype=BAR_DTYPE)
+        data['time_us'] = rates['time'].astype(np.int64) * 1_000_000
+        data['symbol_id'] = 0
+        for column in ('open', 'high', 'low', 'close'):
+            data[column] = rates[column]
+        data['volume'] = rates['tick_volume']
+        # Mirror OHLCVData: typical price stands in for VWAP on traded bars
+        typical = (data['high'] + data['low'] + data['close']) / 3
+        data['vwap'] = np.where(data['volume'] > 0, typical, np.nan)
+        # MT5 counts ticks in tick_volume; real_volume is exchange volume (0 on most forex)
+        data['tick_count'] = rates['tick_volume']
+        if 'real_volume' in rates.dtype.names:
+            data['real_volume'] = rates['real_volume']
+        else:
+            data['real_volume'] = np.nan
+        data['timeframe_id'] = 0
+        data['asset_type'] = _ASSET_CODES[asset_type]
+        data['source'] = _SOURCE_CODES[DataSource.MT5]
+        data['quality'] = _QUALITY_CODES[quality]
+        return cls(data, (symbol,), (timeframe,))
+
+    @classmethod
+    def from_records(cls, records: Iterable[BarRecord]) -> 'BarBatch':
+        """Pack slotted records into a batch"""
+        symbols = _SymbolTable()
+        timeframes = _SymbolTable()
+        rows = [
+            (r.time_us, symbols.intern(r.symbol), r.open, r.high, r.low, r.close,
+             r.volume, np.nan if r.vwap is None else r.vwap,
+             MISSING_INT if r.tick_count is None else r.tick_count, np.nan,
+             timeframes.intern(r.timeframe), _ASSET_CODES[r.asset_type],
+             _SOURCE_CODES[r.source], _QUALITY_CODES[r.quality])
+            for r in records
+        ]
+        return cls(np.array(rows, dtype=BAR_DTYPE), symbols.names, timeframes.names)
+
+    @classmethod
+    def from_ohlcv_data(cls, bars: Iterable[OHLCVData]) -> 'BarBatch':
+        """Pack legacy OHLCVData objects into a batch"""
+        return cls.from_records(BarRecord.from_ohlcv_data(b) for b in bars)
+
+    def record(self, index: int) -> BarRecord:
+        """Materialize one row as a BarRecord"""
+        row = self.data[index]
+        return BarRecord(
+            int(row['time_us']),
+            self.symbols[row['symbol_id']],
+            float(row['open']),
+            float(row['high']),
+            float(row['low']),
+            float(row['close']),
+            float(row['volume']),
+            self.timeframes[row['timeframe_id']],
+            ASSET_TYPES[row['asset_type']],
+            DATA_SOURCES[row['source']],
+            DATA_QUALITIES[row['quality']],
+            _optional_int(row['tick_count']),
+            _optional_float(row['vwap'])
+        )
+
+    def iter_records(self) -> Iterator[BarRecord]:
+        """Iterate rows as BarRecords"""
+        for index in range(len(self.data)):
+            yield self.record(index)
+
+    def to_ohlcv_data(self) -> List[OHLCVData]:
+        """Expand into legacy OHLCVData objects (compatibility path)"""
+        return [record.to_ohlcv_data() for record in self.iter_records()]
+
+    def to_market_data(self) -> List[MarketData]:
+        """Expand into MarketData containers for per-bar callbacks"""
+        return [
+            MarketData(
+                symbol=bar.symbol,
+                asset_type=bar.asset_type,
+                source=bar.source,
+                ohlcv_data=bar
+            )
+            for bar in self.to_ohlcv_data()
+        ]
+
+
+class ValidationReason(IntFlag):
+    """Bit flags explaining a row's batch validation outcome"""
+    NONE = 0
+    # Errors (row rejected)
+    INVALID_PRICE = 1 << 0
+    CROSSED_SPREAD = 1 << 1
+    FUTURE_TIMESTAMP = 1 << 2
+    # Warnings (row kept, quality degraded)
+    WIDE_SPREAD = 1 << 3
+    PRICE_JUMP = 1 << 4
+    HIGH_LATENCY = 1 << 5
+    OUT_OF_SEQUENCE = 1 << 6
+    STALE = 1 << 7
+    VERY_STALE = 1 << 8
+    # Bar checks
+    INCONSISTENT_OHLC = 1 << 9      # error
+    NEGATIVE_VOLUME = 1 << 10       # error
+    OUT_OF_ORDER_BAR = 1 << 11      # error
+    ZERO_VOLUME = 1 << 12           # warning
+
+
+ERROR_REASONS = (
+    ValidationReason.INVALID_PRICE
+    | ValidationReason.CROSSED_SPREAD
+    | ValidationReason.FUTURE_TIMESTAMP
+    | ValidationReason.INCONSISTENT_OHLC
+    | ValidationReason.NEGATIVE_VOLUME
+    | ValidationReason.OUT_OF_ORDER_BAR
+)
+
+
+@dataclass(slots=True)
+class BatchValidationResult:
+    """Per-row outcome of validating a TickBatch or BarBatch"""
+    valid: np.ndarray      # bool mask, True = row accepted
+    quality: np.ndarray    # uint8 codes into DATA_QUALITIES
+    reasons: np.ndarray    # uint16 ValidationReason bit masks
+    validation_latency_ms: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def valid_count(self) -> int:
+        return int(np.count_nonzero(self.valid))
+
+    @property
+    def invalid_count(self) -> int:
+        return len(self.valid) - self.valid_count
+
+    @property
+    def warning_count(self) -> int:
+        """Rows that carry at least one warning flag"""
+        warnings = self.reasons & ~np.uint16(ERROR_REASONS)
+        return int(np.count_nonzero(warnings))
+
+    def quality_of(self, index: int) -> DataQuality:
+        return DATA_QUALITIES[self.quality[index]]
+
+    def reasons_of(self, index: int) -> List[str]:
+        """Reason flag names for one row"""
+        flags = ValidationReason(int(self.reasons[index]))
+        return [reason.name.lower() for reason in ValidationReason
+                if reason and reason in flags]
+
+    def quality_counts(self) -> Dict[DataQuality, int]:
+        counts = np.bincount(self.quality, minlength=len(DATA_QUALITIES))
+        return {quality: int(counts[code]) for code, quality in enumerate(DATA_QUALITIES)}
@@ -1,15 +1,16 @@
 """
 Crypto Data Connector for Binance Integration
 Real-time cryptocurrency data with WebSocket streaming
+
+Ticker frames flow through a StreamMultiplexer: one upstream connection,
+per-symbol fan-out to any number of consumers via subscribe_ticks().
 """
 
 import asyncio
-import json
 import time
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timezone
 import logging
-import websockets
 import aiohttp
 from urllib.parse import urlencode
 
@@ -18,6 +19,8 @@ from .data_models import (
     TickData, OHLCVData, AssetType, DataSource, 
     DataQuality
 )
+from .batch_models import TickBatch
+from .stream_multiplexer import StreamMultiplexer, Subscription, ALL_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +32,13 @@ class CryptoDataConnector(DataConnector):
     Features:
     - Real-time ticker data via WebSocket
     - REST API for OHLCV data
-    - Multiple symbol subscriptions
-    - Automatic reconnection
+    - Multiple symbol subscriptions shared across consumers
+    - Automatic reconnection with resubscribe
     - Sub-10ms latency for tickers
     """
     
-    def __init__(self, use_testnet: bool = False):
+    def __init__(self, use_testnet: bool = False, queue_size: int = 10000,
+                 connect_timeout: float = 10.0):
         super().__init__("crypto_binance", DataSource.BINANCE)
         
         # Binance endpoints
@@ -45,13 +49,13 @@ class CryptoDataConnector(DataConnector):
             self.base_url = "https://api.binance.com"
             self.ws_url = "wss://stream.binance.com:9443/ws/"
         
-        # WebSocket connection
-        self.websocket = None
-        self.ws_task = None
+        # WebSocket stream multiplexer (one upstream connection)
+        self.multiplexer: Optional[StreamMultiplexer] = None
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
         
-        # Subscriptions
-        self.symbol_subscriptions: Dict[str, bool] = {}
-        self.subscription_id = 1
+        # Subscriptions: Binance symbol -> the connector's own queue
+        self.symbol_subscriptions: Dict[str, Subscription] = {}
         
         # Session for REST API
         self.session: Optional[aiohttp.ClientSession] = None
@@ -91,11 +95,10 @@ class CryptoDataConnector(DataConnector):
                     logger.error(f"Binance API ping failed: {response.status}")
                     return False
             
-            # Connect WebSocket
-            self.websocket = await websockets.connect(self.ws_url)
-            
-            # Start WebSocket message handler
-            self.ws_task = asyncio.create_task(self._ws_message_handler())
+            # Connect WebSocket through the multiplexer
+            self.multiplexer = StreamMultiplexer(self.ws_url)
+            await self.multiplexer.start()
+            await asyncio.wait_for(self.multiplexer.connected.wait(), self.connect_timeout)
             
             self.is_connected = True
             self.connection_metrics['messages_received'] = 0
@@ -124,18 +127,11 @@ class CryptoDataConnector(DataConnector):
     
     async def _cleanup_connection(self):
         """Clean up connections"""
-        # Cancel WebSocket task
-        if self.ws_task:
-            self.ws_task.cancel()
-            try:
-                await self.ws_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Close WebSocket
-        if self.websocket:
-            await self.websocket.close()
-            self.websocket = None
+        # Stop the multiplexer (closes the WebSocket)
+        if self.multiplexer:
+            await self.multiplexer.stop()
+            self.multiplexer = None
+        self.symbol_subscriptions.clear()
         
         # Close HTTP session
         if self.session:
@@ -145,30 +141,24 @@ class CryptoDataConnector(DataConnector):
     async def subscribe_symbol(self, symbol: str, asset_type: AssetType) -> bool:
         """Subscribe to symbol ticker updates via WebSocket"""
         try:
-            if not self.is_connected or not self.websocket:
+            if not self.is_connected or not self.multiplexer:
                 logger.error("Not connected to Binance WebSocket")
                 return False
             
             # Convert symbol to Binance format (e.g., BTCUSDT)
             binance_symbol = symbol.upper().replace('/', '')
+            if binance_symbol in self.symbol_subscriptions:
+                return True
             
             # Check if symbol exists
             if not await self._symbol_exists(binance_symbol):
                 logger.error(f"Symbol {binance_symbol} not found on Binance")
                 return False
             
-            # Subscribe to ticker stream
-            subscribe_msg = {
-                "method": "SUBSCRIBE",
-                "params": [f"{binance_symbol.lower()}@ticker"],
-                "id": self.subscription_id
-            }
-            
-            await self.websocket.send(json.dumps(subscribe_msg))
-            self.subscription_id += 1
-            
-            # Add to subscriptions
-            self.symbol_subscriptions[binance_symbol] = True
+            # Subscribe to ticker stream (upstream SUBSCRIBE is shared)
+            self.symbol_subscriptions[binance_symbol] = await self.multiplexer.subscribe(
+                binance_symbol, self.queue_size
+            )
             
             logger.info(f"Subscribed to {binance_symbol} ticker")
             return True
@@ -180,24 +170,12 @@ class CryptoDataConnector(DataConnector):
     async def unsubscribe_symbol(self, symbol: str) -> bool:
         """Unsubscribe from symbol updates"""
         try:
-            if not self.websocket:
-                return True
-            
             binance_symbol = symbol.upper().replace('/', '')
             
-            # Unsubscribe from ticker stream
-            unsubscribe_msg = {
-                "method": "UNSUBSCRIBE",
-                "params": [f"{binance_symbol.lower()}@ticker"],
-                "id": self.subscription_id
-            }
-            
-            await self.websocket.send(json.dumps(unsubscribe_msg))
-            self.subscription_id += 1
-            
-            # Remove from subscriptions
-            if binance_symbol in self.symbol_subscriptions:
-                del self.symbol_subscriptions[binance_symbol]
+            # Upstream UNSUBSCRIBE is sent once the last consumer leaves
+            subscription = self.symbol_subscriptions.pop(binance_symbol, None)
+            if subscription is not None and self.multiplexer:
+                await self.multiplexer.unsubscribe(subscription)
             
             logger.info(f"Unsubscribed from {binance_symbol}")
             return True
@@ -348,71 +326,33 @@ class CryptoDataConnector(DataConnector):
             logger.error(f"Get OHLCV data error for {symbol} {timeframe}: {e}")
             return None
     
-    async def _ws_message_handler(self):
-        """Handle incoming WebSocket messages"""
-        logger.info("Started WebSocket message handler")
-        
-        try:
-            while self.is_connected and self.websocket:
-                message = await self.websocket.recv()
-                
-                try:
-                    data = json.loads(message)
-                    
-                    # Handle ticker updates
-                    if 'e' in data and data['e'] == '24hrTicker':
-                        await self._process_ticker_update(data)
-                    
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON received: {message}")
-                except Exception as e:
-                    logger.error(f"Error processing WebSocket message: {e}")
-                    
-        except websockets.exceptions.ConnectionClosed:
-            logger.warning("WebSocket connection closed")
-        except Exception as e:
-            logger.error(f"WebSocket handler error: {e}")
+    async def subscribe_ticks(self, symbol: str = ALL_SYMBOLS, maxsize: int = 1024) -> Subscription:
+        """
+        Attach a consumer to the live ticker stream
         
-        logger.info("WebSocket message handler stopped")
+        Returns a bounded Subscription yielding TickRecords (async-iterable);
+        a consumer that falls behind loses its oldest records. Pass a symbol
+        to share (or open) that symbol's upstream stream, or ALL_SYMBOLS to
+        receive every subscribed symbol.
+        """
+        if not self.multiplexer:
+            raise RuntimeError("Not connected to Binance WebSocket")
+        return await self.multiplexer.subscribe(symbol, maxsize)
     
-    async def _process_ticker_update(self, data: Dict[str, Any]):
-        """Process ticker update from WebSocket"""
-        try:
-            symbol = data['s']  # Symbol (e.g., BTCUSDT)
-            
-            # Convert to standard format (e.g., BTC/USDT)
-            if symbol.endswith('USDT'):
-                formatted_symbol = f"{symbol[:-4]}/USDT"
-            elif symbol.endswith('BTC'):
-                formatted_symbol = f"{symbol[:-3]}/BTC"
-            elif symbol.endswith('ETH'):
-                formatted_symbol = f"{symbol[:-3]}/ETH"
-            else:
-                formatted_symbol = symbol
-            
-            # Estimate bid/ask from last price and price change
-            last_price = float(data['c'])
-            spread_estimate = last_price * 0.001  # 0.1% spread estimate
-            
-            tick_data = TickData(
-                timestamp=datetime.fromtimestamp(int(data['E']) / 1000, tz=timezone.utc),
-                symbol=formatted_symbol,
-                bid=last_price - (spread_estimate / 2),
-                ask=last_price + (spread_estimate / 2),
-                spread=spread_estimate,
-                volume=float(data['v']),
-                asset_type=AssetType.CRYPTO,
-                source=DataSource.BINANCE,
-                quality=DataQuality.EXCELLENT,  # Real-time WebSocket data
-                latency_ms=1.0  # Very low latency for WebSocket
-            )
-            
-            # Here you would typically emit this data to subscribers
-            # For now, just log for debugging
-            logger.debug(f"Real-time ticker update: {formatted_symbol} @ {last_price}")
-            
-        except Exception as e:
-            logger.error(f"Error processing ticker update: {e}")
+    def get_pending_tick_batch(self, max_ticks: int = 10000) -> TickBatch:
+        """Drain ticker updates received for subscribed symbols into one TickBatch"""
+        records = []
+        for subscription in self.symbol_subscriptions.values():
+            while len(records) < max_ticks:
+                record = subscription.get_nowait()
+                if record is None:
+                    break
+                records.append(record)
+        
+        if records:
+            self.connection_metrics['messages_received'] += len(records)
+            self.update_heartbeat()
+        return TickBatch.from_records(records)
     
     async def _symbol_exists(self, symbol: str) -> bool:
         """Check if symbol exists on Binance"""
@@ -447,9 +387,12 @@ class CryptoDataConnector(DataConnector):
             'is_connected': self.is_connected,
             'subscribed_symbols': len(self.symbol_subscriptions),
             'messages_received': self.connection_metrics['messages_received'],
-            'websocket_connected': self.websocket is not None and not self.websocket.closed
+            'websocket_connected': self.multiplexer is not None and self.multiplexer.connected.is_set()
         }
         
+        if self.multiplexer:
+            stats['stream'] = self.multiplexer.get_stats()
+        
         if self.tick_latencies:
             sorted_latencies = sorted(self.tick_latencies)
             stats['latency_stats'] = {
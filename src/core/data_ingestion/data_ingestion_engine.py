@@ -16,13 +16,21 @@ import threading
 from queue import Queue, PriorityQueue
 import json
 
+import numpy as np
+
 from .data_models import (
     TickData, OHLCVData, MarketData, AssetType, 
     DataSource, DataQuality, ValidationResult,
     DataIngestionMetrics
 )
+from .batch_models import TickBatch, BarBatch, DATA_QUALITIES
 from .data_validator import DataValidator
 
+try:
+    from ..metrics_registry import get_metrics_registry
+except ImportError:
+    from metrics_registry import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,6 +118,7 @@ class DataIngestionEngine:
         # Subscriptions and callbacks
         self.symbol_subscriptions: Dict[str, List[str]] = {}  # symbol -> [connector_ids]
         self.data_callbacks: List[Callable[[MarketData], None]] = []
+        self.batch_callbacks: List[Callable[[Union[TickBatch, BarBatch]], None]] = []
         
         # Engine state
         self.is_running = False
@@ -123,6 +132,21 @@ class DataIngestionEngine:
             'validation_latencies': []
         }
         
+        # Prometheus series, bound once so the hot paths only add numbers
+        registry = get_metrics_registry()
+        messages = registry.counter('mikrobot_ingestion_messages_total',
+                                    'Market data messages by ingestion outcome', ['outcome'])
+        self._accepted_series = messages.labels('accepted')
+        self._rejected_series = messages.labels('rejected')
+        self._failed_series = messages.labels('failed')
+        latency = registry.histogram('mikrobot_ingestion_latency_ms',
+                                     'Validation and dispatch latency per queue message', ['path'])
+        self._message_latency_series = latency.labels('message')
+        self._batch_latency_series = latency.labels('batch')
+        self._queue_depth_series = registry.gauge('mikrobot_ingestion_queue_depth',
+                                                  'Messages waiting in the ingestion queue').labels()
+        registry.add_collector(self._collect_prometheus)
+        
         logger.info("DataIngestionEngine initialized with %d workers", max_workers)
     
     def register_connector(self, connector: DataConnector) -> bool:
@@ -235,6 +259,11 @@ class DataIngestionEngine:
         self.data_callbacks.append(callback)
         logger.debug(f"Registered data callback: {callback.__name__}")
     
+    def register_batch_callback(self, callback: Callable[[Union[TickBatch, BarBatch]], None]):
+        """Register a callback that consumes TickBatch/BarBatch blocks in bulk"""
+        self.batch_callbacks.append(callback)
+        logger.debug(f"Registered batch callback: {callback.__name__}")
+    
     async def _process_messages(self):
         """Main message processing loop"""
         logger.info("Started message processing loop")
@@ -245,29 +274,10 @@ class DataIngestionEngine:
                 if not self.message_queue.empty():
                     priority, timestamp, data = self.message_queue.get_nowait()
                     
-                    # Process message with latency tracking
-                    processing_start = time.perf_counter()
-                    
-                    # Validate data
-                    validation_result = await self._validate_data(data)
-                    
-                    if validation_result.is_valid:
-                        # Update metrics
-                        self.metrics.successful_ingestions += 1
-                        self.metrics.update_quality(validation_result.quality)
-                        
-                        # Calculate processing latency
-                        processing_latency = (time.perf_counter() - processing_start) * 1000
-                        data.processing_latency_ms = processing_latency
-                        self.metrics.update_latency(processing_latency)
-                        
-                        # Invoke callbacks
-                        await self._invoke_callbacks(data)
+                    if isinstance(data, (TickBatch, BarBatch)):
+                        await self._process_batch(data)
                     else:
-                        self.metrics.validation_failures += 1
-                        logger.warning(f"Data validation failed: {validation_result.errors}")
-                        
-                    self.metrics.total_messages += 1
+                        await self._process_market_data(data)
                     
                 else:
                     # Brief pause to prevent CPU spinning
@@ -276,8 +286,86 @@ class DataIngestionEngine:
             except Exception as e:
                 logger.error(f"Message processing error: {e}")
                 self.metrics.failed_ingestions += 1
+                self._failed_series.inc()
                 await asyncio.sleep(0.1)
     
+    async def _process_market_data(self, data: MarketData):
+        """Validate a single MarketData message and dispatch it to callbacks"""
+        # Process message with latency tracking
+        processing_start = time.perf_counter()
+        
+        # Validate data
+        validation_result = await self._validate_data(data)
+        
+        if validation_result.is_valid:
+            # Update metrics
+            self.metrics.successful_ingestions += 1
+            self.metrics.update_quality(validation_result.quality)
+            
+            # Calculate processing latency
+            processing_latency = (time.perf_counter() - processing_start) * 1000
+            data.processing_latency_ms = processing_latency
+            self.metrics.update_latency(processing_latency)
+            self._accepted_series.inc()
+            self._message_latency_series.observe(processing_latency)
+            
+            # Invoke callbacks
+            await self._invoke_callbacks(data)
+        else:
+            self.metrics.validation_failures += 1
+            self._rejected_series.inc()
+            logger.warning(f"Data validation failed: {validation_result.errors}")
+            
+        self.metrics.total_messages += 1
+    
+    async def _process_batch(self, batch: Union[TickBatch, BarBatch]):
+        """Validate a columnar batch in one pass and dispatch the accepted rows"""
+        processing_start = time.perf_counter()
+        
+        if isinstance(batch, TickBatch):
+            validation_result = self.validator.validate_tick_batch(batch)
+        else:
+            validation_result = self.validator.validate_bar_batch(batch)
+        self.latency_tracker['validation_latencies'].append(validation_result.validation_latency_ms)
+        if len(self.latency_tracker['validation_latencies']) > 1000:
+            self.latency_tracker['validation_latencies'] = self.latency_tracker['validation_latencies'][-1000:]
+        
+        if validation_result.invalid_count == 0:
+            accepted = batch
+        elif isinstance(batch, TickBatch):
+            accepted = TickBatch(batch.data[validation_result.valid], batch.symbols)
+        else:
+            accepted = BarBatch(batch.data[validation_result.valid], batch.symbols, batch.timeframes)
+        qualities = validation_result.quality[validation_result.valid]
+        for code, count in enumerate(np.bincount(qualities, minlength=len(DATA_QUALITIES))):
+            if count:
+                self.metrics.update_quality(DATA_QUALITIES[code], int(count))
+        self.metrics.validation_failures += validation_result.invalid_count
+        if validation_result.invalid_count:
+            self._rejected_series.inc(int(validation_result.invalid_count))
+        
+        processing_latency = (time.perf_counter() - processing_start) * 1000
+        self.metrics.successful_ingestions += len(accepted)
+        self.metrics.total_messages += len(batch)
+        self.metrics.update_latency(processing_latency)
+        self._accepted_series.inc(len(accepted))
+        self._batch_latency_series.observe(processing_latency)
+        
+        if not len(accepted):
+            return
+        
+        if self.batch_callbacks:
+            await asyncio.gather(
+                *(self._safe_callback(callback, accepted) for callback in self.batch_callbacks),
+                return_exceptions=True
+            )
+        
+        # Legacy per-item callbacks still see one MarketData per accepted row
+        if self.data_callbacks:
+            for index, market_data in enumerate(accepted.to_market_data()):
+                market_data.quality = DATA_QUALITIES[qualities[index]]
+                await self._invoke_callbacks(market_data)
+    
     async def _monitor_health(self):
         """Monitor connector health and perform recovery"""
         logger.info("Started health monitoring")
@@ -464,6 +552,7 @@ class DataIngestionEngine:
         except Exception as e:
             logger.error(f"Failed to ingest tick data: {e}")
             self.metrics.failed_ingestions += 1
+            self._failed_series.inc()
     
     def ingest_ohlcv_data(self, ohlcv: OHLCVData, priority: int = 7):
         """Ingest OHLCV data with priority"""
@@ -482,6 +571,35 @@ class DataIngestionEngine:
         except Exception as e:
             logger.error(f"Failed to ingest OHLCV data: {e}")
             self.metrics.failed_ingestions += 1
+            self._failed_series.inc()
+    
+    def ingest_tick_batch(self, batch: TickBatch, priority: int = 5):
+        """Ingest a columnar tick batch as a single queue message"""
+        try:
+            if len(batch) == 0:
+                return
+            self.message_queue.put((priority, time.time(), batch))
+            
+        except Exception as e:
+            logger.error(f"Failed to ingest tick batch: {e}")
+            self.metrics.failed_ingestions += len(batch)
+            self._failed_series.inc(len(batch))
+    
+    def ingest_bar_batch(self, batch: BarBatch, priority: int = 7):
+        """Ingest a columnar OHLCV batch as a single queue message"""
+        try:
+            if len(batch) == 0:
+                return
+            self.message_queue.put((priority, time.time(), batch))
+            
+        except Exception as e:
+            logger.error(f"Failed to ingest bar batch: {e}")
+            self.metrics.failed_ingestions += len(batch)
+            self._failed_series.inc(len(batch))
+    
+    def _collect_prometheus(self):
+        """Refresh scrape-time gauges"""
+        self._queue_depth_series.set(self.message_queue.qsize())
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics"""
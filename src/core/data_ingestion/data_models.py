@@ -295,18 +295,18 @@ class DataIngestionMetrics:
         self.max_processing_latency = max(self.max_processing_latency, latency_ms)
         self.min_processing_latency = min(self.min_processing_latency, latency_ms)
     
-    def update_quality(self, quality: DataQuality):
+    def update_quality(self, quality: DataQuality, count: int = 1):
         """Update quality metrics"""
         if quality == DataQuality.EXCELLENT:
-            self.excellent_quality_count += 1
+            self.excellent_quality_count += count
         elif quality == DataQuality.GOOD:
-            self.good_quality_count += 1
+            self.good_quality_count += count
         elif quality == DataQuality.ACCEPTABLE:
-            self.acceptable_quality_count += 1
+            self.acceptable_quality_count += count
         elif quality == DataQuality.POOR:
-            self.poor_quality_count += 1
+            self.poor_quality_count += count
         elif quality == DataQuality.INVALID:
-            self.invalid_quality_count += 1
+            self.invalid_quality_count += count
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for monitoring"""
@@ -9,14 +9,121 @@ from datetime import datetime, timezone, timedelta
 import statistics
 import logging
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from .data_models import (
     TickData, OHLCVData, MarketData, DataQuality, 
     ValidationResult, AssetType
 )
+from .batch_models import (
+    TickBatch, BarBatch, BatchValidationResult, ValidationReason,
+    ASSET_TYPES, MISSING_INT, datetime_to_us
+)
 
 logger = logging.getLogger(__name__)
 
 
+class PriceRing:
+    """
+    Fixed-size ring of (time_us, price) samples for one symbol
+    
+    Keeps a running sum and sum of squares over the last `window` samples so
+    the mean/variance used by the price-jump check are O(1) per push instead
+    of a statistics.mean() over a sliced list.
+    """
+    
+    def __init__(self, capacity: int = 1000, window: int = 10):
+        self.capacity = capacity
+        self.window = window
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.head = 0      # next write position
+        self.count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        
+        # Sequencing state (event time / sequence number of the previous tick)
+        self.last_time_us = np.iinfo(np.int64).min
+        self.last_sequence = MISSING_INT
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    @property
+    def window_count(self) -> int:
+        return min(self.count, self.window)
+    
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the last `window` prices (None when empty)"""
+        n = self.window_count
+        return self._sum / n if n else None
+    
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance of the last `window` prices"""
+        n = self.window_count
+        if not n:
+            return None
+        mean = self._sum / n
+        return max(self._sum_sq / n - mean * mean, 0.0)
+    
+    def push(self, time_us: int, price: float):
+        """Append one sample, sliding the running window in O(1)"""
+        if self.count >= self.window:
+            leaving = self.prices[(self.head - self.window) % self.capacity]
+            self._sum -= leaving
+            self._sum_sq -= leaving * leaving
+        self.times[self.head] = time_us
+        self.prices[self.head] = price
+        self._sum += price
+        self._sum_sq += price * price
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        
+        # Re-anchor the running sums once per lap to stop float drift
+        if self.head == 0:
+            self._resync()
+    
+    def extend(self, times: np.ndarray, prices: np.ndarray):
+        """Append a block of samples with array copies"""
+        n = len(prices)
+        if n == 0:
+            return
+        if n >= self.capacity:
+            times, prices = times[-self.capacity:], prices[-self.capacity:]
+            n = self.capacity
+        first = min(n, self.capacity - self.head)
+        self.times[self.head:self.head + first] = times[:first]
+        self.prices[self.head:self.head + first] = prices[:first]
+        if first < n:
+            self.times[:n - first] = times[first:]
+            self.prices[:n - first] = prices[first:]
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+        self._resync()
+    
+    def tail(self, size: int) -> np.ndarray:
+        """Most recent `size` prices in chronological order"""
+        size = min(size, self.count)
+        idx = (self.head - size + np.arange(size)) % self.capacity
+        return self.prices[idx]
+    
+    def history(self) -> List[Tuple[datetime, float]]:
+        """Chronological (timestamp, price) samples (diagnostics only)"""
+        idx = (self.head - self.count + np.arange(self.count)) % self.capacity
+        return [
+            (datetime.fromtimestamp(t / 1_000_000, tz=timezone.utc), float(p))
+            for t, p in zip(self.times[idx], self.prices[idx])
+        ]
+    
+    def _resync(self):
+        recent = self.tail(self.window)
+        self._sum = float(recent.sum())
+        self._sum_sq = float(np.dot(recent, recent))
+
+
 class DataValidator:
     """
     Validates market data for quality and integrity
@@ -27,9 +134,16 @@ class DataValidator:
     - Spread validation
     - Volume validation
     - Data completeness
+    
+    The batch paths always check ordering (ticks going back in time or
+    repeating a sequence number, bars earlier than the previous bar of
+    their series). The single-record validate() does so only with
+    check_ordering=True, so backfills and multi-source feeds pass as before.
     """
     
-    def __init__(self):
+    def __init__(self, check_ordering: bool = False):
+        self.check_ordering = check_ordering
+        
         # Price range limits by asset type (% from last known price)
         self.price_change_limits = {
             AssetType.FOREX: 0.05,      # 5% max change
@@ -48,9 +162,21 @@ class DataValidator:
             AssetType.STOCKS: 0.02      # 2% max spread
         }
         
-        # Historical price cache for validation
-        self.price_history: Dict[str, List[Tuple[datetime, float]]] = {}
+        # Historical price cache for validation (per-symbol ring buffers)
+        self.price_history: Dict[str, PriceRing] = {}
         self.max_history_size = 1000
+        self.price_window = 10
+        
+        # Per-asset limits as arrays indexed by AssetType code (batch path)
+        self._price_change_limit_table = np.array(
+            [self.price_change_limits.get(a, 0.10) for a in ASSET_TYPES]
+        )
+        self._max_spread_table = np.array(
+            [self.max_spread_percentage.get(a, 0.05) for a in ASSET_TYPES]
+        )
+        
+        # Open time of the last accepted bar per (symbol, timeframe)
+        self._last_bar_us: Dict[Tuple[str, str], int] = {}
         
         # Validation statistics
         self.validation_stats = {
@@ -140,8 +266,21 @@ class DataValidator:
                 result.quality = DataQuality.POOR
                 result.add_warning(f"High latency: {tick.latency_ms:.1f}ms")
         
+        # Sequence check (time going backwards or repeated sequence number)
+        time_us = datetime_to_us(tick.timestamp)
+        ring = self._get_ring(tick.symbol)
+        if self.check_ordering and (time_us < ring.last_time_us or (
+            tick.sequence_number is not None
+            and ring.last_sequence != MISSING_INT
+            and tick.sequence_number <= ring.last_sequence
+        )):
+            result.add_warning("Out-of-sequence tick")
+        ring.last_time_us = time_us
+        if tick.sequence_number is not None:
+            ring.last_sequence = tick.sequence_number
+        
         # Update price history
-        self._update_price_history(tick.symbol, tick.mid_price)
+        self._update_price_history(tick.symbol, tick.mid_price, time_us)
     
     async def _validate_ohlcv_data(self, ohlcv: OHLCVData, result: ValidationResult):
         """Validate OHLCV data"""
@@ -170,6 +309,15 @@ class DataValidator:
         elif ohlcv.volume == 0:
             result.add_warning("Zero volume detected")
         
+        # Bars of one series must not go back in time (the forming bar may repeat)
+        key = (ohlcv.symbol, ohlcv.timeframe)
+        bar_us = datetime_to_us(ohlcv.timestamp)
+        last_us = self._last_bar_us.get(key, bar_us)
+        if bar_us < last_us and self.check_ordering:
+            result.add_error("Out-of-order bar: earlier than the previous bar")
+            return
+        self._last_bar_us[key] = max(bar_us, last_us)
+        
         # Historical validation
         typical_price = (ohlcv.high + ohlcv.low + ohlcv.close) / 3
         if not self._validate_price_change(ohlcv.symbol, typical_price, ohlcv.asset_type):
@@ -200,16 +348,12 @@ class DataValidator:
     
     def _validate_price_change(self, symbol: str, price: float, asset_type: AssetType) -> bool:
         """Validate price change against historical data"""
-        if symbol not in self.price_history or not self.price_history[symbol]:
+        ring = self.price_history.get(symbol)
+        if ring is None or not len(ring):
             return True  # No history to compare
         
-        # Get recent prices
-        recent_prices = [p for _, p in self.price_history[symbol][-10:]]
-        if not recent_prices:
-            return True
-        
-        # Calculate average recent price
-        avg_price = statistics.mean(recent_prices)
+        # Running mean of the last `price_window` prices
+        avg_price = ring.mean
         
         # Check price change
         price_change = abs(price - avg_price) / avg_price
@@ -217,17 +361,273 @@ class DataValidator:
         
         return price_change <= max_change
     
-    def _update_price_history(self, symbol: str, price: float):
+    def _get_ring(self, symbol: str) -> PriceRing:
+        ring = self.price_history.get(symbol)
+        if ring is None:
+            ring = PriceRing(self.max_history_size, self.price_window)
+            self.price_history[symbol] = ring
+        return ring
+    
+    def _update_price_history(self, symbol: str, price: float, time_us: Optional[int] = None):
         """Update price history for symbol"""
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
+        if time_us is None:
+            time_us = datetime_to_us(datetime.now(timezone.utc))
+        self._get_ring(symbol).push(time_us, price)
+    
+    def validate_tick_batch(self, batch: TickBatch,
+                            now: Optional[datetime] = None) -> BatchValidationResult:
+        """
+        Validate a block of ticks with NumPy
+        
+        Applies the same spread, price-jump, latency, sequence and staleness
+        rules as validate() row by row, in row order, and advances the same
+        per-symbol ring state. Staleness is judged against each tick's own
+        timestamp.
+        """
+        validation_start = time.perf_counter()
+        now_us = datetime_to_us(now or datetime.now(timezone.utc))
+        
+        n = len(batch)
+        valid = np.ones(n, dtype=bool)
+        quality = np.zeros(n, dtype=np.uint8)  # EXCELLENT
+        reasons = np.zeros(n, dtype=np.uint16)
         
-        # Add new price
-        self.price_history[symbol].append((datetime.now(timezone.utc), price))
+        if n:
+            if len(batch.symbols) == 1:
+                self._validate_symbol_rows(batch, batch.symbols[0], slice(None),
+                                           now_us, valid, quality, reasons)
+            else:
+                symbol_ids = batch.data['symbol_id']
+                for code, symbol in enumerate(batch.symbols):
+                    rows = np.flatnonzero(symbol_ids == code)
+                    if len(rows):
+                        self._validate_symbol_rows(batch, symbol, rows,
+                                                   now_us, valid, quality, reasons)
+        
+        result = BatchValidationResult(valid, quality, reasons)
+        result.validation_latency_ms = (time.perf_counter() - validation_start) * 1000
+        
+        # Update statistics
+        self.validation_stats['total_validations'] += n
+        self.validation_stats['passed'] += result.valid_count
+        self.validation_stats['failed'] += result.invalid_count
+        self.validation_stats['warnings'] += result.warning_count
         
-        # Maintain size limit
-        if len(self.price_history[symbol]) > self.max_history_size:
-            self.price_history[symbol] = self.price_history[symbol][-self.max_history_size:]
+        return result
+    
+    def _validate_symbol_rows(self, batch: TickBatch, symbol: str, rows,
+                              now_us: int, valid: np.ndarray,
+                              quality: np.ndarray, reasons: np.ndarray):
+        """Vectorized checks for one symbol's rows (in row order)"""
+        data = batch.data[rows]
+        bid = data['bid']
+        ask = data['ask']
+        asset_codes = data['asset_type']
+        q = np.zeros(len(data), dtype=np.uint8)
+        r = np.zeros(len(data), dtype=np.uint16)
+        
+        # Price sanity (errors short-circuit the remaining tick checks)
+        bad_price = (bid <= 0) | (ask <= 0)
+        crossed = ~bad_price & (bid >= ask)
+        r[bad_price] |= np.uint16(ValidationReason.INVALID_PRICE)
+        r[crossed] |= np.uint16(ValidationReason.CROSSED_SPREAD)
+        ok = ~(bad_price | crossed)
+        q[~ok] = 3  # POOR
+        
+        # Spread
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread_pct = (ask - bid) / bid
+        wide = ok & (spread_pct > self._max_spread_table[asset_codes])
+        r[wide] |= np.uint16(ValidationReason.WIDE_SPREAD)
+        q[wide] = np.maximum(q[wide], 1)  # GOOD
+        
+        # Price jump vs running mean of the previous accepted mids
+        ring = self._get_ring(symbol)
+        ok_idx = np.flatnonzero(ok)
+        mids = (bid[ok_idx] + ask[ok_idx]) / 2
+        if len(mids):
+            jump = self._price_jumps(ring, mids, asset_codes[ok_idx])
+            jump_rows = ok_idx[jump]
+            r[jump_rows] |= np.uint16(ValidationReason.PRICE_JUMP)
+            q[jump_rows] = np.maximum(q[jump_rows], 2)  # ACCEPTABLE
+        
+        # Latency (only when reported and non-zero, as in the scalar path)
+        latency = data['latency_ms']
+        has_latency = ok & ~np.isnan(latency) & (latency != 0)
+        fast = has_latency & (latency < 1)
+        good = has_latency & (latency >= 1) & (latency < 5)
+        fair = has_latency & (latency >= 5) & (latency < 10)
+        slow = has_latency & (latency >= 10)
+        q[fast] = 0
+        q[good] = np.maximum(q[good], 1)
+        q[fair] = np.maximum(q[fair], 2)
+        q[slow] = 3
+        r[slow] |= np.uint16(ValidationReason.HIGH_LATENCY)
+        
+        # Sequencing against the previous accepted row
+        if len(ok_idx):
+            times = data['time_us'][ok_idx]
+            prev_times = np.concatenate([[ring.last_time_us], times[:-1]])
+            out_of_order = times < prev_times
+            
+            sequences = data['sequence_number'][ok_idx]
+            has_seq = sequences != MISSING_INT
+            if has_seq.any():
+                seq_vals = sequences[has_seq]
+                prev_seq = np.concatenate([[ring.last_sequence], seq_vals[:-1]])
+                repeated = np.zeros(len(ok_idx), dtype=bool)
+                repeated[has_seq] = (prev_seq != MISSING_INT) & (seq_vals <= prev_seq)
+                out_of_order |= repeated
+                ring.last_sequence = int(seq_vals[-1])
+            
+            seq_rows = ok_idx[out_of_order]
+            r[seq_rows] |= np.uint16(ValidationReason.OUT_OF_SEQUENCE)
+            q[seq_rows] = np.maximum(q[seq_rows], 1)
+            ring.last_time_us = int(times[-1])
+            
+            # Advance price history with the accepted mids
+            ring.extend(times, mids)
+        
+        # Timestamp: future ticks are errors, old ticks degrade quality
+        time_us = data['time_us']
+        future = (time_us - now_us) > 1_000_000
+        r[future] |= np.uint16(ValidationReason.FUTURE_TIMESTAMP)
+        q[future] = 3
+        age_us = now_us - time_us
+        stale = ~future & (age_us > 60_000_000)
+        very_stale = stale & (age_us > 300_000_000)
+        r[stale] |= np.uint16(ValidationReason.STALE)
+        q[stale] = np.maximum(q[stale], 1)
+        r[very_stale] |= np.uint16(ValidationReason.VERY_STALE)
+        q[very_stale] = 3
+        
+        valid[rows] = ~(bad_price | crossed | future)
+        quality[rows] = q
+        reasons[rows] = r
+    
+    def _price_jumps(self, ring: PriceRing, prices: np.ndarray, asset_codes: np.ndarray) -> np.ndarray:
+        """
+        Price-jump flags for accepted prices in order: each is compared with
+        the mean of the `price_window` prices before it (ring history first)
+        """
+        window = self.price_window
+        history = ring.tail(window)
+        combined = np.concatenate([history, prices])
+        padded = np.concatenate([np.zeros(window), combined])
+        window_sums = sliding_window_view(padded, window).sum(axis=1)
+        # Mean of the `window` samples preceding each price
+        positions = len(history) + np.arange(len(prices))
+        counts = np.minimum(positions, window)
+        sums = window_sums[positions]
+        has_history = counts > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+            change = np.abs(prices - means) / means
+        limits = self._price_change_limit_table[asset_codes]
+        return has_history & (change > limits)
+    
+    def validate_bar_batch(self, batch: BarBatch,
+                           now: Optional[datetime] = None) -> BatchValidationResult:
+        """
+        Validate a block of OHLCV bars with NumPy
+        
+        Applies the same price, OHLC consistency, volume, bar order,
+        price-jump and timestamp rules as validate() row by row, in row
+        order, and advances the same per-symbol state.
+        """
+        validation_start = time.perf_counter()
+        now_us = datetime_to_us(now or datetime.now(timezone.utc))
+        
+        n = len(batch)
+        valid = np.ones(n, dtype=bool)
+        quality = np.zeros(n, dtype=np.uint8)  # EXCELLENT
+        reasons = np.zeros(n, dtype=np.uint16)
+        
+        if n:
+            if len(batch.symbols) == 1:
+                self._validate_bar_rows(batch, batch.symbols[0], slice(None),
+                                        now_us, valid, quality, reasons)
+            else:
+                symbol_ids = batch.data['symbol_id']
+                for code, symbol in enumerate(batch.symbols):
+                    rows = np.flatnonzero(symbol_ids == code)
+                    if len(rows):
+                        self._validate_bar_rows(batch, symbol, rows,
+                                                now_us, valid, quality, reasons)
+        
+        result = BatchValidationResult(valid, quality, reasons)
+        result.validation_latency_ms = (time.perf_counter() - validation_start) * 1000
+        
+        # Update statistics
+        self.validation_stats['total_validations'] += n
+        self.validation_stats['passed'] += result.valid_count
+        self.validation_stats['failed'] += result.invalid_count
+        self.validation_stats['warnings'] += result.warning_count
+        
+        return result
+    
+    def _validate_bar_rows(self, batch: BarBatch, symbol: str, rows,
+                           now_us: int, valid: np.ndarray,
+                           quality: np.ndarray, reasons: np.ndarray):
+        """Vectorized bar checks for one symbol's rows (in row order)"""
+        data = batch.data[rows]
+        o, h, l, c = data['open'], data['high'], data['low'], data['close']
+        volume = data['volume']
+        times = data['time_us']
+        q = np.zeros(len(data), dtype=np.uint8)
+        r = np.zeros(len(data), dtype=np.uint16)
+        
+        # Errors short-circuit the remaining bar checks, as in the scalar path
+        bad_price = (o <= 0) | (h <= 0) | (l <= 0) | (c <= 0)
+        inconsistent = ~bad_price & ((h < np.maximum(o, c)) | (l > np.minimum(o, c)) | (h < l))
+        negative_volume = ~bad_price & ~inconsistent & (volume < 0)
+        r[bad_price] |= np.uint16(ValidationReason.INVALID_PRICE)
+        r[inconsistent] |= np.uint16(ValidationReason.INCONSISTENT_OHLC)
+        r[negative_volume] |= np.uint16(ValidationReason.NEGATIVE_VOLUME)
+        ok = ~(bad_price | inconsistent | negative_volume)
+        
+        r[ok & (volume == 0)] |= np.uint16(ValidationReason.ZERO_VOLUME)
+        
+        # Bar order per timeframe against the latest accepted open time; a
+        # rejected bar is earlier than that time, so it never moves it
+        out_of_order = np.zeros(len(data), dtype=bool)
+        timeframe_ids = data['timeframe_id']
+        for tf_code in np.unique(timeframe_ids[ok]):
+            tf_rows = np.flatnonzero(ok & (timeframe_ids == tf_code))
+            key = (symbol, batch.timeframes[tf_code])
+            tf_times = times[tf_rows]
+            previous = np.concatenate([[self._last_bar_us.get(key, tf_times[0])], tf_times[:-1]])
+            out_of_order[tf_rows] = tf_times < np.maximum.accumulate(previous)
+            self._last_bar_us[key] = int(max(tf_times.max(), self._last_bar_us.get(key, tf_times[0])))
+        r[out_of_order] |= np.uint16(ValidationReason.OUT_OF_ORDER_BAR)
+        ok &= ~out_of_order
+        
+        # Price jump of the typical price, then advance the shared history
+        ok_idx = np.flatnonzero(ok)
+        if len(ok_idx):
+            ring = self._get_ring(symbol)
+            typical = (h[ok_idx] + l[ok_idx] + c[ok_idx]) / 3
+            jump_rows = ok_idx[self._price_jumps(ring, typical, data['asset_type'][ok_idx])]
+            r[jump_rows] |= np.uint16(ValidationReason.PRICE_JUMP)
+            q[jump_rows] = np.maximum(q[jump_rows], 2)  # ACCEPTABLE
+            ring.extend(np.full(len(ok_idx), now_us, dtype=np.int64), typical)
+        q[~ok] = 3  # POOR
+        
+        # Timestamp: future bars are errors, old bars degrade quality
+        future = (times - now_us) > 1_000_000
+        r[future] |= np.uint16(ValidationReason.FUTURE_TIMESTAMP)
+        q[future] = 3
+        age_us = now_us - times
+        stale = ~future & (age_us > 60_000_000)
+        very_stale = stale & (age_us > 300_000_000)
+        r[stale] |= np.uint16(ValidationReason.STALE)
+        q[stale] = np.maximum(q[stale], 1)
+        r[very_stale] |= np.uint16(ValidationReason.VERY_STALE)
+        q[very_stale] = 3
+        
+        valid[rows] = ok & ~future
+        quality[rows] = q
+        reasons[rows] = r
     
     def get_validation_stats(self) -> Dict[str, Any]:
         """Get validation statistics"""
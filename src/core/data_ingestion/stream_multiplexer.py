@@ -0,0 +1,385 @@
+"""
+WebSocket Stream Multiplexer
+One upstream connection per exchange stream, fanned out to many consumers
+
+- Fast-path frame parser: orjson when installed, otherwise a hand-tuned
+  extractor that pulls only the ticker fields we use out of the raw text
+- Per-symbol fan-out to N subscribers through bounded per-subscriber queues;
+  a slow consumer loses its oldest frames instead of stalling the reader
+- Reference-counted upstream SUBSCRIBE/UNSUBSCRIBE with automatic
+  resubscribe after reconnect
+
+Everything runs on one event loop, so fan-out needs no locks: each delivery
+is a deque append plus an Event.set().
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Set, Union
+import logging
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from .data_models import AssetType, DataSource, DataQuality
+from .batch_models import TickRecord
+
+logger = logging.getLogger(__name__)
+
+ALL_SYMBOLS = '*'
+TICKER_SUFFIX = '@ticker'
+SPREAD_ESTIMATE = 0.001  # 0.1% when the frame carries no best bid/ask
+
+
+def format_binance_symbol(symbol: str) -> str:
+    """Convert BTCUSDT style names to BTC/USDT"""
+    if symbol.endswith('USDT'):
+        return f"{symbol[:-4]}/USDT"
+    elif symbol.endswith('BTC'):
+        return f"{symbol[:-3]}/BTC"
+    elif symbol.endswith('ETH'):
+        return f"{symbol[:-3]}/ETH"
+    return symbol
+
+
+_formatted_symbols: Dict[str, str] = {}
+
+
+def _field(frame: str, marker: str, start: int = 0) -> Optional[str]:
+    """Extract the raw value following `"key":` from compact JSON text"""
+    idx = frame.find(marker, start)
+    if idx < 0:
+        return None
+    idx += len(marker)
+    if frame[idx] == '"':
+        end = frame.find('"', idx + 1)
+        return frame[idx + 1:end]
+    end = frame.find(',', idx)
+    if end < 0:
+        end = frame.find('}', idx)
+    return frame[idx:end].rstrip('}')
+
+
+def _record(symbol: str, event_ms: int, last: float, volume: float,
+            bid: Optional[float], ask: Optional[float]) -> TickRecord:
+    if not bid or not ask:
+        spread = last * SPREAD_ESTIMATE
+        bid = last - spread / 2
+        ask = last + spread / 2
+    return TickRecord(
+        event_ms * 1000,
+        _formatted_symbols.get(symbol) or _formatted_symbols.setdefault(
+            symbol, format_binance_symbol(symbol)),
+        bid,
+        ask,
+        ask - bid,
+        volume,
+        AssetType.CRYPTO,
+        DataSource.BINANCE,
+        DataQuality.EXCELLENT,  # Real-time WebSocket data
+        1.0
+    )
+
+
+def parse_ticker_extract(frame: Union[str, bytes]) -> Optional[TickRecord]:
+    """Hand-tuned parser: reads only e/s/E/c/v/b/a without building a dict
+
+    Expects the compact encoding the exchange sends; anything else falls
+    back to parse_ticker_json.
+    """
+    if isinstance(frame, (bytes, bytearray)):
+        frame = frame.decode('utf-8')
+    # Combined streams wrap the payload in {"stream":..., "data":{...}}
+    start = frame.find('"data":')
+    start = 0 if start < 0 else start
+    event_type = _field(frame, '"e":', start)
+    if event_type is None or event_type[:1] == ' ':
+        # Not the exchange's compact encoding; take the dict path
+        return parse_ticker_json(frame)
+    if event_type != '24hrTicker':
+        return None
+    bid = _field(frame, '"b":', start)
+    ask = _field(frame, '"a":', start)
+    return _record(
+        _field(frame, '"s":', start),
+        int(_field(frame, '"E":', start)),
+        float(_field(frame, '"c":', start)),
+        float(_field(frame, '"v":', start)),
+        float(bid) if bid else None,
+        float(ask) if ask else None
+    )
+
+
+def parse_ticker_json(frame: Union[str, bytes]) -> Optional[TickRecord]:
+    """Dict-based parser (orjson when available, json otherwise)"""
+    data = orjson.loads(frame) if orjson is not None else json.loads(frame)
+    if 'data' in data and isinstance(data['data'], dict):
+        data = data['data']
+    if data.get('e') != '24hrTicker':
+        return None
+    bid = data.get('b')
+    ask = data.get('a')
+    return _record(data['s'], int(data['E']), float(data['c']), float(data['v']),
+                   float(bid) if bid else None, float(ask) if ask else None)
+
+
+parse_ticker_frame = parse_ticker_json if orjson is not None else parse_ticker_extract
+
+
+class SubscriptionClosed(Exception):
+    """Raised by Subscription.get() once the subscription is closed and drained"""
+    pass
+
+
+class Subscription:
+    """
+    Bounded, single-consumer queue of TickRecords
+
+    When full, the oldest pending record is dropped (slow-consumer drop) so the
+    upstream reader never blocks.
+    """
+
+    def __init__(self, multiplexer: 'StreamMultiplexer', symbol: str, maxsize: int = 1024):
+        self.multiplexer = multiplexer
+        self.symbol = symbol
+        self.maxsize = maxsize
+        self.queue: deque = deque(maxlen=maxsize)
+        self.ready = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, record: TickRecord):
+        if len(self.queue) == self.maxsize:
+            self.dropped += 1
+        self.queue.append(record)
+        self.delivered += 1
+        self.ready.set()
+
+    def get_nowait(self) -> Optional[TickRecord]:
+        if self.queue:
+            return self.queue.popleft()
+        return None
+
+    def drain(self) -> List[TickRecord]:
+        """Take everything pending in one call"""
+        records = list(self.queue)
+        self.queue.clear()
+        self.ready.clear()
+        return records
+
+    async def get(self) -> TickRecord:
+        while not self.queue:
+            if self.closed:
+                raise SubscriptionClosed(self.symbol)
+            self.ready.clear()
+            await self.ready.wait()
+        return self.queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> TickRecord:
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    async def close(self):
+        await self.multiplexer.unsubscribe(self)
+
+
+class StreamMultiplexer:
+    """
+    Shares one upstream WebSocket across all consumers of an exchange stream
+
+    Subscribers call subscribe(symbol) and read from the returned
+    Subscription; the multiplexer keeps one upstream `<symbol>@ticker`
+    subscription per symbol regardless of how many consumers want it.
+    """
+
+    def __init__(self,
+                 url: str,
+                 connect: Optional[Callable] = None,
+                 parser: Callable[[Union[str, bytes]], Optional[TickRecord]] = parse_ticker_frame,
+                 reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0):
+        self.url = url
+        self._connect = connect
+        self.parser = parser
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.websocket = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self.connected = asyncio.Event()
+
+        # symbol (exchange format, e.g. BTCUSDT) -> subscriptions
+        self.subscribers: Dict[str, List[Subscription]] = {}
+        self.upstream_streams: Set[str] = set()
+        self.request_id = 1
+
+        # Ticker symbols are routed by exchange name; keep a cache of the
+        # formatted name to exchange name mapping
+        self._route_cache: Dict[str, str] = {}
+
+        self.stats = {
+            'frames': 0,
+            'records': 0,
+            'parse_errors': 0,
+            'deliveries': 0,
+            'reconnects': 0,
+            'last_frame_time': None
+        }
+
+    async def start(self):
+        """Start the upstream reader (connects lazily, reconnects forever)"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.reader_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the reader and close the upstream connection"""
+        self.is_running = False
+        if self.reader_task:
+            self.reader_task.cancel()
+            try:
+                await self.reader_task
+            except asyncio.CancelledError:
+                pass
+            self.reader_task = None
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+        self.connected.clear()
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.closed = True
+                subscription.ready.set()
+
+    async def subscribe(self, symbol: str = ALL_SYMBOLS, maxsize: int = 1024) -> Subscription:
+        """Add a consumer for `symbol` (exchange format) or ALL_SYMBOLS"""
+        symbol = symbol if symbol == ALL_SYMBOLS else symbol.upper().replace('/', '')
+        subscription = Subscription(self, symbol, maxsize)
+        self.subscribers.setdefault(symbol, []).append(subscription)
+        if symbol != ALL_SYMBOLS and symbol not in self.upstream_streams:
+            self.upstream_streams.add(symbol)
+            await self._send_subscription('SUBSCRIBE', [symbol])
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        """Remove a consumer; drop the upstream stream when the last one leaves"""
+        subscription.closed = True
+        subscription.ready.set()
+        subscriptions = self.subscribers.get(subscription.symbol, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+        if not subscriptions:
+            self.subscribers.pop(subscription.symbol, None)
+            if subscription.symbol in self.upstream_streams:
+                self.upstream_streams.discard(subscription.symbol)
+                await self._send_subscription('UNSUBSCRIBE', [subscription.symbol])
+
+    def dispatch(self, frame: Union[str, bytes]) -> int:
+        """Parse one frame and fan it out; returns the number of deliveries"""
+        self.stats['frames'] += 1
+        try:
+            record = self.parser(frame)
+        except Exception:
+            self.stats['parse_errors'] += 1
+            return 0
+        if record is None:
+            return 0
+
+        self.stats['records'] += 1
+        exchange_symbol = self._route_cache.get(record.symbol)
+        if exchange_symbol is None:
+            exchange_symbol = record.symbol.replace('/', '')
+            self._route_cache[record.symbol] = exchange_symbol
+
+        deliveries = 0
+        for subscription in self.subscribers.get(exchange_symbol, ()):
+            subscription.push(record)
+            deliveries += 1
+        for subscription in self.subscribers.get(ALL_SYMBOLS, ()):
+            subscription.push(record)
+            deliveries += 1
+        self.stats['deliveries'] += deliveries
+        return deliveries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Multiplexer and per-subscriber statistics"""
+        return {
+            **self.stats,
+            'connected': self.connected.is_set(),
+            'upstream_streams': sorted(self.upstream_streams),
+            'subscribers': {
+                symbol: [
+                    {'delivered': s.delivered, 'dropped': s.dropped, 'pending': len(s.queue)}
+                    for s in subscriptions
+                ]
+                for symbol, subscriptions in self.subscribers.items()
+            }
+        }
+
+    async def _open(self):
+        if self._connect is not None:
+            return await self._connect(self.url)
+        import websockets
+        return await websockets.connect(self.url, max_queue=None)
+
+    async def _run(self):
+        """Reader loop with exponential-backoff reconnect and resubscribe"""
+        delay = self.reconnect_delay
+        first = True
+
+        while self.is_running:
+            try:
+                self.websocket = await self._open()
+                if not first:
+                    self.stats['reconnects'] += 1
+                first = False
+                self.connected.set()
+                delay = self.reconnect_delay
+
+                # Replay every active stream on the fresh connection
+                if self.upstream_streams:
+                    await self._send_subscription('SUBSCRIBE', sorted(self.upstream_streams))
+
+                dispatch = self.dispatch
+                async for frame in self.websocket:
+                    dispatch(frame)
+                    self.stats['last_frame_time'] = time.time()
+
+                logger.warning(f"Upstream stream closed: {self.url}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Upstream stream error ({self.url}): {e}")
+
+            self.connected.clear()
+            self.websocket = None
+            if self.is_running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _send_subscription(self, method: str, symbols: List[str]):
+        if self.websocket is None or not symbols:
+            return  # replayed on (re)connect
+        message = {
+            "method": method,
+            "params": [f"{symbol.lower()}{TICKER_SUFFIX}" for symbol in symbols],
+            "id": self.request_id
+        }
+        self.request_id += 1
+        try:
+            await self.websocket.send(json.dumps(message))
+        except Exception as e:
+            logger.error(f"Failed to send {method} for {symbols}: {e}")
@@ -29,6 +29,7 @@ from mt5_connector import MT5Connector
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from mcp_controller import MCPMessage, MessageType
 from product_owner_agent import ProductOwnerAgent
+from metrics_registry import get_metrics_registry
 
 # Import live trading components
 from .live_trading_engine import TradingOrder, ExecutionResult, TradeResult, OrderStatus
@@ -190,6 +191,19 @@ class PositionManager:
             'max_consecutive_losses': 0
         }
         
+        # Prometheus series; portfolio gauges are read from portfolio_summary at scrape time
+        registry = get_metrics_registry()
+        trades = registry.counter('mikrobot_trades_total', 'Positions opened and closed', ['event'])
+        self._trade_series = {event: trades.labels(event) for event in ('opened', 'won', 'lost')}
+        self._realized_pnl_series = registry.gauge('mikrobot_pnl_total',
+                                                   'Realized profit and loss of closed positions').labels()
+        self._portfolio_series = {
+            field_name: registry.gauge(f'mikrobot_portfolio_{field_name}',
+                                       f'Portfolio {field_name.replace("_", " ")}').labels()
+            for field_name in ('total_equity', 'unrealized_pnl', 'open_positions', 'margin_level', 'risk_exposure')
+        }
+        registry.add_collector(self._collect_prometheus)
+        
         # Real-time updates
         self.update_interval = 1.0  # 1 second updates
         self.monitoring_active = False
@@ -306,6 +320,7 @@ class PositionManager:
             
             # Update performance metrics
             self.performance_metrics['total_trades'] += 1
+            self._trade_series['opened'].inc()
             
             # Invoke callbacks
             for callback in self.position_callbacks:
@@ -391,6 +406,9 @@ class PositionManager:
                     if position.realized_pnl < self.performance_metrics['largest_loss']:
                         self.performance_metrics['largest_loss'] = position.realized_pnl
                 
+                self._trade_series['won' if position.realized_pnl > 0 else 'lost'].inc()
+                self._realized_pnl_series.inc(position.realized_pnl)
+                
                 # Update consecutive records
                 self.performance_metrics['max_consecutive_wins'] = max(
                     self.performance_metrics['max_consecutive_wins'],
@@ -597,6 +615,11 @@ class PositionManager:
         except Exception as e:
             logger.error(f"Portfolio summary update error: {e}")
     
+    def _collect_prometheus(self):
+        """Refresh portfolio gauges from the last summary update"""
+        for field_name, series in self._portfolio_series.items():
+            series.set(getattr(self.portfolio_summary, field_name))
+    
     async def _risk_monitoring_loop(self):
         """Risk monitoring and alert loop"""
         logger.info("Risk monitoring loop started")
@@ -15,6 +15,11 @@ from abc import ABC, abstractmethod
 import uuid
 from collections import defaultdict
 
+try:
+    from .metrics_registry import get_metrics_registry
+except ImportError:
+    from metrics_registry import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -154,6 +159,17 @@ class MCPController:
             'event_store_size': 0
         }
         
+        registry = get_metrics_registry()
+        routes = registry.counter('mikrobot_mcp_routes_total', 'MCP messages routed by outcome', ['outcome'])
+        self._route_series = {outcome: routes.labels(outcome) for outcome in ('success', 'failed')}
+        self._route_latency_series = registry.histogram('mikrobot_mcp_route_latency_ms',
+                                                        'MCP message routing latency').labels()
+        self._breaker_trip_series = registry.counter('mikrobot_mcp_circuit_breaker_trips_total',
+                                                     'Agent circuit breakers opened').labels()
+        self._active_agents_series = registry.gauge('mikrobot_mcp_active_agents',
+                                                    'Registered agents that are active').labels()
+        registry.add_collector(self._collect_prometheus)
+        
         # Context storage for cross-agent communication
         self.shared_context: Dict[str, Any] = {}
         
@@ -239,6 +255,7 @@ class MCPController:
     
     async def _route_message_internal(self, message: MCPMessage, start_time: datetime) -> Optional[MCPMessage]:
         """Internal message routing with circuit breaker and event sourcing"""
+        outcome = 'failed'
         try:
             # Log event for replay capability
             self._log_event('message_received', {
@@ -253,6 +270,7 @@ class MCPController:
             if message.method in self.message_handlers:
                 response = await self.message_handlers[message.method](message)
                 self.metrics['successful_routes'] += 1
+                outcome = 'success'
                 self._log_event('message_handled', {'message_id': message.id, 'handler': 'built_in'})
                 return response
             
@@ -271,6 +289,7 @@ class MCPController:
                             # Record successful response
                             self._record_agent_success(message.recipient)
                             self.metrics['successful_routes'] += 1
+                            outcome = 'success'
                             
                             self._log_event('message_routed', {
                                 'message_id': message.id, 
@@ -315,6 +334,7 @@ class MCPController:
                 
                 if responses:
                     self.metrics['successful_routes'] += 1
+                    outcome = 'success'
                     return responses[0]  # Return first response
             
             # No handler found
@@ -341,6 +361,8 @@ class MCPController:
         finally:
             # Update latency metrics
             latency = (datetime.utcnow() - start_time).total_seconds() * 1000
+            self._route_series[outcome].inc()
+            self._route_latency_series.observe(latency)
             current_avg = self.metrics['average_latency']
             total = self.metrics['total_messages']
             if total > 0:
@@ -570,8 +592,13 @@ class MCPController:
             if breaker['failure_count'] >= breaker['failure_threshold']:
                 breaker['state'] = 'OPEN'
                 self.metrics['circuit_breaker_trips'] += 1
+                self._breaker_trip_series.inc()
                 logger.warning(f"Circuit breaker OPENED for {agent_id} after {breaker['failure_count']} failures")
     
+    def _collect_prometheus(self):
+        """Refresh scrape-time gauges"""
+        self._active_agents_series.set(sum(1 for agent in self.agents.values() if agent.is_active))
+    
     def _log_event(self, event_type: str, event_data: Dict[str, Any]):
         """Log event for replay and analysis"""
         event = {
@@ -0,0 +1,376 @@
+"""
+Metrics Registry
+Process-wide counters, gauges and fixed-bucket histograms with Prometheus
+text exposition
+
+Label values are bound once: family.labels(...) returns a child whose
+inc()/set()/observe() only touch numbers, so hot paths never build keys or
+strings. The renderer caches each series' text and re-formats only series
+that changed since the previous scrape.
+"""
+
+import logging
+import math
+import sys
+import threading
+import weakref
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Millisecond buckets for the latencies this codebase records (validation, routing, cells)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+# Unit-less histograms (sizes, counts) spread over several decades
+VALUE_BUCKETS = (1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0, 5000.0, 10000.0, 50000.0, 100000.0)
+
+Number = Union[int, float]
+
+
+def _format_value(value: Number) -> str:
+    # Fast paths first: plain ints and finite floats (inf - inf and nan - nan are nan)
+    if type(value) is float and value - value == 0.0:
+        return repr(value)
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Child:
+    """One labeled series. `_family._dirty` is raised on every update"""
+
+    __slots__ = ('_family', '_labels', '_prefix', '_version', '_rendered_version', '_rendered')
+
+    def __init__(self, family: 'MetricFamily', labels: str):
+        self._family = family
+        self._labels = labels
+        self._prefix = f"{family.name}{labels} "
+        self._version = 0
+        self._rendered_version = -1
+        self._rendered = ''
+
+    def _touch(self):
+        self._version += 1
+        self._family._dirty = True
+
+    def _render(self) -> str:
+        if self._rendered_version != self._version:
+            self._rendered = self._format()
+            self._rendered_version = self._version
+        return self._rendered
+
+    def _format(self) -> str:
+        raise NotImplementedError
+
+
+class CounterChild(_Child):
+    __slots__ = ('value',)
+
+    def __init__(self, family, labels):
+        super().__init__(family, labels)
+        self.value = 0
+
+    def inc(self, amount: Number = 1):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+        self._touch()
+
+    def set_total(self, total: Number):
+        """Mirror an externally kept monotonic count (ignored if it went backwards)"""
+        if total > self.value:
+            self.value = total
+            self._touch()
+
+    def _format(self) -> str:
+        return f"{self._prefix}{_format_value(self.value)}\n"
+
+
+class GaugeChild(_Child):
+    __slots__ = ('value',)
+
+    def __init__(self, family, labels):
+        super().__init__(family, labels)
+        self.value = 0
+
+    def set(self, value: Number):
+        if value != self.value:
+            self.value = value
+            self._touch()
+
+    def inc(self, amount: Number = 1):
+        self.value += amount
+        self._touch()
+
+    def dec(self, amount: Number = 1):
+        self.value -= amount
+        self._touch()
+
+    def _format(self) -> str:
+        return f"{self._prefix}{_format_value(self.value)}\n"
+
+
+class HistogramChild(_Child):
+    __slots__ = ('counts', 'sum', 'count', '_bucket_prefixes', '_sum_prefix', '_count_prefix')
+
+    def __init__(self, family, labels, names: Sequence[str], values: Sequence[str]):
+        super().__init__(family, labels)
+        self.counts = [0] * (len(family.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        bounds = [_format_value(float(b)) for b in family.buckets] + ['+Inf']
+        self._bucket_prefixes = [
+            family.name + '_bucket' + _label_text(names, values, 'le="%s"' % bound) + ' ' for bound in bounds
+        ]
+        self._sum_prefix = f"{family.name}_sum{labels} "
+        self._count_prefix = f"{family.name}_count{labels} "
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self._family.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self._touch()
+
+    def _format(self) -> str:
+        # Cumulative counts repeat (leading zeros, then the total once the
+        # observations are exhausted), so each distinct number is formatted once
+        parts = []
+        append = parts.append
+        previous = text = None
+        for prefix, cumulative in zip(self._bucket_prefixes, accumulate(self.counts)):
+            if cumulative != previous:
+                previous = cumulative
+                text = f"{cumulative}\n"
+            append(prefix)
+            append(text)
+        append(f"{self._sum_prefix}{_format_value(self.sum)}\n{self._count_prefix}{self.count}\n")
+        return ''.join(parts)
+
+
+class MetricFamily:
+    """A named metric and its labeled children"""
+
+    kind = ''
+    _child_class = _Child
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: Dict[Tuple[str, ...], _Child] = {}
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._rendered = ''
+        help_text = documentation.replace('\\', '\\\\').replace('\n', '\\n')
+        self._header = f"# HELP {name} {help_text}\n# TYPE {name} {self.kind}\n"
+
+    def labels(self, *values, **labels) -> _Child:
+        """Bound child for one label combination; keep the result for hot paths"""
+        if labels:
+            if values:
+                raise ValueError("Pass label values either positionally or by name")
+            try:
+                values = tuple(labels[name] for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"{self.name} is missing label {e}") from None
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            with self._lock:
+                child = self.children.get(key)
+                if child is None:
+                    child = self._new_child(key)
+                    self.children[key] = child
+                    self._dirty = True
+        return child
+
+    def _new_child(self, values: Tuple[str, ...]) -> _Child:
+        return self._child_class(self, _label_text(self.labelnames, values))
+
+    def _default(self) -> _Child:
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def render(self) -> str:
+        if self._dirty or not self._rendered:
+            self._dirty = False
+            self._rendered = self._header + ''.join(self._render_children(list(self.children.values())))
+        return self._rendered
+
+    def _render_children(self, children: List[_Child]) -> List[str]:
+        return [child._rendered if child._rendered_version == child._version else child._render()
+                for child in children]
+
+
+def _render_values(children: List[_Child]) -> List[str]:
+    # Counter/gauge children formatted inline: on a cold scrape the per-child
+    # _render()/_format() calls cost more than the formatting itself
+    parts = []
+    append = parts.append
+    for child in children:
+        if child._rendered_version != child._version:
+            value = child.value
+            child._rendered = f"{child._prefix}{repr(value) if type(value) is float and value - value == 0.0 else _format_value(value)}\n"
+            child._rendered_version = child._version
+        append(child._rendered)
+    return parts
+
+
+class Counter(MetricFamily):
+    kind = 'counter'
+    _child_class = CounterChild
+
+    def _render_children(self, children: List[_Child]) -> List[str]:
+        return _render_values(children)
+
+    def inc(self, amount: Number = 1):
+        self._default().inc(amount)
+
+
+class Gauge(MetricFamily):
+    kind = 'gauge'
+    _child_class = GaugeChild
+
+    def _render_children(self, children: List[_Child]) -> List[str]:
+        return _render_values(children)
+
+    def set(self, value: Number):
+        self._default().set(value)
+
+
+class Histogram(MetricFamily):
+    kind = 'histogram'
+    _child_class = HistogramChild
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS_MS):
+        self.buckets = sorted(float(b) for b in buckets if not math.isinf(b))
+        if not self.buckets:
+            raise ValueError("Histogram needs at least one finite bucket")
+        if 'le' in labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self, values: Tuple[str, ...]) -> HistogramChild:
+        return HistogramChild(self, _label_text(self.labelnames, values), self.labelnames, values)
+
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """
+    Named metric families plus scrape-time collectors
+
+    counter()/gauge()/histogram() return the existing family when the name is
+    already registered with the same type and labels, so modules can declare
+    their metrics independently. Collectors run at the start of each render()
+    to refresh gauges from state that is cheaper to read than to push; bound
+    methods are held weakly so a collected object can still be garbage
+    collected.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._collectors: List[Callable[[], Optional[Callable]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.get(name)
+                if family is None:
+                    family = cls(name, documentation, labelnames, **kwargs)
+                    self._families[name] = family
+                    return family
+        if type(family) is not cls or family.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered as {family.kind} with labels {family.labelnames}")
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS_MS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=tuple(buckets))
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def families(self) -> List[MetricFamily]:
+        return list(self._families.values())
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run `collector` before every render (bound methods are referenced weakly)"""
+        if hasattr(collector, '__self__') and hasattr(collector, '__func__'):
+            self._collectors.append(weakref.WeakMethod(collector))
+        else:
+            self._collectors.append(lambda: collector)
+
+    def collect(self):
+        live = []
+        for ref in self._collectors:
+            collector = ref()
+            if collector is None:
+                continue
+            live.append(ref)
+            # One broken source (a dead cache or DB handle) must not fail the whole scrape
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"Metrics collector {collector!r} failed: {e}")
+        self._collectors = live
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4) of every family"""
+        self.collect()
+        return ''.join(family.render() for family in sorted(self._families.values(), key=lambda f: f.name))
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide default registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+# This module is imported as src.core.metrics_registry, core.metrics_registry or
+# metrics_registry depending on sys.path; alias it so all names share one registry
+for _alias in ('src.core.metrics_registry', 'core.metrics_registry', 'metrics_registry'):
+    sys.modules.setdefault(_alias, sys.modules[__name__])
@@ -17,6 +17,12 @@ import statistics
 import threading
 import psutil
 import os
+import re
+
+try:
+    from .metrics_registry import LATENCY_BUCKETS_MS, VALUE_BUCKETS, get_metrics_registry
+except ImportError:
+    from metrics_registry import LATENCY_BUCKETS_MS, VALUE_BUCKETS, get_metrics_registry
 
 # Configure structured logging
 import structlog
@@ -42,6 +48,9 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
+_PROMETHEUS_NAME = re.compile(r'[^a-zA-Z0-9_]')
+
+
 class MetricType(Enum):
     """Metric types"""
     COUNTER = "counter"
@@ -103,6 +112,11 @@ class MetricsCollector:
         self.histograms: Dict[str, List[float]] = defaultdict(list)
         self.timers: Dict[str, List[float]] = defaultdict(list)
         
+        # (name, type, tags) -> (metric_key, registry child); keys and label
+        # strings are built once per series, not per record_metric call
+        self.registry = get_metrics_registry()
+        self._bound: Dict[tuple, tuple] = {}
+        
         # Background aggregation
         self._aggregation_task: Optional[asyncio.Task] = None
         self._aggregation_interval = 60  # seconds
@@ -123,21 +137,55 @@ class MetricsCollector:
         self.metrics.append(metric)
         
         # Update type-specific storage
-        metric_key = f"{name}:{':'.join(f'{k}={v}' for k, v in (tags or {}).items())}"
+        metric_key, series = self._bind(name, metric_type, tags)
         
         if metric_type == MetricType.COUNTER:
             self.counters[metric_key] += value
+            if series is not None and value > 0:
+                series.inc(value)
         elif metric_type == MetricType.GAUGE:
             self.gauges[metric_key] = value
+            if series is not None:
+                series.set(value)
         elif metric_type == MetricType.HISTOGRAM:
             self.histograms[metric_key].append(value)
             # Keep only last 1000 values
             if len(self.histograms[metric_key]) > 1000:
                 self.histograms[metric_key] = self.histograms[metric_key][-1000:]
+            if series is not None:
+                series.observe(value)
         elif metric_type == MetricType.TIMER:
             self.timers[metric_key].append(value)
             if len(self.timers[metric_key]) > 1000:
                 self.timers[metric_key] = self.timers[metric_key][-1000:]
+            if series is not None:
+                series.observe(value)
+    
+    def _bind(self, name: str, metric_type: MetricType, tags: Optional[Dict[str, str]]) -> tuple:
+        """Storage key and Prometheus series for one (name, type, tags) combination"""
+        cache_key = (name, metric_type, tuple(tags.items()) if tags else ())
+        bound = self._bound.get(cache_key)
+        if bound is None:
+            metric_key = f"{name}:{':'.join(f'{k}={v}' for k, v in (tags or {}).items())}"
+            labelnames = [_PROMETHEUS_NAME.sub('_', k) for k in (tags or {})]
+            base = 'mikrobot_' + _PROMETHEUS_NAME.sub('_', name)
+            try:
+                if metric_type == MetricType.COUNTER:
+                    family = self.registry.counter(base + '_total', name, labelnames)
+                elif metric_type == MetricType.GAUGE:
+                    family = self.registry.gauge(base, name, labelnames)
+                elif metric_type == MetricType.TIMER:
+                    family = self.registry.histogram(base + '_ms', name, labelnames, LATENCY_BUCKETS_MS)
+                else:
+                    family = self.registry.histogram(base, name, labelnames, VALUE_BUCKETS)
+                series = family.labels(*(tags or {}).values())
+            except ValueError as e:
+                # Same name recorded with another type or tag set: keep the
+                # in-process stats but leave it out of the exposition
+                logger.warning("Metric not exported", metric=name, error=str(e))
+                series = None
+            bound = self._bound[cache_key] = (metric_key, series)
+        return bound
     
     def get_counter(self, name: str, tags: Optional[Dict[str, str]] = None) -> int:
         """Get counter value"""
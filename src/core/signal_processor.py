@@ -6,7 +6,6 @@ Replaces signal-specific processing across multiple execute files
 """
 
 import asyncio
-import json
 import re
 import logging
 from typing import Dict, Any, Optional, List, Union
@@ -18,6 +17,7 @@ from enum import Enum
 # Local imports
 from ..utils.encoding_utils import ASCIIFileManager, ascii_print
 from ..utils.performance_monitor import PerformanceMonitor
+from ..utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -71,9 +71,9 @@ class SignalProcessor:
             'archive': Path('signals/archive/')
         }
         
-        # Caching system
-        self._signal_cache: Dict[str, Dict[str, Any]] = {}
+        # Caching system (bounded LRU, entries expire after the TTL)
         self._cache_ttl = timedelta(seconds=10)  # Short TTL for signals
+        self._signal_cache = LRUCache(max_entries=512, ttl_seconds=self._cache_ttl.total_seconds())
         
         # Validation rules
         self.validation_rules = {
@@ -217,19 +217,9 @@ class SignalProcessor:
             if not file_path.exists():
                 return None
             
-            # Use ASCIIFileManager for proper MT5 file handling
-            signal_data = ASCIIFileManager.read_mt5_signal_file(str(file_path))
+            # Use ASCIIFileManager for proper MT5 file handling (UTF-16LE and UTF-8)
+            return ASCIIFileManager.read_mt5_signal_file(str(file_path))
             
-            if signal_data:
-                return signal_data
-            
-            # Fallback: try regular JSON read
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                # Clean any problematic characters
-                content = re.sub(r'[^\x20-\x7E\n\r\t]', '', content)
-                return json.loads(content)
-                
         except Exception as e:
             logger.error(f"Error reading signal file {file_path}: {str(e)}")
             self.metrics['file_read_errors'] += 1
@@ -238,24 +228,19 @@ class SignalProcessor:
     async def _read_signal_file_cached(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Read signal file with caching"""
         cache_key = str(file_path)
-        now = datetime.now()
         
         # Check cache
-        if cache_key in self._signal_cache:
-            cached_data = self._signal_cache[cache_key]
-            if now - cached_data['timestamp'] < self._cache_ttl:
-                self.metrics['cache_hits'] += 1
-                return cached_data['data']
+        cached_data = self._signal_cache.get(cache_key)
+        if cached_data is not None:
+            self.metrics['cache_hits'] += 1
+            return cached_data
         
         # Cache miss - read file
         self.metrics['cache_misses'] += 1
         signal_data = await self._read_signal_file(file_path)
         
         if signal_data:
-            self._signal_cache[cache_key] = {
-                'data': signal_data,
-                'timestamp': now
-            }
+            self._signal_cache.set(cache_key, signal_data)
         
         return signal_data
     
@@ -496,10 +481,7 @@ class SignalProcessor:
         """Cache processed signal for quick access"""
         if processed_signal.valid:
             cache_key = f"processed_{processed_signal.symbol}_{processed_signal.timestamp.isoformat()}"
-            self._signal_cache[cache_key] = {
-                'data': processed_signal,
-                'timestamp': datetime.now()
-            }
+            self._signal_cache.set(cache_key, processed_signal)
     
     def _update_processing_time_metric(self, processing_time_ms: float):
         """Update average processing time metric"""
@@ -522,7 +504,9 @@ class SignalProcessor:
         return {
             **self.metrics,
             'valid_signal_rate': round(valid_rate, 3),
-            'cache_hit_rate': round(cache_hit_rate, 3)
+            'cache_hit_rate': round(cache_hit_rate, 3),
+            'cache_size': len(self._signal_cache),
+            'cache_evictions': self._signal_cache.evictions
         }
     
     async def archive_signal(self, processed_signal: ProcessedSignal) -> bool:
@@ -15,10 +15,11 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import numpy as np
-import statistics
-from collections import deque, defaultdict
+from collections import defaultdict
 from enum import Enum
 
+from ..utils.capability_engine import CapabilityEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,8 +134,11 @@ class SixSigmaQualityMonitor:
             }
         }
         
-        # Control chart data storage
-        self.control_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        # Control chart data: running moments over the last 100 samples per metric
+        self.capability = CapabilityEngine(window=100, capacity=len(self.quality_standards))
+        for metric_name, standard in self.quality_standards.items():
+            self.capability.add_metric(metric_name, standard['lower_spec_limit'],
+                                       standard['upper_spec_limit'], standard['target'])
         
         # Quality metrics history
         self.quality_metrics: Dict[str, QualityMetric] = {}
@@ -200,21 +204,18 @@ class SixSigmaQualityMonitor:
                 
             timestamp = timestamp or datetime.utcnow()
             
+            if metric_name not in self.capability:
+                logger.warning(f"Unknown quality metric: {metric_name}")
+                return False
+            
             # Add to control chart data
-            self.control_data[metric_name].append(value)
+            self.capability.push(metric_name, value)
             
             # Calculate statistical metrics
             quality_metric = await self._calculate_quality_metric(metric_name, value, timestamp)
             
             if quality_metric:
-                self.quality_metrics[metric_name] = quality_metric
-                
-                # Check for quality violations
-                await self._check_quality_violations(quality_metric)
-                
-                # Update control limits if needed
-                await self._update_control_limits(metric_name)
-                
+                await self._accept_quality_metric(quality_metric)
                 logger.debug(f"Recorded quality metric: {metric_name} = {value}")
                 return True
             
@@ -224,6 +225,44 @@ class SixSigmaQualityMonitor:
             logger.error(f"Failed to record metric {metric_name}: {str(e)}")
             return False
     
+    async def record_metrics(self, values: Dict[str, float], timestamp: Optional[datetime] = None) -> Dict[str, bool]:
+        """Record one measurement for each of many metrics in a single capability update"""
+        try:
+            if not self.monitoring_active:
+                return {metric_name: False for metric_name in values}
+            
+            timestamp = timestamp or datetime.utcnow()
+            known = [metric_name for metric_name in values if metric_name in self.capability]
+            for metric_name in values.keys() - set(known):
+                logger.warning(f"Unknown quality metric: {metric_name}")
+            
+            self.capability.update(known, [values[metric_name] for metric_name in known])
+            table = self.capability.capability(known)
+            
+            recorded = {metric_name: False for metric_name in values}
+            for i, metric_name in enumerate(known):
+                quality_metric = self._build_quality_metric(
+                    metric_name, values[metric_name], timestamp, int(table.count[i]),
+                    float(table.mean[i]), float(table.std[i]), float(table.cp[i]), float(table.cpk[i]))
+                if quality_metric:
+                    await self._accept_quality_metric(quality_metric)
+                    recorded[metric_name] = True
+            return recorded
+            
+        except Exception as e:
+            logger.error(f"Failed to record metrics: {str(e)}")
+            return {metric_name: False for metric_name in values}
+    
+    async def _accept_quality_metric(self, quality_metric: QualityMetric) -> None:
+        """Store a fresh metric, check it for violations and refresh its control limits"""
+        self.quality_metrics[quality_metric.name] = quality_metric
+        
+        # Check for quality violations
+        await self._check_quality_violations(quality_metric)
+        
+        # Update control limits if needed
+        await self._update_control_limits(quality_metric.name)
+    
     async def _calculate_quality_metric(self, metric_name: str, value: float, timestamp: datetime) -> Optional[QualityMetric]:
         """Calculate comprehensive quality metrics"""
         try:
@@ -231,23 +270,28 @@ class SixSigmaQualityMonitor:
                 logger.warning(f"Unknown quality metric: {metric_name}")
                 return None
             
+            table = self.capability.capability(metric_name)
+            return self._build_quality_metric(
+                metric_name, value, timestamp, int(table.count[0]),
+                float(table.mean[0]), float(table.std[0]), float(table.cp[0]), float(table.cpk[0]))
+            
+        except Exception as e:
+            logger.error(f"Failed to calculate quality metric for {metric_name}: {str(e)}")
+            return None
+    
+    def _build_quality_metric(self, metric_name: str, value: float, timestamp: datetime, samples: int,
+                              mean_val: float, std_dev: float, cp: float, cpk: float) -> Optional[QualityMetric]:
+        """Quality metric from the running window moments and capability of a metric"""
+        try:
             standard = self.quality_standards[metric_name]
-            data_points = list(self.control_data[metric_name])
             
-            if len(data_points) < 5:  # Need minimum data for statistical analysis
+            if samples < 5:  # Need minimum data for statistical analysis
                 return None
             
             # Calculate control limits
-            mean_val = np.mean(data_points)
-            std_dev = np.std(data_points, ddof=1)
-            
             ucl = mean_val + 3 * std_dev
             lcl = max(0, mean_val - 3 * std_dev)  # Non-negative for most trading metrics
             
-            # Calculate capability indices
-            cp = self._calculate_cp(data_points, standard['upper_spec_limit'], standard['lower_spec_limit'])
-            cpk = self._calculate_cpk(data_points, standard['upper_spec_limit'], standard['lower_spec_limit'])
-            
             # Calculate sigma level
             sigma_level = min(6.0, cpk + 1.5) if cpk > 0 else 0.0
             
@@ -276,32 +320,9 @@ class SixSigmaQualityMonitor:
             logger.error(f"Failed to calculate quality metric for {metric_name}: {str(e)}")
             return None
     
-    def _calculate_cp(self, data: List[float], usl: float, lsl: float) -> float:
-        """Calculate Process Capability (Cp)"""
-        if len(data) < 2:
-            return 0.0
-        
-        std_dev = np.std(data, ddof=1)
-        if std_dev == 0:
-            return float('inf')
-        
-        return (usl - lsl) / (6 * std_dev)
-    
-    def _calculate_cpk(self, data: List[float], usl: float, lsl: float) -> float:
-        """Calculate Process Capability Index (Cpk)"""
-        if len(data) < 2:
-            return 0.0
-        
-        mean_val = np.mean(data)
-        std_dev = np.std(data, ddof=1)
-        
-        if std_dev == 0:
-            return float('inf')
-        
-        cpu = (usl - mean_val) / (3 * std_dev)
-        cpl = (mean_val - lsl) / (3 * std_dev)
-        
-        return min(cpu, cpl)
+    def get_capability_table(self) -> Dict[str, Dict[str, Any]]:
+        """Cp, Cpk, expected DPMO and sigma level (3 x Cpk) of every metric over its window"""
+        return self.capability.capability().to_dict()
     
     async def _check_quality_violations(self, metric: QualityMetric) -> None:
         """Check for quality violations and generate alerts"""
@@ -456,11 +477,11 @@ class SixSigmaQualityMonitor:
     async def _update_control_limits(self, metric_name: str) -> None:
         """Update control limits based on recent data"""
         try:
-            data_points = list(self.control_data[metric_name])
+            moments = self.capability.moments(metric_name)
             
-            if len(data_points) >= 20:  # Minimum for reliable control limits
-                mean_val = np.mean(data_points)
-                std_dev = np.std(data_points, ddof=1)
+            if moments['samples'] >= 20:  # Minimum for reliable control limits
+                mean_val = moments['mean']
+                std_dev = moments['std_dev']
                 
                 self.control_limits[metric_name] = {
                     'ucl': mean_val + 3 * std_dev,
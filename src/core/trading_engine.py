@@ -6,17 +6,19 @@ with modular, scalable architecture optimized for 60%+ performance improvement.
 """
 
 import asyncio
-import json
 import sys
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from enum import Enum
 import MetaTrader5 as mt5
 
+from ..utils.lru_cache import LRUCache
+from ..utils.signal_codec import decode_signal
+
 # ASCII-only output enforcement
 sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
 
@@ -127,38 +129,27 @@ class MT5ConnectionPool:
         await self._pool.put(connection)
 
 class SignalCache:
-    """Intelligent signal caching with TTL"""
+    """Intelligent signal caching with TTL and a bounded LRU size"""
     
-    def __init__(self, ttl_seconds: int = 30):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, ttl_seconds: int = 30, max_entries: int = 4096):
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
         self.ttl = ttl_seconds
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached value if not expired"""
-        if key in self._cache:
-            entry = self._cache[key]
-            if datetime.now() < entry['expires']:
-                return entry['value']
-            else:
-                del self._cache[key]
-        return None
+        return self._cache.get(key)
     
     def set(self, key: str, value: Any) -> None:
         """Set cached value with expiration"""
-        self._cache[key] = {
-            'value': value,
-            'expires': datetime.now() + timedelta(seconds=self.ttl)
-        }
+        self._cache.set(key, value)
     
     def clear_expired(self) -> None:
         """Clean up expired entries"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if now >= entry['expires']
-        ]
-        for key in expired_keys:
-            del self._cache[key]
+        self._cache.purge_expired()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss/eviction counters"""
+        return self._cache.get_stats()
 
 class TradingEngine:
     """
@@ -213,11 +204,10 @@ class TradingEngine:
             with open(file_path, 'rb') as f:
                 content = await loop.run_in_executor(None, f.read)
             
-            # Handle UTF-16LE encoding with null bytes (legacy compatibility)
-            content_str = content.decode('utf-16le', errors='ignore').replace('\x00', '')
-            
-            # Parse JSON
-            signal_data = json.loads(content_str)
+            # UTF-16LE (EA) or UTF-8 signal file
+            signal_data = decode_signal(content)
+            if signal_data is None:
+                return None
             
             # Cache the result
             self.signal_cache.set(cache_key, signal_data)
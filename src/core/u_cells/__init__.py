@@ -15,6 +15,12 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+import time
+
+try:
+    from ..metrics_registry import get_metrics_registry
+except ImportError:
+    from metrics_registry import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +59,21 @@ class UCell(ABC):
             'failed': 0,
             'rejected': 0
         }
+        
+        registry = get_metrics_registry()
+        self._outcomes = registry.counter('mikrobot_ucell_executions_total',
+                                          'U-Cell executions by outcome', ['cell', 'status'])
+        self._outcome_series = {status: self._outcomes.labels(cell_id, status)
+                                for status in ('success', 'failed', 'rejected')}
+        self._latency_series = registry.histogram('mikrobot_ucell_latency_ms',
+                                                  'U-Cell execution latency', ['cell']).labels(cell_id)
+    
+    def _observe(self, status: str, started: float):
+        series = self._outcome_series.get(status)
+        if series is None:
+            series = self._outcome_series[status] = self._outcomes.labels(self.cell_id, status)
+        series.inc()
+        self._latency_series.observe((time.perf_counter() - started) * 1000)
     
     @abstractmethod
     def validate_input(self, cell_input: CellInput) -> bool:
@@ -67,11 +88,13 @@ class UCell(ABC):
     def execute(self, cell_input: CellInput) -> CellOutput:
         """Execute cell with validation and metrics"""
         self.metrics['processed'] += 1
+        started = time.perf_counter()
         
         try:
             # Validate input
             if not self.validate_input(cell_input):
                 self.metrics['rejected'] += 1
+                self._observe('rejected', started)
                 return CellOutput(
                     timestamp=datetime.utcnow(),
                     status='rejected',
@@ -88,12 +111,14 @@ class UCell(ABC):
                 self.metrics['success'] += 1
             else:
                 self.metrics['failed'] += 1
+            self._observe(output.status, started)
             
             return output
             
         except Exception as e:
             logger.error(f"Cell {self.name} error: {str(e)}")
             self.metrics['failed'] += 1
+            self._observe('failed', started)
             return CellOutput(
                 timestamp=datetime.utcnow(),
                 status='failed',
@@ -0,0 +1,210 @@
+"""
+U-Cell Artifacts
+Process-wide, load-once store for the read-only artifacts U-Cells share
+
+Every orchestrator used to build its own cells, and every MLAnalysisCell
+deserialized its model again. Cells now ask the registry, which loads each
+artifact the first time it is requested and hands the same object to every
+later caller. Shared artifacts must not be mutated: tables are exposed as
+MappingProxyType/tuples and joblib arrays are memory-mapped read-only.
+
+warm_start() preloads everything before the first signal (and, with
+freeze=True, moves the loaded objects out of the garbage collector's
+reach so forked workers keep sharing their pages copy-on-write).
+stats() reports load time and resident memory growth per artifact.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    import joblib
+except ImportError:  # optional: without it cells fall back to rule-based analysis
+    joblib = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path("models/signal_classifier.pkl")
+DEFAULT_SCALER_PATH = Path("models/feature_scaler.pkl")
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ArtifactRegistry:
+    """Load-once, read-only artifacts keyed by name"""
+
+    def __init__(self):
+        self._artifacts: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Return the artifact, calling loader() only the first time it is requested"""
+        try:
+            artifact = self._artifacts[name]
+        except KeyError:
+            pass
+        else:
+            self._stats[name]['hits'] += 1
+            return artifact
+
+        with self._lock:
+            if name in self._artifacts:
+                self._stats[name]['hits'] += 1
+                return self._artifacts[name]
+
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            artifact = loader()
+            self._stats[name] = {
+                'load_ms': (time.perf_counter() - started) * 1000,
+                'rss_delta_kb': max(_rss_bytes() - rss_before, 0) / 1024,
+                'loaded': artifact is not None,
+                'hits': 0,
+            }
+            self._artifacts[name] = artifact
+            return artifact
+
+    def put(self, name: str, artifact: Any):
+        """Register an artifact built elsewhere (e.g. a model trained in-process)"""
+        with self._lock:
+            self._artifacts[name] = artifact
+            self._stats[name] = {'load_ms': 0.0, 'rss_delta_kb': 0.0, 'loaded': artifact is not None, 'hits': 0}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._artifacts
+
+    def names(self) -> Iterable[str]:
+        return list(self._artifacts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Load time and resident memory growth per artifact, plus totals"""
+        artifacts = {name: dict(stats) for name, stats in self._stats.items()}
+        return {
+            'artifacts': artifacts,
+            'total_load_ms': sum(s['load_ms'] for s in artifacts.values()),
+            'total_rss_delta_kb': sum(s['rss_delta_kb'] for s in artifacts.values()),
+            'rss_kb': _rss_bytes() / 1024,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._artifacts.clear()
+            self._stats.clear()
+
+
+_registry = ArtifactRegistry()
+
+
+def get_artifact_registry() -> ArtifactRegistry:
+    """The process-wide registry"""
+    return _registry
+
+
+def load_joblib(path: Path, label: str, mmap_mode: Optional[str] = 'r') -> Any:
+    """
+    joblib.load() with numpy arrays memory-mapped read-only, so processes
+    (and forked workers) loading the same file share its pages; None when
+    the file or joblib is missing
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    if joblib is None:
+        logger.warning(f"joblib not installed, cannot load {label} from {path}")
+        return None
+    try:
+        artifact = joblib.load(path, mmap_mode=mmap_mode)
+        logger.info(f"{label} loaded successfully")
+        return artifact
+    except Exception as e:
+        logger.error(f"{label} loading error: {str(e)}")
+        return None
+
+
+def model_artifact(path: Optional[Path] = None, registry: Optional[ArtifactRegistry] = None) -> Any:
+    path = Path(path or DEFAULT_MODEL_PATH)
+    return (registry or _registry).get(f"model:{path.resolve()}", lambda: load_joblib(path, "ML model"))
+
+
+def scaler_artifact(path: Optional[Path] = None, registry: Optional[ArtifactRegistry] = None) -> Any:
+    path = Path(path or DEFAULT_SCALER_PATH)
+    return (registry or _registry).get(f"scaler:{path.resolve()}", lambda: load_joblib(path, "Feature scaler"))
+
+
+def _feature_spec() -> MappingProxyType:
+    return MappingProxyType({
+        'price_features': ('rsi', 'macd', 'bb_position', 'atr'),
+        'pattern_features': ('pattern_strength', 'volume_profile', 'trend_alignment'),
+        'market_features': ('volatility', 'session', 'correlation'),
+    })
+
+
+def _pip_table() -> MappingProxyType:
+    return MappingProxyType({
+        'EURUSD': 0.0001, 'GBPUSD': 0.0001, 'AUDUSD': 0.0001, 'NZDUSD': 0.0001,
+        'USDCAD': 0.0001, 'USDCHF': 0.0001,
+        'USDJPY': 0.01, 'EURJPY': 0.01, 'GBPJPY': 0.01,
+        'XAUUSD': 0.01, 'XAGUSD': 0.001,
+        'BTCUSD': 1.0, 'ETHUSD': 0.01, 'ADAUSD': 0.0001
+    })
+
+
+def _validation_spec() -> MappingProxyType:
+    return MappingProxyType({
+        'required_fields': ('symbol', 'timeframe', 'pattern_type', 'price_levels',
+                            'volume', 'timestamp', 'direction'),
+        'valid_patterns': ('M5_BOS', 'M1_BREAK_RETEST', 'M5_BREAK_RETEST', 'M1_BOS'),
+        'valid_timeframes': ('M1', 'M5', 'M15', 'H1'),
+        'false_break_indicators': ('low_volume_break', 'immediate_reversal', 'weak_momentum',
+                                   'news_driven_spike', 'thin_liquidity', 'weekend_gap'),
+    })
+
+
+def feature_spec(registry: Optional[ArtifactRegistry] = None) -> MappingProxyType:
+    """Feature groups the ML model was trained on"""
+    return (registry or _registry).get('ml.feature_spec', _feature_spec)
+
+
+def pip_table(registry: Optional[ArtifactRegistry] = None) -> MappingProxyType:
+    """Pip size per base symbol"""
+    return (registry or _registry).get('symbols.pip_table', _pip_table)
+
+
+def validation_spec(registry: Optional[ArtifactRegistry] = None) -> MappingProxyType:
+    """Required fields, accepted patterns/timeframes and false-break indicators"""
+    return (registry or _registry).get('signal.validation_spec', _validation_spec)
+
+
+def warm_start(model_path: Optional[Path] = None, scaler_path: Optional[Path] = None,
+               freeze: bool = False, registry: Optional[ArtifactRegistry] = None) -> Dict[str, Any]:
+    """
+    Load every shared artifact before the first signal and return stats()
+
+    freeze=True calls gc.freeze() afterwards: use it right before forking
+    workers, so collections in the children do not write to (and thereby
+    copy) the pages holding the preloaded objects.
+    """
+    registry = registry or _registry
+    model_artifact(model_path, registry)
+    scaler_artifact(scaler_path, registry)
+    feature_spec(registry)
+    pip_table(registry)
+    validation_spec(registry)
+    if freeze:
+        gc.freeze()
+    return registry.stats()
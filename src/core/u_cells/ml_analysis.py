@@ -7,8 +7,8 @@ from typing import Dict, Any, Optional, Tuple
 import numpy as np
 from datetime import datetime
 from . import UCell, CellInput, CellOutput
+from .artifacts import ArtifactRegistry, feature_spec, model_artifact, scaler_artifact
 import logging
-import joblib
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -22,34 +22,24 @@ class MLAnalysisCell(UCell):
     - Market condition analysis
     """
     
-    def __init__(self, model_path: Optional[Path] = None):
+    def __init__(self, model_path: Optional[Path] = None, artifacts: Optional[ArtifactRegistry] = None):
         super().__init__(cell_id="U2", name="ML Analysis")
-        self.model_path = model_path or Path("models/signal_classifier.pkl")
+        self.model_path = Path(model_path or "models/signal_classifier.pkl")
         self.scaler_path = Path("models/feature_scaler.pkl")
+        self.artifacts = artifacts
         self.model = None
         self.scaler = None
         self._load_models()
         
-        # Feature engineering parameters
-        self.feature_config = {
-            'price_features': ['rsi', 'macd', 'bb_position', 'atr'],
-            'pattern_features': ['pattern_strength', 'volume_profile', 'trend_alignment'],
-            'market_features': ['volatility', 'session', 'correlation']
-        }
+        # Feature engineering parameters (shared, read-only)
+        self.feature_config = feature_spec(self.artifacts)
     
     def _load_models(self):
-        """Load pre-trained ML models"""
-        try:
-            if self.model_path.exists():
-                self.model = joblib.load(self.model_path)
-                logger.info("ML model loaded successfully")
-            else:
-                logger.warning("ML model not found, using rule-based fallback")
-            
-            if self.scaler_path.exists():
-                self.scaler = joblib.load(self.scaler_path)
-        except Exception as e:
-            logger.error(f"Model loading error: {str(e)}")
+        """Get the pre-trained ML models, deserialized once per process"""
+        self.model = model_artifact(self.model_path, self.artifacts)
+        if self.model is None:
+            logger.warning("ML model not found, using rule-based fallback")
+        self.scaler = scaler_artifact(self.scaler_path, self.artifacts)
     
     def validate_input(self, cell_input: CellInput) -> bool:
         """Validate input from Signal Validation cell"""
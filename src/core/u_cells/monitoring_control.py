@@ -3,7 +3,7 @@ U-Cell 5: Monitoring & Control
 Six Sigma quality control with Cp/Cpk ≥ 2.9
 """
 
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from collections import deque
 import numpy as np
@@ -11,6 +11,11 @@ from . import UCell, CellInput, CellOutput
 import logging
 import statistics
 
+try:
+    from ...utils.capability_engine import CapabilityEngine
+except ImportError:
+    from utils.capability_engine import CapabilityEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,12 +49,15 @@ class MonitoringControlCell(UCell):
         # Performance tracking
         self.performance_data = {
             'trades': deque(maxlen=1000),
-            'win_rates': deque(maxlen=100),
-            'execution_times': deque(maxlen=100),
-            'slippages': deque(maxlen=100),
-            'risk_rewards': deque(maxlen=100)
+            'win_rates': deque(maxlen=100)
         }
         
+        # Running moments of the last 100 samples of each specified metric
+        self.capability = CapabilityEngine(window=100)
+        for metric_name, spec_limits in self.quality_config['spec_limits'].items():
+            self.capability.add_metric(metric_name, spec_limits.get('LSL', float('-inf')),
+                                       spec_limits.get('USL', float('inf')), spec_limits.get('target', float('nan')))
+        
         # Alert thresholds
         self.alert_thresholds = {
             'consecutive_losses': 3,
@@ -141,71 +149,44 @@ class MonitoringControlCell(UCell):
         
         # Update specific metrics if available
         if 'execution_time_ms' in trade_data:
-            self.performance_data['execution_times'].append(trade_data['execution_time_ms'])
+            self.capability.push('execution_time', trade_data['execution_time_ms'])
         
         if 'slippage' in trade_data:
-            self.performance_data['slippages'].append(trade_data['slippage'])
+            self.capability.push('slippage', trade_data['slippage'])
     
     def _calculate_six_sigma_metrics(self) -> Dict[str, Any]:
         """Calculate Six Sigma quality metrics"""
         metrics = {}
         
-        # Calculate Cp and Cpk for each metric
-        for metric_name, spec_limits in self.quality_config['spec_limits'].items():
-            data = self._get_metric_data(metric_name)
+        # Cp and Cpk for every metric in one pass over the running moments
+        capability = self.capability.capability(list(self.quality_config['spec_limits']))
+        
+        for i, metric_name in enumerate(capability.names):
+            samples = self._get_metric_samples(metric_name)
             
-            if len(data) >= self.quality_config['sample_size']:
-                cp, cpk = self._calculate_cp_cpk(data, spec_limits)
+            if samples >= self.quality_config['sample_size']:
+                cp, cpk = float(capability.cp[i]), float(capability.cpk[i])
                 sigma_level = self._cpk_to_sigma_level(cpk)
                 
                 metrics[metric_name] = {
                     'cp': round(cp, 3),
                     'cpk': round(cpk, 3),
                     'sigma_level': round(sigma_level, 2),
-                    'mean': round(statistics.mean(data), 3),
-                    'std_dev': round(statistics.stdev(data), 3),
-                    'samples': len(data),
+                    'dpmo': round(float(capability.dpmo[i]), 1),
+                    'mean': round(float(capability.mean[i]), 3),
+                    'std_dev': round(float(capability.std[i]), 3),
+                    'samples': samples,
                     'meets_target': cpk >= self.quality_config['target_cpk']
                 }
             else:
                 metrics[metric_name] = {
                     'status': 'insufficient_data',
-                    'samples': len(data),
+                    'samples': samples,
                     'required': self.quality_config['sample_size']
                 }
         
         return metrics
     
-    def _calculate_cp_cpk(self, data: List[float], spec_limits: Dict[str, float]) -> Tuple[float, float]:
-        """Calculate Process Capability indices"""
-        if not data or len(data) < 2:
-            return 0.0, 0.0
-        
-        # Get specification limits
-        lsl = spec_limits.get('LSL', float('-inf'))
-        usl = spec_limits.get('USL', float('inf'))
-        target = spec_limits.get('target')
-        
-        # Calculate statistics
-        mean = statistics.mean(data)
-        std_dev = statistics.stdev(data)
-        
-        if std_dev == 0:
-            return float('inf'), float('inf')
-        
-        # Calculate Cp (potential capability)
-        if lsl != float('-inf') and usl != float('inf'):
-            cp = (usl - lsl) / (6 * std_dev)
-        else:
-            cp = float('inf')
-        
-        # Calculate Cpk (actual capability)
-        cpu = float('inf') if usl == float('inf') else (usl - mean) / (3 * std_dev)
-        cpl = float('inf') if lsl == float('-inf') else (mean - lsl) / (3 * std_dev)
-        cpk = min(cpu, cpl)
-        
-        return cp, cpk
-    
     def _cpk_to_sigma_level(self, cpk: float) -> float:
         """Convert Cpk to approximate Sigma level"""
         # Approximation: Sigma Level ≈ 3 * Cpk
@@ -226,17 +207,18 @@ class MonitoringControlCell(UCell):
                 return [wins / total]
             return []
         
-        elif metric_name == 'execution_time':
-            return list(self.performance_data['execution_times'])
-        
-        elif metric_name == 'slippage':
-            return list(self.performance_data['slippages'])
-        
-        elif metric_name == 'risk_reward':
-            return list(self.performance_data['risk_rewards'])
+        elif metric_name in self.capability:
+            return self.capability.values(metric_name).tolist()
         
         return []
     
+    def _get_metric_samples(self, metric_name: str) -> int:
+        """Number of samples behind a metric's capability"""
+        if metric_name == 'win_rate':
+            # A single value derived from recent trades, not a sampled series
+            return len(self._get_metric_data(metric_name))
+        return self.capability.count(metric_name)
+    
     def _perform_quality_checks(self, quality_metrics: Dict[str, Any]) -> Dict[str, bool]:
         """Perform quality control checks"""
         checks = {}
@@ -8,7 +8,7 @@ from datetime import datetime
 import asyncio
 import logging
 import uuid
-from . import CellInput, CellOutput
+from . import CellInput, CellOutput, get_metrics_registry
 from .signal_validation import SignalValidationCell
 from .ml_analysis import MLAnalysisCell
 from .risk_engine import RiskEngineCell
@@ -27,10 +27,11 @@ class UCellOrchestrator:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         
-        # Initialize U-Cells
+        # Initialize U-Cells (models and specs come from the process-wide artifact registry)
+        artifacts = self.config.get('artifacts')
         self.cells = {
-            'U1': SignalValidationCell(),
-            'U2': MLAnalysisCell(model_path=self.config.get('ml_model_path')),
+            'U1': SignalValidationCell(artifacts=artifacts),
+            'U2': MLAnalysisCell(model_path=self.config.get('ml_model_path'), artifacts=artifacts),
             'U3': RiskEngineCell(account_config=self.config.get('account_config')),
             'U4': TradeExecutionCell(mt5_connection=self.config.get('mt5_connection')),
             'U5': MonitoringControlCell(alert_callback=self.config.get('alert_callback'))
@@ -47,6 +48,11 @@ class UCellOrchestrator:
             'failed_executions': 0,
             'average_latency_ms': 0
         }
+        registry = get_metrics_registry()
+        self._signals = registry.counter('mikrobot_signals_total',
+                                         'Trading signals through the U-Cell pipeline by final status', ['status'])
+        self._pipeline_latency = registry.histogram('mikrobot_pipeline_latency_ms',
+                                                    'U1-U5 pipeline latency per signal').labels()
         
         # Active trades tracking
         self.active_trades = {}
@@ -181,6 +187,8 @@ class UCellOrchestrator:
     def _update_metrics(self, pipeline_results: Dict[str, Any]):
         """Update orchestration metrics"""
         self.metrics['total_signals'] += 1
+        self._signals.labels(pipeline_results['final_status']).inc()
+        self._pipeline_latency.observe(pipeline_results['total_latency_ms'])
         
         if pipeline_results['final_status'] == 'success':
             self.metrics['successful_trades'] += 1
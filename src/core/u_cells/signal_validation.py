@@ -6,6 +6,7 @@ Validates incoming webhook signals for M5 BOS and M1 Break-and-Retest patterns
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from . import UCell, CellInput, CellOutput
+from .artifacts import ArtifactRegistry, pip_table, validation_spec
 import logging
 import statistics
 import time
@@ -23,20 +24,18 @@ class SignalValidationCell(UCell):
     - Multi-asset support (forex, crypto, indices, stocks)
     """
     
-    def __init__(self):
+    def __init__(self, artifacts: Optional[ArtifactRegistry] = None):
         super().__init__(cell_id="U1", name="Enhanced Signal Validation")
         
-        # Enhanced validation fields
-        self.required_fields = [
-            'symbol', 'timeframe', 'pattern_type', 'price_levels',
-            'volume', 'timestamp', 'direction'
-        ]
-        self.valid_patterns = ['M5_BOS', 'M1_BREAK_RETEST', 'M5_BREAK_RETEST', 'M1_BOS']
-        self.valid_timeframes = ['M1', 'M5', 'M15', 'H1']
+        # Enhanced validation fields (shared, read-only)
+        spec = validation_spec(artifacts)
+        self.required_fields = spec['required_fields']
+        self.valid_patterns = spec['valid_patterns']
+        self.valid_timeframes = spec['valid_timeframes']
         
         # Advanced pattern recognition engine
-        self.pattern_engine = AdvancedPatternEngine()
-        self.false_break_filter = FalseBreakFilter()
+        self.pattern_engine = AdvancedPatternEngine(artifacts)
+        self.false_break_filter = FalseBreakFilter(artifacts)
         
         # Performance tracking
         self.validation_metrics = {
@@ -424,14 +423,8 @@ class SignalValidationCell(UCell):
 class AdvancedPatternEngine:
     """Advanced pattern recognition engine for BOS and retest patterns"""
     
-    def __init__(self):
-        self.pip_calculators = {
-            'EURUSD': 0.0001, 'GBPUSD': 0.0001, 'AUDUSD': 0.0001, 'NZDUSD': 0.0001,
-            'USDCAD': 0.0001, 'USDCHF': 0.0001,
-            'USDJPY': 0.01, 'EURJPY': 0.01, 'GBPJPY': 0.01,
-            'XAUUSD': 0.01, 'XAGUSD': 0.001,
-            'BTCUSD': 1.0, 'ETHUSD': 0.01, 'ADAUSD': 0.0001
-        }
+    def __init__(self, artifacts: Optional[ArtifactRegistry] = None):
+        self.pip_calculators = pip_table(artifacts)
     
     def get_pip_value(self, symbol: str) -> float:
         """Get pip value for symbol with broker suffix handling"""
@@ -775,15 +768,8 @@ class AdvancedPatternEngine:
 class FalseBreakFilter:
     """Advanced false break filtration system"""
     
-    def __init__(self):
-        self.false_break_indicators = [
-            'low_volume_break',
-            'immediate_reversal',
-            'weak_momentum',
-            'news_driven_spike',
-            'thin_liquidity',
-            'weekend_gap'
-        ]
+    def __init__(self, artifacts: Optional[ArtifactRegistry] = None):
+        self.false_break_indicators = validation_spec(artifacts)['false_break_indicators']
     
     def assess_false_break_risk(self, signal_data: Dict[str, Any], pattern_type: str) -> float:
         """Assess probability of false break"""
@@ -17,6 +17,7 @@ from enum import Enum
 from .mcp_controller import MCPMessage, MessageType
 from .u_cells.signal_validation import SignalValidationCell
 from .u_cells import CellInput, CellOutput
+from ..utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -52,12 +53,12 @@ class ValidationOptimizer:
     - Circuit breaker protection
     """
     
-    def __init__(self, mcp_controller, product_owner_agent):
+    def __init__(self, mcp_controller, product_owner_agent, signal_validation_cell: Optional[SignalValidationCell] = None):
         self.mcp_controller = mcp_controller
         self.product_owner = product_owner_agent
         
-        # Direct U-Cell integration for performance
-        self.signal_validation_cell = SignalValidationCell()
+        # Direct U-Cell integration for performance (pass the orchestrator's U1 to share it)
+        self.signal_validation_cell = signal_validation_cell or SignalValidationCell()
         
         # Performance targets
         self.performance_targets = {
@@ -67,9 +68,9 @@ class ValidationOptimizer:
             'parallel_overhead_ms': 10.0
         }
         
-        # Validation cache
-        self.validation_cache = {}
+        # Validation cache (bounded LRU, 1000 entries)
         self.cache_ttl_seconds = 300  # 5 minutes
+        self.validation_cache = LRUCache(max_entries=1000, ttl_seconds=self.cache_ttl_seconds)
         self.cache_hit_count = 0
         self.cache_miss_count = 0
         
@@ -354,30 +355,13 @@ class ValidationOptimizer:
     
     def _get_cached_validation(self, cache_key: str) -> Optional[ValidationResult]:
         """Get cached validation result if still valid"""
-        if cache_key in self.validation_cache:
-            cached_entry = self.validation_cache[cache_key]
-            cache_age = (datetime.utcnow() - cached_entry['timestamp']).total_seconds()
-            
-            if cache_age < self.cache_ttl_seconds:
-                return cached_entry['result']
-            else:
-                # Remove expired entry
-                del self.validation_cache[cache_key]
-        
-        return None
+        # Expired entries are dropped by the cache on lookup
+        return self.validation_cache.get(cache_key)
     
     def _cache_validation_result(self, cache_key: str, validation_result: ValidationResult):
         """Cache validation result for future use"""
-        self.validation_cache[cache_key] = {
-            'timestamp': datetime.utcnow(),
-            'result': validation_result
-        }
-        
-        # Cleanup old cache entries (keep last 1000)
-        if len(self.validation_cache) > 1000:
-            oldest_key = min(self.validation_cache.keys(), 
-                           key=lambda k: self.validation_cache[k]['timestamp'])
-            del self.validation_cache[oldest_key]
+        # Least recently used entry is evicted beyond 1000 entries
+        self.validation_cache.set(cache_key, validation_result)
     
     def _update_performance_metrics(self, validation_result: ValidationResult):
         """Update performance metrics"""
@@ -547,6 +531,7 @@ class ValidationOptimizer:
             'performance_stats': performance_stats,
             'cache_metrics': {
                 'cache_size': len(self.validation_cache),
+                'cache_evictions': self.validation_cache.evictions,
                 'cache_hit_rate': round(cache_hit_rate, 3),
                 'cache_hits': self.cache_hit_count,
                 'cache_misses': self.cache_miss_count
@@ -19,10 +19,15 @@ __version__ = "2.0.0"
 __author__ = "Mikrobot FastVersion Team"
 __description__ = "Direct MT5 Trading System with Lightning Bolt Strategy"
 
-# Core modules
-from .core import MT5DirectConnector
-from .strategies import LightningBoltStrategy
-from .orchestration import MCPv2Controller, HanseiReflector
+# Core modules, imported on first access to keep `import mikrobot_v2` cheap
+from .utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MT5DirectConnector': '.core',
+    'LightningBoltStrategy': '.strategies',
+    'MCPv2Controller': '.orchestration',
+    'HanseiReflector': '.orchestration',
+})
 
 __all__ = [
     'MT5DirectConnector',
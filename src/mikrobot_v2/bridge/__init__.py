@@ -2,6 +2,17 @@
 Mikrobot MT5 Cross-Platform Bridge Module
 """
 
-from .mikrobot_mt5_bridge import MikrobotMT5Bridge
+from ..utils.lazy_imports import lazy_exports
 
-__all__ = ['MikrobotMT5Bridge']
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MikrobotMT5Bridge': '.mikrobot_mt5_bridge',
+    'MT5Service': '.mt5_service',
+    'Overloaded': '.mt5_service',
+    'OrderChannelClient': '.order_channel',
+    'OrderChannelServer': '.order_channel',
+    'ConfirmationSender': '.order_channel',
+    'ChannelUnavailable': '.order_channel',
+})
+
+__all__ = ['MikrobotMT5Bridge', 'MT5Service', 'Overloaded', 'OrderChannelClient', 'OrderChannelServer',
+           'ConfirmationSender', 'ChannelUnavailable']
@@ -16,46 +16,96 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 
+from .order_channel import ChannelUnavailable, OrderChannelClient
+
 logger = logging.getLogger(__name__)
 
 class MikrobotMT5Bridge:
     """
     Cross-platform bridge for Mac → Windows MT5 trading
+
+    Orders go over one long-lived websocket (see order_channel), which
+    also carries the executor's confirmations back. If the channel cannot
+    be opened the order falls back to HTTP on a keep-alive session.
     """
     
     def __init__(self):
         self.active_signals = []
         self.executed_trades = []
         self.windows_bridge_url = "http://192.168.1.100:8001"  # Windows MT5 machine
+        self.windows_channel_url = "ws://192.168.1.100:8002/orders"
         self.account_id = 95244786
+        self.channel = OrderChannelClient(self.windows_channel_url, on_confirmation=self.apply_confirmation)
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
         
     async def send_to_windows_mt5(self, signal: Dict) -> Dict:
         """Send trade signal to Windows MT5 machine"""
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Add Mikrobot-specific fields
-                signal['magic'] = 20250806
-                signal['comment'] = f"MIKROBOT_{signal.get('strategy', 'LB')}"
-                signal['account'] = self.account_id
+        # Add Mikrobot-specific fields
+        signal['magic'] = 20250806
+        signal['comment'] = f"MIKROBOT_{signal.get('strategy', 'LB')}"
+        signal['account'] = self.account_id
+        
+        try:
+            result = await self.channel.send_order(signal)
+        except ChannelUnavailable as e:
+            # Nothing was sent, so HTTP cannot double-fill the order
+            logger.warning(f"{e}, falling back to HTTP")
+            return await self._post_order(signal)
+        except asyncio.TimeoutError:
+            logger.error(f"MT5 order timed out: {signal.get('signal_id')}")
+            return {'error': 'Order timed out'}
+        except Exception as e:
+            # The order may have reached MT5; never resend it
+            logger.error(f"Bridge connection failed: {e}")
+            return {'error': str(e)}
+        
+        if 'success' in result:
+            logger.info(f"✅ Trade sent to MT5: {signal['symbol']} {signal['action']}")
+            return result
+        logger.error(f"❌ MT5 Bridge error: {result}")
+        return {'error': result}
+    
+    async def _post_order(self, signal: Dict) -> Dict:
+        """Send the order over HTTP, reusing one keep-alive session per event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+            if self._http is None or self._http.closed or self._http_loop is not loop:
+                # A session is bound to the loop that made it (Django runs a new loop per request)
+                self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+                self._http_loop = loop
+            async with self._http.post(f"{self.windows_bridge_url}/execute", json=signal) as response:
+                result = await response.json()
                 
-                async with session.post(
-                    f"{self.windows_bridge_url}/execute",
-                    json=signal,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    result = await response.json()
+                if response.status == 200:
+                    logger.info(f"✅ Trade sent to MT5: {signal['symbol']} {signal['action']}")
+                    return result
+                else:
+                    logger.error(f"❌ MT5 Bridge error: {result}")
+                    return {'error': result}
                     
-                    if response.status == 200:
-                        logger.info(f"✅ Trade sent to MT5: {signal['symbol']} {signal['action']}")
-                        return result
-                    else:
-                        logger.error(f"❌ MT5 Bridge error: {result}")
-                        return {'error': result}
-                        
-            except Exception as e:
-                logger.error(f"Bridge connection failed: {e}")
-                return {'error': str(e)}
+        except Exception as e:
+            logger.error(f"Bridge connection failed: {e}")
+            return {'error': str(e)}
+    
+    def apply_confirmation(self, confirmation: Dict) -> bool:
+        """Mark the confirmed signal as executed; False if it is unknown"""
+        signal_id = confirmation.get('signal_id')
+        
+        for signal in self.active_signals:
+            if signal.get('signal_id') == signal_id:
+                signal['mt5_ticket'] = confirmation.get('ticket')
+                signal['status'] = 'EXECUTED'
+                signal['execution_time'] = confirmation.get('execution_time')
+                
+                # Move to executed trades
+                self.executed_trades.append(signal)
+                logger.info(f"✅ MT5 Confirmation: {confirmation}")
+                return True
+        
+        logger.warning(f"Confirmation for unknown signal: {signal_id}")
+        return False
     
     async def process_lightning_bolt_signal(self, lb_signal: Dict) -> Dict:
         """Process Lightning Bolt signal from Mikrobot v2"""
@@ -76,17 +126,27 @@ class MikrobotMT5Bridge:
             'signal_id': f"LB_{int(datetime.now().timestamp())}"
         }
         
+        # Store signal before sending: the confirmation can arrive before the result
+        stored = {**mt5_signal, 'status': 'PENDING'}
+        self.active_signals.append(stored)
+        
         # Send to Windows MT5
         result = await self.send_to_windows_mt5(mt5_signal)
         
-        # Store signal
-        self.active_signals.append({
-            **mt5_signal,
-            'mt5_result': result,
-            'status': 'SENT' if 'error' not in result else 'FAILED'
-        })
+        stored['mt5_result'] = result
+        if 'error' in result:
+            stored['status'] = 'FAILED'
+        elif stored['status'] == 'PENDING':
+            stored['status'] = 'SENT'
         
         return result
+    
+    async def close(self):
+        """Close the order channel and the HTTP session"""
+        await self.channel.close()
+        if self._http is not None and self._http_loop is asyncio.get_running_loop():
+            await self._http.close()
+        self._http = self._http_loop = None
 
 # Django webhook endpoints
 mikrobot_bridge = MikrobotMT5Bridge()
@@ -148,7 +208,8 @@ def get_bridge_status(request):
         'active_signals': mikrobot_bridge.active_signals[-10:],
         'total_signals': len(mikrobot_bridge.active_signals),
         'executed_trades': len(mikrobot_bridge.executed_trades),
-        'windows_bridge': mikrobot_bridge.windows_bridge_url
+        'windows_bridge': mikrobot_bridge.windows_bridge_url,
+        'order_channel': mikrobot_bridge.channel.get_stats()
     })
 
 @csrf_exempt
@@ -158,20 +219,8 @@ def mt5_confirmation(request):
     
     try:
         confirmation = json.loads(request.body)
-        signal_id = confirmation.get('signal_id')
-        
-        # Update signal status
-        for signal in mikrobot_bridge.active_signals:
-            if signal.get('signal_id') == signal_id:
-                signal['mt5_ticket'] = confirmation.get('ticket')
-                signal['status'] = 'EXECUTED'
-                signal['execution_time'] = confirmation.get('execution_time')
-                
-                # Move to executed trades
-                mikrobot_bridge.executed_trades.append(signal)
-                break
+        mikrobot_bridge.apply_confirmation(confirmation)
         
-        logger.info(f"✅ MT5 Confirmation: {confirmation}")
         return JsonResponse({'status': 'confirmed'})
         
     except Exception as e:
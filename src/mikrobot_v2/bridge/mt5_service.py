@@ -0,0 +1,417 @@
+"""
+MT5 EXECUTOR SERVICE
+====================
+
+Thread-safe front end for one MetaTrader5 terminal session.
+
+The MetaTrader5 module holds a single global connection and is not
+thread-safe, so every call into it happens on one dedicated I/O thread
+that owns the session (initialize, login, reconnect, shutdown). Callers on
+any thread or event loop submit orders and wait on a future:
+
+- orders queue per symbol and run in submission order within a symbol;
+  symbols take turns, so a burst on one pair does not hold up the others
+- admission control: an order is rejected with Overloaded once
+  max_pending orders are queued in total (or max_pending_per_symbol for
+  its symbol), and an order that waited longer than max_queue_wait is
+  expired instead of being filled at a stale price
+- positions and account info are copied into a snapshot every
+  refresh_interval seconds and once the queue drains after a fill, so
+  /status and /positions never touch the terminal
+
+create_app() serves the service over aiohttp: /execute awaits the order's
+completion without tying up a thread, and the order channel (see
+order_channel) shares the same queue.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional
+
+from aiohttp import web
+
+from .order_channel import OrderChannelServer
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Order rejected by admission control; retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Order:
+    signal: Dict
+    symbol: str
+    future: Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class MT5Service:
+    """
+    One MT5 session owned by one I/O thread, fed by a per-symbol order queue
+
+    `mt5` is the MetaTrader5 module (or a fake with the same interface).
+    `on_fill(signal, result)` runs on the I/O thread after each filled
+    order and must not block; queue confirmations from it.
+    """
+
+    def __init__(self, mt5, account: Optional[int] = None, password: Optional[str] = None,
+                 server: Optional[str] = None, max_pending: int = 256, max_pending_per_symbol: int = 32,
+                 max_queue_wait: float = 2.0, refresh_interval: float = 1.0,
+                 on_fill: Optional[Callable[[Dict, Any], None]] = None):
+        self.mt5 = mt5
+        self.account = account
+        self.password = password
+        self.server = server
+        self.max_pending = max_pending
+        self.max_pending_per_symbol = max_pending_per_symbol
+        self.max_queue_wait = max_queue_wait
+        self.refresh_interval = refresh_interval
+        self.on_fill = on_fill
+
+        self.connected = False
+        self._queues: Dict[str, Deque[_Order]] = {}
+        self._ready: Deque[str] = deque()   # symbols with queued orders, in turn order
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._started: Optional[Future] = None
+
+        self._snapshot: Dict[str, Any] = {'connected': False, 'account': None, 'positions': [], 'updated': None}
+        self._next_refresh = 0.0
+        self._positions_stale = False
+        self._order_seconds = 0.0   # moving average of one order's MT5 time
+
+        self.stats = {'submitted': 0, 'executed': 0, 'failed': 0, 'rejected': 0, 'expired': 0,
+                      'refreshes': 0, 'max_depth': 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, timeout: float = 30.0) -> bool:
+        """Start the I/O thread; True once the terminal session is up"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._started = Future()
+            self._thread = threading.Thread(target=self._run, name='mt5-io', daemon=True)
+            self._thread.start()
+        return self._started.result(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Finish running work, fail queued orders and shut the session down"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopping
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def submit(self, signal: Dict) -> Future:
+        """Queue an order; the future resolves to the execution result"""
+        symbol = str(signal.get('symbol', ''))
+        with self._cond:
+            if not self.running:
+                raise ConnectionError("MT5 service is not running")
+            queue = self._queues.get(symbol)
+            queued = len(queue) if queue else 0
+            if self._pending >= self.max_pending or queued >= self.max_pending_per_symbol:
+                self.stats['rejected'] += 1
+                raise Overloaded(f"Executor busy: {self._pending} orders queued ({queued} {symbol})",
+                                 self._retry_after(self._pending))
+
+            order = _Order(signal, symbol, Future())
+            if queue is None:
+                self._queues[symbol] = queue = deque()
+                self._ready.append(symbol)
+            queue.append(order)
+            self._pending += 1
+            self.stats['submitted'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self._pending)
+            self._cond.notify()
+        return order.future
+
+    async def execute(self, signal: Dict) -> Dict:
+        """Submit an order and await its result without blocking the loop"""
+        return await asyncio.wrap_future(self.submit(signal))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Last copied account info and positions, with their age"""
+        snapshot = dict(self._snapshot)
+        updated = snapshot['updated']
+        snapshot['age_s'] = time.monotonic() - updated if updated is not None else None
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            depth = {symbol: len(queue) for symbol, queue in self._queues.items()}
+        return {**self.stats, 'pending': self._pending, 'pending_by_symbol': depth,
+                'connected': self.connected, 'order_ms': self._order_seconds * 1000}
+
+    def _retry_after(self, pending: int) -> float:
+        return max(pending * self._order_seconds, 0.1)
+
+    # ------------------------------------------------------------------
+    # I/O thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            connected = self._connect()
+        except Exception as e:
+            # Treated as a failed connect: start() returns False, orders retry it
+            logger.error(f"MT5 connection error: {e}")
+            self.connected = connected = False
+        self._started.set_result(connected)
+        self._refresh()
+        while True:
+            with self._cond:
+                while not self._ready and not self._stopping:
+                    if self._positions_stale:
+                        break
+                    wait = self._next_refresh - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stopping:
+                    break
+                order = self._take() if self._ready else None
+
+            if order is not None:
+                self._run_order(order)
+            if time.monotonic() >= self._next_refresh or (self._positions_stale and not self._ready):
+                self._refresh()
+        self._shutdown()
+
+    def _take(self) -> _Order:
+        symbol = self._ready.popleft()
+        queue = self._queues[symbol]
+        order = queue.popleft()
+        if queue:
+            self._ready.append(symbol)
+        else:
+            del self._queues[symbol]
+        self._pending -= 1
+        return order
+
+    def _run_order(self, order: _Order):
+        if not order.future.set_running_or_notify_cancel():
+            return   # the caller gave up waiting
+        waited = time.monotonic() - order.enqueued
+        if waited > self.max_queue_wait:
+            self.stats['expired'] += 1
+            order.future.set_exception(Overloaded(
+                f"Order expired after {waited:.2f}s in queue", self._retry_after(self._pending)))
+            return
+
+        started = time.perf_counter()
+        try:
+            result = self._execute_trade(order.signal)
+        except Exception as e:
+            logger.error(f"Execution error: {e}")
+            result = {'error': str(e)}
+        self._order_seconds += 0.1 * ((time.perf_counter() - started) - self._order_seconds)
+        self.stats['executed' if 'success' in result else 'failed'] += 1
+        order.future.set_result(result)
+
+    def _connect(self) -> bool:
+        mt5 = self.mt5
+        if not mt5.initialize():
+            logger.error(f"MT5 initialization failed: {mt5.last_error()}")
+            return False
+
+        if self.account is not None and not mt5.login(self.account, self.password, self.server):
+            logger.error(f"MT5 login failed: {mt5.last_error()}")
+            mt5.shutdown()
+            return False
+
+        self.connected = True
+        account_info = mt5.account_info()
+        logger.info(f"✅ Connected to MT5: {account_info.login}, Balance: {account_info.balance}")
+        return True
+
+    def _execute_trade(self, signal: Dict) -> Dict:
+        mt5 = self.mt5
+        if not self.connected:
+            if not self._connect():
+                return {'error': 'MT5 connection failed'}
+
+        symbol = signal['symbol']
+        action = signal['action']
+        volume = float(signal.get('volume', 0.01))
+
+        # Get current price if not specified
+        tick = mt5.symbol_info_tick(symbol)
+        if not tick:
+            return {'error': f'Symbol {symbol} not found'}
+
+        price = signal.get('price', tick.ask if action == 'BUY' else tick.bid)
+        order_type = mt5.ORDER_TYPE_BUY if action == 'BUY' else mt5.ORDER_TYPE_SELL
+
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "volume": volume,
+            "type": order_type,
+            "price": price,
+            "sl": signal.get('stop_loss', 0),
+            "tp": signal.get('take_profit', 0),
+            "deviation": 20,
+            "magic": signal.get('magic', 20250806),
+            "comment": signal.get('comment', 'MIKROBOT'),
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+
+        result = mt5.order_send(request)
+        if result is None:
+            # The terminal dropped the session; reconnect on the next order
+            self.connected = False
+            return {'error': f'Order failed: {mt5.last_error()}'}
+
+        if result.retcode != mt5.TRADE_RETCODE_DONE:
+            logger.error(f"Order failed: {result.retcode}")
+            return {
+                'error': f'Order failed: {result.retcode}',
+                'comment': result.comment
+            }
+
+        logger.info(f"✅ Order executed: {result.order}")
+        self._positions_stale = True
+        if self.on_fill is not None:
+            try:
+                self.on_fill(signal, result)
+            except Exception as e:
+                logger.error(f"Fill callback failed: {e}")
+
+        return {
+            'success': True,
+            'ticket': result.order,
+            'deal': result.deal,
+            'volume': result.volume,
+            'price': result.price,
+            'symbol': symbol,
+            'action': action
+        }
+
+    def _refresh(self):
+        """Copy account info and open positions into the snapshot"""
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        self._positions_stale = False
+        if not self.connected:
+            self._snapshot = {**self._snapshot, 'connected': False}
+            return
+        try:
+            account_info = self.mt5.account_info()
+            positions = self.mt5.positions_get() or ()
+        except Exception as e:
+            logger.error(f"MT5 snapshot refresh failed: {e}")
+            return
+
+        self._snapshot = {
+            'connected': account_info is not None,
+            'account': {
+                'account': account_info.login,
+                'balance': account_info.balance,
+                'equity': account_info.equity,
+                'margin': account_info.margin,
+                'server': account_info.server
+            } if account_info is not None else None,
+            'positions': [{
+                'ticket': pos.ticket,
+                'symbol': pos.symbol,
+                'type': 'BUY' if pos.type == 0 else 'SELL',
+                'volume': pos.volume,
+                'price': pos.price_open,
+                'profit': pos.profit
+            } for pos in positions],
+            'updated': time.monotonic(),
+            'timestamp': datetime.now().isoformat(),
+        }
+        self.stats['refreshes'] += 1
+
+    def _shutdown(self):
+        with self._cond:
+            orders = [order for queue in self._queues.values() for order in queue]
+            self._queues.clear()
+            self._ready.clear()
+            self._pending = 0
+        for order in orders:
+            if order.future.set_running_or_notify_cancel():
+                order.future.set_exception(ConnectionError("MT5 service stopped"))
+        if self.connected:
+            self.mt5.shutdown()
+            self.connected = False
+
+
+def create_app(service: MT5Service, channel: Optional[OrderChannelServer] = None) -> web.Application:
+    """
+    aiohttp app serving /execute, /status, /positions and /stats, plus the
+    order channel's websocket route when a channel is given
+    """
+    app = channel.app() if channel is not None else web.Application()
+
+    async def execute_trade_endpoint(request: web.Request) -> web.Response:
+        """Receive trade signal and await its execution on MT5"""
+        try:
+            signal = await request.json()
+        except ValueError:
+            return web.json_response({'error': 'Invalid JSON'}, status=400)
+        logger.info(f"📨 Received signal: {signal}")
+
+        try:
+            result = await service.execute(signal)
+        except Overloaded as e:
+            return web.json_response({'error': str(e)}, status=503,
+                                     headers={'Retry-After': str(math.ceil(e.retry_after))})
+        except Exception as e:
+            logger.error(f"Execution error: {e}")
+            return web.json_response({'error': str(e)}, status=500)
+
+        return web.json_response(result, status=200 if 'success' in result else 400)
+
+    async def status(request: web.Request) -> web.Response:
+        """MT5 connection status from the cached snapshot"""
+        snapshot = service.snapshot()
+        if snapshot['connected'] and snapshot['account']:
+            return web.json_response({'status': 'CONNECTED', **snapshot['account'], 'age_s': snapshot['age_s']})
+        return web.json_response({'status': 'DISCONNECTED'})
+
+    async def get_positions(request: web.Request) -> web.Response:
+        """Open positions from the cached snapshot"""
+        snapshot = service.snapshot()
+        if not snapshot['connected']:
+            return web.json_response({'error': 'Not connected'}, status=400)
+        return web.json_response({'positions': snapshot['positions'], 'age_s': snapshot['age_s']})
+
+    async def stats(request: web.Request) -> web.Response:
+        body = {'executor': service.get_stats()}
+        if channel is not None:
+            body['channel'] = channel.get_stats()
+        return web.json_response(body)
+
+    app.router.add_post('/execute', execute_trade_endpoint)
+    app.router.add_get('/status', status)
+    app.router.add_get('/positions', get_positions)
+    app.router.add_get('/stats', stats)
+    return app
@@ -0,0 +1,437 @@
+"""
+ORDER CHANNEL
+=============
+
+One long-lived websocket between the Mac bridge and the Windows executor.
+
+Orders, their results and trade confirmations travel as JSON text frames
+over a single connection, multiplexed by id:
+
+    {"type": "order", "id": 7, "payload": {...signal...}}
+    {"type": "result", "id": 7, "payload": {...execute_trade() result...}}
+    {"type": "confirmation", "payload": {...}}
+
+The client keeps any number of orders in flight and hands each result to
+the caller waiting on its id, so orders pipeline over one connection
+instead of paying connection and session setup per order. The server runs
+the blocking MT5 call on a single worker thread (the MetaTrader5 module is
+not thread-safe) and replies as soon as it returns. Confirmations are
+queued and pushed to the connected clients by a background task, off the
+execution path; a confirmation may therefore arrive before its order's
+result.
+
+ConfirmationSender applies the same idea to the plain HTTP executor: a
+worker thread drains a bounded queue of confirmations, so execute_trade()
+returns without waiting on the Mac webhook.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+import aiohttp
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = '/orders'
+DEFAULT_PORT = 8002
+
+
+class ChannelUnavailable(ConnectionError):
+    """The channel could not be opened; nothing was sent"""
+
+
+def _encode(frame: Dict) -> str:
+    return json.dumps(frame, default=str)
+
+
+def _decode(data: str) -> Optional[Dict]:
+    """Parse one text frame; None (logged) if it is not a JSON object"""
+    try:
+        frame = json.loads(data)
+    except ValueError as e:
+        logger.error(f"Malformed order channel frame skipped: {e}")
+        return None
+    if not isinstance(frame, dict):
+        logger.error(f"Malformed order channel frame skipped: {data[:80]!r}")
+        return None
+    return frame
+
+
+class OrderChannelClient:
+    """
+    Mac side: send orders over one websocket and await their results
+
+    Connects lazily on the first order and again after a drop. Orders
+    already in flight when the connection drops fail with ConnectionError
+    and are not resent, since the executor may have filled them.
+
+    The connection lives on a background event loop thread owned by the
+    client, so it outlives the callers' loops: connect(), send_order() and
+    close() may be awaited from any loop, including a fresh one per Django
+    request. Confirmations are handed to on_confirmation on that thread.
+    """
+
+    def __init__(self, url: str, on_confirmation: Optional[Callable[[Dict], Any]] = None,
+                 timeout: float = 10.0, heartbeat: float = 20.0):
+        self.url = url
+        self.on_confirmation = on_confirmation
+        self.timeout = timeout
+        self.heartbeat = heartbeat
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+        self.stats = {'connects': 0, 'orders': 0, 'results': 0, 'confirmations': 0, 'failures': 0}
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def connect(self):
+        """Open the websocket unless it is already open"""
+        await self._on_channel_loop(self._connect())
+
+    async def send_order(self, signal: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Send one order and return the executor's result
+
+        Raises ChannelUnavailable if the channel cannot be opened (the order
+        was not sent), ConnectionError if it drops with the order in flight
+        and asyncio.TimeoutError if no result arrives in time.
+        """
+        return await self._on_channel_loop(self._send_order(signal, timeout or self.timeout))
+
+    async def close(self):
+        """Close the connection and stop the channel thread"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close(), loop))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            await asyncio.to_thread(thread.join, 5)
+            loop.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'connected': self.connected, 'in_flight': len(self._pending)}
+
+    # ------------------------------------------------------------------
+    # Channel loop
+    # ------------------------------------------------------------------
+
+    def _channel_loop(self) -> asyncio.AbstractEventLoop:
+        """The client's own event loop, started on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='order-channel', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def _on_channel_loop(self, coro):
+        """Run coro on the channel loop and await it from the caller's loop"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._channel_loop()))
+
+    async def _connect(self):
+        if self.connected:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connected:
+                return
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession()
+            try:
+                self._ws = await self._session.ws_connect(
+                    self.url, heartbeat=self.heartbeat, timeout=aiohttp.ClientWSTimeout(ws_close=self.timeout))
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                raise ChannelUnavailable(f"Order channel {self.url} unavailable: {e}") from e
+            self._reader = asyncio.create_task(self._read(self._ws))
+            self.stats['connects'] += 1
+            logger.info(f"Order channel connected: {self.url}")
+
+    async def _send_order(self, signal: Dict, timeout: float) -> Dict:
+        await self._connect()
+        order_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[order_id] = future
+        try:
+            await self._ws.send_str(_encode({'type': 'order', 'id': order_id, 'payload': signal}))
+            self.stats['orders'] += 1
+            return await asyncio.wait_for(future, timeout)
+        except Exception:
+            self.stats['failures'] += 1
+            raise
+        finally:
+            self._pending.pop(order_id, None)
+
+    async def _close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+        self._ws = self._reader = self._session = None
+        self._connect_lock = None
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                frame = _decode(message.data)
+                if frame is None:
+                    continue
+                kind = frame.get('type')
+                if kind == 'result':
+                    future = self._pending.get(frame.get('id'))
+                    if future is not None and not future.done():
+                        future.set_result(frame.get('payload'))
+                        self.stats['results'] += 1
+                elif kind == 'confirmation':
+                    self.stats['confirmations'] += 1
+                    self._dispatch_confirmation(frame.get('payload'))
+        except Exception as e:
+            logger.error(f"Order channel read error: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Order channel closed with the order in flight"))
+
+    def _dispatch_confirmation(self, confirmation: Dict):
+        if self.on_confirmation is None:
+            return
+        try:
+            result = self.on_confirmation(confirmation)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            logger.error(f"Confirmation handler failed: {e}")
+
+
+class OrderChannelServer:
+    """
+    Windows side: execute orders arriving on the websocket and push
+    confirmations back
+
+    A plain `execute(signal) -> result` is called on one worker thread, in
+    arrival order; a coroutine function (e.g. MT5Service.execute, which has
+    its own I/O thread) is awaited on the loop instead.
+    publish_confirmation() may be called from any thread, typically from
+    inside `execute`.
+    """
+
+    def __init__(self, execute: Callable[[Dict], Dict], path: str = DEFAULT_PATH,
+                 max_pending_confirmations: int = 1000, heartbeat: float = 20.0):
+        self.execute = execute
+        self.path = path
+        self.heartbeat = heartbeat
+        self.max_pending_confirmations = max_pending_confirmations
+
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mt5-orders')
+        self._clients: Set[web.WebSocketResponse] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._confirmations: Optional[asyncio.Queue] = None
+        self._client_connected: Optional[asyncio.Event] = None
+        self._pump: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+
+        self.stats = {'orders': 0, 'errors': 0, 'confirmations_sent': 0, 'confirmations_dropped': 0}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(self.path, self._handle)
+        app.on_startup.append(self._on_startup)
+        app.on_shutdown.append(self._on_shutdown)
+        return app
+
+    async def start(self, host: str = '0.0.0.0', port: int = DEFAULT_PORT) -> int:
+        """Serve until stop(); returns the bound port (useful with port=0)"""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Order channel listening on {host}:{bound}{self.path}")
+        return bound
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self._worker.shutdown(wait=False)
+
+    def publish_confirmation(self, confirmation: Dict):
+        """Queue a confirmation for every connected client (thread-safe)"""
+        loop = self._loop
+        if loop is None:
+            logger.warning("Order channel not running, confirmation dropped")
+            self.stats['confirmations_dropped'] += 1
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._enqueue(confirmation)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, confirmation)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'clients': len(self._clients),
+                'pending_confirmations': self._confirmations.qsize() if self._confirmations else 0}
+
+    async def _on_startup(self, app: web.Application):
+        self._loop = asyncio.get_running_loop()
+        self._confirmations = asyncio.Queue()
+        self._client_connected = asyncio.Event()
+        self._pump = asyncio.create_task(self._pump_confirmations())
+
+    async def _on_shutdown(self, app: web.Application):
+        if self._pump is not None:
+            self._pump.cancel()
+            await asyncio.gather(self._pump, return_exceptions=True)
+        for ws in list(self._clients):
+            await ws.close()
+        self._loop = None
+
+    def _enqueue(self, confirmation: Dict):
+        if self._confirmations.qsize() >= self.max_pending_confirmations:
+            self._confirmations.get_nowait()
+            self.stats['confirmations_dropped'] += 1
+            logger.warning("Confirmation queue full, oldest confirmation dropped")
+        self._confirmations.put_nowait(confirmation)
+
+    async def _pump_confirmations(self):
+        while True:
+            confirmation = await self._confirmations.get()
+            while not self._clients:
+                self._client_connected.clear()
+                await self._client_connected.wait()
+            frame = _encode({'type': 'confirmation', 'payload': confirmation})
+            for ws in list(self._clients):
+                try:
+                    await ws.send_str(frame)
+                    self.stats['confirmations_sent'] += 1
+                except Exception as e:
+                    logger.error(f"Failed to push confirmation: {e}")
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=self.heartbeat)
+        await ws.prepare(request)
+        self._clients.add(ws)
+        self._client_connected.set()
+        logger.info(f"Order channel client connected: {request.remote}")
+        in_flight: Set[asyncio.Task] = set()
+        try:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                frame = _decode(message.data)
+                if frame is not None and frame.get('type') == 'order':
+                    # Keep reading while the worker executes, so orders pipeline
+                    task = asyncio.create_task(self._execute(ws, frame))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            self._clients.discard(ws)
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        return ws
+
+    async def _execute(self, ws: web.WebSocketResponse, frame: Dict):
+        self.stats['orders'] += 1
+        try:
+            if asyncio.iscoroutinefunction(self.execute):
+                result = await self.execute(frame.get('payload'))
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._worker, self.execute, frame.get('payload'))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Order execution error: {e}")
+            result = {'error': str(e)}
+        if not ws.closed:
+            await ws.send_str(_encode({'type': 'result', 'id': frame.get('id'), 'payload': result}))
+
+
+class ConfirmationSender:
+    """
+    Deliver confirmations from a background thread
+
+    submit() never blocks: when `maxsize` confirmations are already
+    waiting, the oldest is dropped (and counted).
+    """
+
+    def __init__(self, deliver: Callable[[Dict], Any], maxsize: int = 1000, name: str = 'confirmations'):
+        self.deliver = deliver
+        self.maxsize = maxsize
+        self._queue: queue.Queue = queue.Queue()
+        self.stats = {'sent': 0, 'failed': 0, 'dropped': 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, confirmation: Dict):
+        if self._queue.qsize() >= self.maxsize:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.stats['dropped'] += 1
+                logger.warning("Confirmation queue full, oldest confirmation dropped")
+            except queue.Empty:
+                pass
+        self._queue.put_nowait(confirmation)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every submitted confirmation has been attempted"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            confirmation = self._queue.get()
+            try:
+                if confirmation is None:
+                    return
+                self.deliver(confirmation)
+                self.stats['sent'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"Failed to send confirmation: {e}")
+            finally:
+                self._queue.task_done()
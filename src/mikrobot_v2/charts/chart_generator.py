@@ -8,8 +8,6 @@ Saves images to send with iMessage notifications
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle, FancyBboxPatch, Circle
-import matplotlib.patches as patches
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -18,6 +16,11 @@ import os
 import logging
 from dataclasses import dataclass
 
+from .render_service import (
+    ChartSpec, ChartTheme, ChartMarker, ChartAnnotation,
+    chart_render_service, chart_output_path
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -63,96 +66,34 @@ class ChartGenerator:
         """Generate Lightning Bolt pattern chart"""
         
         try:
-            # Create figure with dark theme
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), 
-                                         gridspec_kw={'height_ratios': [3, 1]})
-            fig.patch.set_facecolor('#0a0a0a')
-            
-            # Price chart (top)
-            ax1.set_facecolor('#1a1a1a')
-            
-            # Candlestick chart
-            for i in range(len(chart_data.times)):
-                time = chart_data.times[i]
-                open_price = chart_data.opens[i]
-                high = chart_data.highs[i]
-                low = chart_data.lows[i]
-                close = chart_data.closes[i]
-                
-                # Candlestick colors
-                color = '#00ff88' if close > open_price else '#ff4444'
-                
-                # High-low line
-                ax1.plot([time, time], [low, high], color='#666666', linewidth=1)
-                
-                # Candle body
-                body_height = abs(close - open_price)
-                body_bottom = min(open_price, close)
-                
-                rect = Rectangle((mdates.date2num(time) - 0.0003, body_bottom), 
-                               0.0006, body_height, 
-                               facecolor=color, edgecolor=color)
-                ax1.add_patch(rect)
-            
-            # Pattern annotations
-            for annotation in pattern_annotations:
-                ax1.annotate(f"{annotation.phase}\n{annotation.description}",
-                           xy=(mdates.date2num(annotation.time), annotation.price),
-                           xytext=(20, 20), textcoords='offset points',
-                           bbox=dict(boxstyle='round,pad=0.5', 
-                                   facecolor=annotation.color, 
-                                   alpha=0.8),
-                           arrowprops=dict(arrowstyle='->', 
-                                         connectionstyle='arc3,rad=0',
-                                         color=annotation.color),
-                           fontsize=10, fontweight='bold')
-            
-            # Chart title and info
-            title = f"⚡ LIGHTNING BOLT - {chart_data.symbol} {chart_data.timeframe}"
-            ax1.set_title(title, fontsize=16, fontweight='bold', color='#ffffff', pad=20)
-            
             # Signal info box
             signal_text = f"""Signal: {signal_info.get('direction', 'N/A')}
 Entry: {signal_info.get('entry_price', 0):.5f}
 Confidence: {signal_info.get('confidence', 0):.1%}
 Time: {datetime.now().strftime('%H:%M:%S')}"""
             
-            ax1.text(0.02, 0.98, signal_text, transform=ax1.transAxes,
-                    verticalalignment='top',
-                    bbox=dict(boxstyle='round,pad=0.5', 
-                            facecolor='#333333', alpha=0.8),
-                    fontsize=10, color='#ffffff')
-            
-            # Format x-axis
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-            
-            # Grid and styling
-            ax1.grid(True, alpha=0.3)
-            ax1.set_ylabel('Price', fontsize=12, color='#ffffff')
-            
-            # Volume chart (bottom)
-            ax2.set_facecolor('#1a1a1a')
-            ax2.bar(chart_data.times, chart_data.volumes, 
-                   color='#4488ff', alpha=0.6, width=0.0008)
-            ax2.set_ylabel('Volume', fontsize=10, color='#ffffff')
-            ax2.grid(True, alpha=0.3)
-            
-            # Format bottom x-axis
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax2.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-            
-            # Adjust layout
-            plt.tight_layout()
-            
-            # Save chart
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"lightning_bolt_{chart_data.symbol}_{timestamp}.png"
-            filepath = os.path.join(self.chart_dir, filename)
-            
-            plt.savefig(filepath, dpi=150, bbox_inches='tight', 
-                       facecolor='#0a0a0a', edgecolor='none')
-            plt.close()
+            spec = ChartSpec(
+                symbol=chart_data.symbol,
+                title=f"⚡ LIGHTNING BOLT - {chart_data.symbol} {chart_data.timeframe}",
+                times=chart_data.times,
+                opens=chart_data.opens,
+                highs=chart_data.highs,
+                lows=chart_data.lows,
+                closes=chart_data.closes,
+                volumes=chart_data.volumes,
+                candle_width=0.0006,
+                annotations=[
+                    ChartAnnotation(a.time, a.price, f"{a.phase}\n{a.description}", a.color, (20, 20))
+                    for a in pattern_annotations
+                ],
+                info_text=signal_text,
+                minute_interval=5,
+                preset='standard',
+                output_path=chart_output_path(self.chart_dir, 'lightning_bolt', chart_data.symbol)
+            )
+            
+            # Rendered by the chart service's worker pool
+            filepath = chart_render_service.render_sync(spec).path
             
             logger.info(f"📊 Chart saved: {filepath}")
             return filepath
@@ -161,16 +102,99 @@ Time: {datetime.now().strftime('%H:%M:%S')}"""
             logger.error(f"Chart generation error: {e}")
             return None
     
+    def _professional_candles(self, current_price: float) -> List[Dict[str, Any]]:
+        """Generate realistic candle data (50 candles, 5min interval)"""
+        candles = []
+        now = datetime.now()
+        start_price = current_price * (1 + np.random.uniform(-0.008, 0.008))
+        
+        for i in range(50):
+            candle_time = now - timedelta(minutes=(50 - i) * 5)
+            
+            # Realistic price progression towards current price
+            if i == 49:  # Last candle
+                target_price = current_price
+            else:
+                progress = i / 49
+                trend = start_price + (current_price - start_price) * progress
+                volatility = current_price * 0.0004
+                target_price = trend + np.random.normal(0, volatility)
+            
+            # Generate OHLC
+            if i == 0:
+                open_price = start_price
+            else:
+                open_price = candles[-1]['close']
+            
+            close_price = target_price
+            
+            # Realistic intrabar movement
+            intrabar_vol = current_price * 0.0002
+            high_price = max(open_price, close_price) + abs(np.random.normal(0, intrabar_vol))
+            low_price = min(open_price, close_price) - abs(np.random.normal(0, intrabar_vol))
+            
+            candles.append({
+                'time': candle_time,
+                'open': open_price,
+                'high': high_price,
+                'low': low_price,
+                'close': close_price,
+                'volume': int(np.random.uniform(80, 200))
+            })
+        
+        return candles
+    
+    def _professional_chart_spec(self, symbol: str, pattern_phase: str,
+                                 current_price: float, preset: str = 'hires') -> ChartSpec:
+        """Build the professional candlestick chart description"""
+        candles = self._professional_candles(current_price)
+        
+        # Add market structure points
+        markers = []
+        for i in range(10, len(candles) - 5, 8):  # Sample some structure points
+            candle = candles[i]
+            is_high_point = i % 2 == 0
+            
+            if is_high_point:
+                structure_type = "HH" if np.random.random() > 0.5 else "LH"
+                price_point = candle['high']
+                color = '#4caf50' if structure_type == "HH" else '#f44336'
+            else:
+                structure_type = "HL" if np.random.random() > 0.5 else "LL"  
+                price_point = candle['low']
+                color = '#4caf50' if structure_type == "HL" else '#f44336'
+            
+            markers.append(ChartMarker(candle['time'], price_point, structure_type, color))
+        
+        # Add BOS detection arrow
+        latest_candle = candles[-1]
+        bos = ChartAnnotation(latest_candle['time'], latest_candle['close'],
+                              f'⚡ {pattern_phase}\nBOS DETECTED\n{current_price:.5f}',
+                              '#ff9800', (30, 50))
+        
+        return ChartSpec(
+            symbol=symbol,
+            title=f'{symbol} • {pattern_phase} • Market Structure\n5min Chart • Real Price: {current_price:.5f}',
+            times=[c['time'] for c in candles],
+            opens=[c['open'] for c in candles],
+            highs=[c['high'] for c in candles],
+            lows=[c['low'] for c in candles],
+            closes=[c['close'] for c in candles],
+            volumes=[c['volume'] for c in candles],
+            candle_width=timedelta(minutes=5).total_seconds() / 86400 * 0.8,
+            theme=ChartTheme(figure_bg='#1e1e1e', axes_bg='#2d2d30', up_color='#26a69a',
+                             down_color='#ef5350', wick_color='#b2b5be', grid_alpha=0.2),
+            markers=markers,
+            annotations=[bos],
+            preset=preset,
+            output_path=chart_output_path(self.chart_dir, 'professional_candlesticks', symbol)
+        )
+    
     def generate_professional_candlestick_chart_sync(self, symbol: str, 
                                                    pattern_phase: str, price: float) -> str:
         """Generate professional candlestick chart (sync version)"""
         
         try:
-            # Create professional candlestick chart
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12),
-                                         gridspec_kw={'height_ratios': [5, 1]})
-            fig.patch.set_facecolor('#1e1e1e')
-            
             # Get real current price for context
             from ..data.real_market_data import real_data_provider
             import asyncio
@@ -189,144 +213,8 @@ Time: {datetime.now().strftime('%H:%M:%S')}"""
             except:
                 current_price = price
             
-            # Generate realistic candle data (50 candles, 5min interval)
-            candles = []
-            now = datetime.now()
-            start_price = current_price * (1 + np.random.uniform(-0.008, 0.008))
-            
-            for i in range(50):
-                candle_time = now - timedelta(minutes=(50 - i) * 5)
-                
-                # Realistic price progression towards current price
-                if i == 49:  # Last candle
-                    target_price = current_price
-                else:
-                    progress = i / 49
-                    trend = start_price + (current_price - start_price) * progress
-                    volatility = current_price * 0.0004
-                    target_price = trend + np.random.normal(0, volatility)
-                
-                # Generate OHLC
-                if i == 0:
-                    open_price = start_price
-                else:
-                    open_price = candles[-1]['close']
-                
-                close_price = target_price
-                
-                # Realistic intrabar movement
-                intrabar_vol = current_price * 0.0002
-                high_price = max(open_price, close_price) + abs(np.random.normal(0, intrabar_vol))
-                low_price = min(open_price, close_price) - abs(np.random.normal(0, intrabar_vol))
-                
-                candles.append({
-                    'time': candle_time,
-                    'open': open_price,
-                    'high': high_price,
-                    'low': low_price,
-                    'close': close_price,
-                    'volume': int(np.random.uniform(80, 200))
-                })
-            
-            # Main candlestick chart
-            ax1.set_facecolor('#2d2d30')
-            
-            # Calculate candle width
-            time_diff = timedelta(minutes=5).total_seconds() / 86400
-            candle_width = time_diff * 0.8
-            
-            # Draw professional candlesticks
-            for candle in candles:
-                is_bullish = candle['close'] > candle['open']
-                body_color = '#26a69a' if is_bullish else '#ef5350'
-                wick_color = '#b2b5be'
-                
-                # Draw wick
-                ax1.plot([candle['time'], candle['time']], 
-                        [candle['low'], candle['high']],
-                        color=wick_color, linewidth=1.5, alpha=0.9)
-                
-                # Draw body
-                body_height = abs(candle['close'] - candle['open'])
-                body_bottom = min(candle['open'], candle['close'])
-                
-                rect = Rectangle(
-                    (mdates.date2num(candle['time']) - candle_width/2, body_bottom),
-                    candle_width, body_height,
-                    facecolor=body_color, edgecolor=body_color,
-                    linewidth=0, alpha=0.9
-                )
-                ax1.add_patch(rect)
-            
-            # Add market structure points
-            structure_points = []
-            for i in range(10, len(candles) - 5, 8):  # Sample some structure points
-                candle = candles[i]
-                is_high_point = i % 2 == 0
-                
-                if is_high_point:
-                    structure_type = "HH" if np.random.random() > 0.5 else "LH"
-                    price_point = candle['high']
-                    color = '#4caf50' if structure_type == "HH" else '#f44336'
-                else:
-                    structure_type = "HL" if np.random.random() > 0.5 else "LL"  
-                    price_point = candle['low']
-                    color = '#4caf50' if structure_type == "HL" else '#f44336'
-                
-                # Draw structure circle
-                circle_radius = (max(c['high'] for c in candles) - min(c['low'] for c in candles)) * 0.015
-                circle = patches.Circle((mdates.date2num(candle['time']), price_point),
-                                      radius=circle_radius, facecolor='none', 
-                                      edgecolor=color, linewidth=4, alpha=0.8)
-                ax1.add_patch(circle)
-                
-                # Structure label
-                ax1.text(mdates.date2num(candle['time']), price_point,
-                        f' {structure_type} ', fontsize=11, fontweight='bold',
-                        color='white', ha='center', va='center',
-                        bbox=dict(boxstyle='round,pad=0.4', facecolor=color,
-                                alpha=0.9, edgecolor='white', linewidth=1))
-            
-            # Add BOS detection arrow
-            latest_candle = candles[-1]
-            ax1.annotate(f'⚡ {pattern_phase}\\nBOS DETECTED\\n{current_price:.5f}',
-                       xy=(latest_candle['time'], latest_candle['close']),
-                       xytext=(30, 50), textcoords='offset points',
-                       bbox=dict(boxstyle='round,pad=1.0', facecolor='#ff9800',
-                               alpha=0.95, edgecolor='white', linewidth=2),
-                       arrowprops=dict(arrowstyle='->', color='#ff9800', lw=4),
-                       fontsize=12, fontweight='bold', color='white', ha='center')
-            
-            # Professional styling
-            title = f'{symbol} • {pattern_phase} • Market Structure\\n5min Chart • Real Price: {current_price:.5f}'
-            ax1.set_title(title, fontsize=16, fontweight='bold', color='white', pad=25)
-            ax1.set_ylabel('Price', fontsize=13, color='white', fontweight='bold')
-            ax1.grid(True, alpha=0.2, linestyle='-', color='#404040', linewidth=0.8)
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax1.tick_params(colors='white')
-            
-            # Volume chart
-            ax2.set_facecolor('#2d2d30')
-            times = [c['time'] for c in candles]
-            volumes = [c['volume'] for c in candles]
-            colors = ['#26a69a' if c['close'] > c['open'] else '#ef5350' for c in candles]
-            
-            ax2.bar(times, volumes, color=colors, alpha=0.7, width=candle_width)
-            ax2.set_ylabel('Volume', fontsize=11, color='white')
-            ax2.grid(True, alpha=0.2, color='#404040')
-            ax2.tick_params(colors='white', labelsize=9)
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            
-            plt.tight_layout(pad=2)
-            
-            # Save chart
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"professional_candlesticks_{symbol}_{timestamp}.png"
-            filepath = os.path.join(self.chart_dir, filename)
-            
-            plt.savefig(filepath, dpi=300, bbox_inches='tight',
-                       facecolor='#1e1e1e', edgecolor='none')
-            plt.close()
+            spec = self._professional_chart_spec(symbol, pattern_phase, current_price)
+            filepath = chart_render_service.render_sync(spec).path
             
             logger.info(f"📊 Professional candlestick chart saved: {filepath}")
             return filepath
@@ -335,6 +223,32 @@ Time: {datetime.now().strftime('%H:%M:%S')}"""
             logger.error(f"Professional candlestick chart error: {e}")
             return None
     
+    async def generate_professional_candlestick_chart(self, symbol: str,
+                                                      pattern_phase: str, price: float) -> str:
+        """Generate professional candlestick chart without blocking the event loop"""
+        
+        try:
+            from ..data.real_market_data import real_data_provider
+            
+            current_price = price
+            try:
+                real_tick = await real_data_provider.get_real_price(symbol)
+                if real_tick:
+                    current_price = real_tick.price
+            except Exception:
+                current_price = price
+            
+            spec = self._professional_chart_spec(symbol, pattern_phase, current_price)
+            result = await chart_render_service.render(spec)
+            
+            logger.info(f"📊 Professional candlestick chart saved: {result.path} "
+                        f"({result.latency_ms:.0f}ms)")
+            return result.path
+            
+        except Exception as e:
+            logger.error(f"Professional candlestick chart error: {e}")
+            return None
+    
     def generate_simple_pattern_chart(self, symbol: str, timeframe: str, 
                                     pattern_phase: str, price: float) -> str:
         """Generate pattern visualization with real price context"""
@@ -450,4 +364,8 @@ chart_generator = ChartGenerator()
 # Convenience functions
 def generate_pattern_chart(symbol: str, pattern_phase: str, price: float) -> str:
     """Generate pattern chart image"""
-    return chart_generator.generate_professional_candlestick_chart_sync(symbol, pattern_phase, price)
\ No newline at end of file
+    return chart_generator.generate_professional_candlestick_chart_sync(symbol, pattern_phase, price)
+
+async def generate_pattern_chart_async(symbol: str, pattern_phase: str, price: float) -> str:
+    """Generate pattern chart image in the chart render service"""
+    return await chart_generator.generate_professional_candlestick_chart(symbol, pattern_phase, price)
\ No newline at end of file
@@ -7,10 +7,6 @@ Uses actual market data from APIs
 Shows market structure (HH, HL, LH, LL)
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import Rectangle, Circle
-import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -22,6 +18,11 @@ import ssl
 import asyncio
 from dataclasses import dataclass
 
+from .render_service import (
+    ChartSpec, ChartTheme, ChartMarker, ChartAnnotation,
+    chart_render_service, chart_output_path
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -53,8 +54,6 @@ class RealCandlestickChartGenerator:
         
         # Alpha Vantage API key
         self.alpha_key = "3M9G2YI3P8TTW72C"
-        
-        plt.style.use('dark_background')
         logger.info("📊 Real Candlestick Chart Generator initialized")
     
     async def get_real_candle_data(self, symbol: str, interval: str = "5min", 
@@ -193,107 +192,43 @@ class RealCandlestickChartGenerator:
             # Detect market structure
             structures = self.detect_market_structure(candles)
             
-            # Create figure
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12),
-                                         gridspec_kw={'height_ratios': [4, 1]})
-            fig.patch.set_facecolor('#1a1a1a')
-            
-            # Main candlestick chart
-            ax1.set_facecolor('#2a2a2a')
-            
-            print(f"📊 Drawing {len(candles)} real candlesticks...")
-            
-            # Draw candlesticks
-            for i, candle in enumerate(candles):
-                # Candlestick colors
-                is_bullish = candle.close > candle.open
-                body_color = '#00ff88' if is_bullish else '#ff4444'
-                wick_color = '#ffffff'
-                
-                # Wick (high-low line)
-                ax1.plot([candle.time, candle.time], [candle.low, candle.high],
-                        color=wick_color, linewidth=1.5, alpha=0.8)
-                
-                # Body rectangle
-                body_height = abs(candle.close - candle.open)
-                body_bottom = min(candle.open, candle.close)
-                
-                # Calculate candle width
-                if len(candles) > 1:
-                    time_diff = (candles[1].time - candles[0].time).total_seconds() / 86400
-                    candle_width = time_diff * 0.7
-                else:
-                    candle_width = 0.002
-                
-                rect = Rectangle(
-                    (mdates.date2num(candle.time) - candle_width/2, body_bottom),
-                    candle_width, body_height,
-                    facecolor=body_color, edgecolor=body_color,
-                    linewidth=1, alpha=0.9
-                )
-                ax1.add_patch(rect)
-            
-            # Draw market structure points
-            for structure in structures:
-                color = '#00ff00' if structure.color == 'green' else '#ff0000'
-                
-                # Circle around structure point
-                circle = Circle((mdates.date2num(structure.time), structure.price),
-                              radius=0.001, facecolor='none', edgecolor=color,
-                              linewidth=3, alpha=0.8)
-                ax1.add_patch(circle)
-                
-                # Label
-                ax1.text(mdates.date2num(structure.time), structure.price,
-                        f'  {structure.type}  ', fontsize=10, fontweight='bold',
-                        color='white', bbox=dict(boxstyle='round,pad=0.3',
-                        facecolor=color, alpha=0.8))
+            # Market structure points
+            markers = [
+                ChartMarker(structure.time, structure.price, structure.type,
+                            '#00ff00' if structure.color == 'green' else '#ff0000')
+                for structure in structures
+            ]
             
             # Add pattern detection
-            if candles:
-                latest_candle = candles[-1]
-                current_price = latest_candle.close
-                
-                # BOS arrow
-                ax1.annotate(f'⚡ {pattern_phase}\nBOS DETECTED\n{current_price:.5f}',
-                           xy=(latest_candle.time, current_price),
-                           xytext=(20, 40), textcoords='offset points',
-                           bbox=dict(boxstyle='round,pad=0.8',
-                                   facecolor='#ff6600', alpha=0.9,
-                                   edgecolor='white', linewidth=2),
-                           arrowprops=dict(arrowstyle='->', color='#ff6600', lw=3),
-                           fontsize=12, fontweight='bold', color='white')
-            
-            # Chart title
-            title = f'⚡ {symbol} - REAL CANDLESTICK CHART\n{pattern_phase} • Market Structure Analysis'
-            ax1.set_title(title, fontsize=18, fontweight='bold', color='white', pad=20)
+            latest_candle = candles[-1]
+            current_price = latest_candle.close
+            bos = ChartAnnotation(latest_candle.time, current_price,
+                                  f'⚡ {pattern_phase}\nBOS DETECTED\n{current_price:.5f}',
+                                  '#ff6600', (20, 40))
             
-            # Format axes
-            ax1.set_ylabel('Price', fontsize=14, color='white', fontweight='bold')
-            ax1.grid(True, alpha=0.3, linestyle='--', color='gray')
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=30))
-            
-            # Volume chart (bottom)
-            ax2.set_facecolor('#2a2a2a')
-            volumes = [c.volume for c in candles]
-            times = [c.time for c in candles]
-            colors = ['#00ff88' if c.close > c.open else '#ff4444' for c in candles]
-            
-            ax2.bar(times, volumes, color=colors, alpha=0.7, width=candle_width)
-            ax2.set_ylabel('Volume', fontsize=12, color='white')
-            ax2.grid(True, alpha=0.3, linestyle='--', color='gray')
-            
-            plt.tight_layout()
-            
-            # Save chart
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"real_candlestick_{symbol}_{timestamp}.png"
-            filepath = os.path.join(self.chart_dir, filename)
+            print(f"📊 Drawing {len(candles)} real candlesticks...")
             
-            plt.savefig(filepath, dpi=300, bbox_inches='tight',
-                       facecolor='#1a1a1a', edgecolor='none')
-            plt.close()
+            spec = ChartSpec(
+                symbol=symbol,
+                title=f'⚡ {symbol} - REAL CANDLESTICK CHART\n{pattern_phase} • Market Structure Analysis',
+                times=[c.time for c in candles],
+                opens=[c.open for c in candles],
+                highs=[c.high for c in candles],
+                lows=[c.low for c in candles],
+                closes=[c.close for c in candles],
+                volumes=[c.volume for c in candles],
+                theme=ChartTheme(figure_bg='#1a1a1a', axes_bg='#2a2a2a', wick_color='#ffffff'),
+                markers=markers,
+                annotations=[bos],
+                minute_interval=30,
+                preset='hires',
+                output_path=chart_output_path(self.chart_dir, 'real_candlestick', symbol)
+            )
+            
+            # Render in the chart service's worker pool (event loop stays free)
+            result = await chart_render_service.render(spec)
+            filepath = result.path
+            filename = os.path.basename(filepath)
             
             print(f"✅ Real candlestick chart saved: {filename}")
             return filepath
@@ -6,10 +6,6 @@ Creates realistic candlestick charts using current real price
 Generates professional trading-style charts with market structure
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import Rectangle, Circle
-import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -19,6 +15,11 @@ import logging
 import asyncio
 from dataclasses import dataclass
 
+from .render_service import (
+    ChartSpec, ChartTheme, ChartMarker, ChartAnnotation,
+    chart_render_service, chart_output_path
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -47,8 +48,6 @@ class RealisticCandlestickGenerator:
     def __init__(self):
         self.chart_dir = "/Users/markuskaprio/Desktop/Claude Code Projektit/MikrobotFastversion/charts"
         os.makedirs(self.chart_dir, exist_ok=True)
-        
-        plt.style.use('dark_background')
         logger.info("🕯️ Realistic Candlestick Generator initialized")
     
     async def generate_realistic_candles(self, symbol: str, current_price: float, 
@@ -222,127 +221,49 @@ class RealisticCandlestickGenerator:
             candles = await self.generate_realistic_candles(symbol, actual_price, 50)
             structures = self.detect_market_structure(candles)
             
-            # Create professional chart
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12),
-                                         gridspec_kw={'height_ratios': [5, 1]})
-            fig.patch.set_facecolor('#1e1e1e')
-            
-            # Main candlestick chart  
-            ax1.set_facecolor('#2d2d30')
-            
             print(f"📊 Drawing {len(candles)} realistic candlesticks...")
-            
-            # Calculate candle width
-            time_diff = (candles[1].time - candles[0].time).total_seconds() / 86400
-            candle_width = time_diff * 0.8
-            
-            # Draw professional candlesticks
-            for candle in candles:
-                is_bullish = candle.close > candle.open
-                
-                # Professional colors
-                body_color = '#26a69a' if is_bullish else '#ef5350'  # Teal/Red like TradingView
-                wick_color = '#b2b5be'
-                
-                # Draw wick (shadow)
-                ax1.plot([candle.time, candle.time], [candle.low, candle.high],
-                        color=wick_color, linewidth=1.5, alpha=0.9, solid_capstyle='round')
-                
-                # Draw body
-                body_height = abs(candle.close - candle.open)
-                body_bottom = min(candle.open, candle.close)
-                
-                if body_height > 0:
-                    # Normal candle with body
-                    rect = Rectangle(
-                        (mdates.date2num(candle.time) - candle_width/2, body_bottom),
-                        candle_width, body_height,
-                        facecolor=body_color, edgecolor=body_color,
-                        linewidth=0, alpha=0.9
-                    )
-                else:
-                    # Doji candle (open = close)
-                    rect = Rectangle(
-                        (mdates.date2num(candle.time) - candle_width/2, body_bottom - actual_price * 0.00001),
-                        candle_width, actual_price * 0.00002,
-                        facecolor=wick_color, edgecolor=wick_color,
-                        linewidth=1, alpha=0.9
-                    )
-                
-                ax1.add_patch(rect)
-            
-            # Draw market structure points like in the image
             print(f"🎯 Adding {len(structures)} market structure points...")
             
-            for structure in structures:
-                color = '#4caf50' if structure.color == 'green' else '#f44336'  # Material colors
-                
-                # Circle around structure point (like in the image)
-                circle_radius = (max(c.high for c in candles) - min(c.low for c in candles)) * 0.015
-                circle = Circle((mdates.date2num(structure.time), structure.price),
-                              radius=circle_radius, facecolor='none', edgecolor=color,
-                              linewidth=4, alpha=0.8)
-                ax1.add_patch(circle)
-                
-                # Structure label
-                ax1.text(mdates.date2num(structure.time), structure.price,
-                        f' {structure.type} ', fontsize=11, fontweight='bold',
-                        color='white', ha='center', va='center',
-                        bbox=dict(boxstyle='round,pad=0.4', facecolor=color, 
-                                alpha=0.9, edgecolor='white', linewidth=1))
+            # Market structure points (Material colors)
+            markers = [
+                ChartMarker(structure.time, structure.price, structure.type,
+                            '#4caf50' if structure.color == 'green' else '#f44336')
+                for structure in structures
+            ]
             
             # Add BOS (Break of Structure) detection
             latest_candle = candles[-1]
-            bos_text = f"⚡ {pattern_phase}\\nBOS DETECTED\\n{actual_price:.5f}\\n{datetime.now().strftime('%H:%M:%S')}"
-            
-            ax1.annotate(bos_text,
-                       xy=(latest_candle.time, latest_candle.close),
-                       xytext=(30, 50), textcoords='offset points',
-                       bbox=dict(boxstyle='round,pad=1.0', facecolor='#ff9800', 
-                               alpha=0.95, edgecolor='white', linewidth=2),
-                       arrowprops=dict(arrowstyle='->', color='#ff9800', 
-                                     lw=4, alpha=0.9),
-                       fontsize=12, fontweight='bold', color='white',
-                       ha='center')
-            
-            # Professional chart title
-            title = f'{symbol} • {pattern_phase} • Market Structure Analysis\\n5min Chart • Real Price: {actual_price:.5f}'
-            ax1.set_title(title, fontsize=16, fontweight='bold', color='white', pad=25)
-            
-            # Professional styling
-            ax1.set_ylabel('Price', fontsize=13, color='white', fontweight='bold')
-            ax1.grid(True, alpha=0.2, linestyle='-', color='#404040', linewidth=0.8)
-            ax1.set_axisbelow(True)
-            
-            # Format time axis professionally
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=30))
-            ax1.tick_params(axis='x', colors='white', labelsize=10)
-            ax1.tick_params(axis='y', colors='white', labelsize=10)
+            bos_text = f"⚡ {pattern_phase}\nBOS DETECTED\n{actual_price:.5f}\n{datetime.now().strftime('%H:%M:%S')}"
+            bos = ChartAnnotation(latest_candle.time, latest_candle.close, bos_text,
+                                  '#ff9800', (30, 50))
             
-            # Volume chart (bottom) - professional style
-            ax2.set_facecolor('#2d2d30')
-            
-            volumes = [c.volume for c in candles]
-            times = [c.time for c in candles]
-            vol_colors = ['#26a69a' if c.close > c.open else '#ef5350' for c in candles]
-            
-            ax2.bar(times, volumes, color=vol_colors, alpha=0.7, width=candle_width)
-            ax2.set_ylabel('Volume', fontsize=11, color='white')
-            ax2.grid(True, alpha=0.2, linestyle='-', color='#404040', linewidth=0.8)
-            ax2.tick_params(axis='both', colors='white', labelsize=9)
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            
-            plt.tight_layout(pad=2)
+            # Calculate candle width
+            time_diff = (candles[1].time - candles[0].time).total_seconds() / 86400
             
-            # Save professional chart
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"professional_{symbol}_candlesticks_{timestamp}.png"
-            filepath = os.path.join(self.chart_dir, filename)
+            spec = ChartSpec(
+                symbol=symbol,
+                title=f'{symbol} • {pattern_phase} • Market Structure Analysis\n5min Chart • Real Price: {actual_price:.5f}',
+                times=[c.time for c in candles],
+                opens=[c.open for c in candles],
+                highs=[c.high for c in candles],
+                lows=[c.low for c in candles],
+                closes=[c.close for c in candles],
+                volumes=[c.volume for c in candles],
+                candle_width=time_diff * 0.8,
+                # Teal/Red like TradingView
+                theme=ChartTheme(figure_bg='#1e1e1e', axes_bg='#2d2d30', up_color='#26a69a',
+                                 down_color='#ef5350', wick_color='#b2b5be', grid_alpha=0.2),
+                markers=markers,
+                annotations=[bos],
+                minute_interval=30,
+                preset='hires',
+                output_path=chart_output_path(self.chart_dir, f'professional_{symbol}', 'candlesticks')
+            )
             
-            plt.savefig(filepath, dpi=300, bbox_inches='tight',
-                       facecolor='#1e1e1e', edgecolor='none')
-            plt.close()
+            # Render in the chart service's worker pool (event loop stays free)
+            result = await chart_render_service.render(spec)
+            filepath = result.path
+            filename = os.path.basename(filepath)
             
             print(f"✅ Professional candlestick chart saved: {filename}")
             return filepath
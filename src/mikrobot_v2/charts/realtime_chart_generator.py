@@ -6,9 +6,7 @@ Generates charts using actual price history from APIs
 Shows real market movements, not simulation
 """
 
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -18,6 +16,10 @@ import logging
 import asyncio
 from dataclasses import dataclass
 
+from .render_service import (
+    ChartSpec, ChartAnnotation, ChartLine, chart_render_service, chart_output_path
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -40,9 +42,6 @@ class RealTimeChartGenerator:
         self.chart_dir = "/Users/markuskaprio/Desktop/Claude Code Projektit/MikrobotFastversion/charts"
         os.makedirs(self.chart_dir, exist_ok=True)
         
-        # Chart styling for real-time data
-        plt.style.use('dark_background')
-        
         logger.info("📊 Real-Time Chart Generator initialized")
     
     async def get_real_price_history(self, symbol: str, minutes: int = 60) -> List[RealTimeCandle]:
@@ -114,61 +113,20 @@ class RealTimeChartGenerator:
                 logger.error(f"No price data for {symbol}")
                 return None
             
-            # Create figure
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), 
-                                         gridspec_kw={'height_ratios': [4, 1]})
-            fig.patch.set_facecolor('#0a0a0a')
-            
-            # Price chart (top)
-            ax1.set_facecolor('#1a1a1a')
-            
-            # Draw candlesticks with REAL data
             times = [candle.time for candle in candles]
-            opens = [candle.open for candle in candles]
             highs = [candle.high for candle in candles] 
             lows = [candle.low for candle in candles]
             closes = [candle.close for candle in candles]
-            volumes = [candle.volume for candle in candles]
-            
-            for i, candle in enumerate(candles):
-                # Candlestick colors
-                color = '#00ff88' if candle.close > candle.open else '#ff4444'
-                
-                # High-low line
-                ax1.plot([candle.time, candle.time], [candle.low, candle.high], 
-                        color='#666666', linewidth=1.5)
-                
-                # Candle body
-                body_height = abs(candle.close - candle.open)
-                body_bottom = min(candle.open, candle.close)
-                
-                # Calculate bar width based on timeframe
-                bar_width = timedelta(minutes=1.5)
-                
-                rect = Rectangle((mdates.date2num(candle.time) - bar_width.total_seconds()/(2*86400), 
-                               body_bottom), 
-                               bar_width.total_seconds()/86400, 
-                               body_height,
-                               facecolor=color, edgecolor=color, linewidth=1)
-                ax1.add_patch(rect)
             
             # Add pattern annotation on latest price
             latest_candle = candles[-1]
             pattern_price = latest_candle.close
-            
-            # Pattern detection arrow and label
-            ax1.annotate(f'⚡ {pattern_phase}\n{symbol}\n{pattern_price:.5f}',
-                        xy=(latest_candle.time, pattern_price),
-                        xytext=(30, 30), textcoords='offset points',
-                        bbox=dict(boxstyle='round,pad=0.8', 
-                                facecolor='#ff6600', alpha=0.9,
-                                edgecolor='#ffffff', linewidth=2),
-                        arrowprops=dict(arrowstyle='->', 
-                                      connectionstyle='arc3,rad=0.2',
-                                      color='#ff6600', lw=3),
-                        fontsize=12, fontweight='bold', color='#ffffff')
+            annotation = ChartAnnotation(latest_candle.time, pattern_price,
+                                         f'⚡ {pattern_phase}\n{symbol}\n{pattern_price:.5f}',
+                                         '#ff6600', (30, 30))
             
             # Add trend line for recent movement
+            lines = []
             if len(candles) >= 20:
                 recent_times = times[-20:]
                 recent_closes = closes[-20:]
@@ -177,14 +135,11 @@ class RealTimeChartGenerator:
                 x_vals = [mdates.date2num(t) for t in recent_times]
                 z = np.polyfit(x_vals, recent_closes, 1)
                 p = np.poly1d(z)
-                
-                ax1.plot(recent_times, p(x_vals), '--', 
-                        color='#ffaa00', linewidth=2, alpha=0.8, label='Trend')
+                lines.append(ChartLine(recent_times, list(p(x_vals)), label='Trend'))
             
             # Chart title with real info
             current_time = datetime.now().strftime('%H:%M:%S')
             title = f'⚡ LIGHTNING BOLT - {symbol} (REAL PRICES)\n{current_time} • Pattern: {pattern_phase}'
-            ax1.set_title(title, fontsize=16, fontweight='bold', color='#ffffff', pad=20)
             
             # Price info box with real data
             price_info = f"""REAL MARKET DATA
@@ -193,51 +148,28 @@ High: {max(highs[-10:]):.5f}
 Low: {min(lows[-10:]):.5f}
 Change: {((pattern_price - closes[-10])/closes[-10]*100):.2f}%"""
             
-            ax1.text(0.02, 0.98, price_info, transform=ax1.transAxes,
-                    verticalalignment='top',
-                    bbox=dict(boxstyle='round,pad=0.5', 
-                            facecolor='#2a2a2a', alpha=0.9,
-                            edgecolor='#555555'),
-                    fontsize=10, color='#ffffff', fontfamily='monospace')
-            
-            # Grid and styling
-            ax1.grid(True, alpha=0.3, linestyle='--')
-            ax1.set_ylabel('Price', fontsize=12, color='#ffffff', fontweight='bold')
-            
-            # Format x-axis
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=15))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
-            
-            # Volume chart (bottom) with real data
-            ax2.set_facecolor('#1a1a1a')
-            
-            # Color volume bars based on price movement
-            volume_colors = ['#00ff88' if c > o else '#ff4444' 
-                           for c, o in zip(closes, opens)]
-            
-            ax2.bar(times, volumes, color=volume_colors, alpha=0.7, 
-                   width=timedelta(minutes=1.5))
-            
-            ax2.set_ylabel('Volume', fontsize=10, color='#ffffff')
-            ax2.grid(True, alpha=0.3, linestyle='--')
-            
-            # Format bottom x-axis  
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            ax2.xaxis.set_major_locator(mdates.MinuteLocator(interval=15))
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
-            
-            # Adjust layout
-            plt.tight_layout()
-            
-            # Save chart
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"realtime_{symbol}_{pattern_phase.replace(' ', '_')}_{timestamp}.png"
-            filepath = os.path.join(self.chart_dir, filename)
+            spec = ChartSpec(
+                symbol=symbol,
+                title=title,
+                times=times,
+                opens=[candle.open for candle in candles],
+                highs=highs,
+                lows=lows,
+                closes=closes,
+                volumes=[candle.volume for candle in candles],
+                candle_width=timedelta(minutes=1.5).total_seconds() / 86400,
+                annotations=[annotation],
+                lines=lines,
+                info_text=price_info,
+                minute_interval=15,
+                preset='hires',
+                output_path=chart_output_path(
+                    self.chart_dir, 'realtime', f"{symbol}_{pattern_phase.replace(' ', '_')}")
+            )
             
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', 
-                       facecolor='#0a0a0a', edgecolor='none')
-            plt.close()
+            # Render in the chart service's worker pool (event loop stays free)
+            result = await chart_render_service.render(spec)
+            filepath = result.path
             
             logger.info(f"📊 Real-time chart saved: {filepath}")
             print(f"✅ Real-time chart generated with {len(candles)} real price points")
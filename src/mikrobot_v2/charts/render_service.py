@@ -0,0 +1,407 @@
+"""
+Chart Rendering Service
+=======================
+
+Renders candlestick charts off the caller's thread
+
+- Candles are drawn as one LineCollection (wicks) and one PolyCollection
+  (bodies) instead of an ax.plot + add_patch pair per candle
+- Figures are built with the object-oriented Agg API (no pyplot global
+  state) and reused: each worker keeps one pre-warmed figure per preset
+- Rendering runs in a process pool; `await render(spec)` returns a file
+  path or PNG bytes and every render's latency is recorded
+"""
+
+import asyncio
+import io
+import os
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Sequence
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PngPreset:
+    """Output size/quality preset"""
+    figsize: Tuple[float, float]
+    dpi: int
+    compress_level: int  # zlib level 0-9: lower is faster, higher is smaller
+
+
+PNG_PRESETS: Dict[str, PngPreset] = {
+    'preview': PngPreset((8, 5), 80, 1),
+    'standard': PngPreset((12, 8), 150, 6),
+    'hires': PngPreset((16, 12), 300, 6),
+}
+
+
+@dataclass(frozen=True)
+class ChartTheme:
+    """Colour scheme for a chart"""
+    figure_bg: str = '#0a0a0a'
+    axes_bg: str = '#1a1a1a'
+    up_color: str = '#00ff88'
+    down_color: str = '#ff4444'
+    wick_color: str = '#666666'
+    text_color: str = '#ffffff'
+    grid_alpha: float = 0.3
+    volume_alpha: float = 0.7
+
+
+@dataclass
+class ChartMarker:
+    """Labelled point on the price axis (e.g. HH/HL/LH/LL structure)"""
+    time: datetime
+    price: float
+    label: str
+    color: str
+
+
+@dataclass
+class ChartAnnotation:
+    """Arrowed text box pointing at a price"""
+    time: datetime
+    price: float
+    text: str
+    color: str = '#ff6600'
+    offset: Tuple[int, int] = (30, 40)
+
+
+@dataclass
+class ChartLine:
+    """Overlay line on the price axis (e.g. a trend line)"""
+    times: List[datetime]
+    values: List[float]
+    color: str = '#ffaa00'
+    linestyle: str = '--'
+    label: Optional[str] = None
+
+
+@dataclass
+class ChartSpec:
+    """
+    Everything needed to draw one candlestick chart
+
+    Plain data only, so a spec pickles cheaply to a worker process.
+    """
+    symbol: str
+    title: str
+    times: Sequence[datetime]
+    opens: Sequence[float]
+    highs: Sequence[float]
+    lows: Sequence[float]
+    closes: Sequence[float]
+    volumes: Optional[Sequence[float]] = None
+    candle_width: Optional[float] = None  # days; default 70% of bar spacing
+    theme: ChartTheme = field(default_factory=ChartTheme)
+    markers: List[ChartMarker] = field(default_factory=list)
+    annotations: List[ChartAnnotation] = field(default_factory=list)
+    lines: List[ChartLine] = field(default_factory=list)
+    info_text: Optional[str] = None
+    time_format: str = '%H:%M'
+    minute_interval: Optional[int] = None
+    preset: str = 'standard'
+    output_path: Optional[str] = None  # None: return PNG bytes
+
+
+@dataclass
+class RenderResult:
+    """Rendered chart plus timing"""
+    path: Optional[str]
+    png: Optional[bytes]
+    render_ms: float      # drawing + encoding inside the worker
+    latency_ms: float     # caller-observed, including queueing and transfer
+    artists: int
+
+
+def candle_collections(x: np.ndarray, opens: np.ndarray, highs: np.ndarray,
+                       lows: np.ndarray, closes: np.ndarray, width: float,
+                       up_color: str, down_color: str, wick_color: str,
+                       alpha: float = 0.9, min_body: float = 0.0) -> Tuple[LineCollection, PolyCollection]:
+    """Build the wick and body artists for all candles at once
+
+    Bodies thinner than min_body (dojis) are widened to it so they stay visible.
+    """
+    wicks = np.empty((len(x), 2, 2))
+    wicks[:, 0, 0] = wicks[:, 1, 0] = x
+    wicks[:, 0, 1] = lows
+    wicks[:, 1, 1] = highs
+
+    half = width / 2
+    bottom = np.minimum(opens, closes)
+    top = np.maximum(np.maximum(opens, closes), bottom + min_body)
+    bodies = np.empty((len(x), 4, 2))
+    bodies[:, 0, 0] = bodies[:, 1, 0] = x - half
+    bodies[:, 2, 0] = bodies[:, 3, 0] = x + half
+    bodies[:, 0, 1] = bodies[:, 3, 1] = bottom
+    bodies[:, 1, 1] = bodies[:, 2, 1] = top
+
+    colors = np.where(closes > opens, up_color, down_color)
+    return (
+        LineCollection(wicks, colors=wick_color, linewidths=1.2, alpha=alpha),
+        PolyCollection(bodies, facecolors=colors, edgecolors=colors, linewidths=0.5, alpha=alpha),
+    )
+
+
+# Worker-side state: one reusable figure per preset
+_figures: Dict[str, Tuple[Figure, Any, Any]] = {}
+
+
+def _figure_for(preset_name: str) -> Tuple[Figure, Any, Any]:
+    cached = _figures.get(preset_name)
+    if cached is None:
+        preset = PNG_PRESETS[preset_name]
+        figure = Figure(figsize=preset.figsize, dpi=preset.dpi)
+        FigureCanvasAgg(figure)
+        price_ax, volume_ax = figure.subplots(2, 1, sharex=True,
+                                              gridspec_kw={'height_ratios': [4, 1]})
+        cached = (figure, price_ax, volume_ax)
+        _figures[preset_name] = cached
+    return cached
+
+
+def draw_chart(spec: ChartSpec) -> Tuple[Figure, int]:
+    """Draw a spec onto the worker's reusable figure; returns (figure, artist count)"""
+    theme = spec.theme
+    figure, price_ax, volume_ax = _figure_for(spec.preset)
+    price_ax.cla()
+    volume_ax.cla()
+    figure.patch.set_facecolor(theme.figure_bg)
+
+    x = mdates.date2num(list(spec.times))
+    opens = np.asarray(spec.opens, dtype=float)
+    highs = np.asarray(spec.highs, dtype=float)
+    lows = np.asarray(spec.lows, dtype=float)
+    closes = np.asarray(spec.closes, dtype=float)
+    if spec.candle_width is not None:
+        width = spec.candle_width
+    elif len(x) > 1:
+        width = float(np.median(np.diff(x))) * 0.7
+    else:
+        width = 0.002
+
+    price_ax.set_facecolor(theme.axes_bg)
+    price_range = float(highs.max() - lows.min()) if len(x) else 0.0
+    wicks, bodies = candle_collections(x, opens, highs, lows, closes, width,
+                                       theme.up_color, theme.down_color, theme.wick_color,
+                                       min_body=price_range * 0.002)
+    price_ax.add_collection(wicks)
+    price_ax.add_collection(bodies)
+    if len(x):
+        pad = price_range * 0.05 or abs(highs.max()) * 0.001 or 1.0
+        price_ax.set_xlim(x[0] - width, x[-1] + width)
+        price_ax.set_ylim(lows.min() - pad, highs.max() + pad)
+
+    for line in spec.lines:
+        price_ax.plot(mdates.date2num(list(line.times)), line.values, line.linestyle,
+                      color=line.color, linewidth=2, alpha=0.8, label=line.label)
+
+    if spec.markers:
+        marker_x = mdates.date2num([m.time for m in spec.markers])
+        price_ax.scatter(marker_x, [m.price for m in spec.markers], s=250,
+                         facecolors='none', edgecolors=[m.color for m in spec.markers],
+                         linewidths=3, alpha=0.8, zorder=4)
+        for mx, marker in zip(marker_x, spec.markers):
+            price_ax.text(mx, marker.price, f' {marker.label} ', fontsize=10,
+                          fontweight='bold', color='white', ha='center', va='center',
+                          bbox=dict(boxstyle='round,pad=0.3', facecolor=marker.color, alpha=0.9))
+
+    for annotation in spec.annotations:
+        price_ax.annotate(annotation.text,
+                          xy=(mdates.date2num(annotation.time), annotation.price),
+                          xytext=annotation.offset, textcoords='offset points',
+                          bbox=dict(boxstyle='round,pad=0.8', facecolor=annotation.color,
+                                    alpha=0.9, edgecolor='white', linewidth=2),
+                          arrowprops=dict(arrowstyle='->', color=annotation.color, lw=3),
+                          fontsize=11, fontweight='bold', color=theme.text_color)
+
+    if spec.info_text:
+        price_ax.text(0.02, 0.98, spec.info_text, transform=price_ax.transAxes,
+                      verticalalignment='top', fontsize=9, color=theme.text_color,
+                      fontfamily='monospace',
+                      bbox=dict(boxstyle='round,pad=0.5', facecolor='#333333', alpha=0.9))
+
+    price_ax.set_title(spec.title, fontsize=14, fontweight='bold', color=theme.text_color, pad=15)
+    price_ax.set_ylabel('Price', color=theme.text_color)
+    price_ax.grid(True, alpha=theme.grid_alpha, linestyle='--')
+    price_ax.tick_params(colors=theme.text_color)
+
+    volume_ax.set_facecolor(theme.axes_bg)
+    if spec.volumes is not None and len(x):
+        volumes = np.asarray(spec.volumes, dtype=float)
+        bars = np.zeros((len(x), 4, 2))
+        bars[:, 0, 0] = bars[:, 1, 0] = x - width / 2
+        bars[:, 2, 0] = bars[:, 3, 0] = x + width / 2
+        bars[:, 1, 1] = bars[:, 2, 1] = volumes
+        volume_ax.add_collection(PolyCollection(
+            bars, facecolors=np.where(closes > opens, theme.up_color, theme.down_color),
+            linewidths=0, alpha=theme.volume_alpha))
+        volume_ax.set_ylim(0, volumes.max() * 1.1 if volumes.max() > 0 else 1)
+    volume_ax.set_ylabel('Volume', color=theme.text_color)
+    volume_ax.grid(True, alpha=theme.grid_alpha, linestyle='--')
+    volume_ax.tick_params(colors=theme.text_color)
+    volume_ax.xaxis.set_major_formatter(mdates.DateFormatter(spec.time_format))
+    if spec.minute_interval:
+        volume_ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=spec.minute_interval))
+
+    figure.tight_layout()
+    artists = sum(len(ax.get_children()) for ax in (price_ax, volume_ax))
+    return figure, artists
+
+
+def render_chart(spec: ChartSpec) -> Tuple[Optional[str], Optional[bytes], float, int]:
+    """Draw and encode one chart; runs inside the worker"""
+    start = time.perf_counter()
+    figure, artists = draw_chart(spec)
+    preset = PNG_PRESETS[spec.preset]
+    save_kwargs = dict(format='png', dpi=preset.dpi, facecolor=spec.theme.figure_bg,
+                       edgecolor='none', pil_kwargs={'compress_level': preset.compress_level})
+
+    if spec.output_path:
+        os.makedirs(os.path.dirname(spec.output_path) or '.', exist_ok=True)
+        figure.savefig(spec.output_path, **save_kwargs)
+        result = (spec.output_path, None)
+    else:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, **save_kwargs)
+        result = (None, buffer.getvalue())
+
+    return result[0], result[1], (time.perf_counter() - start) * 1000, artists
+
+
+def _warm_worker(presets: Sequence[str]):
+    """Process-pool initializer: build figures and render once per preset"""
+    now = datetime(2025, 1, 6, 12, 0)
+    times = [now + timedelta(minutes=5 * i) for i in range(20)]
+    prices = np.linspace(1.0, 1.01, 20)
+    for preset in presets:
+        render_chart(ChartSpec('WARMUP', 'warmup', times, prices, prices + 0.001,
+                               prices - 0.001, prices[::-1], volumes=np.ones(20),
+                               preset=preset))
+
+
+class ChartRenderService:
+    """
+    Off-thread candlestick renderer
+
+    mode='process' (default) renders in a pre-warmed process pool so chart
+    work never competes with the strategy loop for the GIL; 'thread' and
+    'inline' exist for environments where subprocesses are unavailable.
+    """
+
+    def __init__(self, workers: int = 2, mode: str = 'process',
+                 warm_presets: Sequence[str] = ('standard',), history_size: int = 500):
+        if mode not in ('process', 'thread', 'inline'):
+            raise ValueError(f"Unknown render mode: {mode}")
+        self.workers = workers
+        self.mode = mode
+        self.warm_presets = tuple(warm_presets)
+        self.executor: Optional[Executor] = None
+        self._start_lock = threading.Lock()
+        self.latencies: deque = deque(maxlen=history_size)
+        self.render_times: deque = deque(maxlen=history_size)
+        self.stats = {'rendered': 0, 'failed': 0}
+
+    def start(self):
+        """Create (and pre-warm) the worker pool"""
+        if self.executor is not None or self.mode == 'inline':
+            return
+        with self._start_lock:
+            if self.executor is None:
+                self.executor = self._create_executor()
+
+    def _create_executor(self) -> Executor:
+        if self.mode == 'process':
+            executor = ProcessPoolExecutor(max_workers=self.workers,
+                                           initializer=_warm_worker,
+                                           initargs=(self.warm_presets,))
+            # Force every worker to spawn and warm up now, not on first chart
+            for future in [executor.submit(time.sleep, 0.05) for _ in range(self.workers)]:
+                future.result()
+            return executor
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-render',
+                                  initializer=_warm_worker,
+                                  initargs=(self.warm_presets,))
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    async def render(self, spec: ChartSpec) -> RenderResult:
+        """Render a chart without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        if self.executor is None and self.mode != 'inline':
+            # Spawning and warming the pool takes a while; keep it off the loop
+            await loop.run_in_executor(None, self.start)
+        start = time.perf_counter()
+        try:
+            if self.executor is None:
+                outcome = render_chart(spec)
+            else:
+                outcome = await loop.run_in_executor(self.executor, render_chart, spec)
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        return self._record(outcome, start)
+
+    def render_sync(self, spec: ChartSpec) -> RenderResult:
+        """Render from synchronous code (still executed by the pool)"""
+        self.start()
+        start = time.perf_counter()
+        try:
+            if self.executor is None:
+                outcome = render_chart(spec)
+            else:
+                outcome = self.executor.submit(render_chart, spec).result()
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        return self._record(outcome, start)
+
+    def _record(self, outcome, start: float) -> RenderResult:
+        path, png, render_ms, artists = outcome
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.latencies.append(latency_ms)
+        self.render_times.append(render_ms)
+        self.stats['rendered'] += 1
+        logger.debug(f"Chart rendered in {render_ms:.1f}ms ({latency_ms:.1f}ms end-to-end)")
+        return RenderResult(path, png, render_ms, latency_ms, artists)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Render latency statistics (milliseconds)"""
+        stats: Dict[str, Any] = {**self.stats, 'mode': self.mode, 'workers': self.workers}
+        if self.latencies:
+            latencies = np.asarray(self.latencies)
+            stats['latency_ms'] = {
+                'mean': float(latencies.mean()),
+                'p50': float(np.percentile(latencies, 50)),
+                'p95': float(np.percentile(latencies, 95)),
+                'last': float(latencies[-1]),
+            }
+            stats['render_ms_mean'] = float(np.mean(self.render_times))
+        return stats
+
+
+# Global render service (pool is created on first use)
+chart_render_service = ChartRenderService()
+
+
+def chart_output_path(chart_dir: str, prefix: str, symbol: str) -> str:
+    """Timestamped PNG path in chart_dir"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(chart_dir, f"{prefix}_{symbol}_{timestamp}.png")
@@ -5,6 +5,17 @@ MIKROBOT FASTVERSION v2.0 - Core Components
 Core trading system components for direct MT5 integration.
 """
 
-from .mt5_direct_connector import MT5DirectConnector, Tick, Candle, OrderType
+from ..utils.lazy_imports import lazy_exports
 
-__all__ = ['MT5DirectConnector', 'Tick', 'Candle', 'OrderType']
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MT5DirectConnector': '.mt5_direct_connector',
+    'Tick': '.mt5_direct_connector',
+    'Candle': '.mt5_direct_connector',
+    'OrderType': '.mt5_direct_connector',
+    'ReplayConnector': '.replay_connector',
+    'ReplayConfig': '.replay_connector',
+    'ReplayTrade': '.replay_connector',
+})
+
+__all__ = ['MT5DirectConnector', 'Tick', 'Candle', 'OrderType',
+           'ReplayConnector', 'ReplayConfig', 'ReplayTrade']
\ No newline at end of file
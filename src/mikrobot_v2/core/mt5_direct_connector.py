@@ -13,16 +13,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import pandas as pd
 
-# Try to import MetaTrader5 - should work on macOS too
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-    print("✅ MetaTrader5 Python library found!")
-except ImportError:
-    MT5_AVAILABLE = False
-    print("❌ MetaTrader5 library not found - using simulation")
+from ..utils.lazy_imports import is_available, lazy_import
+
+# MetaTrader5 is imported on first use; the connector logs which mode it runs in
+MT5_AVAILABLE = is_available('MetaTrader5')
+mt5 = lazy_import('MetaTrader5') if MT5_AVAILABLE else None
 
 logger = logging.getLogger(__name__)
 
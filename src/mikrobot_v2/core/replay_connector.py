@@ -0,0 +1,354 @@
+"""
+Replay Connector - Deterministic Offline Market
+===============================================
+
+Drop-in stand-in for MT5DirectConnector (get_candles, get_current_tick,
+place_order, get_positions, close_position) that replays recorded or
+synthetic M1 bars on a virtual clock. Higher timeframes are aggregated from
+the M1 bars, including the still-forming bar, so strategies see what MT5's
+copy_rates_from_pos would have returned at that moment and nothing later.
+
+Market orders fill at the replayed bid/ask with a configurable spread and
+slippage; stop loss / take profit are checked against each new bar's range.
+Given the same bars and seed, every run produces identical fills.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .mt5_direct_connector import Candle, Tick, OrderType, Position
+from ..utils.timeframes import TIMEFRAME_SECONDS
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+M1_SECONDS = 60
+
+TRADE_RETCODE_DONE = 10009
+
+
+@dataclass
+class ReplayConfig:
+    """Fill model and account settings for a replay"""
+    spread_pips: float = 0.8
+    slippage_pips: float = 0.2          # maximum; each fill draws uniformly in [0, max]
+    seed: int = 0
+    initial_balance: float = 10_000.0
+    pip_sizes: Dict[str, float] = field(default_factory=dict)
+    contract_sizes: Dict[str, float] = field(default_factory=dict)
+
+    def pip_size(self, symbol: str) -> float:
+        return self.pip_sizes.get(symbol, 0.01 if symbol.endswith('JPY') else 0.0001)
+
+    def contract_size(self, symbol: str) -> float:
+        return self.contract_sizes.get(symbol, 100_000.0)
+
+
+@dataclass
+class ReplayTrade:
+    """A simulated position, open or closed"""
+    ticket: int
+    symbol: str
+    type: OrderType
+    volume: float
+    open_time: datetime
+    price_open: float
+    sl: float
+    tp: float
+    comment: str
+    close_time: Optional[datetime] = None
+    price_close: Optional[float] = None
+    profit: float = 0.0
+    close_reason: str = ""
+
+
+class _Timeframe:
+    """Bars of one timeframe aggregated from M1, with the M1 index range of each bar"""
+
+    def __init__(self, m1: Dict[str, np.ndarray], seconds: int):
+        buckets = m1['time'] - m1['time'] % seconds
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)]
+        self.seconds = seconds
+        self.starts = starts
+        self.time = buckets[starts]
+        self.open = m1['open'][starts]
+        self.high = np.maximum.reduceat(m1['high'], starts)
+        self.low = np.minimum.reduceat(m1['low'], starts)
+        self.close = m1['close'][ends - 1]
+        self.volume = np.add.reduceat(m1['tick_volume'], starts)
+
+
+class _ReplaySymbol:
+    """Replay state of one symbol"""
+
+    def __init__(self, symbol: str, rates: np.ndarray):
+        times = np.asarray(rates['time'], dtype=np.int64)
+        order = np.argsort(times, kind='stable')
+        # One bar per minute: keep the last copy of a repeated time
+        order = order[np.r_[times[order][1:] != times[order][:-1], True]]
+        self.symbol = symbol
+        self.m1 = {
+            'time': rates['time'][order].astype(np.int64),
+            'open': rates['open'][order].astype(float),
+            'high': rates['high'][order].astype(float),
+            'low': rates['low'][order].astype(float),
+            'close': rates['close'][order].astype(float),
+            'tick_volume': rates['tick_volume'][order].astype(np.int64),
+        }
+        self.cursor = -1                       # index of the newest completed M1 bar
+        self.timeframes: Dict[str, _Timeframe] = {}
+        self.candles: Dict[str, List[Candle]] = {}  # completed-bar Candle cache per timeframe
+
+    def timeframe(self, name: str) -> _Timeframe:
+        if name not in self.timeframes:
+            self.timeframes[name] = _Timeframe(self.m1, TIMEFRAME_SECONDS[name])
+        return self.timeframes[name]
+
+
+def _to_datetime(seconds: int) -> datetime:
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+class ReplayConnector:
+    """
+    MT5DirectConnector-compatible market replay
+
+    Call advance() to move the virtual clock to the close of the next M1
+    bar; strategies constructed with this connector read time through
+    clock(). Candle objects are cached and shared between calls, so callers
+    must treat them as read-only.
+    """
+
+    def __init__(self, rates: Dict[str, np.ndarray], config: Optional[ReplayConfig] = None):
+        self.config = config or ReplayConfig()
+        self.simulation_mode = True
+        self.connected = False
+        self.symbols: Dict[str, _ReplaySymbol] = {
+            symbol: _ReplaySymbol(symbol, data) for symbol, data in rates.items() if len(data['time'])
+        }
+        self.active_symbols = list(self.symbols)
+        self.current_ticks: Dict[str, Tick] = {}
+
+        # Virtual clock: every distinct M1 bar time across symbols
+        self.steps = np.unique(np.concatenate([s.m1['time'] for s in self.symbols.values()])) \
+            if self.symbols else np.empty(0, dtype=np.int64)
+        self.step = -1
+        self.updated: List[str] = []           # symbols that printed a bar at the current step
+        self.now_seconds = int(self.steps[0]) if len(self.steps) else 0
+
+        self.rng = np.random.default_rng(self.config.seed)
+        self.balance = self.config.initial_balance
+        self.open_trades: Dict[int, ReplayTrade] = {}
+        self.closed_trades: List[ReplayTrade] = []
+        self._next_ticket = 1
+
+    @classmethod
+    def from_archive(cls, archive, symbols: List[str], start=None, end=None,
+                     config: Optional[ReplayConfig] = None) -> 'ReplayConnector':
+        """Replay M1 bars stored in a CandleArchive"""
+        fields = ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+        return cls({symbol: archive.range(symbol, 'M1', start, end, fields=fields).columns
+                    for symbol in symbols}, config)
+
+    # -- virtual clock -----------------------------------------------------
+
+    def clock(self) -> datetime:
+        return _to_datetime(self.now_seconds)
+
+    @property
+    def finished(self) -> bool:
+        return self.step + 1 >= len(self.steps)
+
+    def advance(self) -> bool:
+        """Close the next M1 bar: move cursors, update ticks and settle SL/TP; False at the end"""
+        if self.finished:
+            return False
+        self.step += 1
+        bar_time = int(self.steps[self.step])
+        self.now_seconds = bar_time + M1_SECONDS
+        self.updated = []
+        for state in self.symbols.values():
+            times = state.m1['time']
+            cursor = state.cursor
+            if cursor + 1 < len(times) and times[cursor + 1] == bar_time:
+                state.cursor = cursor + 1
+                self.updated.append(state.symbol)
+                self._settle(state)
+        return True
+
+    # -- MT5DirectConnector interface -------------------------------------
+
+    async def connect(self) -> bool:
+        self.connected = True
+        return True
+
+    def disconnect(self):
+        self.connected = False
+
+    async def get_current_tick(self, symbol: str) -> Optional[Tick]:
+        state = self.symbols.get(symbol)
+        if state is None or state.cursor < 0:
+            return None
+        bid = float(state.m1['close'][state.cursor])
+        tick = Tick(symbol=symbol, bid=bid, ask=bid + self._spread(symbol),
+                    time=self.clock(), volume=int(state.m1['tick_volume'][state.cursor]))
+        self.current_ticks[symbol] = tick
+        return tick
+
+    async def get_candles(self, symbol: str, timeframe: str, count: int = 100) -> List[Candle]:
+        """Newest `count` bars visible at the virtual time (forming higher-timeframe bar included)"""
+        state = self.symbols.get(symbol)
+        if state is None or state.cursor < 0:
+            return []
+        if timeframe not in TIMEFRAME_SECONDS:
+            timeframe = 'M5'  # same fallback as MT5DirectConnector
+
+        if timeframe == 'M1':
+            cache = self._completed(state, 'M1', state.cursor + 1)
+            return cache[max(0, state.cursor + 1 - count):state.cursor + 1]
+
+        frame = state.timeframe(timeframe)
+        # Bars whose period has fully elapsed are complete; the next one may be forming
+        completed = int(np.searchsorted(frame.time + frame.seconds, self.now_seconds, 'right'))
+        cache = self._completed(state, timeframe, completed)
+        candles = cache[max(0, completed - count):completed]
+        if completed < len(frame.time) and frame.starts[completed] <= state.cursor:
+            candles = candles[1:] if len(candles) == count else candles
+            candles.append(self._forming(state, timeframe, frame, completed))
+        return candles
+
+    async def place_order(self, symbol: str, order_type: OrderType, volume: float,
+                          price: float = 0.0, sl: float = 0.0, tp: float = 0.0,
+                          comment: str = "MikrobotV2") -> Optional[Dict]:
+        """Fill a market order at the replayed bid/ask plus slippage"""
+        tick = await self.get_current_tick(symbol)
+        if tick is None or order_type not in (OrderType.BUY, OrderType.SELL):
+            logger.warning(f"Replay rejected {order_type.value} {symbol}: only market orders are simulated")
+            return None
+
+        slippage = self._slippage(symbol)
+        fill = tick.ask + slippage if order_type == OrderType.BUY else tick.bid - slippage
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self.open_trades[ticket] = ReplayTrade(
+            ticket=ticket, symbol=symbol, type=order_type, volume=volume,
+            open_time=self.clock(), price_open=fill, sl=sl, tp=tp, comment=comment
+        )
+        return {
+            "retcode": TRADE_RETCODE_DONE,
+            "deal": ticket,
+            "order": ticket,
+            "volume": volume,
+            "price": fill,
+            "comment": comment
+        }
+
+    async def get_positions(self) -> List[Position]:
+        positions = []
+        for trade in self.open_trades.values():
+            current = self._exit_price(trade)
+            positions.append(Position(
+                ticket=trade.ticket,
+                symbol=trade.symbol,
+                type=trade.type,
+                volume=trade.volume,
+                price_open=trade.price_open,
+                price_current=current,
+                profit=self._profit(trade, current),
+                swap=0.0,
+                comment=trade.comment
+            ))
+        return positions
+
+    async def close_position(self, ticket: int) -> bool:
+        trade = self.open_trades.get(ticket)
+        if trade is None:
+            return False
+        slippage = self._slippage(trade.symbol)
+        price = self._exit_price(trade)
+        self._close(trade, price - slippage if trade.type == OrderType.BUY else price + slippage, "manual")
+        return True
+
+    # -- internals ---------------------------------------------------------
+
+    def _spread(self, symbol: str) -> float:
+        return self.config.spread_pips * self.config.pip_size(symbol)
+
+    def _slippage(self, symbol: str) -> float:
+        return float(self.rng.random()) * self.config.slippage_pips * self.config.pip_size(symbol)
+
+    def _exit_price(self, trade: ReplayTrade) -> float:
+        """Price a position would close at now (bid for longs, ask for shorts)"""
+        state = self.symbols[trade.symbol]
+        bid = float(state.m1['close'][state.cursor])
+        return bid if trade.type == OrderType.BUY else bid + self._spread(trade.symbol)
+
+    def _profit(self, trade: ReplayTrade, price: float) -> float:
+        direction = 1.0 if trade.type == OrderType.BUY else -1.0
+        return direction * (price - trade.price_open) * trade.volume * self.config.contract_size(trade.symbol)
+
+    def _close(self, trade: ReplayTrade, price: float, reason: str):
+        trade.close_time = self.clock()
+        trade.price_close = price
+        trade.profit = self._profit(trade, price)
+        trade.close_reason = reason
+        self.balance += trade.profit
+        del self.open_trades[trade.ticket]
+        self.closed_trades.append(trade)
+
+    def _settle(self, state: _ReplaySymbol):
+        """Close positions whose SL/TP lies inside the new bar (SL first when both do)"""
+        if not self.open_trades:
+            return
+        high = float(state.m1['high'][state.cursor])
+        low = float(state.m1['low'][state.cursor])
+        spread = self._spread(state.symbol)
+        for trade in [t for t in self.open_trades.values() if t.symbol == state.symbol]:
+            if trade.type == OrderType.BUY:
+                if trade.sl and low <= trade.sl:
+                    self._close(trade, trade.sl, "sl")
+                elif trade.tp and high >= trade.tp:
+                    self._close(trade, trade.tp, "tp")
+            else:
+                if trade.sl and high + spread >= trade.sl:
+                    self._close(trade, trade.sl, "sl")
+                elif trade.tp and low + spread <= trade.tp:
+                    self._close(trade, trade.tp, "tp")
+
+    def _completed(self, state: _ReplaySymbol, timeframe: str, count: int) -> List[Candle]:
+        """Candle cache of completed bars, extended up to `count` bars"""
+        cache = state.candles.setdefault(timeframe, [])
+        if len(cache) < count:
+            if timeframe == 'M1':
+                m1 = state.m1
+                columns = (m1['time'], m1['open'], m1['high'], m1['low'], m1['close'], m1['tick_volume'])
+            else:
+                frame = state.timeframe(timeframe)
+                columns = (frame.time, frame.open, frame.high, frame.low, frame.close, frame.volume)
+            lo = len(cache)
+            cache.extend(
+                Candle(symbol=state.symbol, timeframe=timeframe, time=_to_datetime(t),
+                       open=o, high=h, low=l, close=c, volume=v)
+                for t, o, h, l, c, v in zip(*(column[lo:count].tolist() for column in columns))
+            )
+        return cache
+
+    @staticmethod
+    def _forming(state: _ReplaySymbol, timeframe: str, frame: _Timeframe, index: int) -> Candle:
+        lo, hi = int(frame.starts[index]), state.cursor + 1
+        m1 = state.m1
+        return Candle(
+            symbol=state.symbol,
+            timeframe=timeframe,
+            time=_to_datetime(frame.time[index]),
+            open=float(m1['open'][lo]),
+            high=float(m1['high'][lo:hi].max()),
+            low=float(m1['low'][lo:hi].min()),
+            close=float(m1['close'][hi - 1]),
+            volume=int(m1['tick_volume'][lo:hi].sum())
+        )
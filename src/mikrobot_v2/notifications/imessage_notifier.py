@@ -6,11 +6,12 @@ Sends real-time iMessage notifications for Lightning Bolt trading phases
 Integrates with ML/MCP price data analysis from MT5
 """
 
+import asyncio
 import subprocess
 import logging
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,9 @@ class iMessageNotifier:
             "NEUTRAL": "➡️"
         }
         
+        # Phase notifications scheduled on the caller's event loop
+        self._pending: Set[asyncio.Task] = set()
+        
         logger.info("📱 iMessage Notifier initialized")
     
     def send_imessage(self, message: str, recipient: Optional[str] = None, 
@@ -118,29 +122,56 @@ class iMessageNotifier:
     def notify_lightning_bolt_phase(self, phase_data: LightningBoltPhase) -> bool:
         """
         Send Lightning Bolt phase notification with chart image
+        
+        Called from a running event loop (the strategy scan), the chart render
+        and the AppleScript send are scheduled as a task and True means the
+        notification was queued; otherwise it runs to completion here.
         """
-        emoji = self.phase_emojis.get(phase_data.phase, "⚡")
-        symbol = phase_data.symbol
-        phase_name = phase_data.phase_name
-        price = phase_data.price
-        confidence = phase_data.confidence
-        timeframe = phase_data.timeframe
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.notify_lightning_bolt_phase_async(phase_data))
         
-        # Generate PROFESSIONAL CANDLESTICK chart
+        task = loop.create_task(self.notify_lightning_bolt_phase_async(phase_data))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return True
+    
+    async def notify_lightning_bolt_phase_async(self, phase_data: LightningBoltPhase) -> bool:
+        """
+        Render the phase chart in the chart service and send the notification
+        without blocking the event loop
+        """
         chart_path = None
         try:
             from ..charts.chart_generator import chart_generator
-            phase_name_clean = f"Phase {phase_data.phase} - {phase_name}"
-            chart_path = chart_generator.generate_professional_candlestick_chart_sync(symbol, phase_name_clean, price)
+            phase_name_clean = f"Phase {phase_data.phase} - {phase_data.phase_name}"
+            chart_path = await chart_generator.generate_professional_candlestick_chart(
+                phase_data.symbol, phase_name_clean, phase_data.price)
         except Exception as e:
             logger.warning(f"Professional candlestick chart failed: {e}")
+        
+        if chart_path is None:
             # Fallback to simple chart
             try:
-                from ..charts.chart_generator import generate_pattern_chart
-                chart_path = generate_pattern_chart(symbol, f"Phase {phase_data.phase}", price)
+                from ..charts.chart_generator import generate_pattern_chart_async
+                chart_path = await generate_pattern_chart_async(
+                    phase_data.symbol, f"Phase {phase_data.phase}", phase_data.price)
             except Exception as e2:
                 logger.warning(f"Fallback chart failed: {e2}")
         
+        message = self._phase_message(phase_data)
+        return await asyncio.to_thread(self.send_imessage, message, image_path=chart_path)
+    
+    def _phase_message(self, phase_data: LightningBoltPhase) -> str:
+        """Phase-specific notification text"""
+        emoji = self.phase_emojis.get(phase_data.phase, "⚡")
+        symbol = phase_data.symbol
+        phase_name = phase_data.phase_name
+        price = phase_data.price
+        confidence = phase_data.confidence
+        timeframe = phase_data.timeframe
+        
         # Determine trend direction from details
         trend = "NEUTRAL"
         if phase_data.details:
@@ -206,7 +237,7 @@ PHASE {phase_data.phase}: {phase_name}
 Confidence: {confidence:.1%}
 {datetime.now().strftime('%H:%M:%S')}"""
         
-        return self.send_imessage(message, image_path=chart_path)
+        return message
     
     def notify_market_structure_change(self, symbol: str, change_type: str, 
                                      price: float, details: Dict[str, Any]) -> bool:
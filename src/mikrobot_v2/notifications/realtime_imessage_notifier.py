@@ -113,7 +113,7 @@ Confidence: {confidence:.1%}
 📈 Real-time chart mukana!"""
         
         # Send with real-time chart
-        return self.send_imessage(message, image_path=chart_path)
+        return await asyncio.to_thread(self.send_imessage, message, image_path=chart_path)
 
 # Global real-time notifier
 realtime_notifier = RealTimeMessageNotifier()
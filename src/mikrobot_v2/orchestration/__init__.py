@@ -5,7 +5,15 @@ MIKROBOT FASTVERSION v2.0 - Orchestration
 MCP orchestration and Hansei reflection systems.
 """
 
-from .mcp_v2_controller import MCPv2Controller, MCPMessage, MessageType, AgentType
-from .hansei_reflector import HanseiReflector, ReflectionType
+from ..utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MCPv2Controller': '.mcp_v2_controller',
+    'MCPMessage': '.mcp_v2_controller',
+    'MessageType': '.mcp_v2_controller',
+    'AgentType': '.mcp_v2_controller',
+    'HanseiReflector': '.hansei_reflector',
+    'ReflectionType': '.hansei_reflector',
+})
 
 __all__ = ['MCPv2Controller', 'MCPMessage', 'MessageType', 'AgentType', 'HanseiReflector', 'ReflectionType']
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Replay Engine - Offline Backtesting for Lightning Bolt
+======================================================
+
+Drives a strategy bar by bar over a ReplayConnector as fast as the CPU
+allows. Each virtual M1 close runs analyze_symbol() for the symbols that
+printed a new bar, executes signals the way TradeExecutor does (ATR lot
+size when available, SL/TP from the signal, one position per symbol) and
+lets the connector settle stops and targets. Notifications are disabled
+for the run. The report carries every trade, P&L figures and throughput.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .core.mt5_direct_connector import OrderType
+from .core.replay_connector import ReplayConnector, ReplayTrade
+from .utils.atr_engine import ATREngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of one replay run"""
+    steps: int = 0                 # virtual M1 closes
+    bars: int = 0                  # symbol bars replayed (steps x symbols trading)
+    analyses: int = 0
+    signals: int = 0
+    wall_seconds: float = 0.0
+    initial_balance: float = 0.0
+    final_balance: float = 0.0
+    trades: List[ReplayTrade] = field(default_factory=list)
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def net_profit(self) -> float:
+        return self.final_balance - self.initial_balance
+
+    @property
+    def win_rate(self) -> float:
+        return sum(t.profit > 0 for t in self.trades) / len(self.trades) if self.trades else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough fall of the closed-trade equity curve"""
+        peak = equity = self.initial_balance
+        worst = 0.0
+        for trade in self.trades:
+            equity += trade.profit
+            peak = max(peak, equity)
+            worst = max(worst, peak - equity)
+        return worst
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'steps': self.steps,
+            'bars': self.bars,
+            'signals': self.signals,
+            'trades': len(self.trades),
+            'net_profit': round(self.net_profit, 2),
+            'win_rate': round(self.win_rate, 4),
+            'max_drawdown': round(self.max_drawdown, 2),
+            'final_balance': round(self.final_balance, 2),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'bars_per_second': round(self.bars_per_second, 1),
+        }
+
+
+class ReplayEngine:
+    """
+    Bar-by-bar strategy driver over a ReplayConnector
+
+    `strategy` defaults to a LightningBoltStrategy bound to the connector.
+    Analysis starts after `warmup_steps` M1 closes so M5 structure and H1
+    ATR history are available. The default strategy sizes on an ATR engine
+    of its own, on the connector's virtual clock.
+    """
+
+    def __init__(self, connector: ReplayConnector, strategy=None, warmup_steps: int = 1000,
+                 default_volume: float = 0.01):
+        if strategy is None:
+            from .strategies.lightning_bolt import LightningBoltStrategy
+            strategy = LightningBoltStrategy(connector, atr_engine=ATREngine.for_clock(connector.clock),
+                                             clock=connector.clock)
+        self.connector = connector
+        self.strategy = strategy
+        self.warmup_steps = warmup_steps
+        self.default_volume = default_volume
+        if hasattr(strategy, 'notifications_enabled'):
+            strategy.notifications_enabled = False
+
+    async def run(self, max_steps: Optional[int] = None) -> ReplayReport:
+        connector = self.connector
+        report = ReplayReport(initial_balance=connector.balance)
+        start = time.perf_counter()
+
+        while (max_steps is None or report.steps < max_steps) and connector.advance():
+            report.steps += 1
+            report.bars += len(connector.updated)
+            if connector.step < self.warmup_steps:
+                continue
+            for symbol in connector.updated:
+                report.analyses += 1
+                signal = await self.strategy.analyze_symbol(symbol)
+                if signal:
+                    report.signals += 1
+                    await self._execute(signal)
+
+        for ticket in list(connector.open_trades):
+            await connector.close_position(ticket)
+        report.wall_seconds = time.perf_counter() - start
+        report.final_balance = connector.balance
+        report.trades = list(connector.closed_trades)
+        return report
+
+    async def _execute(self, signal) -> Optional[Dict]:
+        """Place a signal as a market order, mirroring TradeExecutor.execute_trade"""
+        if any(t.symbol == signal.symbol for t in self.connector.open_trades.values()):
+            return None
+        atr_info = getattr(signal, 'atr_info', None)
+        volume = atr_info['position_size'] if atr_info else self.default_volume
+        order_type = OrderType.BUY if signal.direction.value == 'BULLISH' else OrderType.SELL
+        return await self.connector.place_order(
+            symbol=signal.symbol,
+            order_type=order_type,
+            volume=volume,
+            price=signal.entry_price,
+            sl=signal.stop_loss,
+            tp=signal.take_profit,
+            comment=f"REPLAY_LB_{signal.direction.value[:4]}"
+        )
@@ -5,6 +5,12 @@ MIKROBOT FASTVERSION v2.0 - Trading Strategies
 Lightning Bolt and other trading strategies.
 """
 
-from .lightning_bolt import LightningBoltStrategy, TrendDirection, YlipipCalculator
+from ..utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'LightningBoltStrategy': '.lightning_bolt',
+    'TrendDirection': '.lightning_bolt',
+    'YlipipCalculator': '.lightning_bolt',
+})
 
 __all__ = ['LightningBoltStrategy', 'TrendDirection', 'YlipipCalculator']
\ No newline at end of file
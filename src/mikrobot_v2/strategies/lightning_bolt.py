@@ -19,10 +19,10 @@ from enum import Enum
 import numpy as np
 
 from ..core.mt5_direct_connector import Candle, Tick, OrderType
-from ..notifications.imessage_notifier import (
-    imessage_notifier, notify_bos_detected, notify_retest_confirmed, 
-    notify_entry_executed, LightningBoltPhase
-)
+from ..utils.lazy_imports import lazy_import
+
+# iMessage notifications are only imported once a pattern is actually reported
+notifications = lazy_import('..notifications.imessage_notifier', __package__)
 
 logger = logging.getLogger(__name__)
 
@@ -234,11 +234,16 @@ class LightningBoltStrategy:
     Phase 3: Entry at +0.6 Ylipip
     """
     
-    def __init__(self, mt5_connector):
+    def __init__(self, mt5_connector, atr_engine=None, clock=None):
         self.mt5 = mt5_connector
+        self.atr_engine = atr_engine  # None: the sizer builds one for this connector
         self.structure_analyzer = StructureAnalyzer()
         self.ylipip_calc = YlipipCalculator()
         
+        # Time source: replays pass the connector's virtual clock
+        self.clock = clock or datetime.now
+        self.notifications_enabled = True
+        
         # Pattern tracking
         self.active_patterns: Dict[str, BOSPattern] = {}
         self.trade_signals: List[LightningBoltSignal] = []
@@ -260,12 +265,12 @@ class LightningBoltStrategy:
         if symbol not in self.signal_cooldown:
             return False
         
-        time_since_last = datetime.now() - self.signal_cooldown[symbol]
+        time_since_last = self.clock() - self.signal_cooldown[symbol]
         return time_since_last.total_seconds() < (self.cooldown_minutes * 60)
     
     def _add_symbol_to_cooldown(self, symbol: str):
         """Add symbol to cooldown period"""
-        self.signal_cooldown[symbol] = datetime.now()
+        self.signal_cooldown[symbol] = self.clock()
     
     async def analyze_symbol(self, symbol: str) -> Optional[LightningBoltSignal]:
         """Analyze symbol for Lightning Bolt pattern with strict filtering"""
@@ -367,12 +372,13 @@ class LightningBoltStrategy:
                     logger.info(f"📈 VALID M5 BOS: {symbol} bullish @ {level.price} (confidence: {confidence:.1%})")
                     
                     # 📱 Send iMessage notification for Phase 1
-                    notify_bos_detected(
-                        symbol=symbol,
-                        price=level.price,
-                        confidence=confidence,
-                        timeframe="M5"
-                    )
+                    if self.notifications_enabled:
+                        notifications.notify_bos_detected(
+                            symbol=symbol,
+                            price=level.price,
+                            confidence=confidence,
+                            timeframe="M5"
+                        )
                     
                     return pattern
                 
@@ -411,12 +417,13 @@ class LightningBoltStrategy:
                     logger.info(f"📉 VALID M5 BOS: {symbol} bearish @ {level.price} (confidence: {confidence:.1%})")
                     
                     # 📱 Send iMessage notification for Phase 1 (Bearish)
-                    notify_bos_detected(
-                        symbol=symbol,
-                        price=level.price,
-                        confidence=confidence,
-                        timeframe="M5"
-                    )
+                    if self.notifications_enabled:
+                        notifications.notify_bos_detected(
+                            symbol=symbol,
+                            price=level.price,
+                            confidence=confidence,
+                            timeframe="M5"
+                        )
                     
                     return pattern
         
@@ -444,12 +451,13 @@ class LightningBoltStrategy:
                 logger.info(f"✅ M1 RETEST CONFIRMED: {symbol} bullish retest @ {candle.low}")
                 
                 # 📱 Send iMessage notification for Phase 2 (Bullish Retest)
-                notify_retest_confirmed(
-                    symbol=symbol,
-                    price=candle.close,
-                    retest_level=bos_pattern.break_level,
-                    confidence=bos_pattern.confidence
-                )
+                if self.notifications_enabled:
+                    notifications.notify_retest_confirmed(
+                        symbol=symbol,
+                        price=candle.close,
+                        retest_level=bos_pattern.break_level,
+                        confidence=bos_pattern.confidence
+                    )
                 
                 return True
             
@@ -462,12 +470,13 @@ class LightningBoltStrategy:
                 logger.info(f"✅ M1 RETEST CONFIRMED: {symbol} bearish retest @ {candle.high}")
                 
                 # 📱 Send iMessage notification for Phase 2 (Bearish Retest)
-                notify_retest_confirmed(
-                    symbol=symbol,
-                    price=candle.close,
-                    retest_level=bos_pattern.break_level,
-                    confidence=bos_pattern.confidence
-                )
+                if self.notifications_enabled:
+                    notifications.notify_retest_confirmed(
+                        symbol=symbol,
+                        price=candle.close,
+                        retest_level=bos_pattern.break_level,
+                        confidence=bos_pattern.confidence
+                    )
                 
                 return True
         
@@ -486,7 +495,7 @@ class LightningBoltStrategy:
         
         # Initialize ATR sizer if not exists
         if not hasattr(self, 'atr_sizer'):
-            self.atr_sizer = ATRPositionSizer(self.mt5)
+            self.atr_sizer = ATRPositionSizer(self.mt5, atr_engine=self.atr_engine, clock=self.clock)
         
         # Calculate entry price with Ylipip offset
         ylipip_offset = self.ylipip_calc.get_ylipip(symbol)
@@ -513,7 +522,7 @@ class LightningBoltStrategy:
                     ylipip_offset=ylipip_offset,
                     confidence=bos_pattern.confidence,
                     phase=PatternPhase.ENTRY_TRIGGERED,
-                    timestamp=datetime.now()
+                    timestamp=self.clock()
                 )
                 
                 # Add ATR info to signal
@@ -524,13 +533,14 @@ class LightningBoltStrategy:
                 logger.info(f"   🛡️ Fib 0.328 Stop: {position_info['stop_loss']}")
                 
                 # 📱 Send iMessage notification for Phase 3 (Bullish Entry)
-                notify_entry_executed(
-                    symbol=symbol,
-                    entry_price=entry_price,
-                    sl=position_info['stop_loss'],
-                    tp=position_info['take_profit'],
-                    volume=position_info['position_size']
-                )
+                if self.notifications_enabled:
+                    notifications.notify_entry_executed(
+                        symbol=symbol,
+                        entry_price=entry_price,
+                        sl=position_info['stop_loss'],
+                        tp=position_info['take_profit'],
+                        volume=position_info['position_size']
+                    )
                 
                 return signal
         
@@ -556,7 +566,7 @@ class LightningBoltStrategy:
                     ylipip_offset=ylipip_offset,
                     confidence=bos_pattern.confidence,
                     phase=PatternPhase.ENTRY_TRIGGERED,
-                    timestamp=datetime.now()
+                    timestamp=self.clock()
                 )
                 
                 # Add ATR info to signal
@@ -567,13 +577,14 @@ class LightningBoltStrategy:
                 logger.info(f"   🛡️ Fib 0.328 Stop: {position_info['stop_loss']}")
                 
                 # 📱 Send iMessage notification for Phase 3 (Bearish Entry)
-                notify_entry_executed(
-                    symbol=symbol,
-                    entry_price=entry_price,
-                    sl=position_info['stop_loss'],
-                    tp=position_info['take_profit'],
-                    volume=position_info['position_size']
-                )
+                if self.notifications_enabled:
+                    notifications.notify_entry_executed(
+                        symbol=symbol,
+                        entry_price=entry_price,
+                        sl=position_info['stop_loss'],
+                        tp=position_info['take_profit'],
+                        volume=position_info['position_size']
+                    )
                 
                 return signal
         
@@ -652,7 +663,7 @@ class LightningBoltStrategy:
     
     def clear_old_patterns(self, max_age_hours: int = 4):
         """Clear patterns older than specified hours"""
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+        cutoff_time = self.clock() - timedelta(hours=max_age_hours)
         
         to_remove = []
         for symbol, pattern in self.active_patterns.items():
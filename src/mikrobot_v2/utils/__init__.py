@@ -5,6 +5,14 @@ MIKROBOT FASTVERSION v2.0 - Utilities
 Utility modules for trading system.
 """
 
-from .atr_position_sizer import ATRPositionSizer
+from .lazy_imports import LazyModule, lazy_import, lazy_exports, is_available
 
-__all__ = ['ATRPositionSizer']
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'ATREngine': '.atr_engine',
+    'ATRPositionSizer': '.atr_position_sizer',
+    'batch_atr': '.atr_engine',
+    'shared_atr_engine': '.atr_engine',
+})
+
+__all__ = ['ATREngine', 'ATRPositionSizer', 'batch_atr', 'shared_atr_engine',
+           'LazyModule', 'lazy_import', 'lazy_exports', 'is_available']
\ No newline at end of file
@@ -0,0 +1,431 @@
+"""
+ATR Engine - Incremental Average True Range Service
+===================================================
+
+One shared ATR per (symbol, timeframe), kept up to date as bars close
+instead of being recomputed from a fresh candle fetch on every sizing call.
+
+- SMA (mean of the last `period` true ranges, what the sizers always used)
+  or Wilder smoothing, updated in O(1) per closed bar
+- a series stays valid until its forming bar closes, so reads are a
+  dictionary hit until the next bar boundary; only then is a top-up fetch
+  needed, and it asks for just the bars that closed since
+- at most `max_series` series are kept, least recently used evicted first
+- batch_atr() computes ATR for many symbols from one (symbols x bars) array
+
+Bar fetches follow MT5's copy_rates_from_pos: oldest first, with the
+still-forming bar last. The forming bar is never part of the ATR; its open
+time marks when the series goes stale.
+
+Series and the learnt broker clock offset belong to one market, so each
+connector gets its own engine; a replay must never read ATRs or clock skew
+left behind by another run.
+
+    engine = ATREngine.for_clock(connector.clock)
+    atr = engine.atr('EURUSD', 'M1', now)          # None when stale or unknown
+    if atr is None:
+        rates = mt5.copy_rates_from_pos('EURUSD', mt5.TIMEFRAME_M1, 0,
+                                        engine.bars_needed('EURUSD', 'M1', now))
+        atr = engine.ingest_rates('EURUSD', 'M1', rates, now)
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .timeframes import TIMEFRAME_SECONDS
+
+METHODS = ('sma', 'wilder')
+
+
+def true_range(highs, lows, closes, prev_close: Optional[float] = None) -> np.ndarray:
+    """
+    True range of each bar along the last axis
+
+    Without prev_close the first bar only provides the previous close, so
+    the result is one shorter than the input.
+    """
+    highs, lows, closes = (np.asarray(a, dtype=np.float64) for a in (highs, lows, closes))
+    if prev_close is None:
+        highs, lows, prev = highs[..., 1:], lows[..., 1:], closes[..., :-1]
+    else:
+        prev = np.concatenate(([prev_close], closes[:-1]))
+    return np.maximum(highs - lows, np.maximum(np.abs(highs - prev), np.abs(lows - prev)))
+
+
+def _wilder(tr: np.ndarray, period: int, seed=None):
+    """Wilder-smoothed ATR after the last true range (along the last axis)"""
+    if seed is None:
+        seed = tr[..., :period].mean(axis=-1)
+        tr = tr[..., period:]
+    alpha = (period - 1) / period
+    steps = tr.shape[-1]
+    weights = (1 - alpha) * alpha ** np.arange(steps - 1, -1, -1)
+    return alpha ** steps * seed + tr @ weights
+
+
+def batch_atr(highs, lows, closes, period: int = 14, method: str = 'sma') -> np.ndarray:
+    """
+    ATR of the closed bars for every row of (symbols x bars) arrays
+
+    Needs at least period + 1 bars per row; rows are assumed to be aligned
+    and complete.
+    """
+    tr = true_range(highs, lows, closes)
+    if tr.shape[-1] < period:
+        raise ValueError(f"Need at least {period + 1} bars for a {period}-period ATR")
+    if method == 'wilder':
+        return _wilder(tr, period)
+    return tr[..., -period:].mean(axis=-1)
+
+
+class _ATRSeries:
+    """ATR state for one symbol and timeframe"""
+
+    __slots__ = ('trs', 'tr_sum', 'atr', 'prev_close', 'last_closed', 'forming_open')
+
+    def __init__(self, period: int):
+        self.trs = deque(maxlen=period)  # last `period` TRs (SMA), or TRs until seeded (Wilder)
+        self.tr_sum = 0.0
+        self.atr: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.last_closed: Optional[float] = None  # open time of the newest closed bar
+        self.forming_open: Optional[float] = None  # open time of the bar after it
+
+
+class ATREngine:
+    """
+    Incrementally maintained ATR for many symbols and timeframes
+
+    Times are epoch seconds. `now` is the caller's clock; the engine learns
+    how far the broker's bar clock runs ahead of it from the forming bar of
+    each fetch. That is a lower bound, short by however far into the bar
+    the fetch happened, so a series may be served for up to one bar of the
+    finest timeframe fetched after it went stale; observe_server_time()
+    with a tick time removes the error. A forming bar that should already
+    have closed under the current offset means the clock moved back, and
+    the offset is lowered to match.
+    """
+
+    def __init__(self, period: int = 14, method: str = 'sma', max_series: int = 512,
+                 history: Optional[int] = None, clock: Callable[[], float] = time.time):
+        if method not in METHODS:
+            raise ValueError(f"Unknown ATR method {method!r}, expected one of {METHODS}")
+        if max_series <= 0:
+            raise ValueError("max_series must be positive")
+
+        self.period = period
+        self.method = method
+        self.max_series = max_series
+        # Bars fetched to (re)seed a series, forming bar included
+        self.history = history or (period + 2 if method == 'sma' else 4 * period + 2)
+        self.clock = clock
+        self.skew: Optional[float] = None
+
+        self._series: "OrderedDict[Tuple[str, str], _ATRSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bars_ingested = 0
+
+    @classmethod
+    def for_clock(cls, clock: Optional[Callable[[], datetime]] = None, period: int = 14,
+                  method: str = 'sma', **kwargs) -> 'ATREngine':
+        """Engine of its own on a datetime clock (a replay connector's virtual clock), wall time if None"""
+        return cls(period=period, method=method, clock=epoch_clock(clock), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def atr(self, symbol: str, timeframe: str, now: Optional[float] = None) -> Optional[float]:
+        """Current ATR, or None when unknown or a bar has closed since the last update"""
+        series = self._series.get((symbol, timeframe))
+        if series is None or series.atr is None or self._is_stale(series, timeframe, now):
+            self.misses += 1
+            return None
+        self._series.move_to_end((symbol, timeframe))
+        self.hits += 1
+        return series.atr
+
+    def last_value(self, symbol: str, timeframe: str) -> Optional[float]:
+        """Latest ATR regardless of staleness"""
+        series = self._series.get((symbol, timeframe))
+        return series.atr if series is not None else None
+
+    def bars_needed(self, symbol: str, timeframe: str, now: Optional[float] = None) -> int:
+        """
+        Bars to fetch (forming bar included) to bring a series up to date:
+        0 when current, the closed bars since the last update plus one of
+        overlap, or the full history for a new or long-stale series
+        """
+        series = self._series.get((symbol, timeframe))
+        if series is None or series.atr is None or series.forming_open is None:
+            return self.history
+        if not self._is_stale(series, timeframe, now):
+            return 0
+        closed = int((self._server_now(now) - series.forming_open) // TIMEFRAME_SECONDS[timeframe])
+        # New closed bars, plus the last one already seen as overlap and the new forming bar
+        return min(closed + 2, self.history)
+
+    def get(self, symbol: str, timeframe: str, fetch: Callable[[int], Optional[np.ndarray]],
+            now: Optional[float] = None) -> Optional[float]:
+        """Cached ATR, topped up through fetch(count) -> MT5 rates when a bar has closed"""
+        now = self.clock() if now is None else now
+        atr = self.atr(symbol, timeframe, now)
+        if atr is not None:
+            return atr
+        rates = fetch(self.bars_needed(symbol, timeframe, now))
+        if rates is None or len(rates) == 0:
+            return None
+        return self.ingest_rates(symbol, timeframe, rates, now)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def ingest_rates(self, symbol: str, timeframe: str, rates: np.ndarray,
+                     now: Optional[float] = None) -> Optional[float]:
+        """Feed an MT5 rates array (time/high/low/close fields), forming bar last"""
+        return self.ingest(symbol, timeframe, rates['time'], rates['high'], rates['low'], rates['close'], now)
+
+    def ingest_candles(self, symbol: str, timeframe: str, candles: Sequence,
+                       now: Optional[float] = None) -> Optional[float]:
+        """Feed Candle objects as returned by the connectors' get_candles()"""
+        if not candles:
+            return self.last_value(symbol, timeframe)
+        times = [candle.time.timestamp() for candle in candles]
+        return self.ingest(symbol, timeframe, times,
+                           [candle.high for candle in candles],
+                           [candle.low for candle in candles],
+                           [candle.close for candle in candles], now)
+
+    def ingest(self, symbol: str, timeframe: str, times, highs, lows, closes,
+               now: Optional[float] = None) -> Optional[float]:
+        """
+        Feed a fetch of bars, oldest first with the forming bar last
+
+        Bars at or before the series' newest closed bar are skipped. A fetch
+        that does not reach back to that bar means a gap, and the series is
+        rebuilt from this fetch alone.
+        """
+        now = self.clock() if now is None else now
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) == 0:
+            return self.last_value(symbol, timeframe)
+
+        with self._lock:
+            self._learn_skew(float(times[-1]) - now, timeframe)
+
+            series = self._series_for(symbol, timeframe)
+            closed = slice(0, len(times) - 1)
+            if series.last_closed is not None:
+                if times[0] > series.last_closed:
+                    series = self._reset(symbol, timeframe)
+                else:
+                    closed = slice(int(np.searchsorted(times[:-1], series.last_closed, side='right')),
+                                   len(times) - 1)
+
+            self._push(series, np.asarray(highs, dtype=np.float64)[closed],
+                       np.asarray(lows, dtype=np.float64)[closed],
+                       np.asarray(closes, dtype=np.float64)[closed])
+            if closed.stop > closed.start:
+                series.last_closed = float(times[closed.stop - 1])
+            series.forming_open = float(times[-1])
+            return series.atr
+
+    def update_bar(self, symbol: str, timeframe: str, bar_time: float,
+                   high: float, low: float, close: float) -> Optional[float]:
+        """Push one closed bar in O(1), e.g. from a bar-close stream"""
+        with self._lock:
+            series = self._series_for(symbol, timeframe)
+            if series.last_closed is not None and bar_time <= series.last_closed:
+                return series.atr
+
+            prev = series.prev_close
+            series.prev_close = close
+            series.last_closed = bar_time
+            series.forming_open = bar_time + TIMEFRAME_SECONDS[timeframe]
+            self.bars_ingested += 1
+            if prev is not None:
+                self._push_tr(series, max(high - low, abs(high - prev), abs(low - prev)))
+            return series.atr
+
+    def ingest_batch(self, symbols: Sequence[str], timeframe: str, times, highs, lows, closes,
+                     now: Optional[float] = None) -> np.ndarray:
+        """
+        Seed many series from one aligned (symbols x bars) fetch, forming
+        bars in the last column; returns the ATR per symbol
+        """
+        now = self.clock() if now is None else now
+        times = np.broadcast_to(np.asarray(times, dtype=np.float64), np.shape(highs))
+        highs, lows, closes = (np.asarray(a, dtype=np.float64)[:, :-1] for a in (highs, lows, closes))
+        tr = true_range(highs, lows, closes)
+        atrs = (_wilder(tr, self.period) if self.method == 'wilder'
+                else tr[:, -self.period:].mean(axis=1))
+
+        with self._lock:
+            self._learn_skew(float(times[:, -1].max()) - now, timeframe)
+            for row, symbol in enumerate(symbols):
+                series = self._reset(symbol, timeframe)
+                series.trs.extend(tr[row, -self.period:].tolist())
+                series.tr_sum = math.fsum(series.trs)
+                series.atr = float(atrs[row])
+                series.prev_close = float(closes[row, -1])
+                series.last_closed = float(times[row, -2])
+                series.forming_open = float(times[row, -1])
+            self.bars_ingested += closes.size
+        return atrs
+
+    def observe_server_time(self, server_time: float, now: Optional[float] = None):
+        """Pin the broker clock offset from a known server timestamp (e.g. a tick time)"""
+        now = self.clock() if now is None else now
+        self.skew = server_time - now
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Drop matching series (all when no filter is given)"""
+        with self._lock:
+            for key in [key for key in self._series
+                        if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe)]:
+                del self._series[key]
+
+    def clear(self):
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'series': len(self._series),
+            'max_series': self.max_series,
+            'period': self.period,
+            'method': self.method,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'bars_ingested': self.bars_ingested,
+            'clock_skew_seconds': self.skew,
+            'keys': [f"{symbol}_{timeframe}" for symbol, timeframe in self._series],
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _learn_skew(self, observed: float, timeframe: str):
+        """
+        Fold in the offset seen on a forming bar: it is a lower bound, so
+        a larger one raises the estimate; one a whole bar below it cannot
+        come from the same clock and replaces it
+        """
+        if (self.skew is None or observed > self.skew
+                or observed + TIMEFRAME_SECONDS[timeframe] <= self.skew):
+            self.skew = observed
+
+    def _server_now(self, now: Optional[float]) -> float:
+        now = self.clock() if now is None else now
+        return now + (self.skew or 0.0)
+
+    def _is_stale(self, series: _ATRSeries, timeframe: str, now: Optional[float]) -> bool:
+        return self._server_now(now) >= series.forming_open + TIMEFRAME_SECONDS[timeframe]
+
+    def _series_for(self, symbol: str, timeframe: str) -> _ATRSeries:
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is None:
+            return self._reset(symbol, timeframe)
+        self._series.move_to_end(key)
+        return series
+
+    def _reset(self, symbol: str, timeframe: str) -> _ATRSeries:
+        if timeframe not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Unknown timeframe {timeframe!r}")
+        key = (symbol, timeframe)
+        series = self._series[key] = _ATRSeries(self.period)
+        self._series.move_to_end(key)
+        while len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+            self.evictions += 1
+        return series
+
+    def _push(self, series: _ATRSeries, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray):
+        """Vectorized update with a run of closed bars"""
+        if len(closes) == 0:
+            return
+        self.bars_ingested += len(closes)
+        tr = true_range(highs, lows, closes, series.prev_close)
+        series.prev_close = float(closes[-1])
+        if len(tr) == 0:
+            return
+
+        if self.method == 'sma':
+            series.trs.extend(tr[-self.period:].tolist())
+            series.tr_sum = math.fsum(series.trs)
+            if len(series.trs) == self.period:
+                series.atr = series.tr_sum / self.period
+        elif series.atr is not None:
+            series.atr = float(_wilder(tr, self.period, seed=series.atr))
+        else:
+            pending = np.concatenate((np.fromiter(series.trs, dtype=np.float64), tr))
+            if len(pending) >= self.period:
+                series.atr = float(_wilder(pending, self.period))
+            else:
+                series.trs.extend(tr.tolist())
+
+    def _push_tr(self, series: _ATRSeries, tr: float):
+        """O(1) update with one true range"""
+        period = self.period
+        if self.method == 'sma':
+            if len(series.trs) == period:
+                series.tr_sum -= series.trs[0]
+            series.trs.append(tr)
+            series.tr_sum += tr
+            if len(series.trs) == period:
+                series.atr = series.tr_sum / period
+        elif series.atr is not None:
+            series.atr = (series.atr * (period - 1) + tr) / period
+        else:
+            series.trs.append(tr)
+            series.tr_sum += tr
+            if len(series.trs) == period:
+                series.atr = series.tr_sum / period
+
+
+def epoch_clock(clock: Optional[Callable[[], datetime]] = None) -> Callable[[], float]:
+    """Epoch-seconds view of a datetime clock, wall time when None"""
+    if clock is None:
+        return time.time
+    return lambda: clock().timestamp()
+
+
+_shared: Dict[Tuple[int, str], ATREngine] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_atr_engine(period: int = 14, method: str = 'sma') -> ATREngine:
+    """
+    Process-wide engine for a given period and method, for code that talks
+    to the live MT5 terminal directly; connectors use ATREngine.for_clock()
+    """
+    key = (period, method)
+    engine = _shared.get(key)
+    if engine is None:
+        with _shared_lock:
+            engine = _shared.get(key)
+            if engine is None:
+                engine = _shared[key] = ATREngine(period=period, method=method)
+    return engine
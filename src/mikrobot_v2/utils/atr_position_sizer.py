@@ -8,11 +8,11 @@ Implements 1:1 ATR position sizing with 0.328 Fibonacci stop loss levels.
 
 import asyncio
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-import statistics
 
 from ..core.mt5_direct_connector import MT5DirectConnector, Candle
+from .atr_engine import ATREngine
 
 logger = logging.getLogger(__name__)
 
@@ -26,67 +26,38 @@ class ATRPositionSizer:
     - Risk percentage based position sizing
     """
     
-    def __init__(self, mt5_connector: MT5DirectConnector):
+    def __init__(self, mt5_connector: MT5DirectConnector, atr_engine: Optional[ATREngine] = None,
+                 clock: Optional[Callable[[], datetime]] = None):
         self.mt5 = mt5_connector
+        self.clock = clock or datetime.now  # replays pass the connector's virtual clock
         self.atr_period = 14  # Standard ATR period
         self.risk_percent = 0.0015  # 0.15% risk per trade
         self.fib_stop_level = 0.328  # 0.328 Fibonacci retracement
         
-        # ATR cache for performance
-        self.atr_cache: Dict[str, Dict] = {}
-        self.cache_expiry = 300  # 5 minutes
+        # ATR series of this connector, valid until the next bar of their timeframe closes
+        self.atr_engine = atr_engine or ATREngine.for_clock(clock, self.atr_period)
         
         logger.info("📊 ATR Position Sizer initialized")
     
     async def calculate_atr(self, symbol: str, timeframe: str = "H1") -> Optional[float]:
-        """Calculate Average True Range for symbol"""
+        """Average True Range of the closed bars for symbol"""
         try:
-            # Check cache first
-            cache_key = f"{symbol}_{timeframe}"
-            if self._is_cache_valid(cache_key):
-                return self.atr_cache[cache_key]['atr']
+            now = self.clock().timestamp()
+            atr = self.atr_engine.atr(symbol, timeframe, now)
+            if atr is not None:
+                return atr
             
-            # Get candles for ATR calculation
-            candles = await self.mt5.get_candles(symbol, timeframe, self.atr_period + 1)
+            # A bar has closed since the last update: fetch only what is new
+            count = self.atr_engine.bars_needed(symbol, timeframe, now)
+            candles = await self.mt5.get_candles(symbol, timeframe, count)
+            atr = self.atr_engine.ingest_candles(symbol, timeframe, candles, now)
             
-            if len(candles) < self.atr_period + 1:
+            if atr is None:
                 logger.warning(f"Insufficient data for ATR calculation: {symbol}")
                 return None
             
-            # Calculate True Range for each period
-            true_ranges = []
-            
-            for i in range(1, len(candles)):
-                current = candles[i]
-                previous = candles[i-1]
-                
-                # True Range = max of:
-                # 1. Current High - Current Low
-                # 2. Current High - Previous Close
-                # 3. Previous Close - Current Low
-                tr1 = current.high - current.low
-                tr2 = abs(current.high - previous.close)
-                tr3 = abs(previous.close - current.low)
-                
-                true_range = max(tr1, tr2, tr3)
-                true_ranges.append(true_range)
-            
-            # Calculate ATR as simple moving average of True Ranges
-            if len(true_ranges) >= self.atr_period:
-                atr = statistics.mean(true_ranges[-self.atr_period:])
-                
-                # Cache the result
-                self.atr_cache[cache_key] = {
-                    'atr': atr,
-                    'timestamp': datetime.now(),
-                    'symbol': symbol,
-                    'timeframe': timeframe
-                }
-                
-                logger.debug(f"ATR calculated for {symbol}: {atr:.5f}")
-                return atr
-            
-            return None
+            logger.debug(f"ATR calculated for {symbol}: {atr:.5f}")
+            return atr
             
         except Exception as e:
             logger.error(f"ATR calculation error for {symbol}: {e}")
@@ -185,14 +156,6 @@ class ATRPositionSizer:
             logger.error(f"Position sizing error for {symbol}: {e}")
             return self._get_default_position_size(symbol)
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if ATR cache is still valid"""
-        if cache_key not in self.atr_cache:
-            return False
-        
-        cache_time = self.atr_cache[cache_key]['timestamp']
-        return (datetime.now() - cache_time).total_seconds() < self.cache_expiry
-    
     def _get_pip_value(self, symbol: str) -> float:
         """Get pip value for symbol"""
         if symbol.endswith('JPY'):
@@ -285,13 +248,15 @@ class ATRPositionSizer:
     
     def clear_cache(self):
         """Clear ATR cache"""
-        self.atr_cache.clear()
+        self.atr_engine.clear()
         logger.info("ATR cache cleared")
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
+        stats = self.atr_engine.get_stats()
         return {
-            'cached_symbols': len(self.atr_cache),
-            'cache_expiry_minutes': self.cache_expiry / 60,
-            'symbols': list(self.atr_cache.keys())
+            'cached_symbols': stats['series'],
+            'max_series': stats['max_series'],
+            'hit_rate': stats['hit_rate'],
+            'symbols': stats['keys']
         }
\ No newline at end of file
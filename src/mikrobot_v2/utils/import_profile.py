@@ -0,0 +1,138 @@
+"""
+Import Profile - Cold-Start Import Cost Report
+==============================================
+
+Runs a fresh interpreter with `-X importtime`, parses the per-module
+timings it writes to stderr and reports which imports dominate start-up:
+the slowest modules by cumulative or self time, and cost grouped by
+top-level package (numpy, pandas, matplotlib, mikrobot_v2, ...).
+
+    python src/mikrobot_v2/utils/import_profile.py mikrobot_v2.main_trading_engine --path src
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$')
+
+
+@dataclass
+class ImportRecord:
+    """One `-X importtime` line; times in microseconds"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split('.', 1)[0]
+
+
+@dataclass
+class ImportProfile:
+    """Parsed import timings of one interpreter run"""
+    target: str
+    records: List[ImportRecord] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    returncode: int = 0
+    error: str = ''
+
+    @property
+    def total_us(self) -> int:
+        """Import time of everything imported, counted once (top-level entries)"""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0)
+
+    @property
+    def modules(self) -> int:
+        return len(self.records)
+
+    def top(self, count: int = 15, by: str = 'cumulative') -> List[ImportRecord]:
+        key = (lambda r: r.cumulative_us) if by == 'cumulative' else (lambda r: r.self_us)
+        return sorted(self.records, key=key, reverse=True)[:count]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time summed per top-level package, largest first"""
+        totals: Dict[str, int] = defaultdict(int)
+        for record in self.records:
+            totals[record.package] += record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def includes(self, module: str) -> bool:
+        return any(r.module == module or r.module.startswith(module + '.') for r in self.records)
+
+    def report(self, count: int = 15) -> str:
+        lines = [f"Import profile: {self.target}",
+                 f"   wall {self.wall_seconds * 1000:,.0f} ms, imports {self.total_us / 1000:,.1f} ms, "
+                 f"{self.modules} modules"]
+        if self.returncode:
+            lines.append(f"   FAILED (exit {self.returncode}): {self.error}")
+        lines.append(f"   {'cumulative ms':>14} {'self ms':>9}  module")
+        for record in self.top(count):
+            lines.append(f"   {record.cumulative_us / 1000:>14,.1f} {record.self_us / 1000:>9,.1f}  "
+                         f"{'  ' * record.depth}{record.module}")
+        lines.append(f"   {'package self ms':>14}")
+        for package, self_us in list(self.by_package().items())[:count]:
+            lines.append(f"   {self_us / 1000:>14,.1f}  {package}")
+        return '\n'.join(lines)
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse `-X importtime` output; unrelated stderr lines are ignored"""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_import(target: str, code: Optional[str] = None, path: Sequence[str] = (),
+                   python: str = sys.executable, timeout: float = 120.0) -> ImportProfile:
+    """
+    Import `target` (or run `code`) in a fresh interpreter under -X importtime
+
+    `path` entries are prepended to PYTHONPATH of the child process.
+    """
+    env = dict(os.environ)
+    if path:
+        env['PYTHONPATH'] = os.pathsep.join([*path, env.get('PYTHONPATH', '')]).rstrip(os.pathsep)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', code or f'import {target}'],
+        capture_output=True, text=True, env=env, timeout=timeout
+    )
+    profile = ImportProfile(
+        target=target,
+        records=parse_importtime(completed.stderr),
+        wall_seconds=time.perf_counter() - start,
+        returncode=completed.returncode,
+    )
+    if completed.returncode:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        profile.error = errors[-1] if errors else ''
+    return profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report import-time cost of a module')
+    parser.add_argument('target', help='module to import, e.g. mikrobot_v2.main_trading_engine')
+    parser.add_argument('--path', action='append', default=[], help='extra PYTHONPATH entry')
+    parser.add_argument('--top', type=int, default=15, help='rows per table')
+    args = parser.parse_args(argv)
+
+    profile = profile_import(args.target, path=args.path)
+    print(profile.report(args.top))
+    return profile.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
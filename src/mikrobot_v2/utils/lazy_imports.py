@@ -0,0 +1,108 @@
+"""
+Lazy Imports - Deferred Loading of Optional Subsystems
+======================================================
+
+Charts, notifications, ML and data providers pull in matplotlib, pandas,
+aiohttp and friends. Most processes (Celery workers, tests, restarts) never
+touch them, so they are bound through proxies that import on first
+attribute access instead of at module import time.
+
+    notifications = lazy_import('..notifications.imessage_notifier', __package__)
+    notifications.notify_bos_detected(...)   # imported here, once
+
+Package __init__ files expose their public names the same way:
+
+    __getattr__, __dir__ = lazy_exports(__name__, {'MT5DirectConnector': '.mt5_direct_connector'})
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports its target on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        target = self.__dict__['_lazy_target']
+        if target is None:
+            with self.__dict__['_lazy_lock']:
+                target = self.__dict__['_lazy_target']
+                if target is None:
+                    target = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_target'] = target
+        return target
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__['_lazy_target'] is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._load(), name, value)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str, package: Optional[str] = None) -> ModuleType:
+    """
+    Return `name` (absolute, or relative to `package`) without importing it yet
+
+    Modules that are already imported are returned as-is. A missing module
+    raises ImportError on first use, not here; check is_available() first
+    for optional dependencies.
+    """
+    absolute = importlib.util.resolve_name(name, package) if name.startswith('.') else name
+    module = sys.modules.get(absolute)
+    if module is not None:
+        return module
+    return LazyModule(absolute)
+
+
+def is_available(name: str) -> bool:
+    """True when `name` can be imported, without importing it"""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    PEP 562 __getattr__/__dir__ pair for a package __init__
+
+    `exports` maps each public name to the submodule (relative to `package`)
+    that defines it. The submodule is imported the first time the name is
+    read and the value is cached on the package.
+    """
+
+    def __getattr__(name: str):
+        try:
+            submodule = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(submodule, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,12 @@
+"""
+Timeframe Lengths
+=================
+
+Bar length in seconds of each MT5 timeframe name, shared by the replay
+connector and the ATR engine.
+"""
+
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400,
+}
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Candle Archive
+Local, append-only store of MT5 rate history with fast range queries
+
+Layout: <root>/<SYMBOL>/<TIMEFRAME>/<field>.bin, one raw little-endian file
+per field of the MT5 rates dtype (time, open, high, low, close, tick_volume,
+spread, real_volume). Files only grow, so reads are np.memmap views and a
+range query is two binary searches on the sorted time column; nothing is
+parsed or copied until the caller asks for it.
+
+Appends sort and de-duplicate the incoming bars, drop bars older than the
+archived tail, overwrite the tail bar when the same time arrives again (the
+still-forming MT5 bar), and count gaps larger than one timeframe period.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Same layout as the structured arrays returned by mt5.copy_rates_*()
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+FIELDS: Tuple[str, ...] = RATES_DTYPE.names
+
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800,
+}
+
+TimeLike = Union[int, float, datetime, np.datetime64]
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """Bar period in seconds for an MT5 timeframe name ('M1', 'H4', ...)"""
+    try:
+        return TIMEFRAME_SECONDS[timeframe]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe {timeframe!r}") from None
+
+
+def to_epoch_seconds(value: TimeLike) -> int:
+    """Epoch seconds from an int, datetime (naive = UTC) or numpy datetime64"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[s]').astype(np.int64))
+    return int(value)
+
+
+@dataclass(slots=True)
+class AppendResult:
+    """Outcome of one CandleArchive.append call"""
+    appended: int = 0
+    replaced: int = 0      # tail bar overwritten by a newer copy of the same time
+    duplicates: int = 0    # dropped: repeated within the batch or older than the tail
+    gaps: int = 0          # spacings wider than one timeframe period (incl. vs the tail)
+
+
+class CandleSlice:
+    """
+    A contiguous run of archived bars as per-field NumPy views
+
+    Columns are read-only memmap slices: indexing one does not copy it, and
+    only the pages actually touched are read from disk.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['time'])
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def __repr__(self) -> str:
+        return f"CandleSlice({self.symbol} {self.timeframe}, {len(self)} bars)"
+
+    def to_rates(self) -> np.ndarray:
+        """Copy into an MT5-style structured rates array"""
+        rates = np.empty(len(self), dtype=RATES_DTYPE)
+        for field, values in self.columns.items():
+            rates[field] = values
+        return rates
+
+    def to_frame(self):
+        """Copy into a DataFrame (time as datetime64, like pd.DataFrame(rates) usage)"""
+        import pandas as pd
+        frame = pd.DataFrame({field: np.asarray(values) for field, values in self.columns.items()})
+        frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        return frame
+
+
+class _Series:
+    """On-disk state of one symbol/timeframe (guarded by the archive lock)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.length = 0
+        self.maps: Optional[Dict[str, np.ndarray]] = None
+
+    def path(self, field: str) -> str:
+        return os.path.join(self.directory, f"{field}.bin")
+
+
+class CandleArchive:
+    """
+    Per-symbol, per-timeframe columnar candle store
+
+    Safe for one writer and any number of reader threads in a process.
+    Slices returned before an append stay valid; they simply do not see the
+    new bars (except a replaced tail bar, which shares the mapped page).
+    """
+
+    def __init__(self, root: str, fsync: bool = False):
+        self.root = str(root)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    # -- discovery ---------------------------------------------------------
+
+    def symbols(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def timeframes(self, symbol: str) -> List[str]:
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if os.path.exists(os.path.join(directory, name, 'time.bin')))
+
+    def length(self, symbol: str, timeframe: str) -> int:
+        with self._lock:
+            return self._open(symbol, timeframe).length
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, symbol: str, timeframe: str, rates: np.ndarray,
+               replace_last: bool = True) -> AppendResult:
+        """
+        Append MT5 rates (structured array with at least time/open/high/low/close)
+
+        Overlapping history is harmless: bars at or before the archived tail
+        are dropped, except that a bar with exactly the tail's time replaces
+        it when `replace_last` is set.
+        """
+        period = timeframe_seconds(timeframe)
+        result = AppendResult()
+        rates = np.asarray(rates)
+        if len(rates) == 0:
+            return result
+
+        # Sort by time and keep the last copy of any repeated bar
+        times = rates['time'].astype(np.int64)
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        keep = np.ones(len(times), dtype=bool)
+        keep[:-1] = times[1:] != times[:-1]
+        result.duplicates = int(len(times) - keep.sum())
+        rows = order[keep]
+        times = times[keep]
+
+        with self._lock:
+            series = self._open(symbol, timeframe, create=True)
+            tail = self._tail_time(series)
+            if tail is None:
+                spaced = times
+            else:
+                at_tail = int(np.searchsorted(times, tail))
+                if at_tail < len(times) and times[at_tail] == tail:
+                    if replace_last:
+                        self._write_columns(series, rates, rows[at_tail:at_tail + 1],
+                                            offset=series.length - 1)
+                        result.replaced = 1
+                    else:
+                        result.duplicates += 1
+                result.duplicates += at_tail
+                fresh = times > tail
+                rows, times = rows[fresh], times[fresh]
+                spaced = np.concatenate([[tail], times])
+
+            result.gaps = int(np.count_nonzero(np.diff(spaced) > period))
+            if len(rows):
+                self._write_columns(series, rates, rows)
+                series.length += len(rows)
+                result.appended = len(rows)
+            series.maps = None
+        return result
+
+    def sync_from_mt5(self, mt5, symbol: str, timeframe: str, count: int = 1000) -> AppendResult:
+        """Pull the newest `count` bars with mt5.copy_rates_from_pos and append them"""
+        rates = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, count)
+        if rates is None:
+            logger.warning(f"No rates returned for {symbol} {timeframe}: {mt5.last_error()}")
+            return AppendResult()
+        return self.append(symbol, timeframe, rates)
+
+    # -- reading -----------------------------------------------------------
+
+    def range(self, symbol: str, timeframe: str,
+              start: Optional[TimeLike] = None, end: Optional[TimeLike] = None,
+              fields: Optional[Sequence[str]] = None) -> CandleSlice:
+        """Bars with start <= time <= end (either bound optional), as zero-copy views"""
+        maps = self._maps(symbol, timeframe)
+        times = maps['time']
+        lo = 0 if start is None else int(np.searchsorted(times, to_epoch_seconds(start), 'left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, to_epoch_seconds(end), 'right'))
+        return self._slice(symbol, timeframe, maps, lo, max(lo, hi), fields)
+
+    def last(self, symbol: str, timeframe: str, count: int,
+             fields: Optional[Sequence[str]] = None) -> CandleSlice:
+        """The newest `count` bars (the archived equivalent of copy_rates_from_pos(..., 0, count))"""
+        maps = self._maps(symbol, timeframe)
+        total = len(maps['time'])
+        return self._slice(symbol, timeframe, maps, max(0, total - count), total, fields)
+
+    def load(self, symbols: Iterable[str], timeframe: str,
+             start: Optional[TimeLike] = None, end: Optional[TimeLike] = None,
+             fields: Optional[Sequence[str]] = None) -> Dict[str, CandleSlice]:
+        """range() for many symbols at once"""
+        return {symbol: self.range(symbol, timeframe, start, end, fields) for symbol in symbols}
+
+    def gaps(self, symbol: str, timeframe: str,
+             start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> np.ndarray:
+        """(last bar before, first bar after) time pairs wider than one period"""
+        times = self.range(symbol, timeframe, start, end, fields=('time',))['time']
+        steps = np.flatnonzero(np.diff(times) > timeframe_seconds(timeframe))
+        return np.stack([times[steps], times[steps + 1]], axis=1)
+
+    # -- internals ---------------------------------------------------------
+
+    def _open(self, symbol: str, timeframe: str, create: bool = False) -> _Series:
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is not None:
+            return series
+        timeframe_seconds(timeframe)
+
+        series = _Series(os.path.join(self.root, symbol, timeframe))
+        if os.path.isdir(series.directory):
+            series.length = self._recover(series)
+        elif create:
+            os.makedirs(series.directory, exist_ok=True)
+        else:
+            raise KeyError(f"No archived bars for {symbol} {timeframe}")
+        self._series[key] = series
+        return series
+
+    @staticmethod
+    def _recover(series: _Series) -> int:
+        """Common row count of the column files; trims columns left longer by an interrupted append"""
+        lengths = {}
+        for field in FIELDS:
+            path = series.path(field)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths[field] = size // RATES_DTYPE[field].itemsize
+        length = min(lengths.values())
+        for field, rows in lengths.items():
+            if rows != length or os.path.getsize(series.path(field)) % RATES_DTYPE[field].itemsize:
+                logger.warning(f"Trimming {series.path(field)} from {rows} to {length} rows")
+                with open(series.path(field), 'r+b') as handle:
+                    handle.truncate(length * RATES_DTYPE[field].itemsize)
+        return length
+
+    @staticmethod
+    def _tail_time(series: _Series) -> Optional[int]:
+        if series.length == 0:
+            return None
+        with open(series.path('time'), 'rb') as handle:
+            handle.seek((series.length - 1) * RATES_DTYPE['time'].itemsize)
+            return int(np.frombuffer(handle.read(RATES_DTYPE['time'].itemsize), dtype='<i8')[0])
+
+    def _write_columns(self, series: _Series, rates: np.ndarray, rows: np.ndarray,
+                       offset: Optional[int] = None) -> None:
+        """Append rates[rows] to every column file, or overwrite starting at row `offset`"""
+        names = rates.dtype.names
+        for field in FIELDS:
+            dtype = RATES_DTYPE[field]
+            if field in names:
+                column = np.ascontiguousarray(rates[field][rows], dtype=dtype)
+            else:
+                column = np.zeros(len(rows), dtype=dtype)
+            if offset is None:
+                handle = open(series.path(field), 'ab')
+            else:
+                handle = open(series.path(field), 'r+b')
+                handle.seek(offset * dtype.itemsize)
+            with handle:
+                handle.write(column.tobytes())
+                if self.fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+
+    def _maps(self, symbol: str, timeframe: str) -> Dict[str, np.ndarray]:
+        with self._lock:
+            series = self._open(symbol, timeframe)
+            if series.maps is None:
+                if series.length == 0:
+                    series.maps = {field: np.empty(0, dtype=RATES_DTYPE[field]) for field in FIELDS}
+                else:
+                    series.maps = {
+                        field: np.memmap(series.path(field), dtype=RATES_DTYPE[field],
+                                         mode='r', shape=(series.length,))
+                        for field in FIELDS
+                    }
+            return series.maps
+
+    @staticmethod
+    def _slice(symbol: str, timeframe: str, maps: Dict[str, np.ndarray], lo: int, hi: int,
+               fields: Optional[Sequence[str]]) -> CandleSlice:
+        return CandleSlice(symbol, timeframe,
+                           {field: maps[field][lo:hi] for field in (fields or FIELDS)})
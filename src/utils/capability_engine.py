@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Capability Engine
+Running Cp/Cpk/DPMO/sigma level for many quality metrics at once
+
+Each metric is a row of a preallocated NumPy table holding its sample
+count and Welford moments (mean and sum of squared deviations), so adding
+a sample is O(1) whatever the window size, and update() advances any
+number of metrics in one vectorized call. With a window the last `window`
+samples of each row are kept in a ring buffer: a sample arriving in a full
+window replaces the oldest one in the same update. Rolling updates slowly
+accumulate rounding error, so a row's moments are recomputed exactly from
+its buffer once every `window` replacements.
+
+capability() evaluates every metric against its specification limits in
+one pass. Cp/Cpk follow the monitors' conventions (0 below two samples,
+inf for a constant process, inf on a missing side); DPMO is the expected
+out-of-spec rate of a normal process with the running mean and standard
+deviation, and sigma level is the short-term Z.min = 3 * Cpk capped at 6.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+MetricKeys = Union[str, int, Sequence[str], Sequence[int], np.ndarray]
+
+MAX_SIGMA_LEVEL = 6.0
+
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+
+@dataclass(frozen=True)
+class CapabilityTable:
+    """Capability of a set of metrics, one array element per metric"""
+    names: List[str]
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    cp: np.ndarray
+    cpk: np.ndarray
+    dpmo: np.ndarray
+    sigma_level: np.ndarray
+
+    def row(self, name: str) -> Dict[str, Any]:
+        """Plain-float view of one metric"""
+        i = self.names.index(name)
+        return {
+            'samples': int(self.count[i]),
+            'mean': float(self.mean[i]),
+            'std_dev': float(self.std[i]),
+            'cp': float(self.cp[i]),
+            'cpk': float(self.cpk[i]),
+            'dpmo': float(self.dpmo[i]),
+            'sigma_level': float(self.sigma_level[i]),
+        }
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.row(name) for name in self.names}
+
+
+class CapabilityEngine:
+    """
+    Welford moments and specification limits for many metrics
+
+    Metrics are addressed by name or by the integer id add_metric()
+    returned; ids are stable for the life of the engine.
+    """
+
+    def __init__(self, window: Optional[int] = None, capacity: int = 64):
+        if window is not None and window < 2:
+            raise ValueError("window must be at least 2 samples")
+
+        self.window = window
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._allocate(max(capacity, 1))
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def add_metric(self, name: str, lsl: float = -math.inf, usl: float = math.inf,
+                   target: float = math.nan) -> int:
+        """Register a metric (or update its limits) and return its id"""
+        with self._lock:
+            metric = self._ids.get(name)
+            if metric is None:
+                metric = len(self.names)
+                if metric == len(self._count):
+                    self._grow(2 * metric)
+                self.names.append(name)
+                self._ids[name] = metric
+            self._lsl[metric] = lsl
+            self._usl[metric] = usl
+            self._target[metric] = target
+            return metric
+
+    def id(self, name: str) -> int:
+        return self._ids[name]
+
+    def ids(self, names: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self._ids[name] for name in names), dtype=np.intp)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def limits(self, metric: Union[str, int]) -> Dict[str, float]:
+        i = self._row(metric)
+        return {'lsl': float(self._lsl[i]), 'usl': float(self._usl[i]), 'target': float(self._target[i])}
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def push(self, metric: Union[str, int], value: float):
+        """Add one sample to one metric without going through NumPy"""
+        i = self._row(metric)
+        value = float(value)
+        with self._lock:
+            n = int(self._count[i])
+            mean = float(self._mean[i])
+            m2 = float(self._m2[i])
+            window = self.window
+
+            if window is not None and n == window:
+                head = int(self._head[i])
+                old = float(self._buffer[i, head])
+                self._buffer[i, head] = value
+                self._head[i] = (head + 1) % window
+                new_mean = mean + (value - old) / n
+                m2 += (value - old) * (value - new_mean + old - mean)
+                self._since_resync[i] += 1
+            else:
+                if window is not None:
+                    self._buffer[i, (int(self._head[i]) + n) % window] = value
+                n += 1
+                new_mean = mean + (value - mean) / n
+                m2 += (value - mean) * (value - new_mean)
+                self._count[i] = n
+
+            self._mean[i] = new_mean
+            self._m2[i] = max(m2, 0.0)
+            if window is not None and self._since_resync[i] >= window:
+                self._resync(np.array([i]))
+
+    def update(self, metrics: MetricKeys, values) -> None:
+        """
+        Add one sample per entry of `metrics` in a vectorized pass
+
+        A metric may appear several times; its samples are applied in
+        order.
+        """
+        rows = self._rows(metrics)
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), rows.shape)
+        if rows.size == 0:
+            return
+
+        with self._lock:
+            order = np.argsort(rows, kind='stable')
+            ordered = rows[order]
+            positions = np.arange(len(ordered))
+            starts = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+            rank = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+            for r in range(int(rank.max()) + 1):
+                selected = order[rank == r]
+                self._apply(rows[selected], values[selected])
+
+    def reset(self, metric: Optional[Union[str, int]] = None):
+        """Forget the samples of one metric (or all), keeping the limits"""
+        with self._lock:
+            rows = slice(None) if metric is None else self._row(metric)
+            for column in (self._count, self._mean, self._m2, self._head, self._since_resync):
+                column[rows] = 0
+            if self.window is not None:
+                self._buffer[rows] = 0.0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def count(self, metric: Union[str, int]) -> int:
+        return int(self._count[self._row(metric)])
+
+    def moments(self, metric: Union[str, int]) -> Dict[str, float]:
+        """Sample count, mean and sample standard deviation of one metric"""
+        i = self._row(metric)
+        n = int(self._count[i])
+        std = math.sqrt(self._m2[i] / (n - 1)) if n >= 2 else 0.0
+        return {'samples': n, 'mean': float(self._mean[i]), 'std_dev': std}
+
+    def values(self, metric: Union[str, int]) -> np.ndarray:
+        """Samples currently in the metric's window, oldest first"""
+        if self.window is None:
+            raise ValueError("Samples are only kept with a window")
+        i = self._row(metric)
+        n = int(self._count[i])
+        if n < self.window:
+            return self._buffer[i, :n].copy()
+        return np.roll(self._buffer[i], -int(self._head[i]))
+
+    def capability(self, metrics: Optional[MetricKeys] = None) -> CapabilityTable:
+        """Cp, Cpk, expected DPMO and sigma level for the given metrics (default: all)"""
+        if metrics is None:
+            rows = np.arange(len(self.names))
+        else:
+            rows = self._rows(metrics)
+
+        n = self._count[rows].astype(np.float64)
+        mean = self._mean[rows]
+        lsl, usl = self._lsl[rows], self._usl[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.where(n >= 2, np.sqrt(self._m2[rows] / np.maximum(n - 1, 1)), 0.0)
+            cp = np.where(np.isfinite(usl) & np.isfinite(lsl), (usl - lsl) / (6 * std), np.inf)
+            cpu = np.where(np.isfinite(usl), (usl - mean) / (3 * std), np.inf)
+            cpl = np.where(np.isfinite(lsl), (mean - lsl) / (3 * std), np.inf)
+            cpk = np.minimum(cpu, cpl)
+
+            constant = std == 0
+            dpmo = 1e6 * np.where(
+                constant,
+                ((mean > usl) | (mean < lsl)).astype(np.float64),
+                0.5 * (_erfc(3 * cpu / math.sqrt(2)) + _erfc(3 * cpl / math.sqrt(2))),
+            )
+
+        cp = np.where(constant, np.inf, cp)
+        cpk = np.where(constant, np.inf, cpk)
+        few = n < 2
+        cp[few] = 0.0
+        cpk[few] = 0.0
+        dpmo[few] = np.nan
+        sigma_level = np.clip(3 * cpk, 0.0, MAX_SIGMA_LEVEL)
+
+        return CapabilityTable(
+            names=[self.names[i] for i in rows],
+            count=self._count[rows].copy(),
+            mean=mean.copy(),
+            std=std,
+            cp=cp,
+            cpk=cpk,
+            dpmo=dpmo,
+            sigma_level=sigma_level,
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _allocate(self, capacity: int):
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._mean = np.zeros(capacity)
+        self._m2 = np.zeros(capacity)
+        self._lsl = np.full(capacity, -np.inf)
+        self._usl = np.full(capacity, np.inf)
+        self._target = np.full(capacity, np.nan)
+        self._head = np.zeros(capacity, dtype=np.int64)
+        self._since_resync = np.zeros(capacity, dtype=np.int64)
+        self._buffer = np.zeros((capacity, self.window or 0))
+
+    def _grow(self, capacity: int):
+        old = {name: getattr(self, name) for name in
+               ('_count', '_mean', '_m2', '_lsl', '_usl', '_target', '_head', '_since_resync', '_buffer')}
+        self._allocate(capacity)
+        for name, column in old.items():
+            getattr(self, name)[:len(column)] = column
+
+    def _row(self, metric: Union[str, int]) -> int:
+        if isinstance(metric, str):
+            return self._ids[metric]
+        if not 0 <= metric < len(self.names):
+            raise KeyError(metric)
+        return int(metric)
+
+    def _rows(self, metrics: MetricKeys) -> np.ndarray:
+        if isinstance(metrics, (str, int, np.integer)):
+            return np.array([self._row(metrics)], dtype=np.intp)
+        if isinstance(metrics, np.ndarray) and metrics.dtype.kind in 'iu':
+            rows = metrics.astype(np.intp, copy=False)
+            if rows.size and (rows.min() < 0 or rows.max() >= len(self.names)):
+                raise KeyError("metric id out of range")
+            return rows
+        return np.fromiter((self._row(metric) for metric in metrics), dtype=np.intp)
+
+    def _apply(self, rows: np.ndarray, x: np.ndarray):
+        """Welford update for distinct rows"""
+        n = self._count[rows]
+        mean = self._mean[rows]
+        m2 = self._m2[rows]
+
+        if self.window is None:
+            n = n + 1
+            delta = x - mean
+            mean = mean + delta / n
+            self._m2[rows] = m2 + delta * (x - mean)
+            self._mean[rows] = mean
+            self._count[rows] = n
+            return
+
+        window = self.window
+        full = n == window
+        head = self._head[rows]
+        slot = np.where(full, head, (head + n) % window)
+        old = self._buffer[rows, slot]
+        self._buffer[rows, slot] = x
+        self._head[rows] = np.where(full, (head + 1) % window, head)
+
+        n = np.where(full, n, n + 1)
+        # A full window swaps the oldest sample for the new one; otherwise it grows
+        drop = np.where(full, old, mean)
+        new_mean = mean + (x - drop) / n
+        m2 = np.where(full,
+                      m2 + (x - old) * (x - new_mean + old - mean),
+                      m2 + (x - mean) * (x - new_mean))
+
+        self._count[rows] = n
+        self._mean[rows] = new_mean
+        self._m2[rows] = np.maximum(m2, 0.0)
+        self._since_resync[rows] += full
+
+        due = rows[self._since_resync[rows] >= window]
+        if due.size:
+            self._resync(due)
+
+    def _resync(self, rows: np.ndarray):
+        """Recompute exact moments of full windows from their buffers"""
+        samples = self._buffer[rows]
+        mean = samples.mean(axis=1)
+        self._mean[rows] = mean
+        self._m2[rows] = ((samples - mean[:, None]) ** 2).sum(axis=1)
+        self._since_resync[rows] = 0
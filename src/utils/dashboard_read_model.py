@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Dashboard Read Model
+Per-minute rollups of ml_observation_system.db for QualityDashboardSystem
+
+install() adds two rollup tables and the triggers that keep them current
+on every insert into process_capability and spc_violations (and when a
+violation is resolved or reopened), plus the time-filter indexes the
+dashboard and Pareto queries need. The observation tables in
+ML_OBSERVATION_DATABASE_SCHEMA.sql declare their indexes inline, which
+SQLite does not accept, so those are created here as well.
+
+Every rollup row carries the change sequence of its last update.
+DashboardReadModel.refresh() reads only rows changed since its watermark
+and keeps the last 24 hours of minutes in memory, so a refresh costs the
+same with a thousand raw rows or ten million. Rollups are history: rows
+deleted from the raw tables by retention jobs stay counted.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MINUTE_FORMAT = '%Y-%m-%d %H:%M'
+_MINUTE_SQL = "strftime('%Y-%m-%d %H:%M', {})"
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS dashboard_rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    seq INTEGER NOT NULL,
+    cpk_threshold REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_capability_minute (
+    minute TEXT NOT NULL,           -- 'YYYY-MM-DD HH:MM', UTC
+    phase_name TEXT NOT NULL,       -- '' for rows without a phase
+    measurements INTEGER NOT NULL,
+    cp_sum REAL NOT NULL,
+    cp_count INTEGER NOT NULL,
+    cpk_sum REAL NOT NULL,
+    cpk_count INTEGER NOT NULL,
+    sigma_sum REAL NOT NULL,
+    sigma_count INTEGER NOT NULL,
+    cpk_ok_count INTEGER NOT NULL,  -- cpk_value >= cpk_threshold
+    updated_seq INTEGER NOT NULL,
+    PRIMARY KEY (minute, phase_name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dashboard_violation_minute (
+    minute TEXT NOT NULL,
+    phase_name TEXT NOT NULL,
+    violations INTEGER NOT NULL,
+    severity_sum REAL NOT NULL,
+    severity_count INTEGER NOT NULL,
+    unresolved INTEGER NOT NULL,
+    updated_seq INTEGER NOT NULL,
+    PRIMARY KEY (minute, phase_name)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_dashboard_capability_minute_seq ON dashboard_capability_minute(updated_seq);
+CREATE INDEX IF NOT EXISTS idx_dashboard_violation_minute_seq ON dashboard_violation_minute(updated_seq);
+"""
+
+_NEXT_SEQ = "UPDATE dashboard_rollup_state SET seq = seq + 1 WHERE id = 1;"
+_SEQ = "(SELECT seq FROM dashboard_rollup_state WHERE id = 1)"
+
+CAPABILITY_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS dashboard_capability_rollup
+AFTER INSERT ON process_capability
+WHEN {minute} IS NOT NULL
+BEGIN
+    {next_seq}
+    INSERT INTO dashboard_capability_minute VALUES (
+        {minute}, COALESCE(NEW.phase_name, ''), 1,
+        COALESCE(NEW.cp_value, 0), NEW.cp_value IS NOT NULL,
+        COALESCE(NEW.cpk_value, 0), NEW.cpk_value IS NOT NULL,
+        COALESCE(NEW.sigma_level, 0), NEW.sigma_level IS NOT NULL,
+        COALESCE(NEW.cpk_value >= {threshold!r}, 0), {seq})
+    ON CONFLICT (minute, phase_name) DO UPDATE SET
+        measurements = measurements + 1,
+        cp_sum = cp_sum + excluded.cp_sum, cp_count = cp_count + excluded.cp_count,
+        cpk_sum = cpk_sum + excluded.cpk_sum, cpk_count = cpk_count + excluded.cpk_count,
+        sigma_sum = sigma_sum + excluded.sigma_sum, sigma_count = sigma_count + excluded.sigma_count,
+        cpk_ok_count = cpk_ok_count + excluded.cpk_ok_count,
+        updated_seq = excluded.updated_seq;
+END;
+"""
+
+VIOLATION_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS dashboard_violation_rollup
+AFTER INSERT ON spc_violations
+WHEN {minute} IS NOT NULL
+BEGIN
+    {next_seq}
+    INSERT INTO dashboard_violation_minute VALUES (
+        {minute}, COALESCE(NEW.phase_name, ''), 1,
+        COALESCE(NEW.severity_level, 0), NEW.severity_level IS NOT NULL,
+        COALESCE(NEW.resolved, 0) = 0, {seq})
+    ON CONFLICT (minute, phase_name) DO UPDATE SET
+        violations = violations + 1,
+        severity_sum = severity_sum + excluded.severity_sum,
+        severity_count = severity_count + excluded.severity_count,
+        unresolved = unresolved + excluded.unresolved,
+        updated_seq = excluded.updated_seq;
+END;
+
+CREATE TRIGGER IF NOT EXISTS dashboard_violation_resolution
+AFTER UPDATE OF resolved ON spc_violations
+WHEN {minute} IS NOT NULL AND (COALESCE(OLD.resolved, 0) = 0) != (COALESCE(NEW.resolved, 0) = 0)
+BEGIN
+    {next_seq}
+    UPDATE dashboard_violation_minute
+    SET unresolved = unresolved + (CASE WHEN COALESCE(NEW.resolved, 0) THEN -1 ELSE 1 END),
+        updated_seq = {seq}
+    WHERE minute = {minute} AND phase_name = COALESCE(NEW.phase_name, '');
+END;
+"""
+
+CAPABILITY_BACKFILL = """
+INSERT INTO dashboard_capability_minute
+SELECT {minute} AS minute, COALESCE(phase_name, '') AS phase,
+       COUNT(*), COALESCE(SUM(cp_value), 0), COUNT(cp_value),
+       COALESCE(SUM(cpk_value), 0), COUNT(cpk_value),
+       COALESCE(SUM(sigma_level), 0), COUNT(sigma_level),
+       COUNT(CASE WHEN cpk_value >= {threshold!r} THEN 1 END), {seq}
+FROM process_capability
+WHERE minute IS NOT NULL
+GROUP BY minute, phase
+"""
+
+VIOLATION_BACKFILL = """
+INSERT INTO dashboard_violation_minute
+SELECT {minute} AS minute, COALESCE(phase_name, '') AS phase,
+       COUNT(*), COALESCE(SUM(severity_level), 0), COUNT(severity_level),
+       COUNT(CASE WHEN COALESCE(resolved, 0) = 0 THEN 1 END), {seq}
+FROM spc_violations
+WHERE minute IS NOT NULL
+GROUP BY minute, phase
+"""
+
+# (table, indexed columns): time filters used by the dashboard and Pareto collectors
+INDEXES = [
+    ('process_capability', ('measurement_timestamp',)),
+    ('process_capability', ('phase_name', 'measurement_timestamp')),
+    ('spc_violations', ('detection_timestamp',)),
+    ('spc_violations', ('phase_name', 'resolved', 'detection_timestamp')),
+    ('early_warning_alerts', ('alert_timestamp',)),
+    ('early_warning_alerts', ('resolved', 'alert_timestamp')),
+    ('mt5_journal_data', ('event_timestamp',)),
+    ('mt5_expert_data', ('event_timestamp',)),
+    ('m5_bos_quality_metrics', ('measurement_timestamp',)),
+    ('m1_break_quality_metrics', ('measurement_timestamp',)),
+    ('m1_retest_quality_metrics', ('measurement_timestamp',)),
+    ('ylipip_quality_metrics', ('measurement_timestamp',)),
+    ('spc_control_data', ('metric_name', 'measurement_timestamp')),
+]
+
+
+def _tables(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def install(conn: sqlite3.Connection, cpk_threshold: float = 2.5) -> bool:
+    """
+    Create the rollups, triggers and indexes (idempotent)
+
+    Rollups are backfilled from the raw tables the first time, and rebuilt
+    when `cpk_threshold` differs from the one the triggers were built with.
+    Returns False when process_capability or spc_violations is missing.
+    """
+    tables = _tables(conn)
+    with conn:
+        for table, columns in INDEXES:
+            if table in tables and set(columns) <= _columns(conn, table):
+                name = f"idx_{table}_{'_'.join(columns)}"
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(columns)})")
+
+    if not {'process_capability', 'spc_violations'} <= tables:
+        logger.warning("Observation tables not found; dashboard rollups not installed")
+        return False
+
+    threshold = float(cpk_threshold)
+    stored = None
+    if 'dashboard_rollup_state' in tables:
+        row = conn.execute("SELECT cpk_threshold FROM dashboard_rollup_state WHERE id = 1").fetchone()
+        stored = row[0] if row else None
+    rebuild = stored != threshold
+
+    # One script, one transaction: triggers and backfill see the same rows
+    script = ["BEGIN IMMEDIATE;", ROLLUP_DDL]
+    if rebuild:
+        script += [
+            "DROP TRIGGER IF EXISTS dashboard_capability_rollup;",
+            "INSERT OR REPLACE INTO dashboard_rollup_state (id, seq, cpk_threshold) "
+            f"VALUES (1, COALESCE({_SEQ}, 0), {threshold!r});",
+        ]
+    script += [
+        CAPABILITY_TRIGGER.format(minute=_MINUTE_SQL.format('NEW.measurement_timestamp'),
+                                  next_seq=_NEXT_SEQ, seq=_SEQ, threshold=threshold),
+        VIOLATION_TRIGGERS.format(minute=_MINUTE_SQL.format('NEW.detection_timestamp'),
+                                  next_seq=_NEXT_SEQ, seq=_SEQ),
+    ]
+    if rebuild:
+        script += [
+            _NEXT_SEQ,
+            "DELETE FROM dashboard_capability_minute;",
+            "DELETE FROM dashboard_violation_minute;",
+            CAPABILITY_BACKFILL.format(minute=_MINUTE_SQL.format('measurement_timestamp'),
+                                       seq=_SEQ, threshold=threshold) + ";",
+            VIOLATION_BACKFILL.format(minute=_MINUTE_SQL.format('detection_timestamp'), seq=_SEQ) + ";",
+        ]
+    script.append("COMMIT;")
+    conn.executescript("\n".join(script))
+    if rebuild:
+        logger.info("Dashboard rollups rebuilt from raw observation tables")
+    return True
+
+
+def _minute(moment: datetime) -> str:
+    return moment.strftime(MINUTE_FORMAT)
+
+
+def _local_hour(utc_hour: str) -> str:
+    """'YYYY-MM-DD HH' in UTC to the local start of that hour"""
+    moment = datetime.strptime(utc_hour, '%Y-%m-%d %H').replace(tzinfo=timezone.utc)
+    return moment.astimezone().strftime('%Y-%m-%d %H:00:00')
+
+
+def _avg(total: float, count: int) -> Optional[float]:
+    return total / count if count else None
+
+
+class DashboardReadModel:
+    """
+    In-memory window over the dashboard rollups
+
+    refresh() pulls rollup rows whose change sequence is above the last
+    watermark (the first call loads the window by minute) and evicts minutes
+    older than `window_hours`. The query methods aggregate those minutes, so
+    window edges are at minute resolution.
+    """
+
+    def __init__(self, db_path: str = "ml_observation_system.db", cpk_threshold: float = 2.5,
+                 window_hours: int = 24):
+        self.db_path = db_path
+        self.cpk_threshold = cpk_threshold
+        self.window_hours = window_hours
+        self.installed = False
+        self.watermark: Optional[int] = None
+        # (minute, phase) -> rollup columns after the key
+        self._capability: Dict[Tuple[str, str], Tuple] = {}
+        self._violations: Dict[Tuple[str, str], Tuple] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self.stats = {'refreshes': 0, 'rows_read': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.installed = install(self._conn, self.cpk_threshold)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """Apply rollup changes since the watermark; returns rollup rows read"""
+        with self._lock:
+            conn = self._connection()
+            if not self.installed:
+                return 0
+            cutoff = _minute((now or datetime.utcnow()) - timedelta(hours=self.window_hours))
+            if self.watermark is None:
+                where, param = "minute >= ?", cutoff
+                seq = conn.execute("SELECT seq FROM dashboard_rollup_state WHERE id = 1").fetchone()[0]
+            else:
+                where, param, seq = "updated_seq > ?", self.watermark, self.watermark
+
+            rows_read = 0
+            for table, target in (('dashboard_capability_minute', self._capability),
+                                  ('dashboard_violation_minute', self._violations)):
+                for row in conn.execute(f"SELECT * FROM {table} WHERE {where}", (param,)):
+                    rows_read += 1
+                    seq = max(seq, row[-1])
+                    if row[0] >= cutoff:
+                        target[row[0], row[1]] = row[2:-1]
+                for key in [key for key in target if key[0] < cutoff]:
+                    del target[key]
+
+            self.watermark = seq
+            self.stats['refreshes'] += 1
+            self.stats['rows_read'] += rows_read
+            return rows_read
+
+    def _since(self, now: Optional[datetime], minutes: int) -> str:
+        return _minute((now or datetime.utcnow()) - timedelta(minutes=minutes))
+
+    def capability(self, minutes: int = 60, phase_name: Optional[str] = None,
+                   now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Averages of process_capability over the last `minutes` (all phases when None)"""
+        since = self._since(now, minutes)
+        totals = [0] * 8
+        with self._lock:
+            for (minute, phase), values in self._capability.items():
+                if minute >= since and (phase_name is None or phase == phase_name):
+                    for i, value in enumerate(values):
+                        totals[i] += value
+        measurements, cp_sum, cp_n, cpk_sum, cpk_n, sigma_sum, sigma_n, cpk_ok = totals
+        return {
+            'measurements': measurements,
+            'cp': _avg(cp_sum, cp_n),
+            'cpk': _avg(cpk_sum, cpk_n),
+            'sigma_level': _avg(sigma_sum, sigma_n),
+            'cpk_ok_count': cpk_ok,
+        }
+
+    def open_violations(self, phase_name: Optional[str] = None, hours: int = 24,
+                        now: Optional[datetime] = None) -> int:
+        """Unresolved spc_violations detected in the last `hours`"""
+        since = self._since(now, hours * 60)
+        with self._lock:
+            return sum(values[3] for (minute, phase), values in self._violations.items()
+                       if minute >= since and (phase_name is None or phase == phase_name))
+
+    def cpk_trend(self, hours: int = 24, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Hourly Cpk/Cp averages, labelled with the local start of the hour"""
+        since = self._since(now, hours * 60)
+        hourly: Dict[str, List] = {}
+        with self._lock:
+            for (minute, _), values in self._capability.items():
+                if minute >= since:
+                    bucket = hourly.setdefault(minute[:13], [0] * 8)
+                    for i, value in enumerate(values):
+                        bucket[i] += value
+        return [
+            {'timestamp': _local_hour(hour), 'cpk': _avg(b[3], b[4]), 'cp': _avg(b[1], b[2]), 'count': b[0]}
+            for hour, b in sorted(hourly.items())
+        ]
+
+    def violation_trend(self, hours: int = 24, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Hourly violation counts and average severity"""
+        since = self._since(now, hours * 60)
+        hourly: Dict[str, List] = {}
+        with self._lock:
+            for (minute, _), values in self._violations.items():
+                if minute >= since:
+                    bucket = hourly.setdefault(minute[:13], [0, 0, 0])
+                    for i in range(3):
+                        bucket[i] += values[i]
+        return [
+            {'timestamp': _local_hour(hour), 'count': b[0], 'severity': _avg(b[1], b[2])}
+            for hour, b in sorted(hourly.items())
+        ]
+
+    def last_open_violation(self, phase_name: str, hours: int = 24) -> Optional[datetime]:
+        """Newest unresolved violation of a phase (one index probe)"""
+        with self._lock:
+            row = self._connection().execute("""
+                SELECT MAX(detection_timestamp) FROM spc_violations
+                WHERE phase_name = ? AND resolved = 0 AND detection_timestamp >= datetime('now', ?)
+            """, (phase_name, f'-{hours} hours')).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def recent_violations(self, hours: int = 24, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest violations, read backwards along the detection_timestamp index"""
+        with self._lock:
+            rows = self._connection().execute("""
+                SELECT detection_timestamp, metric_name, violation_type,
+                       violation_description, severity_level, phase_name, resolved
+                FROM spc_violations
+                WHERE detection_timestamp >= datetime('now', ?)
+                ORDER BY detection_timestamp DESC
+                LIMIT ?
+            """, (f'-{hours} hours', limit)).fetchall()
+        return [
+            {
+                'timestamp': datetime.fromisoformat(row[0]),
+                'metric': row[1],
+                'type': row[2],
+                'description': row[3],
+                'severity': row[4],
+                'phase': row[5],
+                'resolved': bool(row[6])
+            }
+            for row in rows
+        ]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Bounded LRU Cache with TTL
+Shared cache primitive for signal, validation and file caches
+
+O(1) get/set/evict on an OrderedDict kept in recency order, per-entry TTL
+with lazy expiry on read plus a throttled periodic sweep, optional byte-size
+accounting, and hit/miss/eviction/expiration counters. Not thread-safe;
+intended for single event-loop use like the rest of the async core.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Size-capped LRU cache with optional per-entry TTL
+
+    Entries beyond `max_entries` (or `max_bytes`, when set) are evicted from
+    the least recently used end. Expired entries are dropped when read and
+    by a full sweep at most once every `sweep_interval` seconds of writes.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None,
+                 sweep_interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (sys.getsizeof if max_bytes is not None else None)
+        self.sweep_interval = sweep_interval if sweep_interval is not None else ttl_seconds
+        self.clock = clock
+
+        # key -> (value, expires_at or None, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self.current_bytes = 0
+        self._next_sweep = clock() + self.sweep_interval if self.sweep_interval else None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or self.clock() < entry[1])
+
+    def get(self, key: Hashable, default: Any = None, touch: bool = True) -> Any:
+        """Return the live value for key (marking it most recent) or default"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at = entry[1]
+        if expires_at is not None and self.clock() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        if touch:
+            self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Insert or replace a value; ttl_seconds overrides the cache default"""
+        now = self.clock()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        size = self.sizeof(value) if self.sizeof is not None else 0
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, now + ttl if ttl is not None else None, size)
+        self.current_bytes += size
+
+        if self._next_sweep is not None and now >= self._next_sweep:
+            self.purge_expired()
+
+        while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.current_bytes > self.max_bytes
+                and len(self._entries) > 1):
+            _key, (_value, _expires, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._remove(key)
+        return entry[0]
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries; returns how many were removed"""
+        now = self.clock()
+        expired = [key for key, (_value, expires_at, _size) in self._entries.items()
+                   if expires_at is not None and now >= expires_at]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        if self.sweep_interval:
+            self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Live (key, value) pairs from least to most recently used"""
+        now = self.clock()
+        for key, (value, expires_at, _size) in list(self._entries.items()):
+            if expires_at is None or now < expires_at:
+                yield key, value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+    def _remove(self, key: Hashable):
+        _value, _expires, size = self._entries.pop(key)
+        self.current_bytes -= size
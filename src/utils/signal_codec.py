@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Signal Codec
+Decoding of the EA signal files for the src packages
+"""
+
+# Import from the root signal_codec.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from signal_codec import IncrementalSignalDecoder, decode_signal, decode_signal_text, read_signal_file, sniff_encoding
+
+# Re-export for the src packages
+__all__ = ['IncrementalSignalDecoder', 'decode_signal', 'decode_signal_text', 'read_signal_file', 'sniff_encoding']
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Write-Behind SQLite Persistence
+Batched, asynchronous writer for high-frequency observation tables
+
+Callers append (sql, params) rows to an in-memory buffer; a background
+thread drains it when `flush_rows` rows are pending or `flush_interval`
+seconds have passed, writing each batch with executemany inside a single
+transaction on a WAL-mode connection. `sync_interval_ms` is the durability
+knob: 0 fsyncs every batch (synchronous=FULL), N > 0 fsyncs the WAL at most
+every N ms through a passive checkpoint, None leaves it to SQLite's
+auto-checkpoint. Pending rows are flushed on close() and at interpreter exit.
+A row may carry an `on_done(ok)` callback, called from the writer thread
+once the row is committed (True) or dropped (False), before flush() returns.
+"""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (sql, params, on_done)
+PendingRow = Tuple[str, Sequence[Any], Optional[Callable[[bool], None]]]
+
+
+class WriteBehindWriter:
+    """
+    Background batching writer for one SQLite database
+
+    Rows are written in enqueue order. If a batch fails (constraint or
+    binding error) it is rolled back and replayed row by row so only the
+    offending rows are dropped and counted in `failed_rows`.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 flush_rows: int = 500,
+                 flush_interval: float = 0.25,
+                 sync_interval_ms: Optional[int] = 1000,
+                 max_pending: int = 100_000,
+                 name: str = "sqlite-write-behind"):
+        self.db_path = str(db_path)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.sync_interval_ms = sync_interval_ms
+        self.max_pending = max_pending
+
+        self._cond = threading.Condition()
+        self._pending: List[PendingRow] = []
+        self._enqueued = 0
+        self._flushed = 0
+        self._flush_requested = False
+        self._closing = False
+        self._closed = False
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_lock = threading.Lock()
+
+        self.stats = {
+            'rows_written': 0,
+            'failed_rows': 0,
+            'batches': 0,
+            'syncs': 0,
+            'max_batch': 0,
+            'last_flush_ms': 0.0
+        }
+
+        # Open in the caller so configuration errors surface immediately
+        self._conn = self._connect()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL" if self.sync_interval_ms == 0 else "PRAGMA synchronous=NORMAL")
+        return conn
+
+    def execute(self, sql: str, params: Sequence[Any] = (),
+                on_done: Optional[Callable[[bool], None]] = None):
+        """Queue one statement; returns immediately"""
+        self._enqueue([(sql, params, on_done)])
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]):
+        """Queue one statement for each parameter row"""
+        self._enqueue([(sql, params, None) for params in rows])
+
+    def _enqueue(self, items: List[PendingRow]):
+        if not items:
+            return
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("WriteBehindWriter is closed")
+            self._pending.extend(items)
+            self._enqueued += len(items)
+            backlog = len(self._pending)
+            if backlog >= self.flush_rows:
+                self._cond.notify_all()
+        if backlog >= self.max_pending:
+            # Backpressure: the writer thread cannot keep up
+            self.flush()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed"""
+        with self._cond:
+            target = self._enqueued
+            if self._flushed >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._flushed >= target or self._closed, timeout)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """Read-your-writes query: flushes pending rows, then reads"""
+        self.flush()
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._reader.execute(sql, params).fetchall()
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush pending rows, sync and stop the writer thread"""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        atexit.unregister(self.close)
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput and buffer counters"""
+        return dict(self.stats, pending=self.pending, enqueued=self._enqueued)
+
+    def _run(self):
+        conn = self._conn
+        dirty = False
+        last_sync = time.monotonic()
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: (len(self._pending) >= self.flush_rows
+                             or self._flush_requested or self._closing),
+                    self.flush_interval
+                )
+                batch, self._pending = self._pending, []
+                target = self._enqueued
+                self._flush_requested = False
+                closing = self._closing
+
+            if batch:
+                try:
+                    failed = self._write(conn, batch)
+                except Exception as e:
+                    # Keep the writer alive; the batch is lost but callers unblock
+                    failed = set(range(len(batch)))
+                    self.stats['failed_rows'] += len(batch)
+                    logger.error(f"Write-behind batch of {len(batch)} rows lost: {e}")
+                self._notify(batch, failed)
+                dirty = True
+
+            now = time.monotonic()
+            if dirty and self.sync_interval_ms and (closing or (now - last_sync) * 1000 >= self.sync_interval_ms):
+                self._sync(conn)
+                dirty = False
+                last_sync = now
+
+            with self._cond:
+                self._flushed = target
+                if closing and not self._pending:
+                    break
+                self._cond.notify_all()
+
+        try:
+            if dirty:
+                self._sync(conn)
+            conn.close()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[PendingRow]) -> set:
+        """Commit one batch; returns the positions of dropped rows"""
+        start = time.perf_counter()
+        failed = set()
+        try:
+            conn.execute("BEGIN")
+            # Consecutive rows sharing a statement go through one executemany
+            for sql, group in groupby(batch, key=lambda item: item[0]):
+                conn.executemany(sql, [params for _sql, params, _on_done in group])
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            logger.warning(f"Batch of {len(batch)} rows failed ({e}); retrying row by row")
+            failed = self._write_rows(conn, batch)
+        written = len(batch) - len(failed)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats['rows_written'] += written
+        self.stats['batches'] += 1
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        self.stats['last_flush_ms'] = elapsed_ms
+        return failed
+
+    def _write_rows(self, conn: sqlite3.Connection, batch: List[PendingRow]) -> set:
+        failed = set()
+        conn.execute("BEGIN")
+        for position, (sql, params, _on_done) in enumerate(batch):
+            try:
+                conn.execute(sql, params)
+            except sqlite3.Error as e:
+                failed.add(position)
+                self.stats['failed_rows'] += 1
+                logger.error(f"Dropped row for '{sql.split('(')[0].strip()}': {e}")
+        conn.execute("COMMIT")
+        return failed
+
+    def _notify(self, batch: List[PendingRow], failed: set):
+        """Report each row's outcome to its on_done callback"""
+        for position, (_sql, _params, on_done) in enumerate(batch):
+            if on_done is None:
+                continue
+            try:
+                on_done(position not in failed)
+            except Exception as e:
+                logger.error(f"Write-behind completion callback failed: {e}")
+
+    def _sync(self, conn: sqlite3.Connection):
+        try:
+            # With synchronous=NORMAL the WAL is fsynced before every checkpoint
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            self.stats['syncs'] += 1
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+SYMBOL SPECIFICATION REGISTRY - MIKROBOT FASTVERSION
+====================================================
+
+One table of pip and contract specifications for every traded symbol.
+
+Built once from MT5 symbol_info (or from the last saved JSON snapshot when
+the terminal is offline) and kept as numpy columns indexed by symbol id, so
+scalar lookups are a dict hit plus an array read and whole portfolios
+convert in one vectorized call:
+
+    specs = get_registry()
+    specs.pip('EURUSD')                             # 0.0001
+    ids = specs.ids(['EURUSD', 'XAUUSD', 'BTCUSD'])
+    specs.price_to_pips(ids, [0.0012, 1.5, 250.0])  # array of pips
+    specs.value_to_lots(ids, 550.0, [8.0, 12.0, 10.0])
+
+Asset classification and the per-class pip rules live here; the pip
+converter, ylipip trigger and position sizers all read from this table.
+
+trade_tick_value moves with the quote whenever the profit currency is not
+the account currency, so a registry backed by a live terminal re-reads it
+from symbol_info on sizing calls once it is older than `tick_value_ttl`
+seconds; the static columns are never refetched.
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+
+logger = logging.getLogger(__name__)
+
+YLIPIP_STANDARD = 0.6  # MIKROBOT_FASTVERSION.md universal trigger
+DEFAULT_SNAPSHOT = Path(__file__).with_name('symbol_specs_snapshot.json')
+TICK_VALUE_TTL = 1.0  # seconds a live tick value is trusted for sizing
+
+# Asset classification system
+ASSET_CLASSIFICATIONS = {
+    # 1. FOREX - Currency pairs
+    'FOREX': {
+        'symbols': [
+            'EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD', 'NZDUSD',
+            'EURGBP', 'EURJPY', 'GBPJPY', 'AUDJPY', 'EURAUD', 'GBPAUD', 'EURCHF',
+            'GBPCHF', 'AUDCHF', 'CADCHF', 'NZDCHF', 'EURCZK', 'EURHUF', 'EURPLN',
+            'EURSEK', 'EURNOK', 'EURDKK', 'USDSEK', 'USDNOK', 'USDDKK', 'USDPLN',
+            'USDCZK', 'USDHUF', 'USDSGD', 'USDHKD', 'USDMXN', 'USDZAR', 'USDTRY'
+        ],
+        'pip_calculation': 'forex_standard',
+        'decimal_adjustment': 'auto',
+        'jpy_special': True
+    },
+
+    # 2. CFD-INDICES - Stock market indices
+    'CFD_INDICES': {
+        'symbols': [
+            'US30', 'US500', 'USTEC', 'US2000', 'DJI30', 'SPX500', 'NAS100',
+            'GER40', 'GER30', 'DAX40', 'UK100', 'FTSE100', 'FRA40', 'CAC40',
+            'ESP35', 'IBEX35', 'ITA40', 'MIB40', 'NED25', 'AEX25', 'SUI20',
+            'SMI20', 'AUS200', 'ASX200', 'JPN225', 'N225', 'HKG33', 'HSI33'
+        ],
+        'pip_calculation': 'index_points',
+        'decimal_adjustment': 'minimal',
+        'point_value': 1.0
+    },
+
+    # 3. CFD-CRYPTO - Cryptocurrencies
+    'CFD_CRYPTO': {
+        'symbols': [
+            'BTCUSD', 'ETHUSD', 'XRPUSD', 'ADAUSD', 'DOTUSD', 'LTCUSD', 'LINKUSD',
+            'BCHUSD', 'XLMUSD', 'EOSUSD', 'TRXUSD', 'BNBUSD', 'SOLUSD', 'AVAXUSD',
+            'MATICUSD', 'DOGEUSD', 'ATOMUSD', 'FILUSD', 'APTUSD', 'NEARUSD',
+            'BTCEUR', 'ETHEUR', 'XRPEUR', 'ADAEUR', 'DOTEUR', 'LTCEUR'
+        ],
+        'pip_calculation': 'crypto_dynamic',
+        'decimal_adjustment': 'price_based',
+        'btc_special': True
+    },
+
+    # 4. CFD-METALS - Precious metals
+    'CFD_METALS': {
+        'symbols': [
+            'XAUUSD', 'XAGUSD', 'XPTUSD', 'XPDUSD', 'XAUEUR', 'XAGEUR',
+            'GOLD', 'SILVER', 'PLATINUM', 'PALLADIUM'
+        ],
+        'pip_calculation': 'metals_standard',
+        'decimal_adjustment': 'metals_specific',
+        'gold_special': True
+    },
+
+    # 5. CFD-ENERGIES - Oil and gas
+    'CFD_ENERGIES': {
+        'symbols': [
+            'USOIL', 'UKOIL', 'NGAS', 'CRUDE', 'BRENT', 'WTI', 'NATGAS',
+            'HEATING', 'GASOLINE', 'OILGAS'
+        ],
+        'pip_calculation': 'energy_standard',
+        'decimal_adjustment': 'commodity_based',
+        'oil_special': True
+    },
+
+    # 6. CFD-AGRICULTURAL - Agricultural commodities
+    'CFD_AGRICULTURAL': {
+        'symbols': [
+            'WHEAT', 'CORN', 'SOYBEANS', 'RICE', 'COFFEE', 'COCOA', 'SUGAR',
+            'COTTON', 'LUMBER', 'CATTLE', 'HOGS', 'FEEDER'
+        ],
+        'pip_calculation': 'agricultural_standard',
+        'decimal_adjustment': 'commodity_based',
+        'contract_specific': True
+    },
+
+    # 7. CFD-BONDS - Government bonds
+    'CFD_BONDS': {
+        'symbols': [
+            'US10Y', 'US30Y', 'US2Y', 'US5Y', 'DE10Y', 'DE30Y', 'UK10Y', 'UK30Y',
+            'FR10Y', 'IT10Y', 'ES10Y', 'JP10Y', 'AU10Y', 'CA10Y'
+        ],
+        'pip_calculation': 'bonds_basis_points',
+        'decimal_adjustment': 'basis_points',
+        'yield_based': True
+    },
+
+    # 8. CFD-SHARES - Individual stocks
+    'CFD_SHARES': {
+        'symbols': [
+            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX',
+            'AMD', 'INTC', 'ORCL', 'CRM', 'ADBE', 'PYPL', 'DIS', 'BA', 'JPM',
+            'V', 'MA', 'WMT', 'HD', 'PG', 'JNJ', 'UNH', 'KO', 'PEP'
+        ],
+        'pip_calculation': 'shares_cents',
+        'decimal_adjustment': 'currency_based',
+        'cent_based': True
+    },
+
+    # 9. CFD-ETFS - Exchange traded funds
+    'CFD_ETFS': {
+        'symbols': [
+            'SPY', 'QQQ', 'IWM', 'VTI', 'VOO', 'VEA', 'VWO', 'BND', 'VNQ',
+            'GLD', 'SLV', 'USO', 'TLT', 'HYG', 'LQD', 'EFA', 'EEM', 'XLF'
+        ],
+        'pip_calculation': 'etf_cents',
+        'decimal_adjustment': 'currency_based',
+        'cent_based': True
+    }
+}
+
+ASSET_CLASSES = tuple(ASSET_CLASSIFICATIONS)
+_CLASS_CODES = {name: code for code, name in enumerate(ASSET_CLASSES)}
+_KNOWN_SYMBOLS = {symbol: asset_class
+                  for asset_class, config in ASSET_CLASSIFICATIONS.items()
+                  for symbol in config['symbols']}
+
+# Pattern fallbacks, checked in order
+_FOREX_CURRENCIES = ('USD', 'EUR', 'GBP', 'JPY', 'CHF', 'AUD', 'CAD', 'NZD', 'SEK', 'NOK', 'DKK')
+_CLASS_PATTERNS = (
+    ('CFD_CRYPTO', ('BTC', 'ETH', 'XRP', 'ADA', 'DOT', 'LTC', 'LINK', 'BCH', 'XLM', 'EOS', 'TRX', 'BNB',
+                    'SOL', 'AVAX', 'MATIC', 'DOGE', 'ATOM')),
+    ('CFD_METALS', ('XAU', 'XAG', 'XPT', 'XPD', 'GOLD', 'SILVER', 'PLATINUM', 'PALLADIUM')),
+    ('CFD_INDICES', ('US30', 'US500', 'USTEC', 'GER40', 'UK100', 'FRA40', 'DAX', 'FTSE', 'CAC', 'IBEX',
+                     'MIB', 'AEX', 'SMI', 'ASX', 'N225', 'HSI')),
+    ('CFD_ENERGIES', ('OIL', 'NGAS', 'CRUDE', 'BRENT', 'WTI', 'NATGAS', 'HEATING', 'GASOLINE')),
+    ('CFD_AGRICULTURAL', ('WHEAT', 'CORN', 'SOYBEANS', 'RICE', 'COFFEE', 'COCOA', 'SUGAR', 'COTTON',
+                          'LUMBER', 'CATTLE', 'HOGS')),
+    ('CFD_BONDS', ('10Y', '30Y', '2Y', '5Y')),
+)
+
+# symbol_info attributes kept per symbol, with the defaults used when a
+# broker leaves one out
+SPEC_FIELDS = {
+    'point': 0.00001,
+    'digits': 5,
+    'trade_tick_value': 0.0,
+    'trade_tick_size': 0.0,
+    'trade_contract_size': 100000.0,
+    'volume_min': 0.01,
+    'volume_max': 100.0,
+    'volume_step': 0.01,
+    'currency_profit': '',
+    'path': '',
+}
+
+Symbols = Union[str, Sequence[str], np.ndarray]
+
+
+def classify_symbol(symbol: str) -> str:
+    """Classify a symbol into one of the 9 MT5 asset classes"""
+    asset_class = _KNOWN_SYMBOLS.get(symbol)
+    if asset_class:
+        return asset_class
+
+    symbol_upper = symbol.upper()
+    if len(symbol_upper) == 6 and any(curr in symbol_upper for curr in _FOREX_CURRENCIES):
+        return 'FOREX'
+    for asset_class, patterns in _CLASS_PATTERNS:
+        if any(pattern in symbol_upper for pattern in patterns):
+            return asset_class
+    if symbol_upper in ASSET_CLASSIFICATIONS['CFD_ETFS']['symbols']:
+        return 'CFD_ETFS'
+    return 'CFD_SHARES'
+
+
+def pip_multiplier(symbol: str, asset_class: str, digits: int) -> float:
+    """Points per pip for a symbol of the given class and digits"""
+    if asset_class == 'FOREX':
+        # Fractional quotes (5 digits, 3 for JPY pairs): 1 pip = 10 points
+        return 10.0 if digits in (3, 5) else 1.0
+    if asset_class == 'CFD_CRYPTO':
+        return 100.0 if 'BTC' in symbol else 10.0
+    if asset_class == 'CFD_INDICES':
+        return 1.0
+    if asset_class == 'CFD_METALS':
+        if 'XAU' in symbol or 'GOLD' in symbol:
+            return 10.0
+        return 100.0 if 'XAG' in symbol or 'SILVER' in symbol else 10.0
+    if asset_class == 'CFD_ENERGIES':
+        return 100.0 if 'NGAS' in symbol or 'NATGAS' in symbol else 10.0
+    if asset_class == 'CFD_BONDS':
+        return 10.0
+    if asset_class in ('CFD_SHARES', 'CFD_ETFS'):
+        return 100.0 if digits >= 2 else 1.0
+    # Agricultural and unknown classes
+    return 10.0 if digits >= 3 else 1.0
+
+
+def _info_to_spec(info) -> Dict:
+    return {field: getattr(info, field, default) for field, default in SPEC_FIELDS.items()}
+
+
+class SymbolSpecRegistry:
+    """
+    Columnar symbol specification table
+
+    Every method taking `symbols` accepts a single symbol name (returns a
+    float), a sequence of names, or an integer array from ids() (returns
+    an ndarray). Resolve ids once per portfolio and reuse them on the hot path.
+    """
+
+    def __init__(self, specs: Optional[Dict[str, Dict]] = None, fetch_missing: bool = False,
+                 tick_value_ttl: Optional[float] = TICK_VALUE_TTL):
+        self.fetch_missing = fetch_missing and mt5 is not None
+        # Live tick values only when the terminal may be queried
+        self.tick_value_ttl = tick_value_ttl if self.fetch_missing else None
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._specs: List[Dict] = []
+        self._build_columns()
+        if specs:
+            self.extend(specs)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_mt5(cls, symbols: Optional[Iterable[str]] = None) -> 'SymbolSpecRegistry':
+        """Build from the connected terminal (all symbols when none are given)"""
+        if mt5 is None:
+            raise RuntimeError("MetaTrader5 package not available")
+        if symbols is None:
+            infos = mt5.symbols_get() or ()
+        else:
+            infos = [info for info in (mt5.symbol_info(symbol) for symbol in symbols) if info]
+        return cls({info.name: _info_to_spec(info) for info in infos}, fetch_missing=True)
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path] = DEFAULT_SNAPSHOT,
+                      fetch_missing: bool = False) -> 'SymbolSpecRegistry':
+        """Build from a JSON snapshot written by save_snapshot()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['symbols'], fetch_missing=fetch_missing)
+
+    @classmethod
+    def load(cls, snapshot_path: Union[str, Path] = DEFAULT_SNAPSHOT) -> 'SymbolSpecRegistry':
+        """
+        Build from MT5 when the terminal answers, refreshing the snapshot;
+        otherwise from the snapshot, or empty if there is none
+        """
+        if mt5 is not None and mt5.symbols_get():
+            registry = cls.from_mt5()
+            try:
+                registry.save_snapshot(snapshot_path)
+            except OSError as e:
+                logger.warning(f"Could not save symbol snapshot {snapshot_path}: {e}")
+            return registry
+        if Path(snapshot_path).exists():
+            logger.info(f"MT5 offline, loading symbol specs from {snapshot_path}")
+            return cls.from_snapshot(snapshot_path, fetch_missing=True)
+        logger.warning("MT5 offline and no symbol snapshot, starting with an empty registry")
+        return cls(fetch_missing=True)
+
+    def save_snapshot(self, path: Union[str, Path] = DEFAULT_SNAPSHOT):
+        """Write the raw specifications so offline processes can load them"""
+        data = {
+            'timestamp': datetime.now().isoformat(),
+            'symbols': dict(zip(self.names, self._specs)),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def extend(self, specs: Dict[str, Dict]):
+        """Add or replace symbols and rebuild the columns"""
+        with self._lock:
+            for symbol, spec in specs.items():
+                spec = {field: spec.get(field, default) for field, default in SPEC_FIELDS.items()}
+                if symbol in self._ids:
+                    self._specs[self._ids[symbol]] = spec
+                else:
+                    self._ids[symbol] = len(self.names)
+                    self.names.append(symbol)
+                    self._specs.append(spec)
+            self._build_columns()
+
+    def _build_columns(self):
+        specs = self._specs
+        column = lambda field: np.array([spec[field] for spec in specs], dtype=np.float64)
+
+        self.point = column('point')
+        self.digits = np.array([spec['digits'] for spec in specs], dtype=np.int64)
+        self.tick_value = column('trade_tick_value')
+        self.tick_size = column('trade_tick_size')
+        self.contract_size = column('trade_contract_size')
+        self.volume_min = column('volume_min')
+        self.volume_max = column('volume_max')
+        self.volume_step = column('volume_step')
+
+        classes = [classify_symbol(symbol) for symbol in self.names]
+        self.asset_class_code = np.array([_CLASS_CODES[c] for c in classes], dtype=np.int8)
+        self.pip_size = self.point * np.array(
+            [pip_multiplier(symbol, c, spec['digits']) for symbol, c, spec in zip(self.names, classes, specs)],
+            dtype=np.float64)
+
+        # Account currency per pip per lot; 0 where the broker gives no tick size
+        self.pip_value = np.divide(self.tick_value * self.pip_size, self.tick_size,
+                                   out=np.zeros_like(self.pip_size), where=self.tick_size > 0)
+        self.tick_value_time = np.full(len(specs), time.monotonic())
+
+        # The same rows as plain floats for single-symbol calls
+        self._records = list(zip(self.pip_size.tolist(), self.pip_value.tolist(), self.volume_step.tolist(),
+                                 self.volume_min.tolist(), self.volume_max.tolist()))
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def id(self, symbol: str) -> int:
+        """Row of a symbol, fetched from MT5 on first use when allowed"""
+        row = self._ids.get(symbol)
+        if row is None:
+            info = mt5.symbol_info(symbol) if self.fetch_missing else None
+            if not info:
+                raise KeyError(f"No symbol specification for {symbol}")
+            self.extend({symbol: _info_to_spec(info)})
+            row = self._ids[symbol]
+        return row
+
+    def ids(self, symbols: Iterable[str]) -> np.ndarray:
+        """Rows for a list of symbols, to reuse across vectorized calls"""
+        return np.fromiter((self.id(symbol) for symbol in symbols), dtype=np.int64)
+
+    def _rows(self, symbols: Symbols):
+        if isinstance(symbols, str):
+            return self.id(symbols)
+        if isinstance(symbols, (int, np.integer)):
+            return symbols
+        if isinstance(symbols, np.ndarray) and symbols.dtype.kind in 'iu':
+            return symbols
+        return self.ids(symbols)
+
+    def _record(self, symbols: Symbols, *values, live: bool = False) -> Optional[tuple]:
+        """Plain-float row for a single symbol with scalar arguments, else None"""
+        if isinstance(symbols, str) and all(isinstance(value, (int, float)) for value in values):
+            row = self.id(symbols)
+            if live:
+                self._refresh_tick_values(row)
+            return self._records[row]
+        return None
+
+    def _live_rows(self, symbols: Symbols):
+        """Rows for a sizing call, with their tick values refreshed"""
+        rows = self._rows(symbols)
+        self._refresh_tick_values(rows)
+        return rows
+
+    def _refresh_tick_values(self, rows):
+        """Re-read trade_tick_value for rows older than tick_value_ttl"""
+        if self.tick_value_ttl is None:
+            return
+        now = time.monotonic()
+        rows = np.atleast_1d(rows)
+        stale = rows[now - self.tick_value_time[rows] >= self.tick_value_ttl]
+        for row in np.unique(stale).tolist():
+            self.tick_value_time[row] = now
+            info = mt5.symbol_info(self.names[row])
+            tick_value = getattr(info, 'trade_tick_value', 0.0) if info else 0.0
+            if tick_value > 0 and tick_value != self.tick_value[row]:
+                self._set_tick_value(row, float(tick_value))
+
+    def _set_tick_value(self, row: int, tick_value: float):
+        with self._lock:
+            self._specs[row]['trade_tick_value'] = tick_value
+            self.tick_value[row] = tick_value
+            tick_size = self.tick_size[row]
+            self.pip_value[row] = tick_value * self.pip_size[row] / tick_size if tick_size > 0 else 0.0
+            record = self._records[row]
+            self._records[row] = (record[0], float(self.pip_value[row])) + record[2:]
+
+    @staticmethod
+    def _out(values):
+        return float(values) if np.ndim(values) == 0 else values
+
+    def spec(self, symbol: str) -> Dict:
+        """Raw symbol_info fields for one symbol"""
+        return dict(self._specs[self.id(symbol)])
+
+    def asset_class(self, symbols: Symbols):
+        rows = self._rows(symbols)
+        codes = self.asset_class_code[rows]
+        if np.ndim(codes) == 0:
+            return ASSET_CLASSES[codes]
+        return [ASSET_CLASSES[code] for code in codes]
+
+    def pip(self, symbols: Symbols):
+        """Price distance of one pip"""
+        record = self._record(symbols)
+        if record:
+            return record[0]
+        return self._out(self.pip_size[self._rows(symbols)])
+
+    def pip_value_per_lot(self, symbols: Symbols):
+        """Account currency value of one pip on one lot"""
+        record = self._record(symbols, live=True)
+        if record:
+            return record[1]
+        return self._out(self.pip_value[self._live_rows(symbols)])
+
+    def ylipip(self, symbols: Symbols, amount: float = YLIPIP_STANDARD):
+        """Ylipip trigger distance in price units (0.6 pip by default)"""
+        record = self._record(symbols, amount)
+        if record:
+            return amount * record[0]
+        return self._out(amount * self.pip_size[self._rows(symbols)])
+
+    # ------------------------------------------------------------------
+    # Conversions
+    # ------------------------------------------------------------------
+
+    def price_to_pips(self, symbols: Symbols, distances):
+        record = self._record(symbols, distances)
+        if record:
+            return distances / record[0]
+        return self._out(np.asarray(distances, dtype=np.float64) / self.pip_size[self._rows(symbols)])
+
+    def pips_to_price(self, symbols: Symbols, pips):
+        record = self._record(symbols, pips)
+        if record:
+            return pips * record[0]
+        return self._out(np.asarray(pips, dtype=np.float64) * self.pip_size[self._rows(symbols)])
+
+    def lots_to_value(self, symbols: Symbols, lots, pips):
+        """Account currency moved by `pips` on a position of `lots`"""
+        record = self._record(symbols, lots, pips, live=True)
+        if record:
+            return lots * pips * record[1]
+        rows = self._live_rows(symbols)
+        return self._out(np.asarray(lots, dtype=np.float64) * np.asarray(pips, dtype=np.float64)
+                         * self.pip_value[rows])
+
+    def round_lots(self, symbols: Symbols, lots):
+        """Snap lots to each symbol's volume step and clamp to its volume limits"""
+        record = self._record(symbols, lots)
+        if record:
+            _, _, step, volume_min, volume_max = record
+            return min(max(round(lots / step) * step, volume_min), volume_max)
+        rows = self._rows(symbols)
+        step = self.volume_step[rows]
+        lots = np.round(np.asarray(lots, dtype=np.float64) / step) * step
+        return self._out(np.clip(lots, self.volume_min[rows], self.volume_max[rows]))
+
+    def value_to_lots(self, symbols: Symbols, value, pips, round_to_step: bool = True):
+        """Lots that risk `value` account currency over a `pips` stop distance (nan if unpriced)"""
+        record = self._record(symbols, value, pips, live=True)
+        if record:
+            risk_per_lot = pips * record[1]
+            if risk_per_lot <= 0:
+                return float('nan')
+            lots = value / risk_per_lot
+            return self.round_lots(symbols, lots) if round_to_step else lots
+        rows = self._live_rows(symbols)
+        risk_per_lot = np.asarray(pips, dtype=np.float64) * self.pip_value[rows]
+        lots = np.divide(np.asarray(value, dtype=np.float64), risk_per_lot,
+                         out=np.full(np.broadcast(risk_per_lot, value).shape, np.nan),
+                         where=risk_per_lot > 0)
+        return self.round_lots(rows, lots) if round_to_step else self._out(lots)
+
+
+_registry: Optional[SymbolSpecRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SymbolSpecRegistry:
+    """Process-wide registry, built on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SymbolSpecRegistry.load()
+    return _registry
+
+
+def set_registry(registry: Optional[SymbolSpecRegistry]):
+    """Replace the process-wide registry (None rebuilds it on next use)"""
+    global _registry
+    with _registry_lock:
+        _registry = registry
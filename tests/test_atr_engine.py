@@ -0,0 +1,221 @@
+"""
+Tests for the incremental ATR engine and the ATR position sizer on top of it
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mikrobot_v2.core.mt5_direct_connector import Candle
+from mikrobot_v2.utils.atr_engine import ATREngine, batch_atr, true_range
+from mikrobot_v2.utils.atr_position_sizer import ATRPositionSizer
+
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8')])
+
+
+def synthetic_rates(bars: int, seed: int = 0, period: int = 60) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars) * period
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, bars))
+    rates['open'] = np.concatenate(([1.1], close[:-1]))
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 2e-4, bars)
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 2e-4, bars)
+    rates['close'] = close
+    return rates
+
+
+def reference_atr(rates, period, method='sma'):
+    """ATR of every bar but the last (forming) one, the slow way"""
+    closed = rates[:-1]
+    trs = [max(h - l, abs(h - pc), abs(l - pc))
+           for h, l, pc in zip(closed['high'][1:], closed['low'][1:], closed['close'][:-1])]
+    if method == 'sma':
+        return sum(trs[-period:]) / period
+    atr = sum(trs[:period]) / period
+    for tr in trs[period:]:
+        atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+class TestATREngine:
+    @pytest.mark.parametrize('method', ['sma', 'wilder'])
+    def test_incremental_fetches_match_full_recompute(self, method):
+        rates = synthetic_rates(300)
+        engine = ATREngine(period=14, method=method)
+        fetched = []
+
+        def fetch_until(end):
+            def fetch(count):
+                fetched.append(count)
+                return rates[max(0, end - count):end]
+            return fetch
+
+        end = engine.history
+        now = float(rates['time'][end - 1]) + 30
+        assert engine.get('EURUSD', 'M1', fetch_until(end), now) == pytest.approx(
+            reference_atr(rates[:end], 14, method))
+
+        for step in (1, 1, 3, 7):
+            end += step
+            now += step * 60
+            assert engine.bars_needed('EURUSD', 'M1', now) == step + 2
+            assert engine.get('EURUSD', 'M1', fetch_until(end), now) == pytest.approx(
+                reference_atr(rates[:end], 14, method))
+        assert fetched == [engine.history, 3, 3, 5, 9]
+
+        if method == 'wilder':
+            # Wilder depends on the whole path, so compare against the same seed window
+            seeded = ATREngine(period=14, method=method)
+            seeded.ingest_rates('EURUSD', 'M1', rates[:engine.history], now)
+            for i in range(engine.history, end):
+                seeded.update_bar('EURUSD', 'M1', rates['time'][i - 1], *rates[['high', 'low', 'close']][i - 1])
+            assert seeded.last_value('EURUSD', 'M1') == pytest.approx(engine.last_value('EURUSD', 'M1'))
+
+    def test_reads_are_served_until_the_forming_bar_closes(self):
+        rates = synthetic_rates(20, period=3600)
+        engine = ATREngine(period=14)
+        forming = float(rates['time'][-1])
+        # Broker clock two hours ahead of ours: learnt from the forming bar
+        local = forming - 7200 + 600
+
+        engine.ingest_rates('EURUSD', 'H1', rates, local)
+        assert engine.skew == pytest.approx(7200 - 600)
+        assert engine.atr('EURUSD', 'H1', local + 3500) is not None
+        assert engine.bars_needed('EURUSD', 'H1', local + 3500) == 0
+        assert engine.atr('EURUSD', 'H1', local + 3600) is None
+        assert engine.bars_needed('EURUSD', 'H1', local + 3600) == 3
+
+        # A tick time pins the offset exactly
+        engine.observe_server_time(forming + 600, local)
+        assert engine.atr('EURUSD', 'H1', local + 2900) is not None
+        assert engine.atr('EURUSD', 'H1', local + 3000) is None
+        assert engine.get_stats()['hits'] == 2
+
+    def test_skew_moves_down_when_the_clock_moves_back(self):
+        rates = synthetic_rates(20, period=3600)
+        engine = ATREngine(period=14)
+        forming = float(rates['time'][-1])
+
+        engine.ingest_rates('EURUSD', 'H1', rates, forming - 7200 + 600)
+        # Later in the same bar: still a lower bound, the estimate stays
+        engine.ingest_rates('EURUSD', 'H1', rates, forming - 7200 + 1800)
+        assert engine.skew == pytest.approx(7200 - 600)
+        # The forming bar would have closed under the old offset: the clock moved back an hour
+        engine.ingest_rates('EURUSD', 'H1', rates, forming - 3600 + 600)
+        assert engine.skew == pytest.approx(3600 - 600)
+
+    def test_gap_in_fetch_rebuilds_series(self):
+        rates = synthetic_rates(100)
+        engine = ATREngine(period=14)
+        engine.ingest_rates('EURUSD', 'M1', rates[:20], 0)
+        atr = engine.ingest_rates('EURUSD', 'M1', rates[60:80], 0)
+        assert atr == pytest.approx(reference_atr(rates[60:80], 14))
+
+    def test_update_bar_is_o1_sma(self):
+        rates = synthetic_rates(80)
+        engine = ATREngine(period=14)
+        for row in rates[:-1]:
+            engine.update_bar('XAUUSD', 'M5', float(row['time']), row['high'], row['low'], row['close'])
+        assert engine.last_value('XAUUSD', 'M5') == pytest.approx(reference_atr(rates, 14))
+        # A repeated bar is ignored
+        row = rates[-2]
+        engine.update_bar('XAUUSD', 'M5', float(row['time']), 99.0, 0.0, 50.0)
+        assert engine.last_value('XAUUSD', 'M5') == pytest.approx(reference_atr(rates, 14))
+
+    def test_lru_bound_evicts_least_recent_series(self):
+        engine = ATREngine(period=14, max_series=3)
+        rates = synthetic_rates(20)
+        now = float(rates['time'][-1]) + 10
+        for symbol in ('A', 'B', 'C'):
+            engine.ingest_rates(symbol, 'M1', rates, now)
+        assert engine.atr('A', 'M1', now) is not None
+        engine.ingest_rates('D', 'M1', rates, now)
+        assert len(engine) == 3
+        assert engine.last_value('B', 'M1') is None
+        assert engine.last_value('A', 'M1') is not None
+        assert engine.get_stats()['evictions'] == 1
+
+    @pytest.mark.parametrize('method', ['sma', 'wilder'])
+    def test_batch_matches_per_symbol(self, method):
+        symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
+        stack = [synthetic_rates(71, seed=i)[:70] for i in range(len(symbols))]
+        highs, lows, closes = (np.stack([r[field] for r in stack]) for field in ('high', 'low', 'close'))
+
+        expected = [reference_atr(r, 14, method) for r in stack]
+        assert batch_atr(highs[:, :-1], lows[:, :-1], closes[:, :-1], 14, method) == pytest.approx(expected)
+
+        engine = ATREngine(period=14, method=method)
+        atrs = engine.ingest_batch(symbols, 'M1', stack[0]['time'], highs, lows, closes, now=START + 69 * 60)
+        assert atrs == pytest.approx(expected)
+        assert engine.atr('USDJPY', 'M1', START + 69 * 60 + 10) == pytest.approx(expected[2])
+
+        # Seeded series continue incrementally
+        more = synthetic_rates(71, seed=0)
+        assert engine.ingest_rates('EURUSD', 'M1', more[-3:], START + 70 * 60) == pytest.approx(
+            reference_atr(more, 14, method))
+
+    def test_true_range_with_previous_close(self):
+        tr = true_range([3.0, 5.0], [1.0, 4.0], [2.0, 4.5], prev_close=0.5)
+        assert tr.tolist() == [2.5, 3.0]
+
+
+class FakeConnector:
+    def __init__(self, rates):
+        self.rates = rates
+        self.now = datetime.fromtimestamp(int(rates['time'][20]) + 30)
+        self.requests = []
+
+    def clock(self):
+        return self.now
+
+    async def get_candles(self, symbol, timeframe, count):
+        self.requests.append(count)
+        visible = self.rates[self.rates['time'] <= self.now.timestamp()][-count:]
+        return [Candle(symbol, timeframe, datetime.fromtimestamp(int(r['time'])),
+                       r['open'], r['high'], r['low'], r['close'], 0) for r in visible]
+
+
+class TestATRPositionSizer:
+    def test_sizing_reads_cached_atr_until_next_bar(self):
+        rates = synthetic_rates(40, period=3600)
+        connector = FakeConnector(rates)
+        sizer = ATRPositionSizer(connector, atr_engine=ATREngine(period=14), clock=connector.clock)
+
+        async def run():
+            first = await sizer.calculate_atr('EURUSD', 'H1')
+            again = await sizer.calculate_atr('EURUSD', 'H1')
+            connector.now = connector.now.replace(hour=(connector.now.hour + 1) % 24)
+            later = await sizer.calculate_atr('EURUSD', 'H1')
+            return first, again, later
+
+        first, again, later = asyncio.run(run())
+        assert first == again == pytest.approx(reference_atr(rates[:21], 14))
+        assert later == pytest.approx(reference_atr(rates[:22], 14))
+        assert connector.requests == [16, 3]
+        assert sizer.get_cache_stats()['symbols'] == ['EURUSD_H1']
+
+    def test_connectors_do_not_share_series(self):
+        first, second = FakeConnector(synthetic_rates(40, period=3600, seed=1)), \
+            FakeConnector(synthetic_rates(40, period=3600, seed=2))
+        sizers = [ATRPositionSizer(first, clock=first.clock), ATRPositionSizer(second, clock=second.clock)]
+
+        async def run():
+            return [await sizer.calculate_atr('EURUSD', 'H1') for sizer in sizers]
+
+        atrs = asyncio.run(run())
+        assert sizers[0].atr_engine is not sizers[1].atr_engine
+        assert atrs == pytest.approx([reference_atr(first.rates[:21], 14),
+                                      reference_atr(second.rates[:21], 14)])
+        assert first.requests == second.requests == [16]
+        assert sizers[1].atr_engine.clock() == second.now.timestamp()
@@ -0,0 +1,135 @@
+"""
+Tests for the slotted records and columnar TickBatch/BarBatch containers
+Round-trips against the legacy TickData/OHLCVData dataclasses must be lossless
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+from data_ingestion.data_models import (
+    TickData, OHLCVData, AssetType, DataSource, DataQuality
+)
+from data_ingestion.batch_models import (
+    TickRecord, BarRecord, TickBatch, BarBatch, TICK_DTYPE,
+    datetime_to_us, us_to_datetime
+)
+
+
+def _ticks():
+    base = datetime(2025, 3, 4, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    return [
+        TickData(base, 'EURUSD', 1.08501, 1.08513, 0.00012),
+        TickData(base + timedelta(microseconds=1), 'USDJPY', 149.101, 149.112, 0.011,
+                 volume=3.0, asset_type=AssetType.FOREX, quality=DataQuality.EXCELLENT,
+                 latency_ms=0.42, sequence_number=17),
+        TickData(base.replace(tzinfo=None), 'BTCUSD', 64000.5, 64001.0, 0.5,
+                 asset_type=AssetType.CRYPTO, source=DataSource.BINANCE,
+                 quality=DataQuality.POOR, sequence_number=0),
+    ]
+
+
+def _bars():
+    base = datetime(2025, 3, 4, 12, 0, tzinfo=timezone.utc)
+    return [
+        OHLCVData(base, 'EURUSD', 1.0850, 1.0860, 1.0845, 1.0855, 120.0, '1m'),
+        OHLCVData(base, 'GBPJPY', 190.10, 190.30, 190.00, 190.20, 0.0, '5m',
+                  tick_count=42, quality=DataQuality.ACCEPTABLE),
+        OHLCVData(base + timedelta(minutes=1), 'EURUSD', 1.0855, 1.0858, 1.0850, 1.0851,
+                  80.0, '1m', vwap=1.08531),
+    ]
+
+
+class TestTimestamps:
+    def test_microsecond_round_trip(self):
+        ts = datetime(2025, 1, 1, 0, 0, 0, 999999, tzinfo=timezone.utc)
+        assert us_to_datetime(datetime_to_us(ts)) == ts
+
+    def test_naive_is_utc(self):
+        naive = datetime(2025, 1, 1, 8, 30)
+        assert datetime_to_us(naive) == datetime_to_us(naive.replace(tzinfo=timezone.utc))
+
+
+class TestRecords:
+    def test_tick_record_is_slotted(self):
+        record = TickRecord.from_tick_data(_ticks()[0])
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.extra = 2.0
+
+    def test_tick_record_round_trip(self):
+        for tick in _ticks():
+            assert TickRecord.from_tick_data(tick).to_tick_data() == tick
+
+    def test_bar_record_round_trip(self):
+        for bar in _bars():
+            assert BarRecord.from_ohlcv_data(bar).to_ohlcv_data() == bar
+
+
+class TestTickBatch:
+    def test_round_trip_is_lossless(self):
+        ticks = _ticks()
+        batch = TickBatch.from_tick_data(ticks)
+        assert batch.data.dtype == TICK_DTYPE
+        assert batch.symbols == ('EURUSD', 'USDJPY', 'BTCUSD')
+        assert batch.to_tick_data() == ticks
+
+    def test_columns_are_views(self):
+        batch = TickBatch.from_tick_data(_ticks())
+        assert np.shares_memory(batch['bid'], batch.data)
+        np.testing.assert_allclose(batch.mid_price, [t.mid_price for t in _ticks()])
+
+    def test_split_and_concat(self):
+        ticks = _ticks() + _ticks()
+        batch = TickBatch.from_tick_data(ticks)
+        parts = batch.split_by_symbol()
+        assert len(parts['EURUSD']) == 2
+        merged = TickBatch.concat(list(parts.values()))
+        assert sorted(t.symbol for t in merged.to_tick_data()) == sorted(t.symbol for t in ticks)
+
+    def test_from_mt5_ticks(self):
+        ticks = np.zeros(3, dtype=[('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'),
+                                   ('last', '<f8'), ('volume', '<u8'), ('time_msc', '<i8'),
+                                   ('flags', '<u4'), ('volume_real', '<f8')])
+        ticks['time_msc'] = [1_700_000_000_001, 1_700_000_000_002, 1_700_000_000_250]
+        ticks['bid'] = [1.1, 1.1001, 1.1002]
+        ticks['ask'] = [1.1002, 1.1003, 1.1004]
+        batch = TickBatch.from_mt5_ticks('EURUSD', ticks)
+        records = list(batch.iter_records())
+        assert records[2].timestamp == datetime.fromtimestamp(1_700_000_000.25, tz=timezone.utc)
+        assert records[0].spread == pytest.approx(0.0002)
+
+
+class TestBarBatch:
+    def test_round_trip_is_lossless(self):
+        bars = _bars()
+        batch = BarBatch.from_ohlcv_data(bars)
+        assert batch.timeframes == ('1m', '5m')
+        assert batch.to_ohlcv_data() == bars
+
+    def test_from_mt5_rates_matches_legacy(self):
+        rates = np.zeros(2, dtype=[('time', '<i8'), ('open', '<f8'), ('high', '<f8'),
+                                   ('low', '<f8'), ('close', '<f8'), ('tick_volume', '<u8'),
+                                   ('spread', '<i4'), ('real_volume', '<u8')])
+        rates['time'] = [1_700_000_000, 1_700_000_060]
+        rates['open'], rates['high'] = [1.1, 1.2], [1.15, 1.25]
+        rates['low'], rates['close'] = [1.05, 1.15], [1.12, 1.22]
+        rates['tick_volume'] = [10, 0]
+        rates['real_volume'] = [0, 0]
+
+        batch = BarBatch.from_mt5_rates('EURUSD', '1m', rates)
+        bars = batch.to_ohlcv_data()
+        legacy = OHLCVData(
+            timestamp=datetime.fromtimestamp(1_700_000_000, tz=timezone.utc),
+            symbol='EURUSD', open=1.1, high=1.15, low=1.05, close=1.12,
+            volume=10.0, timeframe='1m', tick_count=10
+        )
+        assert list(batch.data['tick_count']) == [10, 0]
+        assert list(batch.data['real_volume']) == [0.0, 0.0]
+        assert bars[0] == legacy
+        assert bars[1].vwap is None
@@ -0,0 +1,282 @@
+"""
+Equivalence tests for DataValidator.validate_tick_batch and validate_bar_batch
+The vectorized paths must reproduce the scalar validate() outcome row by row
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+from data_ingestion.data_models import TickData, OHLCVData, MarketData, AssetType, DataQuality
+from data_ingestion.data_validator import DataValidator, PriceRing
+from data_ingestion.batch_models import TickBatch, BarBatch, ValidationReason
+
+MESSAGE_FLAGS = {
+    'Invalid price': ValidationReason.INVALID_PRICE,
+    'Invalid spread': ValidationReason.CROSSED_SPREAD,
+    'Future timestamp': ValidationReason.FUTURE_TIMESTAMP,
+    'Large spread': ValidationReason.WIDE_SPREAD,
+    'Unusual price change': ValidationReason.PRICE_JUMP,
+    'High latency': ValidationReason.HIGH_LATENCY,
+    'Out-of-sequence': ValidationReason.OUT_OF_SEQUENCE,
+    'Stale data': ValidationReason.STALE,
+    'Invalid OHLCV: negative': ValidationReason.INVALID_PRICE,
+    'Invalid OHLCV: high': ValidationReason.INCONSISTENT_OHLC,
+    'Invalid OHLCV: low': ValidationReason.INCONSISTENT_OHLC,
+    'Invalid volume': ValidationReason.NEGATIVE_VOLUME,
+    'Zero volume': ValidationReason.ZERO_VOLUME,
+    'Out-of-order bar': ValidationReason.OUT_OF_ORDER_BAR,
+    'Unusual OHLCV price change': ValidationReason.PRICE_JUMP,
+}
+
+
+def _scenario_ticks(count: int, seed: int = 3):
+    """Random walk ticks salted with every failure mode the validator knows"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    symbols = ['EURUSD', 'USDJPY', 'BTCUSD']
+    base = {'EURUSD': 1.1, 'USDJPY': 150.0, 'BTCUSD': 60000.0}
+    assets = {'EURUSD': AssetType.FOREX, 'USDJPY': AssetType.FOREX, 'BTCUSD': AssetType.CRYPTO}
+    ticks = []
+    for i in range(count):
+        symbol = symbols[rng.integers(len(symbols))]
+        mid = base[symbol] * (1 + rng.normal(0, 0.001))
+        half_spread = base[symbol] * 0.00005
+        bid, ask = mid - half_spread, mid + half_spread
+        ts = now - timedelta(seconds=30) + timedelta(milliseconds=i)
+        latency = None
+        sequence = i
+        roll = rng.random()
+        if roll < 0.03:
+            bid = -bid
+        elif roll < 0.06:
+            bid, ask = ask, bid
+        elif roll < 0.09:
+            ask = bid * 1.2
+        elif roll < 0.12:
+            bid, ask = bid * 1.3, ask * 1.3
+        elif roll < 0.15:
+            ts = now - timedelta(seconds=120)
+        elif roll < 0.18:
+            ts = now - timedelta(seconds=900)
+        elif roll < 0.21:
+            ts = now + timedelta(seconds=30)
+        elif roll < 0.24:
+            sequence = max(i - 5, 0)
+        if rng.random() < 0.5:
+            latency = float(rng.choice([0.0, 0.5, 2.0, 7.0, 15.0]))
+        ticks.append(TickData(ts, symbol, bid, ask, ask - bid, asset_type=assets[symbol],
+                              latency_ms=latency, sequence_number=sequence))
+    return ticks, now
+
+
+def _scenario_bars(count: int, seed: int = 5):
+    """One-minute bars on two timeframes salted with every bar failure mode"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    symbols = ['EURUSD', 'BTCUSD']
+    base = {'EURUSD': 1.1, 'BTCUSD': 60000.0}
+    assets = {'EURUSD': AssetType.FOREX, 'BTCUSD': AssetType.CRYPTO}
+    bars = []
+    for i in range(count):
+        symbol = symbols[rng.integers(len(symbols))]
+        timeframe = '1m' if rng.random() < 0.7 else '5m'
+        o, c = base[symbol] * (1 + rng.normal(0, 0.001, 2))
+        h = max(o, c) * (1 + abs(rng.normal(0, 0.0005)))
+        l = min(o, c) * (1 - abs(rng.normal(0, 0.0005)))
+        volume = float(rng.integers(1, 500))
+        ts = now - timedelta(minutes=10) + timedelta(milliseconds=100 * i)
+        roll = rng.random()
+        if roll < 0.03:
+            l = -l
+        elif roll < 0.06:
+            h = max(o, c) * 0.999
+        elif roll < 0.09:
+            l = min(o, c) * 1.001
+        elif roll < 0.12:
+            volume = -volume
+        elif roll < 0.15:
+            volume = 0.0
+        elif roll < 0.18:
+            ts = ts - timedelta(minutes=5)
+        elif roll < 0.21:
+            o, h, l, c = o * 1.3, h * 1.3, l * 1.3, c * 1.3
+        elif roll < 0.24:
+            ts = now + timedelta(seconds=30)
+        elif roll < 0.27:
+            ts = now - timedelta(seconds=90)
+        bars.append(OHLCVData(ts, symbol, o, h, l, c, volume, timeframe, asset_type=assets[symbol]))
+    return bars, now
+
+
+def _scalar_outcomes(items, check_ordering=True):
+    # The batch paths always check ordering; the scalar path only when asked
+    validator = DataValidator(check_ordering=check_ordering)
+
+    async def run():
+        outcomes = []
+        for item in items:
+            if isinstance(item, TickData):
+                data = MarketData(timestamp=item.timestamp, symbol=item.symbol,
+                                  asset_type=item.asset_type, tick_data=item)
+            else:
+                data = MarketData(timestamp=item.timestamp, symbol=item.symbol,
+                                  asset_type=item.asset_type, ohlcv_data=item)
+            outcomes.append(await validator.validate(data))
+        return outcomes
+
+    return validator, asyncio.run(run())
+
+
+def _flags(result) -> int:
+    flags = 0
+    for message in result.errors + result.warnings:
+        for prefix, flag in MESSAGE_FLAGS.items():
+            if message.startswith(prefix):
+                flags |= flag
+    return flags
+
+
+class TestPriceRing:
+    def test_running_mean_matches_tail(self):
+        ring = PriceRing(capacity=32, window=10)
+        prices = np.linspace(1.0, 2.0, 100)
+        for i, price in enumerate(prices):
+            ring.push(i, price)
+            assert ring.mean == pytest.approx(prices[max(0, i - 9):i + 1].mean())
+        assert ring.variance == pytest.approx(prices[-10:].var())
+
+    def test_extend_wraps(self):
+        ring = PriceRing(capacity=8, window=4)
+        ring.extend(np.arange(5), np.arange(5, dtype=float))
+        ring.extend(np.arange(6), np.arange(10, 16, dtype=float))
+        assert len(ring) == 8
+        np.testing.assert_array_equal(ring.tail(4), [12.0, 13.0, 14.0, 15.0])
+        assert ring.mean == pytest.approx(13.5)
+
+
+class TestBatchValidationEquivalence:
+    @pytest.mark.parametrize('chunk', [1, 7, 500, 5000])
+    def test_matches_scalar_path(self, chunk):
+        ticks, now = _scenario_ticks(3000)
+        scalar_validator, scalar = _scalar_outcomes(ticks)
+
+        batch_validator = DataValidator()
+        batch = TickBatch.from_tick_data(ticks)
+        results = [
+            batch_validator.validate_tick_batch(TickBatch(batch.data[i:i + chunk], batch.symbols), now=now)
+            for i in range(0, len(batch), chunk)
+        ]
+        valid = np.concatenate([r.valid for r in results])
+        quality = np.concatenate([r.quality for r in results])
+        reasons = np.concatenate([r.reasons for r in results])
+
+        for i, expected in enumerate(scalar):
+            assert valid[i] == expected.is_valid, i
+            assert quality[i] == list(DataQuality).index(expected.quality), i
+            assert reasons[i] & ~ValidationReason.VERY_STALE == _flags(expected), i
+
+        for key in ('total_validations', 'passed', 'failed', 'warnings'):
+            assert batch_validator.validation_stats[key] == scalar_validator.validation_stats[key]
+
+    def test_reason_labels(self):
+        ticks, now = _scenario_ticks(200)
+        result = DataValidator().validate_tick_batch(TickBatch.from_tick_data(ticks), now=now)
+        rejected = int(np.flatnonzero(~result.valid)[0])
+        labels = result.reasons_of(rejected)
+        assert set(labels) & {'invalid_price', 'crossed_spread', 'future_timestamp'}
+
+
+class TestBarBatchValidation:
+    @pytest.mark.parametrize('chunk', [1, 7, 500, 5000])
+    def test_matches_scalar_path(self, chunk):
+        bars, now = _scenario_bars(3000)
+        scalar_validator, scalar = _scalar_outcomes(bars)
+
+        batch_validator = DataValidator()
+        batch = BarBatch.from_ohlcv_data(bars)
+        results = [
+            batch_validator.validate_bar_batch(
+                BarBatch(batch.data[i:i + chunk], batch.symbols, batch.timeframes), now=now)
+            for i in range(0, len(batch), chunk)
+        ]
+        valid = np.concatenate([r.valid for r in results])
+        quality = np.concatenate([r.quality for r in results])
+        reasons = np.concatenate([r.reasons for r in results])
+
+        for i, expected in enumerate(scalar):
+            assert valid[i] == expected.is_valid, i
+            assert quality[i] == list(DataQuality).index(expected.quality), i
+            assert reasons[i] & ~ValidationReason.VERY_STALE == _flags(expected), i
+
+        for key in ('total_validations', 'passed', 'failed', 'warnings'):
+            assert batch_validator.validation_stats[key] == scalar_validator.validation_stats[key]
+
+    def test_invalid_bars_are_rejected(self):
+        now = datetime.now(timezone.utc)
+        t = now - timedelta(seconds=30)
+        bars = [
+            OHLCVData(t, 'EURUSD', 1.10, 1.11, 1.09, 1.105, 10, '1m'),
+            OHLCVData(t, 'EURUSD', 1.10, 1.10, 1.09, 1.105, 10, '1m'),    # high below close
+            OHLCVData(t, 'EURUSD', 1.10, 1.11, 1.101, 1.105, 10, '1m'),   # low above open
+            OHLCVData(t, 'EURUSD', 0.0, 1.11, 1.09, 1.105, 10, '1m'),     # zero price
+            OHLCVData(t, 'EURUSD', 1.10, 1.11, 1.09, 1.105, -1, '1m'),    # negative volume
+            OHLCVData(t - timedelta(seconds=20), 'EURUSD', 1.10, 1.11, 1.09, 1.105, 10, '1m'),  # goes back
+            OHLCVData(t, 'EURUSD', 1.10, 1.11, 1.09, 1.105, 0, '1m'),     # repeated forming bar, no volume
+        ]
+        result = DataValidator().validate_bar_batch(BarBatch.from_ohlcv_data(bars), now=now)
+
+        assert result.valid.tolist() == [True, False, False, False, False, False, True]
+        assert result.reasons_of(1) == ['inconsistent_ohlc']
+        assert result.reasons_of(2) == ['inconsistent_ohlc']
+        assert result.reasons_of(3) == ['invalid_price']
+        assert result.reasons_of(4) == ['negative_volume']
+        assert result.reasons_of(5) == ['out_of_order_bar']
+        assert result.reasons_of(6) == ['zero_volume']
+        assert result.warning_count == 1
+
+    def test_bar_order_is_kept_per_timeframe_across_batches(self):
+        now = datetime.now(timezone.utc)
+        validator = DataValidator()
+        first = [OHLCVData(now - timedelta(seconds=20), 'EURUSD', 1.1, 1.11, 1.09, 1.1, 5, tf)
+                 for tf in ('1m', '5m')]
+        validator.validate_bar_batch(BarBatch.from_ohlcv_data(first), now=now)
+
+        late = [OHLCVData(now - timedelta(seconds=40), 'EURUSD', 1.1, 1.11, 1.09, 1.1, 5, '1m'),
+                OHLCVData(now - timedelta(seconds=10), 'EURUSD', 1.1, 1.11, 1.09, 1.1, 5, '5m')]
+        result = validator.validate_bar_batch(BarBatch.from_ohlcv_data(late), now=now)
+        assert result.valid.tolist() == [False, True]
+
+    def test_scalar_path_accepts_backfill_by_default(self):
+        now = datetime.now(timezone.utc)
+        items = [OHLCVData(now - timedelta(seconds=20), 'EURUSD', 1.1, 1.11, 1.09, 1.1, 5, '1m'),
+                 OHLCVData(now - timedelta(seconds=40), 'EURUSD', 1.1, 1.11, 1.09, 1.1, 5, '1m'),
+                 TickData(now - timedelta(seconds=5), 'EURUSD', 1.1, 1.1002, 0.0002, sequence_number=7),
+                 TickData(now - timedelta(seconds=6), 'EURUSD', 1.1, 1.1002, 0.0002, sequence_number=3)]
+
+        _, default = _scalar_outcomes(items, check_ordering=False)
+        assert all(r.is_valid and not r.warnings for r in default)
+
+        _, checked = _scalar_outcomes(items)
+        assert not checked[1].is_valid and checked[3].warnings == ["Out-of-sequence tick"]
+
+    def test_engine_forwards_only_valid_bars(self):
+        from data_ingestion.data_ingestion_engine import DataIngestionEngine
+
+        now = datetime.now(timezone.utc)
+        bars = [OHLCVData(now - timedelta(seconds=30 - i), 'EURUSD', 1.1, high, 1.09, 1.1, 5, '1m')
+                for i, high in enumerate([1.11, 1.0, 1.11])]
+        engine = DataIngestionEngine()
+        received = []
+        engine.register_batch_callback(received.append)
+
+        asyncio.run(engine._process_batch(BarBatch.from_ohlcv_data(bars)))
+
+        assert len(received) == 1 and len(received[0]) == 2
+        assert engine.metrics.validation_failures == 1
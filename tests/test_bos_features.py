@@ -0,0 +1,65 @@
+"""
+Equivalence tests for the vectorized BOS feature engine
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bos_feature_engine import (
+    extract_features, extract_features_multi, rolling_rank_pct, rolling_slope, rolling_std
+)
+from build_bos_prediction_model import BOSPredictionModel
+
+
+def synthetic_bars(bars: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=bars, freq='1min'),
+        'price': 1.085 + np.cumsum(rng.normal(0, 1e-4, bars)),
+        'volume': 1000 + rng.exponential(300, bars),
+    })
+
+
+@pytest.fixture(scope='module')
+def model():
+    return BOSPredictionModel()
+
+
+class TestBOSFeatureEngine:
+    def test_matches_pandas_reference(self, model):
+        data = model.generate_production_training_data(2500)
+        reference = model._extract_features_pandas(data)
+        vectorized = model.extract_comprehensive_features(data)
+
+        assert list(vectorized.columns) == list(reference.columns)
+        for column in reference.columns.drop('timestamp'):
+            assert vectorized[column].dtype == reference[column].dtype, column
+            np.testing.assert_allclose(vectorized[column].to_numpy(float), reference[column].to_numpy(float),
+                                       rtol=1e-7, atol=1e-12, err_msg=column)
+
+    def test_multi_symbol_matches_single(self):
+        frames = {'EURUSD': synthetic_bars(800, 1), 'GBPUSD': synthetic_bars(800, 2),
+                  'XAUUSD': synthetic_bars(650, 3)}
+        multi = extract_features_multi(frames)
+        assert list(multi) == list(frames)
+        for symbol, data in frames.items():
+            pd.testing.assert_frame_equal(multi[symbol], extract_features(data))
+
+    def test_rolling_primitives(self):
+        series = pd.Series(np.random.default_rng(5).normal(0, 1, 300).round(1))  # ties for rank
+        values = series.to_numpy()
+        np.testing.assert_allclose(rolling_slope(values, 10),
+                                   series.rolling(10).apply(lambda x: np.polyfit(range(10), x, 1)[0]),
+                                   atol=1e-12)
+        np.testing.assert_allclose(rolling_rank_pct(values, 50), series.rolling(50).rank(pct=True))
+        np.testing.assert_allclose(rolling_std(values, 20), series.rolling(20).std(), atol=1e-12)
+
+    def test_short_series(self):
+        features = extract_features(synthetic_bars(12, 4))
+        assert len(features) == 12
+        assert (features['price_percentile'] == 0).all()
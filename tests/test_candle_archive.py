@@ -0,0 +1,104 @@
+"""
+Tests for the memory-mapped candle archive
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.candle_archive import CandleArchive, RATES_DTYPE, FIELDS
+
+START = int(datetime(2024, 1, 1).timestamp()) // 60 * 60
+
+
+def make_rates(first: int, count: int, step: int = 60) -> np.ndarray:
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates['time'] = first + np.arange(count) * step
+    rates['close'] = 1.08 + np.arange(count) * 1e-5
+    rates['open'] = rates['close'] - 1e-5
+    rates['high'] = rates['close'] + 2e-5
+    rates['low'] = rates['open'] - 2e-5
+    rates['tick_volume'] = 100 + np.arange(count)
+    rates['spread'] = 12
+    return rates
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return CandleArchive(tmp_path / "candles")
+
+
+class TestCandleArchive:
+    def test_round_trip_and_range_query(self, archive):
+        rates = make_rates(START, 1000)
+        result = archive.append('EURUSD', 'M1', rates)
+        assert (result.appended, result.duplicates, result.gaps) == (1000, 0, 0)
+
+        window = archive.range('EURUSD', 'M1', START + 100 * 60, START + 199 * 60)
+        assert len(window) == 100
+        np.testing.assert_array_equal(window.to_rates(), rates[100:200])
+        assert isinstance(window['close'], np.memmap)
+        assert archive.symbols() == ['EURUSD'] and archive.timeframes('EURUSD') == ['M1']
+
+    def test_datetime_bounds_and_last(self, archive):
+        archive.append('EURUSD', 'M1', make_rates(START, 500))
+        window = archive.range('EURUSD', 'M1', start=datetime.utcfromtimestamp(START + 450 * 60))
+        assert len(window) == 50
+        np.testing.assert_array_equal(archive.last('EURUSD', 'M1', 10)['time'],
+                                      make_rates(START, 500)['time'][-10:])
+        assert len(archive.range('EURUSD', 'M1', START - 600, START - 60)) == 0
+
+    def test_overlapping_appends_are_deduplicated(self, archive):
+        archive.append('EURUSD', 'M1', make_rates(START, 100))
+        update = make_rates(START + 90 * 60, 20)
+        update['close'][9] = 9.99  # newer copy of the archived tail bar
+        result = archive.append('EURUSD', 'M1', update)
+
+        assert (result.appended, result.replaced, result.duplicates) == (10, 1, 9)
+        times = archive.range('EURUSD', 'M1')['time']
+        np.testing.assert_array_equal(times, make_rates(START, 110)['time'])
+        assert archive.range('EURUSD', 'M1')['close'][99] == 9.99
+
+    def test_unsorted_batch_with_repeats(self, archive):
+        rates = make_rates(START, 10)
+        shuffled = np.concatenate([rates[::-1], rates[3:4]])
+        result = archive.append('EURUSD', 'M1', shuffled)
+        assert (result.appended, result.duplicates) == (10, 1)
+        np.testing.assert_array_equal(archive.range('EURUSD', 'M1').to_rates(), rates)
+
+    def test_gaps_are_reported(self, archive):
+        archive.append('EURUSD', 'M1', make_rates(START, 10))
+        result = archive.append('EURUSD', 'M1', make_rates(START + 60 * 60, 10))
+        assert result.gaps == 1
+        gaps = archive.gaps('EURUSD', 'M1')
+        np.testing.assert_array_equal(gaps, [[START + 9 * 60, START + 60 * 60]])
+
+    def test_reopen_recovers_interrupted_append(self, tmp_path):
+        root = tmp_path / "candles"
+        CandleArchive(root).append('GBPUSD', 'M5', make_rates(START, 50, step=300))
+        with open(root / 'GBPUSD' / 'M5' / 'close.bin', 'ab') as handle:
+            handle.write(b'\x00' * 12)  # torn write: 1.5 extra rows in one column
+
+        reopened = CandleArchive(root)
+        assert reopened.length('GBPUSD', 'M5') == 50
+        assert os.path.getsize(root / 'GBPUSD' / 'M5' / 'close.bin') == 50 * 8
+        assert reopened.append('GBPUSD', 'M5', make_rates(START + 50 * 300, 5, step=300)).appended == 5
+        assert len(reopened.range('GBPUSD', 'M5')) == 55
+
+    def test_missing_fields_are_zero_filled(self, archive):
+        rates = make_rates(START, 5)[['time', 'open', 'high', 'low', 'close']]
+        archive.append('XAUUSD', 'H1', rates)
+        window = archive.range('XAUUSD', 'H1')
+        assert set(window.columns) == set(FIELDS)
+        assert (window['real_volume'] == 0).all()
+
+    def test_unknown_series(self, archive):
+        with pytest.raises(KeyError):
+            archive.range('NOPE', 'M1')
+        with pytest.raises(ValueError):
+            archive.append('EURUSD', 'M2', make_rates(START, 1))
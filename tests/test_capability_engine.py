@@ -0,0 +1,140 @@
+"""
+Tests for the columnar capability engine and the monitors built on it
+"""
+
+import asyncio
+import math
+import statistics
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.capability_engine import CapabilityEngine
+from src.core.six_sigma_quality_monitor import SixSigmaQualityMonitor
+from src.core.u_cells.monitoring_control import MonitoringControlCell
+
+
+def reference(data, lsl, usl):
+    mean, std = statistics.mean(data), statistics.stdev(data)
+    return mean, std, (usl - lsl) / (6 * std), min(usl - mean, mean - lsl) / (3 * std)
+
+
+class TestCapabilityEngine:
+    def test_windowed_moments_match_statistics(self):
+        rng = np.random.default_rng(3)
+        engine = CapabilityEngine(window=50)
+        ids = [engine.add_metric(f"m{i}", -3.0, 3.0) for i in range(8)]
+        history = {i: [] for i in ids}
+
+        for _ in range(260):
+            values = rng.normal(rng.uniform(-1, 1, len(ids)), 0.5)
+            engine.update(np.array(ids), values)
+            for i, value in zip(ids, values):
+                history[i].append(value)
+
+        table = engine.capability()
+        for i in ids:
+            mean, std, cp, cpk = reference(history[i][-50:], -3.0, 3.0)
+            assert table.count[i] == 50
+            assert table.mean[i] == pytest.approx(mean)
+            assert table.std[i] == pytest.approx(std)
+            assert table.cp[i] == pytest.approx(cp)
+            assert table.cpk[i] == pytest.approx(cpk)
+            assert engine.values(i) == pytest.approx(history[i][-50:])
+
+    def test_scalar_push_and_repeated_metrics_match_vector_update(self):
+        rng = np.random.default_rng(4)
+        values = rng.normal(10, 2, 75)
+        pushed = CapabilityEngine(window=20)
+        batched = CapabilityEngine(window=20)
+        for engine in (pushed, batched):
+            engine.add_metric('latency', 0, 20)
+            engine.add_metric('other', 0, 20)
+
+        for value in values:
+            pushed.push('latency', value)
+        # One call carrying the whole stream for the same metric applies it in order
+        batched.update(['latency'] * len(values), values)
+
+        assert pushed.moments('latency') == pytest.approx(batched.moments('latency'))
+        assert pushed.moments('latency')['std_dev'] == pytest.approx(statistics.stdev(values[-20:]))
+        assert batched.count('other') == 0
+
+    def test_unbounded_window_is_plain_welford(self):
+        engine = CapabilityEngine()
+        engine.add_metric('x')
+        data = [1e9 + v for v in (4.0, 7.0, 13.0, 16.0)]
+        engine.update(['x'] * 4, data)
+        moments = engine.moments('x')
+        assert moments['mean'] == pytest.approx(statistics.mean(data))
+        assert moments['std_dev'] == pytest.approx(statistics.stdev(data))
+
+    def test_conventions_and_dpmo(self):
+        engine = CapabilityEngine(window=10)
+        engine.add_metric('one_sided', usl=10.0)
+        engine.add_metric('constant', 0.0, 1.0)
+        engine.add_metric('empty', 0.0, 1.0)
+        engine.add_metric('centred', -3.0, 3.0)
+
+        engine.update(['one_sided'] * 3 + ['constant'] * 3, [1.0, 2.0, 3.0, 0.5, 0.5, 0.5])
+        engine.update(['centred'] * 2, [-1.0, 1.0])
+        table = engine.capability()
+        one_sided, constant, empty, centred = (table.row(name) for name in table.names)
+
+        assert one_sided['cp'] == math.inf and one_sided['cpk'] == pytest.approx((10 - 2) / 3)
+        assert constant['cp'] == constant['cpk'] == math.inf and constant['dpmo'] == 0.0
+        assert empty['cp'] == empty['cpk'] == 0.0 and math.isnan(empty['dpmo'])
+        # Mean 0, std sqrt(2): limits at +-3 are 2.12 sigma away on each side
+        assert centred['dpmo'] == pytest.approx(2e6 * 0.5 * math.erfc(3 / math.sqrt(2) / math.sqrt(2)))
+        assert one_sided['sigma_level'] == 6.0
+
+    def test_growth_keeps_ids_and_reset_keeps_limits(self):
+        engine = CapabilityEngine(window=5, capacity=2)
+        for i in range(5):
+            assert engine.add_metric(f"m{i}", 0, 10) == i
+            engine.push(i, float(i))
+        assert [engine.count(i) for i in range(5)] == [1] * 5
+        engine.reset('m3')
+        assert engine.count('m3') == 0 and engine.limits('m3')['usl'] == 10
+        with pytest.raises(KeyError):
+            engine.update(['nope'], [1.0])
+
+
+class TestMonitors:
+    def test_quality_monitor_records_one_and_many(self):
+        monitor = SixSigmaQualityMonitor()
+        latencies = [40.0, 55.0, 48.0, 61.0, 52.0, 47.0]
+
+        async def run():
+            await monitor.start_monitoring()
+            for latency in latencies:
+                await monitor.record_metric('execution_latency_ms', latency)
+            return await monitor.record_metrics({'execution_latency_ms': 50.0, 'slippage_pips': 0.4, 'nope': 1.0})
+
+        recorded = asyncio.run(run())
+        assert recorded == {'execution_latency_ms': True, 'slippage_pips': False, 'nope': False}
+
+        metric = monitor.quality_metrics['execution_latency_ms']
+        _, std, cp, cpk = reference(latencies + [50.0], 0.0, 100.0)
+        assert metric.cp == pytest.approx(cp) and metric.cpk == pytest.approx(cpk)
+        assert metric.upper_control_limit == pytest.approx(statistics.mean(latencies + [50.0]) + 3 * std)
+        assert monitor.get_capability_table()['slippage_pips']['samples'] == 1
+
+    def test_monitoring_cell_capability(self):
+        cell = MonitoringControlCell()
+        rng = np.random.default_rng(5)
+        times = rng.normal(200, 40, 40)
+        for i, execution_time in enumerate(times):
+            cell._update_performance_data({'order_id': i, 'execution_time_ms': execution_time})
+
+        metrics = cell._calculate_six_sigma_metrics()
+        _, std, cp, cpk = reference(list(times), 0, 1000)
+        assert metrics['execution_time']['samples'] == 40
+        assert metrics['execution_time']['cp'] == pytest.approx(round(cp, 3))
+        assert metrics['execution_time']['cpk'] == pytest.approx(round(cpk, 3))
+        assert metrics['slippage']['status'] == 'insufficient_data'
+        assert metrics['win_rate']['samples'] == 0
@@ -0,0 +1,160 @@
+"""
+Tests for the dashboard rollups and the watermark-driven read model
+"""
+
+import sqlite3
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.dashboard_read_model import DashboardReadModel, install
+
+DDL = """
+CREATE TABLE process_capability (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measurement_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    cp_value REAL, cpk_value REAL, sigma_level REAL,
+    phase_name TEXT
+);
+CREATE TABLE spc_violations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    detection_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    violation_type TEXT,
+    violation_description TEXT,
+    severity_level INTEGER,
+    phase_name TEXT,
+    resolved BOOLEAN DEFAULT FALSE
+);
+CREATE TABLE ylipip_quality_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measurement_timestamp TIMESTAMP NOT NULL
+);
+"""
+
+NOW = datetime.utcnow().replace(second=30, microsecond=0)
+
+
+def ts(minutes_ago: float) -> str:
+    return (NOW - timedelta(minutes=minutes_ago)).isoformat(sep=' ')
+
+
+def add_capability(conn, minutes_ago, cpk, phase='M5_BOS_DETECTION'):
+    conn.execute("""
+        INSERT INTO process_capability (measurement_timestamp, metric_name, cp_value, cpk_value, sigma_level, phase_name)
+        VALUES (?, 'latency', ?, ?, ?, ?)
+    """, (ts(minutes_ago), cpk and cpk + 0.1, cpk, cpk and cpk * 3, phase))
+
+
+def add_violation(conn, minutes_ago, severity, phase='M5_BOS_DETECTION'):
+    conn.execute("""
+        INSERT INTO spc_violations (detection_timestamp, metric_name, violation_type, severity_level, phase_name)
+        VALUES (?, 'latency', 'RULE_1', ?, ?)
+    """, (ts(minutes_ago), severity, phase))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "ml_observation_system.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DDL)
+    return path
+
+
+class TestDashboardReadModel:
+    def test_rollups_match_raw_aggregates(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            install(conn)
+            for i in range(120):
+                add_capability(conn, i, 2.0 + (i % 5) * 0.25, phase='M5_BOS_DETECTION' if i % 2 else 'YLIPIP_ENTRY_TRIGGER')
+            add_capability(conn, 5, None)
+
+        model = DashboardReadModel(db_path)
+        model.refresh(now=NOW)
+        with sqlite3.connect(db_path) as conn:
+            raw = conn.execute("""
+                SELECT COUNT(*), AVG(cpk_value), COUNT(CASE WHEN cpk_value >= 2.5 THEN 1 END)
+                FROM process_capability WHERE phase_name = 'M5_BOS_DETECTION' AND measurement_timestamp >= ?
+            """, (NOW.replace(second=0) - timedelta(minutes=60),)).fetchone()
+
+        summary = model.capability(60, 'M5_BOS_DETECTION', now=NOW)
+        assert summary['measurements'] == raw[0]
+        assert summary['cpk'] == pytest.approx(raw[1])
+        assert summary['cpk_ok_count'] == raw[2]
+        assert model.capability(24 * 60, now=NOW)['measurements'] == 121
+
+    def test_refresh_reads_only_changes_since_watermark(self, db_path):
+        model = DashboardReadModel(db_path)
+        with sqlite3.connect(db_path) as conn:
+            install(conn)
+            for i in range(50):
+                add_capability(conn, i, 3.0)
+        assert model.refresh(now=NOW) == 50
+        assert model.refresh(now=NOW) == 0
+
+        with sqlite3.connect(db_path) as conn:
+            add_capability(conn, 0, 2.0)
+            add_capability(conn, 0, 2.0)
+            add_violation(conn, 0, 4)
+        assert model.refresh(now=NOW) == 2
+        assert model.capability(0, now=NOW)['measurements'] == 3
+        assert model.open_violations(now=NOW) == 1
+
+    def test_resolving_a_violation_updates_open_counts(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            install(conn)
+            add_violation(conn, 10, 3)
+            add_violation(conn, 10, 5)
+            add_violation(conn, 90, 2, phase='M1_RETEST_VALIDATION')
+        model = DashboardReadModel(db_path)
+        model.refresh(now=NOW)
+        assert model.open_violations('M5_BOS_DETECTION', now=NOW) == 2
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE spc_violations SET resolved = 1 WHERE severity_level = 5")
+            conn.execute("UPDATE spc_violations SET resolved = 1 WHERE severity_level = 5")
+        assert model.refresh(now=NOW) == 1
+        assert model.open_violations('M5_BOS_DETECTION', now=NOW) == 1
+        assert model.open_violations(now=NOW) == 2
+
+        trend = model.violation_trend(now=NOW)
+        assert sum(hour['count'] for hour in trend) == 3
+        assert model.last_open_violation('M5_BOS_DETECTION') == datetime.fromisoformat(ts(10))
+        assert sorted(v['severity'] for v in model.recent_violations(limit=2)) == [3, 5]
+
+    def test_install_backfills_and_rebuilds_on_threshold_change(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            for i in range(10):
+                add_capability(conn, i, 2.0 + i * 0.1)
+            install(conn, cpk_threshold=2.5)
+            assert conn.execute("SELECT SUM(measurements), SUM(cpk_ok_count) FROM dashboard_capability_minute"
+                                ).fetchone() == (10, 5)
+            install(conn, cpk_threshold=2.5)
+            install(conn, cpk_threshold=2.8)
+            assert conn.execute("SELECT SUM(measurements), SUM(cpk_ok_count) FROM dashboard_capability_minute"
+                                ).fetchone() == (10, 2)
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'idx_ylipip_quality_metrics_measurement_timestamp' in indexes
+        assert 'idx_spc_violations_phase_name_resolved_detection_timestamp' in indexes
+
+    def test_window_evicts_old_minutes(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            install(conn)
+            add_capability(conn, 23 * 60, 3.0)
+            add_capability(conn, 0, 3.0)
+        model = DashboardReadModel(db_path)
+        model.refresh(now=NOW)
+        assert len(model._capability) == 2
+        model.refresh(now=NOW + timedelta(hours=2))
+        assert len(model._capability) == 1
+        assert len(model.cpk_trend(now=NOW + timedelta(hours=2))) == 1
+
+    def test_missing_tables_leave_model_empty(self, tmp_path):
+        model = DashboardReadModel(str(tmp_path / "empty.db"))
+        assert model.refresh() == 0
+        assert model.capability()['cpk'] is None
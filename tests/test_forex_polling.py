@@ -0,0 +1,147 @@
+"""
+Tests for ForexDataConnector tick polling
+A fake MT5 replays a tick tape; every distinct quote must be emitted once,
+including quotes that share a millisecond and ticks missed between polls
+"""
+
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+from data_ingestion import forex_connector
+from data_ingestion.forex_connector import ForexDataConnector, SymbolPollState
+
+TICK_ROW = np.dtype([('time', np.int64), ('bid', np.float64), ('ask', np.float64),
+                     ('last', np.float64), ('volume', np.uint64), ('time_msc', np.int64),
+                     ('flags', np.uint32), ('volume_real', np.float64)])
+
+
+class TapeMT5:
+    """MetaTrader5 stand-in: the tape grows, symbol_info_tick returns its last row"""
+
+    COPY_TICKS_ALL = -1
+    TIMEFRAME_M1, TIMEFRAME_M5, TIMEFRAME_M15, TIMEFRAME_M30 = 1, 5, 15, 30
+    TIMEFRAME_H1, TIMEFRAME_H4, TIMEFRAME_D1, TIMEFRAME_W1, TIMEFRAME_MN1 = 16385, 16388, 16408, 32769, 49153
+
+    def __init__(self):
+        self.tape = []
+
+    def add(self, time_msc, bid, ask, flags=6):
+        self.tape.append((time_msc // 1000, bid, ask, 0.0, 1, time_msc, flags, 0.0))
+
+    def symbol_info_tick(self, symbol):
+        if not self.tape:
+            return None
+        time_s, bid, ask, _, volume, time_msc, flags, _ = self.tape[-1]
+        return SimpleNamespace(time=time_s, bid=bid, ask=ask, volume=volume,
+                               time_msc=time_msc, flags=flags)
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        start_msc = int(date_from.timestamp()) * 1000
+        rows = np.array(self.tape, dtype=TICK_ROW)
+        return rows[rows['time_msc'] >= start_msc][:count]
+
+
+@pytest.fixture
+def tape(monkeypatch):
+    fake = TapeMT5()
+    monkeypatch.setattr(forex_connector, 'mt5', fake)
+    return fake
+
+
+def _connector(backfill=False):
+    return ForexDataConnector(use_tick_backfill=backfill)
+
+
+def _emitted(connector):
+    return [(t['time_msc'], t['bid'], t['ask'], t['backfilled']) for t in connector.get_pending_ticks(1000)]
+
+
+class TestPollSymbol:
+    def test_first_poll_emits_current_quote(self, tape):
+        connector = _connector(backfill=True)
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+        tape.add(1_700_000_000_200, 1.1001, 1.1003)
+
+        connector._poll_symbol('EURUSD', state)
+
+        # Nothing before the first poll is backfilled
+        assert _emitted(connector) == [(1_700_000_000_200, 1.1001, 1.1003, False)]
+        assert state.last_time_msc == 1_700_000_000_200
+
+    def test_unchanged_quote_backs_off(self, tape):
+        connector = _connector()
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+
+        connector._poll_symbol('EURUSD', state)
+        connector._poll_symbol('EURUSD', state)
+
+        assert len(_emitted(connector)) == 1
+        assert state.unchanged_polls == 1
+        assert state.interval == connector.min_poll_interval * connector.poll_backoff
+
+    def test_same_millisecond_quotes_are_distinct(self, tape):
+        connector = _connector()
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+        connector._poll_symbol('EURUSD', state)
+        tape.add(1_700_000_000_100, 1.1001, 1.1002)
+        connector._poll_symbol('EURUSD', state)
+        connector._poll_symbol('EURUSD', state)
+
+        assert _emitted(connector) == [(1_700_000_000_100, 1.1000, 1.1002, False),
+                                       (1_700_000_000_100, 1.1001, 1.1002, False)]
+        assert state.unchanged_polls == 1
+
+    def test_older_quote_is_ignored(self, tape):
+        connector = _connector()
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+        connector._poll_symbol('EURUSD', state)
+        tape.add(1_700_000_000_050, 1.0990, 1.0992)
+        connector._poll_symbol('EURUSD', state)
+
+        assert len(_emitted(connector)) == 1
+
+
+class TestBackfillTicks:
+    def test_gap_is_backfilled_in_order(self, tape):
+        connector = _connector(backfill=True)
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+        connector._poll_symbol('EURUSD', state)
+        for i, msc in enumerate([1_700_000_000_150, 1_700_000_000_900, 1_700_000_001_300]):
+            tape.add(msc, 1.1001 + i / 10_000, 1.1003 + i / 10_000)
+
+        connector._poll_symbol('EURUSD', state)
+
+        emitted = _emitted(connector)
+        assert [e[0] for e in emitted] == [1_700_000_000_100, 1_700_000_000_150,
+                                           1_700_000_000_900, 1_700_000_001_300]
+        assert [e[3] for e in emitted] == [False, True, True, False]
+        assert state.ticks_backfilled == 2 and state.ticks_emitted == 4
+
+    def test_backfill_keeps_same_millisecond_quotes_at_both_ends(self, tape):
+        connector = _connector(backfill=True)
+        state = SymbolPollState(interval=connector.min_poll_interval)
+        tape.add(1_700_000_000_100, 1.1000, 1.1002)
+        connector._poll_symbol('EURUSD', state)
+        tape.add(1_700_000_000_100, 1.1001, 1.1003)   # same ms as the last emitted tick
+        tape.add(1_700_000_000_400, 1.1002, 1.1004)
+        tape.add(1_700_000_000_400, 1.1003, 1.1005)   # same ms as the polled tick
+
+        connector._poll_symbol('EURUSD', state)
+        connector._poll_symbol('EURUSD', state)
+
+        assert _emitted(connector) == [(1_700_000_000_100, 1.1000, 1.1002, False),
+                                       (1_700_000_000_100, 1.1001, 1.1003, True),
+                                       (1_700_000_000_400, 1.1002, 1.1004, True),
+                                       (1_700_000_000_400, 1.1003, 1.1005, False)]
+        assert state.boundary_quotes == {(1.1002, 1.1004, 6), (1.1003, 1.1005, 6)}
@@ -0,0 +1,67 @@
+"""
+Tests for the hot path benchmark runner and baseline comparison
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.hot_path_suite import (
+    CaseResult, HotPath, compare_results, load_baseline, measure, save_baseline
+)
+
+
+def result(name='case', ops_per_sec=1000.0, p50_ms=1.0, p99_ms=2.0, peak_kb=100.0) -> CaseResult:
+    return CaseResult(name=name, ops=100, items_per_op=1, ops_per_sec=ops_per_sec,
+                      items_per_sec=ops_per_sec, p50_ms=p50_ms, p99_ms=p99_ms, peak_kb=peak_kb)
+
+
+class TestHotPathSuite:
+    def test_measure_runs_sync_and_async_ops(self):
+        calls = []
+
+        async def build_sync():
+            return (lambda: calls.append('sync')), None
+
+        async def build_async():
+            async def op():
+                calls.append('async')
+            return op, lambda: calls.append('cleanup')
+
+        sync_result = asyncio.run(measure(HotPath('sync', '', build_sync, 20, items_per_op=10)))
+        async_result = asyncio.run(measure(HotPath('async', '', build_async, 20)))
+
+        assert sync_result.ops == 20 and sync_result.items_per_sec == pytest.approx(sync_result.ops_per_sec * 10)
+        assert sync_result.p50_ms <= sync_result.p99_ms
+        assert calls.count('async') > 20 and calls.count('cleanup') == 2
+        assert async_result.peak_kb >= 0
+
+    def test_baseline_round_trip(self, tmp_path):
+        path = tmp_path / 'baseline.json'
+        save_baseline(str(path), [result('a'), result('b', ops_per_sec=50.0)])
+        baseline = load_baseline(str(path))
+        assert baseline['b']['ops_per_sec'] == 50.0
+        assert 'python' in json.loads(path.read_text())
+
+    def test_compare_flags_only_regressions_beyond_threshold(self):
+        baseline = {'a': vars(result('a')), 'b': vars(result('b'))}
+        current = [
+            result('a', ops_per_sec=850.0, p99_ms=2.1),    # 15% slower, p99 within 10%
+            result('b', ops_per_sec=2000.0, peak_kb=130.0),  # faster, but 30% more memory
+            result('new'),                                   # not in the baseline
+        ]
+        regressions = compare_results(baseline, current, threshold=0.10)
+        assert {(r.case, r.metric) for r in regressions} == {('a', 'ops_per_sec'), ('b', 'peak_kb')}
+        assert regressions[0].change == pytest.approx(0.15)
+        assert compare_results(baseline, current, threshold=0.5) == []
+
+    def test_compare_can_gate_on_selected_metrics(self):
+        baseline = {'a': vars(result('a'))}
+        noisy = [result('a', p99_ms=4.0)]
+        assert [r.metric for r in compare_results(baseline, noisy)] == ['p99_ms']
+        assert compare_results(baseline, noisy, metrics=['ops_per_sec', 'p50_ms']) == []
@@ -0,0 +1,96 @@
+"""
+Tests for lazy subsystem imports and the import-time profile parser
+"""
+
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+# Add src to path for imports
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from mikrobot_v2.utils.lazy_imports import LazyModule, is_available, lazy_exports, lazy_import
+from mikrobot_v2.utils.import_profile import parse_importtime, profile_import
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        500 |     numpy._core
+import time:       900 |       1400 |   numpy
+import time:       200 |       1600 | mikrobot_v2.strategies.lightning_bolt
+Traceback (most recent call last):
+import time:        50 |         50 | json
+"""
+
+
+def run_isolated(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                          env=env, check=True).stdout.strip()
+
+
+class TestLazyImport:
+    def test_module_is_imported_on_first_attribute_access(self):
+        sys.modules.pop('colorsys', None)
+        proxy = lazy_import('colorsys')
+        assert isinstance(proxy, LazyModule) and not proxy.is_loaded
+        assert 'colorsys' not in sys.modules
+
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert proxy.is_loaded and 'colorsys' in sys.modules
+
+    def test_loaded_modules_and_relative_names(self):
+        assert lazy_import('os') is os
+        proxy = lazy_import('..notifications.imessage_notifier', 'mikrobot_v2.strategies')
+        assert proxy.__name__ == 'mikrobot_v2.notifications.imessage_notifier'
+
+    def test_missing_module_fails_on_use(self):
+        proxy = lazy_import('no_such_module_for_lazy_tests')
+        assert not is_available('no_such_module_for_lazy_tests')
+        with pytest.raises(ImportError):
+            proxy.anything
+        assert is_available('json')
+
+    def test_lazy_exports_resolve_and_cache(self):
+        package = types.ModuleType('lazy_pkg_for_tests')
+        sys.modules['lazy_pkg_for_tests'] = package
+        try:
+            getattr_, dir_ = lazy_exports('lazy_pkg_for_tests', {'dumps': 'json'})
+            assert getattr_('dumps')({'a': 1}) == '{"a": 1}'
+            assert 'dumps' in vars(package) and 'dumps' in dir_()
+            with pytest.raises(AttributeError):
+                getattr_('loads')
+        finally:
+            del sys.modules['lazy_pkg_for_tests']
+
+    def test_scan_path_skips_heavy_subsystems(self):
+        loaded = run_isolated(
+            "import sys\n"
+            "import mikrobot_v2\n"
+            "from mikrobot_v2.strategies import LightningBoltStrategy, TrendDirection\n"
+            "names = ('pandas', 'matplotlib', 'aiohttp', 'mikrobot_v2.notifications.imessage_notifier')\n"
+            "print(','.join(n for n in names if n in sys.modules))"
+        )
+        assert loaded == ''
+
+
+class TestImportProfile:
+    def test_parse_importtime(self):
+        records = parse_importtime(IMPORTTIME)
+        assert [r.module for r in records] == ['_io', 'numpy._core', 'numpy',
+                                              'mikrobot_v2.strategies.lightning_bolt', 'json']
+        assert [r.depth for r in records] == [1, 2, 1, 0, 0]
+        assert records[2].self_us == 900 and records[2].cumulative_us == 1400
+
+    def test_profile_reports_top_imports(self):
+        profile = profile_import('json', path=[SRC])
+        assert profile.returncode == 0 and profile.includes('json')
+        assert profile.total_us > 0 and profile.top(1)[0].cumulative_us <= profile.total_us
+        assert 'json' in profile.by_package() and 'Import profile: json' in profile.report()
+
+        failed = profile_import('no_such_module_for_lazy_tests')
+        assert failed.returncode != 0 and 'ModuleNotFoundError' in failed.error
@@ -0,0 +1,80 @@
+"""
+Tests for the shared bounded LRU/TTL cache
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.lru_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=3)
+        for key in 'abc':
+            cache.set(key, key.upper())
+        assert cache.get('a') == 'A'  # 'b' is now least recent
+        cache.set('d', 'D')
+        assert 'b' not in cache
+        assert [key for key, _ in cache.items()] == ['c', 'a', 'd']
+        assert cache.evictions == 1
+
+    def test_ttl_lazy_and_periodic_expiry(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=100, ttl_seconds=10, clock=clock)
+        cache.set('short', 1, ttl_seconds=1)
+        cache.set('long', 2)
+        for i in range(20):
+            cache.set(f'k{i}', i)
+
+        clock.now = 2
+        assert cache.get('short') is None
+        assert cache.get('long') == 2
+        assert cache.expirations == 1
+
+        clock.now = 11
+        cache.set('fresh', 3)  # past the sweep interval: everything stale goes
+        assert len(cache) == 1
+        assert cache.expirations == 22
+
+    def test_byte_budget(self):
+        cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+        cache.set('a', 'xxxx')
+        cache.set('b', 'yyyy')
+        cache.set('c', 'zzzz')
+        assert 'a' not in cache and len(cache) == 2
+        assert cache.current_bytes == 8
+        cache.set('b', 'y')
+        assert cache.current_bytes == 5
+
+    def test_counters(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('missing')
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+    def test_flat_size_over_long_run(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=1000, ttl_seconds=300, clock=clock)
+        for i in range(100_000):
+            clock.now = i * 0.01
+            cache.set(f'signal_{i}', i)
+        assert len(cache) == 1000
+        assert cache.evictions + cache.expirations == 99_000
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
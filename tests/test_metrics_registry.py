@@ -0,0 +1,122 @@
+"""
+Tests for the metrics registry and its Prometheus text exposition
+"""
+
+import pytest
+import sys
+import os
+import gc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+from metrics_registry import MetricsRegistry, get_metrics_registry
+
+
+class TestMetricsRegistry:
+    def test_counter_gauge_exposition(self):
+        registry = MetricsRegistry()
+        routes = registry.counter('mikrobot_routes_total', 'Routed messages', ['outcome'])
+        routes.labels('success').inc()
+        routes.labels(outcome='success').inc(2)
+        routes.labels('failed').inc()
+        registry.gauge('mikrobot_agents', 'Active agents').set(3)
+
+        assert registry.render() == (
+            '# HELP mikrobot_agents Active agents\n'
+            '# TYPE mikrobot_agents gauge\n'
+            'mikrobot_agents 3\n'
+            '# HELP mikrobot_routes_total Routed messages\n'
+            '# TYPE mikrobot_routes_total counter\n'
+            'mikrobot_routes_total{outcome="success"} 3\n'
+            'mikrobot_routes_total{outcome="failed"} 1\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram('mikrobot_latency_ms', 'Latency', ['cell'], buckets=(1, 5, 10))
+        child = latency.labels('U1')
+        for value in (0.5, 1.0, 3.0, 12.0):
+            child.observe(value)
+
+        text = registry.render()
+        assert 'mikrobot_latency_ms_bucket{cell="U1",le="1.0"} 2\n' in text
+        assert 'mikrobot_latency_ms_bucket{cell="U1",le="5.0"} 3\n' in text
+        assert 'mikrobot_latency_ms_bucket{cell="U1",le="10.0"} 3\n' in text
+        assert 'mikrobot_latency_ms_bucket{cell="U1",le="+Inf"} 4\n' in text
+        assert 'mikrobot_latency_ms_sum{cell="U1"} 16.5\n' in text
+        assert 'mikrobot_latency_ms_count{cell="U1"} 4\n' in text
+
+    def test_labels_are_bound_once_and_escaped(self):
+        registry = MetricsRegistry()
+        family = registry.counter('mikrobot_errors_total', 'Errors', ['reason'])
+        assert family.labels('a') is family.labels('a')
+        family.labels('say "hi"\n').inc()
+        assert 'mikrobot_errors_total{reason="say \\"hi\\"\\n"} 1\n' in registry.render()
+
+        with pytest.raises(ValueError):
+            family.labels()
+        with pytest.raises(ValueError):
+            family.labels('a').inc(-1)
+        with pytest.raises(ValueError):
+            family.inc()
+
+    def test_get_or_create_rejects_conflicts(self):
+        registry = MetricsRegistry()
+        family = registry.counter('mikrobot_x_total', 'X', ['a'])
+        assert registry.counter('mikrobot_x_total', 'X', ['a']) is family
+        with pytest.raises(ValueError):
+            registry.gauge('mikrobot_x_total', 'X', ['a'])
+        with pytest.raises(ValueError):
+            registry.counter('mikrobot_x_total', 'X', ['b'])
+
+    def test_render_reuses_text_of_unchanged_series(self):
+        registry = MetricsRegistry()
+        family = registry.counter('mikrobot_ticks_total', 'Ticks', ['symbol'])
+        eurusd, gbpusd = family.labels('EURUSD'), family.labels('GBPUSD')
+        eurusd.inc()
+        gbpusd.inc()
+        assert registry.render() == family._rendered
+
+        cached = gbpusd._rendered
+        eurusd.inc()
+        text = registry.render()
+        assert gbpusd._rendered is cached
+        assert 'mikrobot_ticks_total{symbol="EURUSD"} 2\n' in text
+
+    def test_collectors_run_at_scrape_and_are_weak(self):
+        registry = MetricsRegistry()
+
+        class Engine:
+            def __init__(self):
+                self.depth = registry.gauge('mikrobot_queue_depth', 'Queue depth').labels()
+                self.queue = [1, 2, 3]
+                registry.add_collector(self.collect)
+
+            def collect(self):
+                self.depth.set(len(self.queue))
+
+        engine = Engine()
+        assert 'mikrobot_queue_depth 3\n' in registry.render()
+        del engine
+        gc.collect()
+        registry.render()
+        assert registry._collectors == []
+
+    def test_failing_collector_does_not_break_render(self):
+        registry = MetricsRegistry()
+        ticks = registry.counter('mikrobot_ticks_total', 'Ticks').labels()
+        ticks.inc()
+
+        def broken():
+            raise RuntimeError("cache handle closed")
+
+        registry.add_collector(broken)
+        registry.add_collector(lambda: ticks.inc())
+        assert 'mikrobot_ticks_total 2\n' in registry.render()
+        assert 'mikrobot_ticks_total 3\n' in registry.render()
+
+    def test_default_registry_is_shared_across_import_names(self):
+        import metrics_registry
+        for name in ('src.core.metrics_registry', 'core.metrics_registry'):
+            assert sys.modules[name] is metrics_registry
+        assert get_metrics_registry() is metrics_registry.get_metrics_registry()
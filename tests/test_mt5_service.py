@@ -0,0 +1,254 @@
+"""
+Tests for the MT5 executor service
+Single I/O thread, per-symbol ordering, admission control and the cached snapshot
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mikrobot_v2.bridge.mt5_service import MT5Service, Overloaded, create_app
+from mikrobot_v2.bridge.order_channel import OrderChannelClient
+
+
+class FakeMT5:
+    """MetaTrader5 stand-in that records which threads call it and what it filled"""
+
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    TRADE_ACTION_DEAL, ORDER_TIME_GTC, ORDER_FILLING_IOC = 1, 0, 1
+    TRADE_RETCODE_DONE = 10009
+
+    def __init__(self):
+        self.threads = set()
+        self.filled = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.account_calls = 0
+
+    def _call(self):
+        self.threads.add(threading.get_ident())
+
+    def initialize(self):
+        self._call()
+        return True
+
+    def login(self, account, password, server):
+        self._call()
+        return True
+
+    def shutdown(self):
+        self._call()
+
+    def last_error(self):
+        return (1, 'ok')
+
+    def account_info(self):
+        self._call()
+        self.account_calls += 1
+        return SimpleNamespace(login=1, balance=1000.0, equity=1000.0, margin=0.0, server='Fake')
+
+    def positions_get(self):
+        self._call()
+        return [SimpleNamespace(ticket=ticket, symbol=symbol, type=0, volume=0.01, price_open=1.1, profit=0.0)
+                for ticket, symbol in enumerate(self.filled)]
+
+    def symbol_info_tick(self, symbol):
+        self._call()
+        return SimpleNamespace(bid=1.1, ask=1.1002)
+
+    def order_send(self, request):
+        self._call()
+        self.gate.wait(5)
+        self.filled.append(request['symbol'] + ':' + request['comment'])
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, order=len(self.filled), deal=len(self.filled),
+                               volume=request['volume'], price=request['price'], comment='done')
+
+
+def order(symbol, tag='MIKROBOT'):
+    return {'symbol': symbol, 'action': 'BUY', 'volume': 0.01, 'comment': tag}
+
+
+@pytest.fixture
+def fake():
+    return FakeMT5()
+
+
+@pytest.fixture
+def service(fake):
+    fills = []
+    service = MT5Service(fake, account=1, password='x', server='Fake', max_pending_per_symbol=3,
+                         refresh_interval=60, on_fill=lambda signal, result: fills.append(result.order))
+    service.fills = fills
+    assert service.start()
+    yield service
+    fake.gate.set()
+    service.stop()
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestMT5Service:
+    def test_all_mt5_calls_stay_on_one_thread(self, fake, service):
+        def submit_many(symbol):
+            return [service.submit(order(symbol)).result(5) for _ in range(3)]
+
+        threads = [threading.Thread(target=submit_many, args=(symbol,)) for symbol in ('EURUSD', 'GBPUSD', 'USDJPY')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(fake.filled) == 9
+        assert fake.threads == {service._thread.ident}
+        assert service.fills == list(range(1, 10))
+
+    def test_symbols_take_turns_and_keep_their_order(self, fake, service):
+        fake.gate.clear()
+        blocker = service.submit(order('XAUUSD', 'first'))
+        assert wait_until(lambda: service.get_stats()['pending'] == 0)
+        futures = [service.submit(order('EURUSD', f"e{i}")) for i in range(3)]
+        futures.append(service.submit(order('GBPUSD', 'g0')))
+        fake.gate.set()
+
+        assert all('success' in f.result(5) for f in [blocker] + futures)
+        assert fake.filled == ['XAUUSD:first', 'EURUSD:e0', 'GBPUSD:g0', 'EURUSD:e1', 'EURUSD:e2']
+
+    def test_admission_control_and_queue_expiry(self, fake, service):
+        fake.gate.clear()
+        service.submit(order('XAUUSD'))
+        assert wait_until(lambda: service.get_stats()['pending'] == 0)
+        queued = [service.submit(order('EURUSD')) for _ in range(3)]
+        with pytest.raises(Overloaded) as rejected:
+            service.submit(order('EURUSD'))
+        assert rejected.value.retry_after > 0
+        assert service.submit(order('GBPUSD'))   # other symbols are still admitted
+
+        service.max_queue_wait = 0.05
+        time.sleep(0.1)
+        fake.gate.set()
+        for future in queued:
+            with pytest.raises(Overloaded):
+                future.result(5)
+        stats = service.get_stats()
+        assert stats['rejected'] == 1 and stats['expired'] == 4
+
+    def test_snapshot_is_refreshed_after_fills(self, fake, service):
+        assert service.snapshot()['positions'] == []
+        service.submit(order('EURUSD')).result(5)
+        assert wait_until(lambda: len(service.snapshot()['positions']) == 1)
+
+        calls = fake.account_calls
+        snapshot = service.snapshot()
+        assert snapshot['connected'] and snapshot['account']['balance'] == 1000.0
+        assert fake.account_calls == calls
+
+    def test_connect_error_is_reported_by_start(self, fake):
+        fake.account_info = lambda: None   # connect() reads .login from it
+        service = MT5Service(fake, account=1, password='x', server='Fake')
+        try:
+            started = time.perf_counter()
+            assert service.start(timeout=5) is False
+            assert time.perf_counter() - started < 1
+            assert service.running and not service.connected
+        finally:
+            service.stop()
+
+    def test_stop_fails_queued_orders(self, fake, service):
+        fake.gate.clear()
+        service.submit(order('XAUUSD'))
+        assert wait_until(lambda: service.get_stats()['pending'] == 0)
+        queued = service.submit(order('EURUSD'))
+        threading.Timer(0.05, fake.gate.set).start()
+        service.stop()
+        with pytest.raises(ConnectionError):
+            queued.result(1)
+        with pytest.raises(ConnectionError):
+            service.submit(order('EURUSD'))
+
+
+class TestHTTP:
+    def test_handlers_await_the_service(self, fake, service):
+        async def run():
+            runner = aiohttp.web.AppRunner(create_app(service))
+            await runner.setup()
+            site = aiohttp.web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async def post():
+                        async with session.post(f"{url}/execute", json=order('EURUSD')) as response:
+                            await response.json()
+                            return response.status
+
+                    fake.gate.clear()
+                    first = asyncio.ensure_future(post())
+                    # The first order is running (held at the gate) before the rest arrive
+                    await asyncio.to_thread(wait_until, lambda: service.get_stats()['submitted'] == 1
+                                            and service.get_stats()['pending'] == 0)
+                    rest = [asyncio.ensure_future(post()) for _ in range(4)]
+                    await asyncio.sleep(0.2)
+                    fake.gate.set()
+                    statuses = sorted(await asyncio.gather(first, *rest))
+                    async with session.get(f"{url}/positions") as response:
+                        positions = await response.json()
+                    return statuses, positions
+            finally:
+                await runner.cleanup()
+
+        statuses, positions = asyncio.run(run())
+        # One order runs, three queue, the fifth is over the per-symbol limit
+        assert statuses == [200, 200, 200, 200, 503]
+        assert 'positions' in positions
+
+
+class TestConfirmationRouting:
+    def test_confirmations_go_back_the_way_the_order_came(self, fake):
+        pytest.importorskip('requests')
+        from mikrobot_v2.bridge.windows_mt5_executor import MT5Executor
+        from mikrobot_v2.bridge.order_channel import OrderChannelServer
+
+        executor = MT5Executor(fake)
+        webhook = []
+        executor.confirmations.deliver = webhook.append
+        assert executor.service.start()
+
+        async def run():
+            channel = executor.channel = OrderChannelServer(executor.execute_channel_order)
+            port = await channel.start(host='127.0.0.1', port=0)
+            pushed = []
+            client = OrderChannelClient(f"ws://127.0.0.1:{port}/orders", on_confirmation=pushed.append)
+            try:
+                await client.send_order({**order('EURUSD'), 'signal_id': 'channel'})
+                await executor.service.execute({**order('GBPUSD'), 'signal_id': 'http'})
+                await asyncio.to_thread(wait_until, lambda: pushed)
+            finally:
+                await client.close()
+            # The channel has no client left: its confirmation must not be parked
+            await asyncio.to_thread(wait_until, lambda: channel.client_count == 0)
+            await executor.execute_channel_order({**order('USDJPY'), 'signal_id': 'orphan'})
+            await channel.stop()
+            return pushed
+
+        try:
+            pushed = asyncio.run(run())
+            assert executor.confirmations.flush()
+        finally:
+            executor.service.stop()
+            executor.confirmations.close()
+
+        assert [c['signal_id'] for c in pushed] == ['channel']
+        assert [c['signal_id'] for c in webhook] == ['http', 'orphan']
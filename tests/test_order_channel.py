@@ -0,0 +1,200 @@
+"""
+Tests for the persistent Mac <-> Windows order channel
+Id multiplexing, confirmation push, disconnects and the HTTP confirmation queue
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mikrobot_v2.bridge.order_channel import (
+    ChannelUnavailable, ConfirmationSender, OrderChannelClient, OrderChannelServer
+)
+
+
+async def serve(execute):
+    server = OrderChannelServer(execute)
+    port = await server.start(host='127.0.0.1', port=0)
+    return server, f"ws://127.0.0.1:{port}/orders"
+
+
+class TestOrderChannel:
+    def test_concurrent_orders_are_matched_by_id(self):
+        def execute(signal):
+            time.sleep(0.001)
+            return {'success': True, 'ticket': signal['n'] * 100}
+
+        async def run():
+            server, url = await serve(execute)
+            client = OrderChannelClient(url)
+            try:
+                return await asyncio.gather(*(client.send_order({'n': n}) for n in range(10))), client.get_stats()
+            finally:
+                await client.close()
+                await server.stop()
+
+        results, stats = asyncio.run(run())
+        assert [r['ticket'] for r in results] == [n * 100 for n in range(10)]
+        assert stats['connects'] == 1 and stats['results'] == 10 and stats['in_flight'] == 0
+
+    def test_confirmations_are_pushed_from_the_worker(self):
+        received = []
+
+        async def run():
+            server = None
+
+            def execute(signal):
+                server.publish_confirmation({'signal_id': signal['signal_id'], 'ticket': 7})
+                return {'success': True}
+
+            server, url = await serve(execute)
+            client = OrderChannelClient(url, on_confirmation=received.append)
+            try:
+                result = await client.send_order({'signal_id': 'LB_1'})
+                for _ in range(100):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+                return result
+            finally:
+                await client.close()
+                await server.stop()
+
+        assert asyncio.run(run()) == {'success': True}
+        assert received == [{'signal_id': 'LB_1', 'ticket': 7}]
+
+    def test_execution_errors_become_results(self):
+        def execute(signal):
+            raise RuntimeError('MT5 down')
+
+        async def run():
+            server, url = await serve(execute)
+            client = OrderChannelClient(url)
+            try:
+                return await client.send_order({})
+            finally:
+                await client.close()
+                await server.stop()
+
+        assert asyncio.run(run()) == {'error': 'MT5 down'}
+
+    def test_malformed_frames_are_skipped_on_both_ends(self):
+        async def run():
+            server, url = await serve(lambda signal: {'ticket': signal['n']})
+            client = OrderChannelClient(url)
+            try:
+                # A bad frame to the server, then orders on the same connection
+                await client.connect()
+                await client._on_channel_loop(client._ws.send_str('{not json'))
+                first = await client.send_order({'n': 1})
+                # A bad frame to the client, then another order
+                for ws in list(server._clients):
+                    await ws.send_str('[1, 2]')
+                second = await client.send_order({'n': 2})
+                return first, second, client.get_stats()
+            finally:
+                await client.close()
+                await server.stop()
+
+        first, second, stats = asyncio.run(run())
+        assert (first, second) == ({'ticket': 1}, {'ticket': 2})
+        assert stats['connects'] == 1 and stats['failures'] == 0
+
+    def test_disconnect_fails_orders_in_flight(self):
+        release = threading.Event()
+
+        def execute(signal):
+            release.wait(2)
+            return {'success': True}
+
+        async def run():
+            server, url = await serve(execute)
+            client = OrderChannelClient(url)
+            try:
+                order = asyncio.create_task(client.send_order({}, timeout=5))
+                await asyncio.sleep(0.05)
+                await server.stop()
+                with pytest.raises(ConnectionError):
+                    await order
+            finally:
+                release.set()
+                await client.close()
+
+        asyncio.run(run())
+
+    def test_connection_outlives_the_callers_event_loops(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        server, url = asyncio.run_coroutine_threadsafe(
+            serve(lambda signal: {'ticket': signal['n']}), loop).result(5)
+        client = OrderChannelClient(url, timeout=2)
+        try:
+            # A fresh loop per request, as under Django, all on one connection
+            results = [asyncio.run(client.send_order({'n': n})) for n in range(3)]
+            stats = client.get_stats()
+        finally:
+            asyncio.run(client.close())
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+        assert [r['ticket'] for r in results] == [0, 1, 2]
+        assert stats['connects'] == 1 and stats['results'] == 3 and stats['failures'] == 0
+
+    def test_unreachable_executor_is_reported_before_sending(self):
+        async def run():
+            client = OrderChannelClient('ws://127.0.0.1:9/orders')
+            try:
+                with pytest.raises(ChannelUnavailable):
+                    await client.send_order({})
+                return client.get_stats()
+            finally:
+                await client.close()
+
+        assert asyncio.run(run())['orders'] == 0
+
+
+class TestConfirmationSender:
+    def test_submit_does_not_wait_for_delivery(self):
+        delivered = []
+        gate = threading.Event()
+
+        def deliver(confirmation):
+            gate.wait(2)
+            delivered.append(confirmation)
+
+        sender = ConfirmationSender(deliver)
+        started = time.perf_counter()
+        for i in range(5):
+            sender.submit({'signal_id': i})
+        assert time.perf_counter() - started < 0.1
+
+        gate.set()
+        sender.close()
+        assert [c['signal_id'] for c in delivered] == list(range(5))
+        assert sender.stats['sent'] == 5
+
+    def test_failures_are_counted_and_full_queue_drops_oldest(self):
+        gate = threading.Event()
+
+        def deliver(confirmation):
+            gate.wait(2)
+            if confirmation['signal_id'] == 'bad':
+                raise ConnectionError('webhook down')
+
+        sender = ConfirmationSender(deliver, maxsize=2)
+        sender.submit({'signal_id': 'bad'})
+        time.sleep(0.05)  # the worker is now blocked on 'bad'
+        for i in range(4):
+            sender.submit({'signal_id': i})
+        gate.set()
+        sender.close()
+        assert sender.stats == {'sent': 2, 'failed': 1, 'dropped': 2}
@@ -0,0 +1,208 @@
+"""
+Tests for the SQL-side Pareto aggregation and the hourly failure buckets
+"""
+
+import random
+import sqlite3
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PARETO_ANALYSIS_FRAMEWORK import NestedParetoAnalyzer, install_failure_buckets
+
+DDL = """
+CREATE TABLE spc_violations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    detection_timestamp TIMESTAMP NOT NULL,
+    metric_name TEXT NOT NULL,
+    violation_type TEXT,
+    violation_description TEXT,
+    severity_level INTEGER,
+    data_point_value REAL,
+    symbol TEXT,
+    phase_name TEXT
+);
+CREATE TABLE mt5_journal_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_timestamp TIMESTAMP NOT NULL,
+    event_type TEXT NOT NULL,
+    event_category TEXT,
+    severity_level INTEGER,
+    message TEXT,
+    symbol TEXT,
+    raw_data TEXT
+);
+CREATE TABLE mt5_expert_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_timestamp TIMESTAMP NOT NULL,
+    expert_name TEXT NOT NULL,
+    event_type TEXT,
+    symbol TEXT,
+    execution_time_ms INTEGER,
+    success_flag BOOLEAN,
+    error_code INTEGER,
+    error_message TEXT
+);
+CREATE TABLE early_warning_alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_timestamp TIMESTAMP NOT NULL,
+    alert_type TEXT,
+    severity_level INTEGER,
+    metric_name TEXT NOT NULL,
+    current_value REAL,
+    threshold_value REAL,
+    deviation_magnitude REAL,
+    phase_name TEXT,
+    symbol TEXT
+);
+"""
+
+MESSAGES = ['Connection lost', 'Order rejected', 'Bad tick data', 'Request timeout', 'Unknown failure', None]
+
+
+def insert_failures(conn, count, now, max_hours, seed=3):
+    rng = random.Random(seed)
+
+    def ts():
+        return (now - timedelta(hours=rng.random() * max_hours)).isoformat(sep=' ')
+
+    for _ in range(count):
+        conn.execute("""
+            INSERT INTO spc_violations (detection_timestamp, metric_name, violation_type, violation_description,
+                                        severity_level, data_point_value, symbol, phase_name)
+            VALUES (?, 'latency', ?, 'rule', ?, ?, 'EURUSD', 'M5_BOS_DETECTION')
+        """, (ts(), rng.choice(['RULE_1', 'RULE_2', None]), rng.randint(1, 5), rng.choice([None, 0.0, -12.5, 40.0])))
+        conn.execute("""
+            INSERT INTO mt5_journal_data (event_timestamp, event_type, event_category, severity_level, message, symbol)
+            VALUES (?, ?, ?, ?, ?, 'EURUSD')
+        """, (ts(), rng.choice(['TERMINAL', 'TRADE']), rng.choice(['ERROR', 'WARNING', 'INFO']),
+              rng.choice([1, 3, 5]), rng.choice(MESSAGES)))
+        conn.execute("""
+            INSERT INTO mt5_expert_data (event_timestamp, expert_name, event_type, symbol, execution_time_ms,
+                                         success_flag, error_code, error_message)
+            VALUES (?, 'Mikrobot', ?, 'EURUSD', ?, ?, ?, NULL)
+        """, (ts(), rng.choice(['ERROR', 'TRADE_OPENED']), rng.choice([None, 0, 120, 7000]),
+              rng.choice([0, 1, None]), rng.choice([None, 2, 131, 10004])))
+        conn.execute("""
+            INSERT INTO early_warning_alerts (alert_timestamp, alert_type, severity_level, metric_name,
+                                              current_value, threshold_value, deviation_magnitude, symbol)
+            VALUES (?, ?, ?, 'cpk', 2.1, 2.5, ?, 'EURUSD')
+        """, (ts(), rng.choice(['CAPABILITY_DECLINE', 'THRESHOLD_BREACH', 'ANOMALY_DETECTED', 'OTHER']),
+              rng.randint(1, 5), rng.choice([None, 0.4, 1.5])))
+
+
+def event_totals(analyzer, hours_back):
+    """Totals per (category, subcategory, failure_type) from the per-event readers"""
+    totals = {}
+    for event in analyzer.collect_failure_data(hours_back):
+        group = totals.setdefault((event.category, event.subcategory, event.failure_type), [0, 0.0, 0.0, 0.0])
+        group[0] += 1
+        group[1] += event.impact_score
+        group[2] += event.cost_estimate
+        group[3] += event.severity * event.impact_score
+    return totals
+
+
+def assert_totals_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert actual[key][0] == values[0], key
+        assert actual[key][1:] == pytest.approx(values[1:]), key
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "ml_observation_system.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DDL)
+    return path
+
+
+class TestParetoAggregation:
+    @pytest.mark.parametrize('buckets_first', [True, False])
+    def test_sql_totals_match_per_event_path(self, db_path, buckets_first):
+        now = datetime.utcnow()
+        if buckets_first:
+            analyzer = NestedParetoAnalyzer(db_path)
+        with sqlite3.connect(db_path) as conn:
+            insert_failures(conn, 300, now, max_hours=72)
+        if not buckets_first:
+            analyzer = NestedParetoAnalyzer(db_path)
+        assert len(analyzer.bucket_sources) == 4
+
+        for hours_back in (6, 24, 30 * 24):
+            assert_totals_equal(analyzer.aggregate_failures(hours_back), event_totals(analyzer, hours_back))
+
+    def test_nested_levels_match_event_grouping(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            insert_failures(conn, 200, datetime.utcnow(), max_hours=20)
+        analyzer = NestedParetoAnalyzer(db_path)
+        events = analyzer.collect_failure_data(24)
+        results = analyzer.perform_nested_pareto_analysis(hours_back=24)
+
+        level1 = results['level_1_categories']
+        expected = analyzer._perform_pareto_analysis(events, 'category', 1, 0.80)
+        assert level1.total_failures == len(events)
+        assert level1.analysis_period_hours == 24
+        assert [item.name for item in level1.pareto_items] == [item.name for item in expected.pareto_items]
+        assert [item.is_vital_few for item in level1.pareto_items] == [
+            item.is_vital_few for item in expected.pareto_items]
+
+        for key, result in results.items():
+            if key.startswith('level_2_'):
+                subset = [e for e in events if e.category == result.parent_category]
+                assert result.total_failures == len(subset)
+                assert sum(item.cost_of_poor_quality for item in result.pareto_items) == pytest.approx(
+                    sum(e.cost_estimate for e in subset))
+
+    def test_window_edge_reads_partial_hour_from_raw_rows(self, db_path):
+        analyzer = NestedParetoAnalyzer(db_path)
+        now = datetime(2030, 1, 2, 12, 40, 0)
+        with sqlite3.connect(db_path) as conn:
+            for minutes in (-10, 10, 50, 25 * 60 - 30):
+                moment = now - timedelta(hours=24) + timedelta(minutes=minutes)
+                conn.execute("""
+                    INSERT INTO early_warning_alerts (alert_timestamp, alert_type, severity_level, metric_name)
+                    VALUES (?, 'TREND_REVERSAL', 2, 'cpk')
+                """, (moment.isoformat(sep=' '),))
+
+        totals = analyzer.aggregate_failures(24, now=now)
+        assert totals[('signal_failures', 'early_warning', 'TREND_REVERSAL')][0] == 3
+        assert sum(v[0] for v in analyzer.aggregate_failures(1, now=now).values()) == 1
+
+    def test_install_is_idempotent_and_rebuilds_changed_triggers(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            insert_failures(conn, 50, datetime.utcnow(), max_hours=10)
+            install_failure_buckets(conn)
+
+            def bucket_total():
+                return conn.execute("SELECT SUM(failures) FROM pareto_failure_buckets").fetchone()[0]
+
+            total = bucket_total()
+            install_failure_buckets(conn)
+            assert bucket_total() == total
+
+            # A trigger built from different cost tables is replaced and its buckets rebuilt
+            conn.executescript("""
+                DROP TRIGGER pareto_bucket_spc_violations;
+                CREATE TRIGGER pareto_bucket_spc_violations AFTER INSERT ON spc_violations BEGIN SELECT 1; END;
+                UPDATE pareto_failure_buckets SET failures = failures * 2 WHERE source = 'spc_violations';
+            """)
+            install_failure_buckets(conn)
+            assert bucket_total() == total
+
+    def test_missing_sources_are_skipped(self, tmp_path):
+        path = str(tmp_path / "partial.db")
+        with sqlite3.connect(path) as conn:
+            conn.executescript(DDL.split("CREATE TABLE mt5_journal_data")[0])
+            conn.execute("""
+                INSERT INTO spc_violations (detection_timestamp, metric_name, violation_type, severity_level)
+                VALUES (datetime('now', '-1 hour'), 'latency', 'RULE_1', 4)
+            """)
+        analyzer = NestedParetoAnalyzer(path)
+        assert analyzer.bucket_sources == ['spc_violations']
+        assert analyzer.aggregate_failures(24) == {('signal_failures', 'spc_violation', 'RULE_1'): [1, 40.0, 200.0, 160.0]}
@@ -0,0 +1,170 @@
+"""
+Tests for the chart render service and the notifier's non-blocking chart path
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from matplotlib.colors import to_rgb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mikrobot_v2.charts.render_service import (
+    ChartRenderService, ChartSpec, ChartMarker, ChartAnnotation, candle_collections
+)
+from mikrobot_v2.notifications.imessage_notifier import iMessageNotifier, LightningBoltPhase
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def make_spec(count=30, **kwargs):
+    start = datetime(2025, 1, 6, 12, 0)
+    times = [start + timedelta(minutes=5 * i) for i in range(count)]
+    closes = 1.10 + np.cumsum(np.random.default_rng(1).normal(0, 0.0005, count))
+    opens = np.concatenate([[1.10], closes[:-1]])
+    highs = np.maximum(opens, closes) + 0.0003
+    lows = np.minimum(opens, closes) - 0.0003
+    kwargs.setdefault('preset', 'preview')
+    return ChartSpec('EURUSD', 'EURUSD M5', times, opens, highs, lows, closes,
+                     volumes=np.full(count, 100.0), **kwargs)
+
+
+@pytest.fixture
+def service():
+    service = ChartRenderService(mode='thread', warm_presets=('preview',))
+    yield service
+    service.shutdown()
+
+
+class TestCandleCollections:
+    def test_one_artist_pair_for_all_candles(self):
+        x = np.arange(4.0)
+        opens = np.array([1.0, 2.0, 1.5, 1.5])
+        closes = np.array([2.0, 1.0, 1.5, 1.6])
+        wicks, bodies = candle_collections(x, opens, closes + 0.5, opens - 0.5, closes, 0.6,
+                                           'green', 'red', 'grey', min_body=0.05)
+
+        assert len(wicks.get_segments()) == 4 and len(bodies.get_paths()) == 4
+        np.testing.assert_allclose(wicks.get_segments()[0], [[0.0, 0.5], [0.0, 2.5]])
+        # The doji body is widened to min_body
+        doji = bodies.get_paths()[2].vertices
+        assert doji[:, 1].max() - doji[:, 1].min() == pytest.approx(0.05)
+        np.testing.assert_allclose(bodies.get_facecolors()[:2, :3], [to_rgb('green'), to_rgb('red')])
+
+
+class TestChartRenderService:
+    def test_inline_render_returns_png_bytes(self):
+        inline = ChartRenderService(mode='inline')
+        result = asyncio.run(inline.render(make_spec(markers=[
+            ChartMarker(datetime(2025, 1, 6, 13, 0), 1.1, 'HH', '#4caf50')])))
+
+        assert result.path is None and result.png.startswith(PNG_SIGNATURE)
+        assert result.artists > 0
+        assert inline.get_stats()['rendered'] == 1
+
+    def test_render_writes_output_path(self, service, tmp_path):
+        path = str(tmp_path / 'charts' / 'eurusd.png')
+        spec = make_spec(annotations=[ChartAnnotation(datetime(2025, 1, 6, 13, 0), 1.1, 'BOS')],
+                         output_path=path)
+
+        result = asyncio.run(service.render(spec))
+
+        assert result.path == path and result.png is None
+        with open(path, 'rb') as f:
+            assert f.read(8) == PNG_SIGNATURE
+
+    def test_render_does_not_block_the_event_loop(self, service):
+        async def run():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            beat = asyncio.ensure_future(heartbeat())
+            # Covers pool start-up and warm-up as well as the render itself
+            started = time.perf_counter()
+            await asyncio.gather(*(service.render(make_spec(preset='standard')) for _ in range(3)))
+            elapsed = time.perf_counter() - started
+            beat.cancel()
+            return ticks, elapsed
+
+        ticks, elapsed = asyncio.run(run())
+        assert ticks >= elapsed / 0.005 * 0.3
+
+    def test_concurrent_starts_create_one_pool(self, service):
+        async def run():
+            await asyncio.gather(*(service.render(make_spec()) for _ in range(4)))
+
+        asyncio.run(run())
+        executor = service.executor
+        asyncio.run(run())
+        assert service.executor is executor
+        assert service.get_stats()['rendered'] == 8
+
+    def test_render_failure_is_counted(self, service):
+        with pytest.raises(Exception):
+            asyncio.run(service.render(make_spec(preset='missing')))
+        assert service.get_stats()['failed'] == 1
+
+    def test_stats_report_latency(self, service):
+        service.render_sync(make_spec())
+        stats = service.get_stats()
+        assert stats['mode'] == 'thread'
+        assert stats['latency_ms']['p50'] >= stats['render_ms_mean'] > 0
+
+
+class TestNotifierChartPath:
+    def test_phase_notification_is_scheduled_on_the_running_loop(self, service, tmp_path, monkeypatch):
+        from mikrobot_v2.charts import chart_generator as chart_module
+
+        monkeypatch.setattr(chart_module, 'chart_render_service', service)
+        monkeypatch.setattr(chart_module.chart_generator, 'chart_dir', str(tmp_path))
+        notifier = iMessageNotifier()
+        sent = []
+        monkeypatch.setattr(notifier, 'send_imessage',
+                            lambda message, image_path=None: sent.append((message, image_path)) or True)
+        phase = LightningBoltPhase('EURUSD', 1, 'BOS_DETECTION', 'M5', 1.1, 0.9, datetime.now())
+
+        async def run():
+            started = time.perf_counter()
+            queued = notifier.notify_lightning_bolt_phase(phase)
+            returned_after = time.perf_counter() - started
+            assert not sent
+            await asyncio.gather(*notifier._pending)
+            return queued, returned_after
+
+        queued, returned_after = asyncio.run(run())
+        assert queued and returned_after < 0.05
+        assert len(sent) == 1 and 'PHASE 1' in sent[0][0]
+        assert sent[0][1] and os.path.exists(sent[0][1])
+
+    def test_failed_render_falls_back_to_the_pattern_chart(self, tmp_path, monkeypatch):
+        from mikrobot_v2.charts import chart_generator as chart_module
+
+        fallback_path = str(tmp_path / 'fallback.png')
+        calls = []
+
+        async def render(symbol, pattern_phase, price):
+            calls.append(pattern_phase)
+            if len(calls) == 1:
+                raise RuntimeError('render pool down')
+            return fallback_path
+
+        monkeypatch.setattr(chart_module.chart_generator, 'generate_professional_candlestick_chart', render)
+        notifier = iMessageNotifier()
+        sent = []
+        monkeypatch.setattr(notifier, 'send_imessage',
+                            lambda message, image_path=None: sent.append(image_path) or True)
+        phase = LightningBoltPhase('EURUSD', 2, 'BREAK_RETEST', 'M1', 1.1, 0.9, datetime.now())
+
+        assert asyncio.run(notifier.notify_lightning_bolt_phase_async(phase))
+        assert calls == ['Phase 2 - BREAK_RETEST', 'Phase 2']
+        assert sent == [fallback_path]
@@ -0,0 +1,181 @@
+"""
+Tests for the deterministic replay connector and engine
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mikrobot_v2.core.mt5_direct_connector import OrderType
+from mikrobot_v2.core.replay_connector import ReplayConnector, ReplayConfig
+from mikrobot_v2.replay_engine import ReplayEngine
+from mikrobot_v2.strategies.lightning_bolt import LightningBoltStrategy, TrendDirection
+
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8')])
+
+
+def synthetic_rates(bars: int, seed: int = 0, step: float = 1e-4) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(bars) * 60
+    rates['close'] = 1.085 + np.cumsum(rng.normal(0, step, bars))
+    rates['open'] = np.r_[rates['close'][0], rates['close'][:-1]]
+    rates['high'] = np.maximum(rates['open'], rates['close']) + 2e-5
+    rates['low'] = np.minimum(rates['open'], rates['close']) - 2e-5
+    rates['tick_volume'] = 100
+    return rates
+
+
+def no_cost_config(**kwargs) -> ReplayConfig:
+    return ReplayConfig(spread_pips=0.0, slippage_pips=0.0, **kwargs)
+
+
+class EveryNBars:
+    """Minimal strategy: a BULLISH signal with fixed SL/TP every n analyses"""
+
+    def __init__(self, connector, n: int = 50, distance: float = 5e-4):
+        self.mt5 = connector
+        self.n = n
+        self.distance = distance
+        self.calls = 0
+
+    async def analyze_symbol(self, symbol):
+        self.calls += 1
+        if self.calls % self.n:
+            return None
+        tick = await self.mt5.get_current_tick(symbol)
+        return SimpleNamespace(symbol=symbol, direction=TrendDirection.BULLISH, entry_price=tick.ask,
+                               stop_loss=tick.ask - self.distance, take_profit=tick.ask + self.distance)
+
+
+class TestReplayConnector:
+    @pytest.mark.asyncio
+    async def test_candles_never_look_ahead(self):
+        rates = synthetic_rates(30)
+        connector = ReplayConnector({'EURUSD': rates}, no_cost_config())
+        for _ in range(12):
+            connector.advance()
+
+        assert connector.clock() == datetime(2024, 1, 1, 0, 12)
+        m1 = await connector.get_candles('EURUSD', 'M1', 100)
+        assert len(m1) == 12 and m1[-1].close == rates['close'][11]
+
+        m5 = await connector.get_candles('EURUSD', 'M5', 100)
+        assert [c.time.minute for c in m5] == [0, 5, 10]
+        assert m5[1].high == rates['high'][5:10].max()
+        forming = m5[-1]
+        assert (forming.open, forming.close) == (rates['open'][10], rates['close'][11])
+        assert len(await connector.get_candles('EURUSD', 'M5', 2)) == 2
+
+        tick = await connector.get_current_tick('EURUSD')
+        assert tick.bid == rates['close'][11]
+
+    @pytest.mark.asyncio
+    async def test_fills_apply_spread_and_slippage(self):
+        config = ReplayConfig(spread_pips=1.0, slippage_pips=0.5, seed=3)
+        connector = ReplayConnector({'EURUSD': synthetic_rates(10)}, config)
+        connector.advance()
+        tick = await connector.get_current_tick('EURUSD')
+        assert tick.ask - tick.bid == pytest.approx(1e-4)
+
+        result = await connector.place_order('EURUSD', OrderType.BUY, 0.1)
+        assert result['retcode'] == 10009
+        assert tick.ask <= result['price'] <= tick.ask + 0.5e-4
+        assert await connector.place_order('EURUSD', OrderType.BUY_LIMIT, 0.1) is None
+
+        positions = await connector.get_positions()
+        assert len(positions) == 1 and positions[0].profit < 0
+
+    @pytest.mark.asyncio
+    async def test_take_profit_and_stop_loss_settle_on_bar_range(self):
+        rates = synthetic_rates(5)
+        rates['close'][:] = rates['open'][:] = 1.1
+        rates['high'][:] = rates['low'][:] = 1.1
+        rates['high'][2] = 1.1012          # touches TP of the long
+        rates['high'][4] = 1.1020          # touches SL of the short
+        connector = ReplayConnector({'EURUSD': rates}, no_cost_config())
+        connector.advance()
+        await connector.place_order('EURUSD', OrderType.BUY, 1.0, sl=1.0990, tp=1.1010)
+        await connector.place_order('EURUSD', OrderType.SELL, 1.0, sl=1.1015, tp=1.0900)
+        while connector.advance():
+            pass
+
+        long_trade, short_trade = connector.closed_trades
+        assert (long_trade.close_reason, long_trade.price_close) == ('tp', 1.1010)
+        assert long_trade.profit == pytest.approx(100.0)
+        assert (short_trade.close_reason, short_trade.profit) == ('sl', pytest.approx(-150.0))
+        assert connector.balance == pytest.approx(10_000 - 50.0)
+
+    def test_symbols_step_on_a_shared_clock(self):
+        late = synthetic_rates(10, seed=1)
+        late['time'] += 300
+        connector = ReplayConnector({'EURUSD': synthetic_rates(10), 'GBPUSD': late}, no_cost_config())
+        updates = []
+        while connector.advance():
+            updates.append(tuple(connector.updated))
+        assert len(updates) == 15
+        assert updates[0] == ('EURUSD',) and updates[5] == ('EURUSD', 'GBPUSD')
+        assert updates[-1] == ('GBPUSD',)
+
+
+class TestReplayEngine:
+    @pytest.mark.asyncio
+    async def test_engine_executes_signals_and_reports(self):
+        connector = ReplayConnector({'EURUSD': synthetic_rates(3000)}, no_cost_config())
+        engine = ReplayEngine(connector, EveryNBars(connector), warmup_steps=100)
+        report = await engine.run()
+
+        assert report.steps == report.bars == 3000
+        assert report.signals == (3000 - 100) // 50
+        assert 0 < len(report.trades) <= report.signals
+        assert report.final_balance == pytest.approx(10_000 + sum(t.profit for t in report.trades))
+        assert not connector.open_trades
+        assert report.bars_per_second > 0
+        assert set(report.summary()) >= {'trades', 'net_profit', 'win_rate', 'bars_per_second'}
+
+    @pytest.mark.asyncio
+    async def test_lightning_bolt_replay_is_deterministic(self):
+        summaries = []
+        for _ in range(2):
+            connector = ReplayConnector({'EURUSD': synthetic_rates(2500, seed=7),
+                                         'GBPUSD': synthetic_rates(2500, seed=8)}, ReplayConfig(seed=1))
+            report = await ReplayEngine(connector, warmup_steps=1500).run()
+            summary = report.summary()
+            summary.pop('wall_seconds')
+            summary.pop('bars_per_second')
+            summaries.append((summary, [(t.symbol, t.open_time, t.price_open) for t in report.trades]))
+
+        assert summaries[0] == summaries[1]
+        assert summaries[0][0]['bars'] == 5000
+
+    def test_each_run_sizes_on_its_own_atr_engine(self):
+        connectors = [ReplayConnector({'EURUSD': synthetic_rates(100, seed=seed)}) for seed in (1, 2)]
+        engines = [ReplayEngine(connector).strategy.atr_engine for connector in connectors]
+
+        assert engines[0] is not engines[1]
+        connectors[1].advance()
+        # The engine reads the connector's virtual clock, not wall time
+        assert engines[1].clock() == connectors[1].clock().timestamp()
+        assert engines[0].clock() == connectors[0].clock().timestamp()
+
+    def test_strategy_clock_is_explicit(self):
+        connector = ReplayConnector({'EURUSD': synthetic_rates(100, seed=1)})
+        strategy = ReplayEngine(connector).strategy
+        assert strategy.clock == connector.clock
+
+        # A connector's own attributes are never taken for a clock
+        live = LightningBoltStrategy(Mock())
+        assert live.clock == datetime.now
+        live._add_symbol_to_cooldown('EURUSD')
+        assert live._is_symbol_in_cooldown('EURUSD')
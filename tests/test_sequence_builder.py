@@ -0,0 +1,144 @@
+"""
+Tests for the zero-copy LSTM sequence builder
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sequence_builder import SequenceWindows
+from create_tensorflow_pipeline import TensorFlowFeaturePipeline
+
+
+def loop_sequences(data: np.ndarray, targets: np.ndarray, sequence_length: int):
+    """The original prepare_sequences window loop"""
+    X, y = [], []
+    for i in range(sequence_length, len(data)):
+        X.append(data[i - sequence_length:i])
+        y.append(targets[i])
+    return np.array(X), np.array(y)
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(500, 7)), (rng.random(500) > 0.7).astype(float)
+
+
+class TestSequenceWindows:
+    def test_matches_copying_loop(self, matrix):
+        data, targets = matrix
+        windows = SequenceWindows(data, targets, 30)
+        X, y = windows.to_arrays()
+        X_ref, y_ref = loop_sequences(data, targets, 30)
+        assert windows.shape == X_ref.shape
+        np.testing.assert_array_equal(X, X_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_windows_are_views(self, matrix):
+        data, targets = matrix
+        windows = SequenceWindows(data, targets, 30)
+        assert np.shares_memory(windows.windows, windows.features)
+
+    def test_batches_cover_every_sample_once(self, matrix):
+        data, targets = matrix
+        windows = SequenceWindows(data, targets, 30)
+        X_ref, y_ref = windows.to_arrays()
+
+        batches = list(windows.batches(64))
+        assert all(len(X) <= 64 for X, _ in batches)
+        np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]), X_ref)
+
+        shuffled = list(windows.batches(64, shuffle=True, seed=1))
+        X_shuffled = np.concatenate([X for X, _ in shuffled])
+        assert not np.array_equal(X_shuffled, X_ref)
+        order = np.lexsort(X_shuffled[:, 0, ::-1].T)
+        np.testing.assert_array_equal(X_shuffled[order], X_ref[np.lexsort(X_ref[:, 0, ::-1].T)])
+
+    def test_windows_never_straddle_symbols(self):
+        symbols = np.repeat(['EURUSD', 'GBPUSD', 'XAUUSD'], [100, 5, 80])
+        data = np.arange(len(symbols), dtype=float)[:, None]
+        targets = np.arange(len(symbols), dtype=float)
+        windows = SequenceWindows(data, targets, 10, groups=symbols)
+
+        assert len(windows) == (100 - 10) + 0 + (80 - 10)
+        for X, y in windows.batches(32):
+            rows = np.concatenate([X[:, :, 0], y[:, None]], axis=1).astype(int)
+            assert (symbols[rows] == symbols[rows[:, :1]]).all()
+
+    def test_chronological_split(self, matrix):
+        data, targets = matrix
+        windows = SequenceWindows(data, targets, 20)
+        head, tail = windows.split(0.8)
+        assert len(head) + len(tail) == len(windows)
+        np.testing.assert_array_equal(np.concatenate([head.to_arrays()[0], tail.to_arrays()[0]]),
+                                      windows.to_arrays()[0])
+
+    def test_short_input_has_no_samples(self):
+        windows = SequenceWindows(np.ones((10, 3)), np.zeros(10), 10)
+        assert len(windows) == 0
+        assert windows.to_arrays()[0].shape == (0, 10, 3)
+
+
+class TestPipelineSequences:
+    def test_prepare_sequences_matches_loop(self):
+        pipeline = TensorFlowFeaturePipeline()
+        features = pipeline.extract_technical_features(pipeline.generate_synthetic_data(600))
+        X, y = pipeline.prepare_sequences(features, sequence_length=30)
+
+        raw = features[pipeline.feature_columns].ffill().fillna(0)
+        if isinstance(pipeline.scaler, dict):  # scikit-learn not installed
+            scaled = (raw.values - pipeline.scaler['mean']) / pipeline.scaler['std']
+        else:
+            scaled = pipeline.scaler.transform(raw)
+        X_ref, y_ref = loop_sequences(scaled, features['bos_signal'].values, 30)
+        np.testing.assert_allclose(X, X_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_symbol_column_splits_windows(self):
+        pipeline = TensorFlowFeaturePipeline()
+        data = pipeline.generate_synthetic_data(300)
+        features = pipeline.extract_technical_features(data)
+        features['symbol'] = np.repeat(['EURUSD', 'GBPUSD'], 150)
+        windows = pipeline.prepare_sequence_windows(features, sequence_length=20)
+        assert len(windows) == 2 * (150 - 20)
+        assert 'symbol' not in pipeline.feature_columns
+
+    def test_train_model_streams_windows_to_fit(self, monkeypatch):
+        import create_tensorflow_pipeline as module
+
+        class FakeModel:
+            def fit(self, data, validation_data, **kwargs):
+                self.fit_batches = list(data)
+                self.val_batches = list(validation_data)
+                return type('History', (), {'history': {'loss': [0.5]}})()
+
+            def evaluate(self, data, verbose=0):
+                self.test_batches = list(data)
+                return 0.5, 0.8, 0.7, 0.6
+
+        model = FakeModel()
+        monkeypatch.setattr(module, 'TENSORFLOW_AVAILABLE', True)
+        monkeypatch.setattr(module, 'EarlyStopping', lambda **kwargs: None, raising=False)
+        monkeypatch.setattr(module, 'ModelCheckpoint', lambda *args, **kwargs: None, raising=False)
+        monkeypatch.setattr(SequenceWindows, 'as_tf_dataset',
+                            lambda self, batch_size=32, shuffle=False, seed=None: self.batches(batch_size, shuffle, seed))
+        monkeypatch.setattr(SequenceWindows, 'to_arrays', lambda self: pytest.fail("dense arrays built"))
+
+        pipeline = TensorFlowFeaturePipeline()
+        pipeline.create_lstm_model = lambda input_shape: model
+        windows = pipeline.prepare_sequence_windows(
+            pipeline.extract_technical_features(pipeline.generate_synthetic_data(600)), sequence_length=30)
+        results = pipeline.train_model(windows)
+
+        batch_size = pipeline.model_config['batch_size']
+        sizes = [sum(len(y) for _, y in batches)
+                 for batches in (model.fit_batches, model.val_batches, model.test_batches)]
+        assert sum(sizes) == len(windows)
+        assert sizes[2] == len(windows) - int(len(windows) * 0.8)
+        assert all(len(y) <= batch_size for _, y in model.fit_batches)
+        assert model.fit_batches[0][0].shape[1:] == windows.shape[1:]
+        assert results['model_type'] == 'tensorflow_lstm' and results['test_accuracy'] == 0.8
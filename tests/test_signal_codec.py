@@ -0,0 +1,107 @@
+"""
+Tests for the signal codec against the signal corpus in tests/data/signals
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from encoding_utils import ASCIIFileManager, UnicodeReplacer
+from signal_codec import IncrementalSignalDecoder, decode_signal, sanitize, sniff_encoding
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'signals')
+
+with open(os.path.join(CORPUS, 'MANIFEST.json')) as _f:
+    MANIFEST = json.load(_f)
+
+
+def corpus_bytes(name):
+    with open(os.path.join(CORPUS, name), 'rb') as f:
+        return f.read()
+
+
+def all_strings(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from all_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from all_strings(item)
+    elif isinstance(value, str):
+        yield value
+
+
+class TestSignalCodec:
+    @pytest.mark.parametrize('name', sorted(MANIFEST))
+    def test_corpus_decodes_to_ascii_signals(self, name):
+        expected = MANIFEST[name]
+        data = decode_signal(corpus_bytes(name))
+        if expected['symbol'] is None:
+            assert data is None
+            return
+        assert data['symbol'] == expected['symbol']
+        for field, value in expected.get('fields', {}).items():
+            assert data[field] == value
+        assert all(text.isascii() for text in all_strings(data))
+
+    def test_encoding_variants_agree(self):
+        reference = decode_signal(corpus_bytes('ea_4phase_utf16le_bom.json'))
+        for name in ('ea_4phase_utf16le_crlf.json', 'ea_4phase_utf16le_nul_padded.json', 'ea_4phase_utf8_bom.json'):
+            assert decode_signal(corpus_bytes(name)) == reference
+        assert (decode_signal(corpus_bytes('trade_signal_utf8.json'))
+                == decode_signal(corpus_bytes('trade_signal_utf16le.json')))
+
+    def test_sniff_encoding(self):
+        assert sniff_encoding(b'\xff\xfe{\x00') == ('utf-16-le', 2)
+        assert sniff_encoding(b'\xfe\xff\x00{') == ('utf-16-be', 2)
+        assert sniff_encoding(b'\xef\xbb\xbf{"') == ('utf-8', 3)
+        assert sniff_encoding(b'{\x00"\x00') == ('utf-16-le', 0)
+        assert sniff_encoding(b'\x00{\x00"') == ('utf-16-be', 0)
+        assert sniff_encoding(b'{"a"') == ('utf-8', 0)
+        assert sniff_encoding(b'') == ('utf-8', 0)
+
+    def test_sanitize_keeps_json_valid(self):
+        text = '{"note": "line\r\none\x00\x07 “q” → é"}'
+        assert sanitize(text) == b'{"note": "line  one \'q\' -> "}'
+        assert decode_signal(text.encode('utf-16-le')) == {"note": "line  one 'q' -> "}
+        assert decode_signal(b'[1, 2]') is None
+        assert decode_signal(b'\x00\x00\x00\x00') is None
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 64, 4096])
+    def test_incremental_decoder_matches_whole_file(self, chunk_size):
+        for name, expected in MANIFEST.items():
+            raw = corpus_bytes(name)
+            decoder = IncrementalSignalDecoder()
+            results = [decoder.feed(raw[i:i + chunk_size]) for i in range(0, len(raw), chunk_size)]
+            signals = [result for result in results if result is not None]
+            if expected['symbol'] is None:
+                assert signals == [] and not decoder.done
+            else:
+                assert signals == [decode_signal(raw)]
+                assert decoder.done and not decoder.error
+
+    def test_incremental_decoder_tracks_strings_and_escapes(self):
+        text = '{"comment": "brace } and quote \\" inside", "n": {"x": 1}}   '
+        decoder = IncrementalSignalDecoder()
+        raw = text.encode('utf-16-le')
+        for i in range(0, len(raw) - 8, 2):
+            assert decoder.feed(raw[i:i + 2]) is None
+        assert decoder.feed(raw[len(raw) - 8:]) == json.loads(text)
+        assert decoder.feed(b'{"a": 1}') is None
+
+        decoder.reset()
+        assert decoder.feed(b'{"a": tru}') is None
+        assert decoder.done and decoder.error
+
+    def test_legacy_entry_points_use_the_codec(self, tmp_path):
+        path = tmp_path / 'signal.json'
+        path.write_bytes(corpus_bytes('ea_4phase_utf16le_unicode.json'))
+        assert ASCIIFileManager.read_mt5_signal_file(str(path))['symbol'] == 'EURJPY'
+        assert ASCIIFileManager.read_mt5_signal_file(str(tmp_path / 'missing.json')) is None
+
+        assert UnicodeReplacer.replace_unicode('Trade ✅ profit \U0001F4B0 → ü') == 'Trade OK profit MONEY -> '
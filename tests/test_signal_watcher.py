@@ -0,0 +1,155 @@
+"""
+Tests for the shared signal file watcher and its subscribers
+"""
+
+import json
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from signal_watcher import (
+    SignalEvent, SignalFileWatcher, SignalSubscriber, SignalWatcherServer, decode_signal_bytes
+)
+
+SIGNAL = {
+    "symbol": "EURJPY", "timestamp": "2025.08.05 08:30:00", "trade_direction": "BEAR",
+    "phase_4_ylipip": {"target": 171.22, "triggered": True},
+}
+
+
+def write_signal(path, data, bom=True):
+    tmp = str(path) + '.tmp'
+    with open(tmp, 'w', encoding='utf-16le') as f:
+        f.write(('﻿' if bom else '') + json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def address(tmp_path):
+    if hasattr(socket, 'AF_UNIX'):
+        return str(tmp_path / 'watcher.sock')
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()
+
+
+class TestSignalFileWatcher:
+    def test_decode_signal_bytes(self):
+        raw = '﻿{"symbol": "GBPJPY"}'.encode('utf-16le')
+        assert decode_signal_bytes(raw) == {"symbol": "GBPJPY"}
+        assert decode_signal_bytes(raw[:-6]) is None
+        assert decode_signal_bytes(b'') is None
+        assert decode_signal_bytes(b'{"symbol": "EURUSD"}') == {"symbol": "EURUSD"}
+
+    def test_reads_only_when_the_file_changes(self, tmp_path):
+        path = tmp_path / 'signal.json'
+        watcher = SignalFileWatcher(str(path))
+        assert watcher.poll() is None
+
+        write_signal(path, SIGNAL)
+        event = watcher.poll()
+        assert event.seq == 1 and event.data == SIGNAL
+        assert watcher.poll() is None and watcher.stats['reads'] == 1
+
+        write_signal(path, SIGNAL, bom=True)
+        os.utime(path, ns=(1, 1))
+        assert watcher.poll() is None and watcher.stats['unchanged'] == 1
+
+        with open(path, 'wb') as f:
+            f.write('﻿{"symbol": "EUR'.encode('utf-16le'))
+        assert watcher.poll() is None and watcher.stats['decode_errors'] == 1
+
+        write_signal(path, dict(SIGNAL, symbol="GBPJPY"))
+        assert watcher.poll().seq == 2
+
+    def test_settled_undecodable_file_is_reported_once(self, tmp_path):
+        path = tmp_path / 'signal.json'
+        watcher = SignalFileWatcher(str(path))
+        write_signal(path, SIGNAL)
+        watcher.poll()
+
+        with open(path, 'wb') as f:
+            f.write(b'\xff\xfe{\x00')
+        assert watcher.poll() is None   # may still be being written
+        event = watcher.poll()
+        assert event.seq == 2 and event.data is None and event.error
+        assert watcher.poll() is None and watcher.latest.data == SIGNAL
+        assert SignalEvent.decode(event.encode().rstrip(b'\n')) == event
+
+        # Restoring the last signal is not a new signal
+        write_signal(path, SIGNAL)
+        assert watcher.poll() is None
+        assert watcher.stats['error_events'] == 1
+
+    def test_event_wire_format_round_trips(self, tmp_path):
+        path = tmp_path / 'signal.json'
+        write_signal(path, SIGNAL)
+        event = SignalFileWatcher(str(path)).poll()
+        assert SignalEvent.decode(event.encode().rstrip(b'\n')) == event
+
+
+class TestSignalPubSub:
+    def test_subscribers_get_each_signal_once(self, tmp_path, address):
+        path = tmp_path / 'signal.json'
+        write_signal(path, SIGNAL)
+        with SignalWatcherServer([str(path)], address, poll_interval=0.005) as server:
+            subscribers = [SignalSubscriber(str(path), server.address) for _ in range(3)]
+            try:
+                for subscriber in subscribers:
+                    assert subscriber.wait(timeout=2).data == SIGNAL
+                    assert subscriber.mode == 'daemon'
+
+                write_signal(path, dict(SIGNAL, symbol="GBPJPY"))
+                for subscriber in subscribers:
+                    event = subscriber.wait(timeout=2)
+                    assert event.seq == 2 and event.data['symbol'] == "GBPJPY"
+                    assert subscriber.wait(timeout=0.05) is None
+                    assert subscriber.current()['symbol'] == "GBPJPY"
+                assert server.watchers[0].stats['reads'] == 2
+            finally:
+                for subscriber in subscribers:
+                    subscriber.close()
+
+    def test_second_daemon_is_refused(self, tmp_path, address):
+        with SignalWatcherServer([str(tmp_path / 'signal.json')], address) as server:
+            with pytest.raises(RuntimeError):
+                SignalWatcherServer([str(tmp_path / 'signal.json')], server.address).start()
+
+    def test_falls_back_to_local_watching_without_daemon(self, tmp_path, address):
+        path = tmp_path / 'signal.json'
+        write_signal(path, SIGNAL)
+        with SignalSubscriber(str(path), address, poll_interval=0.005) as subscriber:
+            assert subscriber.wait(timeout=2).data == SIGNAL
+            assert subscriber.mode == 'local'
+
+    def test_switching_source_does_not_redeliver(self, tmp_path, address):
+        path = tmp_path / 'signal.json'
+        write_signal(path, SIGNAL)
+        with SignalSubscriber(str(path), address, poll_interval=0.005, reconnect_interval=0.05) as subscriber:
+            assert subscriber.wait(timeout=2).data == SIGNAL
+            with SignalWatcherServer([str(path)], address, poll_interval=0.005):
+                assert subscriber.wait(timeout=0.5) is None
+                assert subscriber.mode == 'daemon'
+
+    def test_error_events_reach_only_subscribers_that_ask(self, tmp_path, address):
+        path = tmp_path / 'signal.json'
+        write_signal(path, SIGNAL)
+        with SignalWatcherServer([str(path)], address, poll_interval=0.005) as server:
+            with SignalSubscriber(str(path), server.address) as plain, \
+                    SignalSubscriber(str(path), server.address, include_errors=True) as checked:
+                assert plain.wait(timeout=2).data == checked.wait(timeout=2).data == SIGNAL
+
+                with open(path, 'wb') as f:
+                    f.write(b'\xff\xfe{\x00')
+                event = checked.wait(timeout=2)
+                assert event.data is None and event.error
+                assert checked.current() == SIGNAL
+                assert plain.wait(timeout=0.1) is None
+
+                write_signal(path, dict(SIGNAL, symbol="GBPJPY"))
+                assert plain.wait(timeout=2).data['symbol'] == "GBPJPY"
+                assert checked.wait(timeout=2).data['symbol'] == "GBPJPY"
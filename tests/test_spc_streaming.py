@@ -0,0 +1,101 @@
+"""
+Equivalence tests for the streaming Western Electric rule engine
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from SPC_CONTROL_CHARTS_IMPLEMENTATION import (
+    BaseControlChart, ControlLimits, ViolationType, WesternElectricRules, XBarRChart
+)
+
+LIMITS = ControlLimits(center_line=10.0, upper_control_limit=13.0, lower_control_limit=7.0)
+
+
+class FixedLimitChart(BaseControlChart):
+    """Chart whose limits never move, so batch and streaming see the same zones"""
+
+    def __init__(self):
+        super().__init__('fixed')
+        self.control_limits = LIMITS
+
+    def update_control_limits(self):
+        pass
+
+
+def patterned_series(seed: int, length: int = 900):
+    """Noise with injected shifts, trends, alternation, ties and hugging runs"""
+    rng = np.random.default_rng(seed)
+    values = list(np.round(rng.normal(10.0, 1.0, length), 1))  # rounding creates ties
+    for start in rng.integers(0, length - 20, 12):
+        kind = rng.integers(0, 5)
+        if kind == 0:
+            values[start:start + 12] = list(np.round(rng.normal(11.5, 0.3, 12), 1))
+        elif kind == 1:
+            values[start:start + 8] = list(9.0 + 0.3 * np.arange(8))
+        elif kind == 2:
+            values[start:start + 16] = [10.0 + (1.5 if i % 2 else -1.5) + 0.1 * i for i in range(16)]
+        elif kind == 3:
+            values[start:start + 18] = list(np.round(rng.normal(10.0, 0.2, 18), 2))
+        else:
+            values[start:start + 3] = [13.5, 6.5, 12.5]
+    return values
+
+
+def batch_violations(values):
+    chart = FixedLimitChart()
+    for value in values:
+        chart.data_points.append({'value': value})
+    return {(v.violation_type, v.point_index, v.description)
+            for v in chart.check_violations_batch(window=len(values))}
+
+
+def streaming_violations(values):
+    chart = FixedLimitChart()
+    found = set()
+    for value in values:
+        for v in chart.add_data_point(value)['violations']:
+            found.add((v['violation_type'], v['point_index'], v['description']))
+    return found
+
+
+class TestWesternElectricRules:
+    @pytest.mark.parametrize('seed', range(8))
+    def test_matches_batch_rules(self, seed):
+        values = patterned_series(seed)
+        assert streaming_violations(values) == batch_violations(values)
+
+    def test_every_rule_exercised(self):
+        fired = set()
+        for seed in range(8):
+            fired |= {rule for rule, _index, _description in batch_violations(patterned_series(seed))}
+        assert fired == set(ViolationType)
+
+    def test_scan_matches_update(self):
+        values = patterned_series(42, 5000)
+        engine = WesternElectricRules()
+        scanned = engine.scan(values, LIMITS)
+        engine = WesternElectricRules()
+        stepped = [(i, m) for i, m in enumerate(engine.update(v, LIMITS) for v in values) if m]
+        assert scanned == stepped and scanned
+
+    def test_alternation_needs_full_window(self):
+        engine = WesternElectricRules()
+        zigzag = [10.0 + (1 if i % 2 else -1) for i in range(14)]
+        masks = [engine.update(v, LIMITS) for v in zigzag]
+        assert [bool(m & 8) for m in masks] == [False] * 13 + [True]
+
+
+class TestXBarRRunningSums:
+    def test_limits_match_full_recompute(self):
+        rng = np.random.default_rng(3)
+        chart = XBarRChart('latency', sample_size=5)
+        for _ in range(450):
+            chart.add_subgroup(list(rng.normal(500, 40, 5)))
+        assert chart.x_bar_limits.center_line == pytest.approx(np.mean(chart.x_bar_values), rel=1e-12)
+        r_bar = np.mean(chart.r_values)
+        assert chart.r_limits.upper_control_limit == pytest.approx(2.114 * r_bar, rel=1e-12)
@@ -0,0 +1,134 @@
+"""
+Tests for the websocket StreamMultiplexer
+Parser agreement, per-symbol fan-out, slow-consumer drop and resubscribe
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+from data_ingestion.data_models import AssetType, DataSource
+from data_ingestion.stream_multiplexer import (
+    StreamMultiplexer, parse_ticker_extract, parse_ticker_json, ALL_SYMBOLS
+)
+
+
+def _frame(symbol: str, price: float, event_ms: int = 1_736_121_600_000, book: bool = True) -> str:
+    payload = {"e": "24hrTicker", "E": event_ms, "s": symbol, "c": f"{price}",
+               "v": "10.5", "Q": "0.1", "C": event_ms}
+    if book:
+        payload.update({"b": f"{price - 0.5}", "B": "1", "a": f"{price + 0.5}", "A": "2"})
+    return json.dumps(payload, separators=(',', ':'))
+
+
+class FakeUpstream:
+    """In-memory websocket: records sent messages, yields queued frames"""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        if not self.frames:
+            raise StopAsyncIteration
+        return self.frames.pop(0)
+
+
+class TestTickerParsers:
+    @pytest.mark.parametrize('parser', [parse_ticker_extract, parse_ticker_json])
+    def test_book_prices(self, parser):
+        record = parser(_frame('BTCUSDT', 60000.0))
+        assert record.symbol == 'BTC/USDT'
+        assert (record.bid, record.ask, record.volume) == (59999.5, 60000.5, 10.5)
+        assert record.time_us == 1_736_121_600_000_000
+        assert record.asset_type == AssetType.CRYPTO and record.source == DataSource.BINANCE
+
+    def test_parsers_agree_without_book(self):
+        frame = _frame('ETHBTC', 0.05, book=False)
+        combined = json.dumps({"stream": "ethbtc@ticker", "data": json.loads(frame)})
+        expected = parse_ticker_json(frame)
+        assert expected.spread == pytest.approx(0.05 * 0.001)
+        assert parse_ticker_extract(frame) == expected
+        assert parse_ticker_extract(combined) == expected
+        assert parse_ticker_json(combined) == expected
+
+    def test_non_ticker_frames_ignored(self):
+        assert parse_ticker_extract('{"result":null,"id":1}') is None
+        assert parse_ticker_json('{"result":null,"id":1}') is None
+
+
+class TestStreamMultiplexer:
+    def test_fan_out_and_slow_consumer_drop(self):
+        async def run():
+            multiplexer = StreamMultiplexer('ws://unused')
+            btc_a = await multiplexer.subscribe('BTC/USDT')
+            btc_b = await multiplexer.subscribe('BTCUSDT')
+            everything = await multiplexer.subscribe(ALL_SYMBOLS, maxsize=3)
+            for i in range(5):
+                multiplexer.dispatch(_frame('BTCUSDT', 100.0 + i))
+            multiplexer.dispatch(_frame('ETHUSDT', 10.0))
+            multiplexer.dispatch('not json')
+            return multiplexer, btc_a, btc_b, everything
+
+        multiplexer, btc_a, btc_b, everything = asyncio.run(run())
+        assert multiplexer.upstream_streams == {'BTCUSDT'}
+        assert len(btc_a.drain()) == len(btc_b.drain()) == 5
+        assert [r.symbol for r in everything.drain()] == ['BTC/USDT', 'BTC/USDT', 'ETH/USDT']
+        assert everything.dropped == 3
+        assert multiplexer.stats['parse_errors'] == 1
+
+    def test_resubscribe_on_reconnect(self):
+        upstreams = [FakeUpstream([_frame('BTCUSDT', 1.0)]), FakeUpstream([_frame('BTCUSDT', 2.0)])]
+        opened = []
+
+        async def connect(url):
+            opened.append(upstreams[len(opened)])
+            return opened[-1]
+
+        async def run():
+            multiplexer = StreamMultiplexer('ws://unused', connect=connect, reconnect_delay=0.001)
+            subscription = await multiplexer.subscribe('BTCUSDT')
+            await multiplexer.subscribe('ETHUSDT')
+            await multiplexer.start()
+            prices = [(await subscription.get()).bid, (await subscription.get()).bid]
+            while multiplexer.stats['reconnects'] < 1:
+                await asyncio.sleep(0.001)
+            await multiplexer.stop()
+            return multiplexer, prices
+
+        multiplexer, prices = asyncio.run(run())
+        assert prices[0] < prices[1]
+        for upstream in upstreams:
+            assert upstream.sent[0]['method'] == 'SUBSCRIBE'
+            assert upstream.sent[0]['params'] == ['btcusdt@ticker', 'ethusdt@ticker']
+
+    def test_last_unsubscribe_releases_stream(self):
+        async def run():
+            upstream = FakeUpstream([])
+            multiplexer = StreamMultiplexer('ws://unused')
+            multiplexer.websocket = upstream
+            first = await multiplexer.subscribe('SOLUSDT')
+            second = await multiplexer.subscribe('SOLUSDT')
+            await first.close()
+            sent_after_first = len(upstream.sent)
+            await second.close()
+            return multiplexer, upstream, sent_after_first
+
+        multiplexer, upstream, sent_after_first = asyncio.run(run())
+        assert sent_after_first == 1
+        assert upstream.sent[-1] == {'method': 'UNSUBSCRIBE', 'params': ['solusdt@ticker'], 'id': 2}
+        assert multiplexer.upstream_streams == set()
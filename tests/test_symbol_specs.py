@@ -0,0 +1,142 @@
+"""
+Tests for the symbol specification registry and its vectorized conversions
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import symbol_specs
+from symbol_specs import SymbolSpecRegistry, classify_symbol, pip_multiplier
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), 'data', 'symbol_specs.json')
+
+
+@pytest.fixture
+def specs():
+    return SymbolSpecRegistry.from_snapshot(SNAPSHOT)
+
+
+class TestClassification:
+    @pytest.mark.parametrize('symbol, asset_class', [
+        ('EURUSD', 'FOREX'), ('USDJPY', 'FOREX'), ('NZDJPY', 'FOREX'),
+        ('BTCUSD', 'CFD_CRYPTO'), ('XAUUSD', 'CFD_METALS'), ('GER40.cash', 'CFD_INDICES'),
+        ('USOIL', 'CFD_ENERGIES'), ('US10Y', 'CFD_BONDS'), ('SPY', 'CFD_ETFS'), ('AAPL', 'CFD_SHARES'),
+    ])
+    def test_classify_symbol(self, symbol, asset_class):
+        assert classify_symbol(symbol) == asset_class
+
+    def test_fractional_forex_quotes_use_ten_points_per_pip(self):
+        assert pip_multiplier('EURUSD', 'FOREX', 5) == 10.0
+        assert pip_multiplier('USDJPY', 'FOREX', 3) == 10.0
+        assert pip_multiplier('USDJPY', 'FOREX', 2) == 1.0
+
+
+class TestSymbolSpecRegistry:
+    def test_scalar_lookups(self, specs):
+        assert len(specs) == 9
+        assert specs.pip('EURUSD') == pytest.approx(0.0001)
+        assert specs.pip('USDJPY') == pytest.approx(0.01)
+        assert specs.pip('XAUUSD') == pytest.approx(0.1)
+        assert specs.pip('BTCUSD') == pytest.approx(1.0)
+        assert specs.ylipip('EURUSD') == pytest.approx(0.00006)
+        assert specs.pip_value_per_lot('EURUSD') == pytest.approx(10.0)
+        assert specs.asset_class('US30') == 'CFD_INDICES'
+        assert isinstance(specs.pip('EURUSD'), float)
+
+    def test_vectorized_conversions_match_scalar(self, specs):
+        symbols = ['EURUSD', 'USDJPY', 'XAUUSD', 'BTCUSD', 'US30', 'USOIL']
+        ids = specs.ids(symbols)
+        distances = np.array([0.0012, 0.085, 1.5, 250.0, 42.0, 0.3])
+
+        pips = specs.price_to_pips(ids, distances)
+        assert pips == pytest.approx([specs.price_to_pips(s, d) for s, d in zip(symbols, distances)])
+        assert specs.pips_to_price(symbols, pips) == pytest.approx(distances)
+        assert specs.asset_class(ids) == [specs.asset_class(s) for s in symbols]
+
+        values = specs.lots_to_value(ids, 0.5, pips)
+        assert specs.value_to_lots(ids, values, pips, round_to_step=False) == pytest.approx(np.full(6, 0.5))
+
+    def test_value_to_lots_snaps_to_volume_step_and_limits(self, specs):
+        # 550 risked over 10 pips: EURUSD at $10/pip/lot -> 5.5 lots
+        assert specs.value_to_lots('EURUSD', 550.0, 10.0) == pytest.approx(5.5)
+        lots = specs.value_to_lots(['EURUSD', 'AAPL', 'XAUUSD'], [0.01, 1e9, 123.0], [10.0, 1.0, 7.0])
+        assert lots == pytest.approx([0.01, 1000.0, 1.76])
+
+    def test_snapshot_round_trip_and_extend(self, specs, tmp_path):
+        path = tmp_path / 'specs.json'
+        specs.save_snapshot(path)
+        reloaded = SymbolSpecRegistry.from_snapshot(path)
+        assert reloaded.names == specs.names
+        assert np.array_equal(reloaded.pip_size, specs.pip_size)
+
+        eurusd = specs.id('EURUSD')
+        specs.extend({'EURJPY': specs.spec('USDJPY'), 'EURUSD': dict(specs.spec('EURUSD'), trade_tick_value=0.9)})
+        assert specs.id('EURUSD') == eurusd
+        assert specs.pip('EURJPY') == pytest.approx(0.01)
+        assert specs.pip_value_per_lot('EURUSD') == pytest.approx(9.0)
+
+    def test_unknown_symbol_without_terminal(self, specs):
+        with pytest.raises(KeyError):
+            specs.pip('NOSUCH')
+
+
+class QuoteMT5:
+    """Terminal whose tick values move with the quote"""
+
+    def __init__(self, tick_values):
+        self.tick_values = tick_values
+        self.calls = []
+
+    def symbol_info(self, symbol):
+        self.calls.append(symbol)
+        return SimpleNamespace(trade_tick_value=self.tick_values[symbol])
+
+
+class TestLiveTickValue:
+    @pytest.fixture
+    def terminal(self, monkeypatch):
+        terminal = QuoteMT5({'EURUSD': 1.0, 'USDJPY': 0.65, 'XAUUSD': 1.0})
+        monkeypatch.setattr(symbol_specs, 'mt5', terminal)
+        return terminal
+
+    def live(self, ttl):
+        snapshot = SymbolSpecRegistry.from_snapshot(SNAPSHOT)
+        return SymbolSpecRegistry({name: snapshot.spec(name) for name in snapshot.names},
+                                  fetch_missing=True, tick_value_ttl=ttl)
+
+    def test_sizing_reads_the_current_tick_value(self, terminal):
+        specs = self.live(ttl=0.0)
+        before = specs.pip_value_per_lot('USDJPY')
+        terminal.tick_values['USDJPY'] = 0.70
+
+        assert specs.pip_value_per_lot('USDJPY') == pytest.approx(before * 0.70 / 0.65)
+        lots = specs.value_to_lots(['USDJPY', 'EURUSD'], 700.0, 10.0, round_to_step=False)
+        assert lots == pytest.approx([700.0 / (10 * specs.pip_value_per_lot('USDJPY')), 7.0])
+        assert specs.spec('USDJPY')['trade_tick_value'] == 0.70
+
+    def test_tick_value_is_cached_for_the_ttl(self, terminal):
+        specs = self.live(ttl=60.0)
+        specs.pip_value_per_lot('USDJPY')
+        assert terminal.calls == []
+
+        specs.tick_value_time[specs.id('USDJPY')] -= 61.0
+        specs.lots_to_value('USDJPY', 1.0, 10.0)
+        specs.lots_to_value('USDJPY', 1.0, 10.0)
+        assert terminal.calls == ['USDJPY']
+
+    def test_static_lookups_never_query_the_terminal(self, terminal):
+        specs = self.live(ttl=0.0)
+        specs.pip('USDJPY')
+        specs.price_to_pips(specs.ids(['EURUSD', 'XAUUSD']), [0.001, 1.0])
+        specs.round_lots('EURUSD', 0.123)
+        assert terminal.calls == []
+
+    def test_snapshot_registry_stays_offline(self, terminal):
+        SymbolSpecRegistry.from_snapshot(SNAPSHOT).value_to_lots('EURUSD', 100.0, 10.0)
+        assert terminal.calls == []
@@ -0,0 +1,93 @@
+"""
+Tests for the process-wide U-Cell artifact registry and the cells sharing it
+"""
+
+import gc
+import sys
+import os
+from types import MappingProxyType
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.u_cells import artifacts
+from src.core.u_cells.artifacts import ArtifactRegistry, warm_start
+from src.core.u_cells.ml_analysis import MLAnalysisCell
+from src.core.u_cells.orchestrator import UCellOrchestrator
+from src.core.u_cells.signal_validation import SignalValidationCell
+
+
+class CountingJoblib:
+    """Stands in for joblib so model loads can be counted"""
+
+    def __init__(self):
+        self.loads = []
+
+    def load(self, path, mmap_mode=None):
+        self.loads.append((os.path.basename(path), mmap_mode))
+        return {'model': os.path.basename(path)}
+
+
+class TestArtifactRegistry:
+    def test_loader_runs_once_and_stats_are_reported(self):
+        registry = ArtifactRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [0] * 100_000
+
+        first = registry.get('big', loader)
+        assert registry.get('big', loader) is first
+        assert len(calls) == 1
+
+        stats = registry.stats()
+        assert stats['artifacts']['big']['hits'] == 1
+        assert stats['artifacts']['big']['loaded'] is True
+        assert stats['artifacts']['big']['load_ms'] >= 0
+        assert stats['total_rss_delta_kb'] >= 0 and stats['rss_kb'] > 0
+
+    def test_models_load_once_memory_mapped(self, tmp_path, monkeypatch):
+        fake = CountingJoblib()
+        monkeypatch.setattr(artifacts, 'joblib', fake)
+        model_path = tmp_path / 'signal_classifier.pkl'
+        model_path.write_bytes(b'model')
+        registry = ArtifactRegistry()
+
+        cells = [MLAnalysisCell(model_path=model_path, artifacts=registry) for _ in range(3)]
+        assert all(cell.model is cells[0].model for cell in cells)
+        assert fake.loads == [('signal_classifier.pkl', 'r')]
+
+    def test_missing_model_falls_back_to_rules(self, tmp_path):
+        registry = ArtifactRegistry()
+        cell = MLAnalysisCell(model_path=tmp_path / 'missing.pkl', artifacts=registry)
+        assert cell.model is None
+        assert registry.stats()['artifacts'][f"model:{(tmp_path / 'missing.pkl').resolve()}"]['loaded'] is False
+
+    def test_warm_start_preloads_and_freezes(self, tmp_path):
+        registry = ArtifactRegistry()
+        stats = warm_start(tmp_path / 'model.pkl', tmp_path / 'scaler.pkl', freeze=True, registry=registry)
+        try:
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+        assert {'ml.feature_spec', 'symbols.pip_table', 'signal.validation_spec'} <= set(stats['artifacts'])
+
+        cell = SignalValidationCell(artifacts=registry)
+        assert all(s['hits'] >= 1 for name, s in registry.stats()['artifacts'].items()
+                   if name in ('symbols.pip_table', 'signal.validation_spec'))
+        assert cell.pattern_engine.get_pip_value('USDJPY.raw') == 0.01
+
+
+class TestSharedCells:
+    def test_orchestrators_share_read_only_specs(self):
+        first, second = UCellOrchestrator(), UCellOrchestrator()
+        u1, other = first.cells['U1'], second.cells['U1']
+        assert u1.pattern_engine.pip_calculators is other.pattern_engine.pip_calculators
+        assert u1.valid_patterns is other.valid_patterns
+        assert first.cells['U2'].feature_config is second.cells['U2'].feature_config
+
+        assert isinstance(u1.pattern_engine.pip_calculators, MappingProxyType)
+        with pytest.raises(TypeError):
+            u1.pattern_engine.pip_calculators['EURUSD'] = 1.0
@@ -0,0 +1,99 @@
+"""
+Tests for the write-behind SQLite writer
+"""
+
+import sqlite3
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.write_behind import WriteBehindWriter
+
+INSERT = "INSERT INTO points (seq, value) VALUES (?, ?)"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "observations.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE points (seq INTEGER PRIMARY KEY, value REAL NOT NULL)")
+        conn.execute("CREATE TABLE events (name TEXT)")
+    return path
+
+
+def read_all(path, sql="SELECT seq, value FROM points ORDER BY seq"):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+class TestWriteBehindWriter:
+    def test_flush_commits_all_rows_in_wal_mode(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_rows=100, flush_interval=10)
+        writer.executemany(INSERT, [(i, i * 0.5) for i in range(1000)])
+        assert writer.flush(timeout=5)
+        assert read_all(db_path) == [(i, i * 0.5) for i in range(1000)]
+        assert read_all(db_path, "PRAGMA journal_mode") == [('wal',)]
+        assert writer.get_stats()['batches'] < 1000
+        writer.close()
+
+    def test_preserves_order_across_statements(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_interval=10)
+        writer.execute(INSERT, (1, 1.0))
+        writer.execute("INSERT INTO events (name) VALUES (?)", ('first',))
+        writer.execute("UPDATE points SET value = ? WHERE seq = ?", (2.0, 1))
+        writer.execute("INSERT INTO events (name) VALUES (?)", ('second',))
+        writer.flush()
+        assert read_all(db_path) == [(1, 2.0)]
+        assert read_all(db_path, "SELECT name FROM events ORDER BY rowid") == [('first',), ('second',)]
+        writer.close()
+
+    def test_bad_row_only_drops_itself(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_interval=10)
+        writer.execute(INSERT, (1, 1.0))
+        writer.execute(INSERT, (1, 9.0))   # primary key conflict
+        writer.execute(INSERT, (2, None))  # NOT NULL violation
+        writer.execute(INSERT, (3, 3.0))
+        writer.flush()
+        assert read_all(db_path) == [(1, 1.0), (3, 3.0)]
+        assert writer.stats['failed_rows'] == 2
+        writer.close()
+
+    def test_time_based_flush(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_rows=10_000, flush_interval=0.05)
+        writer.execute(INSERT, (1, 1.0))
+        for _ in range(100):
+            if read_all(db_path):
+                break
+            time.sleep(0.02)
+        assert read_all(db_path) == [(1, 1.0)]
+        writer.close()
+
+    def test_close_flushes_and_rejects_new_rows(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_rows=10_000, flush_interval=60)
+        writer.executemany(INSERT, [(i, float(i)) for i in range(50)])
+        writer.close()
+        assert len(read_all(db_path)) == 50
+        with pytest.raises(RuntimeError):
+            writer.execute(INSERT, (99, 1.0))
+
+    def test_query_reads_own_writes(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_rows=10_000, flush_interval=60, sync_interval_ms=0)
+        writer.execute(INSERT, (7, 7.5))
+        assert writer.query("SELECT value FROM points WHERE seq = ?", (7,)) == [(7.5,)]
+        writer.close()
+
+    def test_on_done_reports_each_row_before_flush_returns(self, db_path):
+        writer = WriteBehindWriter(db_path, flush_interval=10)
+        outcomes = []
+        writer.execute(INSERT, (1, 1.0), on_done=lambda ok: outcomes.append((1, ok)))
+        writer.execute(INSERT, (1, 9.0), on_done=lambda ok: outcomes.append((2, ok)))
+        writer.execute(INSERT, (2, 2.0))
+        writer.execute(INSERT, (3, 3.0), on_done=lambda ok: outcomes.append((3, ok)))
+        writer.flush()
+        assert outcomes == [(1, True), (2, False), (3, True)]
+        assert read_all(db_path) == [(1, 1.0), (2, 2.0), (3, 3.0)]
+        writer.close()
@@ -0,0 +1,85 @@
+"""
+Tests for XPWS weekly tracking persistence
+Tracking rows are upserted per symbol and cached only once committed
+"""
+
+import sqlite3
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from xpws_weekly_tracker import XPWSWeeklyTracker
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    tracker = XPWSWeeklyTracker(common_path=tmp_path)
+    profits = {}
+    monkeypatch.setattr(tracker, 'calculate_weekly_profit_for_symbol',
+                        lambda symbol, balance: (profits.get(symbol, 0.0), 0.0))
+    tracker.profits = profits
+    yield tracker
+    tracker.close()
+
+
+def rows(tracker):
+    with sqlite3.connect(tracker.db_path) as conn:
+        return conn.execute("SELECT symbol, week_start, initial_balance, current_balance, xpws_active "
+                            "FROM xpws_tracking ORDER BY symbol").fetchall()
+
+
+class TestXPWSWeeklyTracker:
+    def test_cache_waits_for_the_write(self, tracker):
+        # Park the writer thread on a long timed wait
+        tracker.writer.flush_interval = 60
+        tracker.writer.execute("UPDATE xpws_tracking SET last_update = last_update WHERE 0")
+        tracker.writer.flush()
+
+        tracker.update_symbol_tracking('EURUSD', 1000.0)
+        week = tracker.get_week_start()
+        assert tracker._tracking.get(('EURUSD', week)) is None
+        assert rows(tracker) == []
+
+        tracker.writer.flush()
+        assert tracker._tracking[('EURUSD', week)][3] == 1000.0
+
+    def test_activation_is_kept_across_updates(self, tracker):
+        tracker.update_symbol_tracking('EURUSD', 1000.0)
+        tracker.profits['EURUSD'] = 12.0
+        tracker.update_symbol_tracking('EURUSD', 1120.0)
+        activated = tracker._tracking_row('EURUSD', tracker.get_week_start())[6]
+        tracker.update_symbol_tracking('EURUSD', 1130.0)
+
+        assert tracker.is_xpws_active('EURUSD')
+        assert tracker.get_risk_reward_ratio('EURUSD') == 2.0
+        row = tracker._tracking_row('EURUSD', tracker.get_week_start())
+        assert row[2] == 1000.0 and row[6] == activated
+        tracker.writer.flush()
+        assert rows(tracker) == [('EURUSD', str(tracker.get_week_start()), 1000.0, 1130.0, 1)]
+
+    def test_new_week_replaces_the_previous_row(self, tracker):
+        tracker.writer.execute(
+            "INSERT INTO xpws_tracking VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ('EURUSD', '2020-01-06', 500.0, 900.0, 80.0, True, '2020-01-07T10:00:00', '2020-01-10T10:00:00'))
+
+        tracker.update_symbol_tracking('EURUSD', 1000.0)
+        tracker.writer.flush()
+
+        assert rows(tracker) == [('EURUSD', str(tracker.get_week_start()), 1000.0, 1000.0, 0)]
+        assert not tracker.is_xpws_active('EURUSD')
+
+    def test_dropped_write_is_not_cached(self, tracker):
+        tracker.update_symbol_tracking('EURUSD', 1000.0)
+        tracker.writer.flush()
+        with sqlite3.connect(tracker.db_path) as conn:
+            conn.execute("CREATE TRIGGER reject BEFORE UPDATE ON xpws_tracking "
+                         "BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+
+        tracker.profits['EURUSD'] = 12.0
+        tracker.update_symbol_tracking('EURUSD', 1120.0)
+
+        assert not tracker.is_xpws_active('EURUSD')
+        assert tracker.writer.stats['failed_rows'] == 1
@@ -24,119 +24,11 @@ COMPLIANCE: MIKROBOT_FASTVERSION.md ABSOLUTE
 import MetaTrader5 as mt5
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
-# Asset classification system
-ASSET_CLASSIFICATIONS = {
-    # 1. FOREX - Currency pairs
-    'FOREX': {
-        'symbols': [
-            'EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD', 'NZDUSD',
-            'EURGBP', 'EURJPY', 'GBPJPY', 'AUDJPY', 'EURAUD', 'GBPAUD', 'EURCHF',
-            'GBPCHF', 'AUDCHF', 'CADCHF', 'NZDCHF', 'EURCZK', 'EURHUF', 'EURPLN',
-            'EURSEK', 'EURNOK', 'EURDKK', 'USDSEK', 'USDNOK', 'USDDKK', 'USDPLN',
-            'USDCZK', 'USDHUF', 'USDSGD', 'USDHKD', 'USDMXN', 'USDZAR', 'USDTRY'
-        ],
-        'pip_calculation': 'forex_standard',
-        'decimal_adjustment': 'auto',
-        'jpy_special': True
-    },
-    
-    # 2. CFD-INDICES - Stock market indices
-    'CFD_INDICES': {
-        'symbols': [
-            'US30', 'US500', 'USTEC', 'US2000', 'DJI30', 'SPX500', 'NAS100',
-            'GER40', 'GER30', 'DAX40', 'UK100', 'FTSE100', 'FRA40', 'CAC40',
-            'ESP35', 'IBEX35', 'ITA40', 'MIB40', 'NED25', 'AEX25', 'SUI20',
-            'SMI20', 'AUS200', 'ASX200', 'JPN225', 'N225', 'HKG33', 'HSI33'
-        ],
-        'pip_calculation': 'index_points',
-        'decimal_adjustment': 'minimal',
-        'point_value': 1.0
-    },
-    
-    # 3. CFD-CRYPTO - Cryptocurrencies
-    'CFD_CRYPTO': {
-        'symbols': [
-            'BTCUSD', 'ETHUSD', 'XRPUSD', 'ADAUSD', 'DOTUSD', 'LTCUSD', 'LINKUSD',
-            'BCHUSD', 'XLMUSD', 'EOSUSD', 'TRXUSD', 'BNBUSD', 'SOLUSD', 'AVAXUSD',
-            'MATICUSD', 'DOGEUSD', 'ATOMUSD', 'FILUSD', 'APTUSD', 'NEARUSD',
-            'BTCEUR', 'ETHEUR', 'XRPEUR', 'ADAEUR', 'DOTEUR', 'LTCEUR'
-        ],
-        'pip_calculation': 'crypto_dynamic',
-        'decimal_adjustment': 'price_based',
-        'btc_special': True
-    },
-    
-    # 4. CFD-METALS - Precious metals
-    'CFD_METALS': {
-        'symbols': [
-            'XAUUSD', 'XAGUSD', 'XPTUSD', 'XPDUSD', 'XAUEUR', 'XAGEUR',
-            'GOLD', 'SILVER', 'PLATINUM', 'PALLADIUM'
-        ],
-        'pip_calculation': 'metals_standard',
-        'decimal_adjustment': 'metals_specific',
-        'gold_special': True
-    },
-    
-    # 5. CFD-ENERGIES - Oil and gas
-    'CFD_ENERGIES': {
-        'symbols': [
-            'USOIL', 'UKOIL', 'NGAS', 'CRUDE', 'BRENT', 'WTI', 'NATGAS',
-            'HEATING', 'GASOLINE', 'OILGAS'
-        ],
-        'pip_calculation': 'energy_standard',
-        'decimal_adjustment': 'commodity_based',
-        'oil_special': True
-    },
-    
-    # 6. CFD-AGRICULTURAL - Agricultural commodities
-    'CFD_AGRICULTURAL': {
-        'symbols': [
-            'WHEAT', 'CORN', 'SOYBEANS', 'RICE', 'COFFEE', 'COCOA', 'SUGAR',
-            'COTTON', 'LUMBER', 'CATTLE', 'HOGS', 'FEEDER'
-        ],
-        'pip_calculation': 'agricultural_standard',
-        'decimal_adjustment': 'commodity_based',
-        'contract_specific': True
-    },
-    
-    # 7. CFD-BONDS - Government bonds
-    'CFD_BONDS': {
-        'symbols': [
-            'US10Y', 'US30Y', 'US2Y', 'US5Y', 'DE10Y', 'DE30Y', 'UK10Y', 'UK30Y',
-            'FR10Y', 'IT10Y', 'ES10Y', 'JP10Y', 'AU10Y', 'CA10Y'
-        ],
-        'pip_calculation': 'bonds_basis_points',
-        'decimal_adjustment': 'basis_points',
-        'yield_based': True
-    },
-    
-    # 8. CFD-SHARES - Individual stocks
-    'CFD_SHARES': {
-        'symbols': [
-            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX',
-            'AMD', 'INTC', 'ORCL', 'CRM', 'ADBE', 'PYPL', 'DIS', 'BA', 'JPM',
-            'V', 'MA', 'WMT', 'HD', 'PG', 'JNJ', 'UNH', 'KO', 'PEP'
-        ],
-        'pip_calculation': 'shares_cents',
-        'decimal_adjustment': 'currency_based',
-        'cent_based': True
-    },
-    
-    # 9. CFD-ETFS - Exchange traded funds
-    'CFD_ETFS': {
-        'symbols': [
-            'SPY', 'QQQ', 'IWM', 'VTI', 'VOO', 'VEA', 'VWO', 'BND', 'VNQ',
-            'GLD', 'SLV', 'USO', 'TLT', 'HYG', 'LQD', 'EFA', 'EEM', 'XLF'
-        ],
-        'pip_calculation': 'etf_cents',
-        'decimal_adjustment': 'currency_based',
-        'cent_based': True
-    }
-}
+from symbol_specs import ASSET_CLASSIFICATIONS, SymbolSpecRegistry, Symbols, classify_symbol, get_registry
 
 @dataclass
 class AssetPipInfo:
@@ -161,8 +53,9 @@ class UniversalAssetPipConverter:
     Implements MIKROBOT_FASTVERSION.md 0.6 ylipip universal trigger
     """
     
-    def __init__(self):
+    def __init__(self, specs: Optional[SymbolSpecRegistry] = None):
         self.setup_logging()
+        self.specs = specs or get_registry()
         self.asset_cache: Dict[str, AssetPipInfo] = {}
         self.classification_cache: Dict[str, str] = {}
         
@@ -186,76 +79,17 @@ class UniversalAssetPipConverter:
     def classify_asset(self, symbol: str) -> str:
         """
         Classify symbol into one of 9 MT5 asset classes
-        Uses comprehensive pattern matching and symbol databases
+        Uses the symbol database, then pattern matching (see symbol_specs)
         """
         if symbol in self.classification_cache:
             return self.classification_cache[symbol]
         
-        # Direct lookup in classification database
-        for asset_class, config in ASSET_CLASSIFICATIONS.items():
-            if symbol in config['symbols']:
-                self.classification_cache[symbol] = asset_class
-                logger.info(f"Asset classified: {symbol} -> {asset_class}")
-                return asset_class
-        
-        # Pattern-based classification fallback
-        asset_class = self._pattern_based_classification(symbol)
+        asset_class = classify_symbol(symbol)
         self.classification_cache[symbol] = asset_class
-        logger.info(f"Pattern-based classification: {symbol} -> {asset_class}")
+        logger.info(f"Asset classified: {symbol} -> {asset_class}")
         
         return asset_class
     
-    def _pattern_based_classification(self, symbol: str) -> str:
-        """Pattern-based asset classification"""
-        symbol_upper = symbol.upper()
-        
-        # FOREX patterns
-        forex_currencies = ['USD', 'EUR', 'GBP', 'JPY', 'CHF', 'AUD', 'CAD', 'NZD', 'SEK', 'NOK', 'DKK']
-        if len(symbol_upper) == 6 and any(curr in symbol_upper for curr in forex_currencies):
-            return 'FOREX'
-        
-        # CRYPTO patterns
-        crypto_patterns = ['BTC', 'ETH', 'XRP', 'ADA', 'DOT', 'LTC', 'LINK', 'BCH', 'XLM', 'EOS', 'TRX', 'BNB', 'SOL', 'AVAX', 'MATIC', 'DOGE', 'ATOM']
-        if any(crypto in symbol_upper for crypto in crypto_patterns):
-            return 'CFD_CRYPTO'
-        
-        # METALS patterns
-        metals_patterns = ['XAU', 'XAG', 'XPT', 'XPD', 'GOLD', 'SILVER', 'PLATINUM', 'PALLADIUM']
-        if any(metal in symbol_upper for metal in metals_patterns):
-            return 'CFD_METALS'
-        
-        # INDICES patterns
-        indices_patterns = ['US30', 'US500', 'USTEC', 'GER40', 'UK100', 'FRA40', 'DAX', 'FTSE', 'CAC', 'IBEX', 'MIB', 'AEX', 'SMI', 'ASX', 'N225', 'HSI']
-        if any(index in symbol_upper for index in indices_patterns):
-            return 'CFD_INDICES'
-        
-        # ENERGIES patterns
-        energy_patterns = ['OIL', 'NGAS', 'CRUDE', 'BRENT', 'WTI', 'NATGAS', 'HEATING', 'GASOLINE']
-        if any(energy in symbol_upper for energy in energy_patterns):
-            return 'CFD_ENERGIES'
-        
-        # AGRICULTURAL patterns
-        agri_patterns = ['WHEAT', 'CORN', 'SOYBEANS', 'RICE', 'COFFEE', 'COCOA', 'SUGAR', 'COTTON', 'LUMBER', 'CATTLE', 'HOGS']
-        if any(agri in symbol_upper for agri in agri_patterns):
-            return 'CFD_AGRICULTURAL'
-        
-        # BONDS patterns
-        bond_patterns = ['10Y', '30Y', '2Y', '5Y']
-        if any(bond in symbol_upper for bond in bond_patterns):
-            return 'CFD_BONDS'
-        
-        # ETF patterns
-        etf_patterns = ['SPY', 'QQQ', 'IWM', 'VTI', 'VOO', 'VEA', 'VWO', 'BND', 'VNQ', 'GLD', 'SLV', 'USO', 'TLT', 'HYG', 'LQD', 'EFA', 'EEM', 'XLF']
-        if symbol_upper in etf_patterns:
-            return 'CFD_ETFS'
-        
-        # Default to shares if stock-like pattern
-        if len(symbol_upper) <= 5 and symbol_upper.isalpha():
-            return 'CFD_SHARES'
-        
-        # Ultimate fallback
-        return 'CFD_SHARES'
-    
     def get_asset_pip_info(self, symbol: str) -> Optional[AssetPipInfo]:
         """
         Get comprehensive pip information for any MT5 asset
@@ -264,230 +98,40 @@ class UniversalAssetPipConverter:
         if symbol in self.asset_cache:
             return self.asset_cache[symbol]
         
-        # Get MT5 symbol info
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
+        try:
+            row = self.specs.id(symbol)
+        except KeyError:
             logger.warning(f"Cannot get MT5 symbol info for {symbol}")
             return None
         
-        # Classify asset
+        spec = self.specs.spec(symbol)
         asset_class = self.classify_asset(symbol)
+        pip_size = float(self.specs.pip_size[row])
+        
+        pip_info = AssetPipInfo(
+            symbol=symbol,
+            asset_class=asset_class,
+            point=spec['point'],
+            digits=spec['digits'],
+            pip_value=pip_size,
+            pip_size=pip_size,
+            ylipip_06_value=0.6 * pip_size,
+            currency_profit=spec['currency_profit'],
+            contract_size=spec['trade_contract_size'],
+            min_volume=spec['volume_min'],
+            max_volume=spec['volume_max'],
+            volume_step=spec['volume_step'],
+            calculation_method=ASSET_CLASSIFICATIONS[asset_class]['pip_calculation']
+        )
         
-        # Calculate pip value based on asset class
-        pip_info = self._calculate_asset_pip_value(symbol, symbol_info, asset_class)
-        
-        if pip_info:
-            self.asset_cache[symbol] = pip_info
-            logger.info(f"Pip info cached for {symbol}:")
-            logger.info(f"  Asset class: {asset_class}")
-            logger.info(f"  Pip value: {pip_info.pip_value}")
-            logger.info(f"  0.6 ylipip: {pip_info.ylipip_06_value}")
+        self.asset_cache[symbol] = pip_info
+        logger.info(f"Pip info cached for {symbol}:")
+        logger.info(f"  Asset class: {asset_class}")
+        logger.info(f"  Pip value: {pip_info.pip_value}")
+        logger.info(f"  0.6 ylipip: {pip_info.ylipip_06_value}")
         
         return pip_info
     
-    def _calculate_asset_pip_value(self, symbol: str, symbol_info, asset_class: str) -> Optional[AssetPipInfo]:
-        """Calculate asset-specific pip value using specialized methods"""
-        
-        try:
-            point = symbol_info.point
-            digits = symbol_info.digits
-            currency_profit = symbol_info.currency_profit if hasattr(symbol_info, 'currency_profit') else ""
-            contract_size = symbol_info.trade_contract_size if hasattr(symbol_info, 'trade_contract_size') else 100000
-            
-            # Asset-class specific pip calculations
-            if asset_class == 'FOREX':
-                pip_value, pip_size = self._calculate_forex_pip(symbol, point, digits, currency_profit)
-                calculation_method = "forex_standard"
-            
-            elif asset_class == 'CFD_CRYPTO':
-                pip_value, pip_size = self._calculate_crypto_pip(symbol, point, digits)
-                calculation_method = "crypto_dynamic"
-            
-            elif asset_class == 'CFD_INDICES':
-                pip_value, pip_size = self._calculate_index_pip(symbol, point, digits)
-                calculation_method = "index_points"
-            
-            elif asset_class == 'CFD_METALS':
-                pip_value, pip_size = self._calculate_metals_pip(symbol, point, digits)
-                calculation_method = "metals_standard"
-            
-            elif asset_class == 'CFD_ENERGIES':
-                pip_value, pip_size = self._calculate_energy_pip(symbol, point, digits)
-                calculation_method = "energy_standard"
-            
-            elif asset_class == 'CFD_AGRICULTURAL':
-                pip_value, pip_size = self._calculate_agricultural_pip(symbol, point, digits)
-                calculation_method = "agricultural_standard"
-            
-            elif asset_class == 'CFD_BONDS':
-                pip_value, pip_size = self._calculate_bonds_pip(symbol, point, digits)
-                calculation_method = "bonds_basis_points"
-            
-            elif asset_class == 'CFD_SHARES':
-                pip_value, pip_size = self._calculate_shares_pip(symbol, point, digits)
-                calculation_method = "shares_cents"
-            
-            elif asset_class == 'CFD_ETFS':
-                pip_value, pip_size = self._calculate_etfs_pip(symbol, point, digits)
-                calculation_method = "etf_cents"
-            
-            else:
-                # Fallback to standard calculation
-                pip_value, pip_size = self._calculate_standard_pip(point, digits)
-                calculation_method = "standard_fallback"
-            
-            # Calculate universal 0.6 ylipip value
-            ylipip_06_value = 0.6 * pip_value
-            
-            return AssetPipInfo(
-                symbol=symbol,
-                asset_class=asset_class,
-                point=point,
-                digits=digits,
-                pip_value=pip_value,
-                pip_size=pip_size,
-                ylipip_06_value=ylipip_06_value,
-                currency_profit=currency_profit,
-                contract_size=contract_size,
-                min_volume=symbol_info.volume_min,
-                max_volume=symbol_info.volume_max,
-                volume_step=symbol_info.volume_step,
-                calculation_method=calculation_method
-            )
-            
-        except Exception as e:
-            logger.error(f"Error calculating pip value for {symbol}: {e}")
-            return None
-    
-    def _calculate_forex_pip(self, symbol: str, point: float, digits: int, currency_profit: str) -> Tuple[float, float]:
-        """Calculate FOREX pip value with JPY special handling"""
-        if 'JPY' in symbol:
-            # JPY pairs: 1 pip = 1 point (0.01)
-            pip_value = point
-            pip_size = point
-        else:
-            # Standard pairs: 1 pip = 10 points for 5-digit brokers
-            if digits == 5:
-                pip_value = point * 10
-                pip_size = point * 10
-            else:
-                pip_value = point
-                pip_size = point
-        
-        return pip_value, pip_size
-    
-    def _calculate_crypto_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate CRYPTO pip value with price-based adjustment"""
-        if 'BTC' in symbol:
-            # Bitcoin: Higher pip value due to high price
-            pip_value = point * 100
-            pip_size = point * 100
-        elif any(crypto in symbol for crypto in ['ETH', 'XRP', 'ADA', 'DOT']):
-            # Major altcoins: Standard calculation
-            pip_value = point * 10
-            pip_size = point * 10
-        else:
-            # Other cryptos: Point-based
-            pip_value = point * 10
-            pip_size = point * 10
-        
-        return pip_value, pip_size
-    
-    def _calculate_index_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate INDEX pip value (usually 1 point = 1 pip)"""
-        pip_value = point
-        pip_size = point
-        return pip_value, pip_size
-    
-    def _calculate_metals_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate METALS pip value with gold/silver specifics"""
-        if 'XAU' in symbol or 'GOLD' in symbol:
-            # Gold: 1 pip = 10 points (0.10)
-            pip_value = point * 10
-            pip_size = point * 10
-        elif 'XAG' in symbol or 'SILVER' in symbol:
-            # Silver: 1 pip = 100 points (0.001)
-            pip_value = point * 100
-            pip_size = point * 100
-        else:
-            # Other metals: Standard
-            pip_value = point * 10
-            pip_size = point * 10
-        
-        return pip_value, pip_size
-    
-    def _calculate_energy_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate ENERGY pip value for oil and gas"""
-        if 'OIL' in symbol or 'CRUDE' in symbol or 'BRENT' in symbol or 'WTI' in symbol:
-            # Oil: 1 pip = 10 points (0.01)
-            pip_value = point * 10
-            pip_size = point * 10
-        elif 'NGAS' in symbol or 'NATGAS' in symbol:
-            # Natural gas: 1 pip = 100 points (0.001)
-            pip_value = point * 100
-            pip_size = point * 100
-        else:
-            # Other energies: Standard
-            pip_value = point * 10
-            pip_size = point * 10
-        
-        return pip_value, pip_size
-    
-    def _calculate_agricultural_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate AGRICULTURAL pip value for commodities"""
-        # Agricultural commodities: Contract-specific calculation
-        if digits >= 3:
-            pip_value = point * 10
-            pip_size = point * 10
-        else:
-            pip_value = point
-            pip_size = point
-        
-        return pip_value, pip_size
-    
-    def _calculate_bonds_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate BONDS pip value in basis points"""
-        # Bonds: 1 basis point = 0.01% = 0.0001
-        pip_value = point * 10  # Basis point calculation
-        pip_size = point * 10
-        
-        return pip_value, pip_size
-    
-    def _calculate_shares_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate SHARES pip value in cents"""
-        # Individual stocks: 1 pip = 1 cent
-        if digits >= 2:
-            pip_value = point * 100  # 1 cent
-            pip_size = point * 100
-        else:
-            pip_value = point
-            pip_size = point
-        
-        return pip_value, pip_size
-    
-    def _calculate_etfs_pip(self, symbol: str, point: float, digits: int) -> Tuple[float, float]:
-        """Calculate ETFs pip value in cents"""
-        # ETFs: Similar to shares, 1 pip = 1 cent
-        if digits >= 2:
-            pip_value = point * 100  # 1 cent
-            pip_size = point * 100
-        else:
-            pip_value = point
-            pip_size = point
-        
-        return pip_value, pip_size
-    
-    def _calculate_standard_pip(self, point: float, digits: int) -> Tuple[float, float]:
-        """Standard fallback pip calculation"""
-        if digits >= 3:
-            pip_value = point * 10
-            pip_size = point * 10
-        else:
-            pip_value = point
-            pip_size = point
-        
-        return pip_value, pip_size
-    
     def get_ylipip_trigger_value(self, symbol: str, ylipip_amount: float = 0.6) -> Optional[float]:
         """
         Get ylipip trigger value for any symbol
@@ -505,6 +149,10 @@ class UniversalAssetPipConverter:
         
         return ylipip_value
     
+    def get_portfolio_ylipip_values(self, symbols: Symbols, ylipip_amount: float = 0.6):
+        """Ylipip trigger values for a whole portfolio in one vectorized lookup"""
+        return self.specs.ylipip(symbols, ylipip_amount)
+    
     def validate_all_asset_classes(self) -> Dict[str, Dict]:
         """
         Validate pip calculations for all 9 asset classes
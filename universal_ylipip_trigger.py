@@ -8,6 +8,23 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
+from symbol_specs import get_registry
+
+# Registry asset classes as named in the trigger config
+ASSET_CLASS_LABELS = {
+    "FOREX": "Forex",
+    "CFD_INDICES": "CFD-Indices",
+    "CFD_CRYPTO": "CFD-Crypto",
+    "CFD_METALS": "CFD-Metals",
+    "CFD_ENERGIES": "CFD-Energies",
+    "CFD_AGRICULTURAL": "CFD-Agricultural",
+    "CFD_BONDS": "CFD-Bonds",
+    "CFD_SHARES": "CFD-Shares",
+    "CFD_ETFS": "CFD-ETFs",
+}
+
 class UniversalYlipipTrigger:
     """
     Universal 0.6 ylipip trigger for ALL MT5 asset classes:
@@ -15,109 +32,20 @@ class UniversalYlipipTrigger:
     CFD-Agricultural, CFD-Bonds, CFD-Shares, CFD-ETFs
     """
     
-    def __init__(self):
+    def __init__(self, specs=None):
         self.ylipip_standard = 0.6  # Universal standard
         self.common_path = Path("C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files")
         
-        # Asset class detection patterns
-        self.asset_patterns = {
-            "Forex": ["USD", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD"],
-            "CFD-Crypto": ["BTC", "ETH", "ADA", "XRP", "LTC", "BCH", "DOT", "LINK"],
-            "CFD-Metals": ["XAU", "XAG", "XPT", "XPD", "GOLD", "SILVER"],
-            "CFD-Indices": ["SPX", "NAS", "DAX", "FTSE", "CAC", "NIK", "ASX", "HSI"],
-            "CFD-Energies": ["CRUDE", "BRENT", "NGAS", "HEATING", "GASOLINE"],
-            "CFD-Agricultural": ["WHEAT", "CORN", "SOYBEAN", "SUGAR", "COFFEE", "COCOA"],
-            "CFD-Bonds": ["BOND", "BUND", "NOTE", "GILT", "OAT"],
-            "CFD-Shares": [],  # Individual stocks - detected by symbol info
-            "CFD-ETFs": ["SPY", "QQQ", "IWM", "EFA", "EEM", "GLD", "SLV"]
-        }
+        # Pip sizes and asset classes come from the shared symbol table
+        self.specs = specs or get_registry()
     
     def detect_asset_class(self, symbol):
         """Detect asset class for given symbol"""
-        symbol_upper = symbol.upper()
-        
-        # Check each asset class pattern
-        for asset_class, patterns in self.asset_patterns.items():
-            if asset_class == "CFD-Shares":
-                continue  # Handle stocks separately
-                
-            for pattern in patterns:
-                if pattern in symbol_upper:
-                    return asset_class
-        
-        # Check if it's a stock (has company-like symbol)
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info and hasattr(symbol_info, 'path'):
-            if "Stocks" in symbol_info.path or "Shares" in symbol_info.path:
-                return "CFD-Shares"
-            elif "ETF" in symbol_info.path:
-                return "CFD-ETFs"
-        
-        # Default to Forex if no pattern matches
-        return "Forex"
+        return ASSET_CLASS_LABELS[self.specs.asset_class(symbol)]
     
-    def get_asset_pip_value(self, symbol, asset_class):
-        """Get pip value specific to asset class"""
-        pip_values = {
-            "Forex": {
-                "JPY_pairs": 0.01,      # USDJPY, EURJPY etc.
-                "standard": 0.0001      # EURUSD, GBPUSD etc.
-            },
-            "CFD-Crypto": {
-                "BTC": 1.0,             # Bitcoin: 1 dollar = 1 pip
-                "ETH": 0.1,             # Ethereum: 10 cents = 1 pip
-                "standard": 0.01        # Other crypto: 1 cent = 1 pip
-            },
-            "CFD-Metals": {
-                "XAU": 0.1,             # Gold: 10 cents = 1 pip
-                "XAG": 0.01,            # Silver: 1 cent = 1 pip
-                "standard": 0.01
-            },
-            "CFD-Indices": {
-                "SPX": 1.0,             # S&P500: 1 point = 1 pip
-                "NAS": 1.0,             # Nasdaq: 1 point = 1 pip
-                "DAX": 1.0,             # DAX: 1 point = 1 pip
-                "standard": 1.0
-            },
-            "CFD-Energies": {
-                "CRUDE": 0.01,          # Crude oil: 1 cent = 1 pip
-                "BRENT": 0.01,          # Brent oil: 1 cent = 1 pip
-                "NGAS": 0.001,          # Natural gas: 0.1 cent = 1 pip
-                "standard": 0.01
-            },
-            "CFD-Agricultural": {
-                "standard": 0.01        # 1 cent = 1 pip for most agricultural
-            },
-            "CFD-Bonds": {
-                "standard": 0.01        # 1 cent = 1 pip for bonds
-            },
-            "CFD-Shares": {
-                "standard": 0.01        # 1 cent = 1 pip for stocks
-            },
-            "CFD-ETFs": {
-                "standard": 0.01        # 1 cent = 1 pip for ETFs
-            }
-        }
-        
-        asset_config = pip_values.get(asset_class, {"standard": 0.0001})
-        
-        # Check for specific symbol patterns
-        symbol_upper = symbol.upper()
-        
-        if asset_class == "Forex" and "JPY" in symbol_upper:
-            return asset_config["JPY_pairs"]
-        elif asset_class == "CFD-Crypto":
-            if "BTC" in symbol_upper:
-                return asset_config["BTC"]
-            elif "ETH" in symbol_upper:
-                return asset_config["ETH"]
-        elif asset_class == "CFD-Metals":
-            if "XAU" in symbol_upper:
-                return asset_config["XAU"]
-            elif "XAG" in symbol_upper:
-                return asset_config["XAG"]
-        
-        return asset_config["standard"]
+    def get_asset_pip_value(self, symbol, asset_class=None):
+        """Get pip size for symbol (asset class is resolved by the registry)"""
+        return self.specs.pip(symbol)
     
     def calculate_ylipip_trigger(self, symbol):
         """Calculate 0.6 ylipip trigger for any MT5 symbol"""
@@ -161,6 +89,20 @@ class UniversalYlipipTrigger:
             "trigger_info": trigger_info
         }
     
+    def validate_ylipip_triggers(self, symbols, current_prices, entry_prices, trade_types):
+        """Vectorized validate_ylipip_trigger for a whole portfolio of open setups"""
+        ylipip_triggers = self.specs.ylipip(self.specs.ids(symbols), self.ylipip_standard)
+        direction = np.where(np.char.upper(np.asarray(trade_types, dtype=str)) == "BUY", 1.0, -1.0)
+        price_movement = direction * (np.asarray(current_prices, dtype=np.float64)
+                                      - np.asarray(entry_prices, dtype=np.float64))
+        
+        return {
+            "trigger_reached": price_movement >= ylipip_triggers,
+            "price_movement": price_movement,
+            "ylipip_trigger": ylipip_triggers,
+            "distance_to_trigger": ylipip_triggers - price_movement
+        }
+    
     def create_universal_trigger_config(self):
         """Create configuration for all supported symbols"""
         if not mt5.initialize():
@@ -180,14 +122,24 @@ class UniversalYlipipTrigger:
         
         asset_class_counts = {}
         
-        for symbol in symbols[:100]:  # Limit to first 100 for performance
-            symbol_name = symbol.name
-            trigger_info = self.calculate_ylipip_trigger(symbol_name)
-            
-            config["supported_symbols"][symbol_name] = trigger_info
+        names = [symbol.name for symbol in symbols[:100]]  # Limit to first 100 for performance
+        ids = self.specs.ids(names)
+        pip_values = self.specs.pip(ids)
+        ylipip_triggers = self.specs.ylipip(ids, self.ylipip_standard)
+        asset_classes = self.specs.asset_class(ids)
+        
+        for symbol_name, asset_class, pip_value, ylipip_trigger in zip(names, asset_classes, pip_values, ylipip_triggers):
+            asset_class = ASSET_CLASS_LABELS[asset_class]
+            config["supported_symbols"][symbol_name] = {
+                "symbol": symbol_name,
+                "asset_class": asset_class,
+                "pip_value": float(pip_value),
+                "ylipip_standard": self.ylipip_standard,
+                "ylipip_trigger": float(ylipip_trigger),
+                "trigger_formatted": f"{ylipip_trigger:.5f}"
+            }
             
             # Count asset classes
-            asset_class = trigger_info["asset_class"]
             asset_class_counts[asset_class] = asset_class_counts.get(asset_class, 0) + 1
         
         config["asset_class_summary"] = asset_class_counts
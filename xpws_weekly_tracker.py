@@ -8,6 +8,9 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 import sqlite3
+import threading
+
+from src.utils.write_behind import WriteBehindWriter
 
 class XPWSWeeklyTracker:
     """
@@ -18,12 +21,19 @@ class XPWSWeeklyTracker:
     - Per-symbol tracking and memory
     """
     
-    def __init__(self):
+    def __init__(self, common_path=None):
         self.profit_threshold = 10.0  # 10% weekly profit threshold
-        self.common_path = Path("C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files")
+        self.common_path = Path(common_path or "C:/Users/HP/AppData/Roaming/MetaQuotes/Terminal/Common/Files")
         self.db_path = self.common_path / "xpws_tracking.db"
         self.init_database()
         
+        # Writes are batched in the background; tracking rows are cached per
+        # (symbol, week_start) once committed, so reads don't force a flush
+        self.writer = WriteBehindWriter(self.db_path, flush_interval=0.5, name="xpws-writer")
+        self._tracking = {}
+        self._in_flight = {}  # (symbol, week_start) -> queued, uncommitted writes
+        self._in_flight_lock = threading.Lock()
+        
     def init_database(self):
         """Initialize XPWS tracking database"""
         conn = sqlite3.connect(self.db_path)
@@ -100,53 +110,72 @@ class XPWSWeeklyTracker:
             
         return profit_percent, symbol_profit
     
+    def _tracking_row(self, symbol, week_start):
+        """Cached xpws_tracking row for symbol/week (loaded from the database once)"""
+        key = (symbol, week_start)
+        if self._in_flight.get(key):
+            # The cached row is older than a queued write; wait for it to land
+            self.writer.flush()
+        if key not in self._tracking:
+            rows = self.writer.query('''
+                SELECT * FROM xpws_tracking 
+                WHERE symbol = ? AND week_start = ?
+            ''', (symbol, week_start))
+            self._tracking[key] = rows[0] if rows else None
+        return self._tracking[key]
+    
     def update_symbol_tracking(self, symbol, account_balance):
         """Update XPWS tracking for symbol"""
         week_start = self.get_week_start()
         profit_percent, symbol_profit = self.calculate_weekly_profit_for_symbol(symbol, account_balance)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Check if symbol exists for current week
-        cursor.execute('''
-            SELECT * FROM xpws_tracking 
-            WHERE symbol = ? AND week_start = ?
-        ''', (symbol, week_start))
-        
-        existing = cursor.fetchone()
+        existing = self._tracking_row(symbol, week_start)
+        now = datetime.now().isoformat()
+        xpws_active = profit_percent >= self.profit_threshold
         
         if existing:
-            # Update existing record
-            xpws_active = profit_percent >= self.profit_threshold
-            activation_time = existing[5] if existing[5] else None
-            
+            initial_balance = existing[2]
+            activation_time = existing[6]
             # Set activation time if just activated
-            if xpws_active and not existing[4]:  # Just activated
-                activation_time = datetime.now().isoformat()
-            
-            cursor.execute('''
-                UPDATE xpws_tracking 
-                SET current_balance = ?, weekly_profit_percent = ?, 
-                    xpws_active = ?, activation_time = ?, last_update = ?
-                WHERE symbol = ? AND week_start = ?
-            ''', (account_balance, profit_percent, xpws_active, 
-                  activation_time, datetime.now().isoformat(), symbol, week_start))
+            if xpws_active and not existing[5]:
+                activation_time = now
         else:
-            # Create new record for this week
-            xpws_active = profit_percent >= self.profit_threshold
-            activation_time = datetime.now().isoformat() if xpws_active else None
-            
-            cursor.execute('''
-                INSERT INTO xpws_tracking 
-                (symbol, week_start, initial_balance, current_balance, 
-                 weekly_profit_percent, xpws_active, activation_time, last_update)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (symbol, week_start, account_balance, account_balance,
-                  profit_percent, xpws_active, activation_time, datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+            # New week: the symbol's row from an earlier week is replaced
+            initial_balance = account_balance
+            activation_time = now if xpws_active else None
+        
+        # Same column order as SELECT *
+        row = (symbol, str(week_start), initial_balance, account_balance,
+               profit_percent, xpws_active, activation_time, now)
+        key = (symbol, week_start)
+        
+        def on_done(ok):
+            # Cache only what was committed; a dropped write reloads from the database
+            if ok:
+                self._tracking[key] = row
+            else:
+                self._tracking.pop(key, None)
+            with self._in_flight_lock:
+                self._in_flight[key] -= 1
+        
+        with self._in_flight_lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        self.writer.execute('''
+            INSERT INTO xpws_tracking 
+            (symbol, week_start, initial_balance, current_balance, 
+             weekly_profit_percent, xpws_active, activation_time, last_update)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                week_start = excluded.week_start,
+                initial_balance = excluded.initial_balance,
+                current_balance = excluded.current_balance,
+                weekly_profit_percent = excluded.weekly_profit_percent,
+                xpws_active = excluded.xpws_active,
+                activation_time = excluded.activation_time,
+                last_update = excluded.last_update
+        ''', (symbol, week_start, initial_balance, account_balance,
+              profit_percent, xpws_active, activation_time, now), on_done=on_done)
         
         return {
             "symbol": symbol,
@@ -161,18 +190,9 @@ class XPWSWeeklyTracker:
         """Check if XPWS mode is active for symbol"""
         week_start = self.get_week_start()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        result = self._tracking_row(symbol, week_start)
         
-        cursor.execute('''
-            SELECT xpws_active FROM xpws_tracking 
-            WHERE symbol = ? AND week_start = ?
-        ''', (symbol, week_start))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result[0] if result else False
+        return result[5] if result else False
     
     def get_risk_reward_ratio(self, symbol):
         """Get appropriate R:R ratio based on XPWS status"""
@@ -185,18 +205,13 @@ class XPWSWeeklyTracker:
         """Reset tracking for new week (Monday)"""
         current_week = self.get_week_start()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Archive old week data and reset
-        cursor.execute('''
+        self.writer.execute('''
             UPDATE xpws_tracking 
             SET xpws_active = FALSE, weekly_profit_percent = 0.0, activation_time = NULL
             WHERE week_start < ?
         ''', (current_week,))
-        
-        conn.commit()
-        conn.close()
+        self._tracking = {key: row for key, row in self._tracking.items() if key[1] >= current_week}
         
         return f"Weekly tracking reset for week starting {current_week}"
     
@@ -258,21 +273,19 @@ class XPWSWeeklyTracker:
         week_start = self.get_week_start()
         xpws_mode = self.is_xpws_active(symbol)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        self.writer.execute('''
             INSERT INTO xpws_trades 
             (symbol, ticket, open_time, profit, volume, trade_type, xpws_mode, week_start)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (symbol, ticket, datetime.now().isoformat(), profit, volume, 
               trade_type, xpws_mode, week_start))
         
-        conn.commit()
-        conn.close()
-        
         return f"Trade logged: {symbol} | {trade_type} | Profit: ${profit} | XPWS: {xpws_mode}"
 
+    def close(self):
+        """Flush queued tracking writes"""
+        self.writer.close()
+
 if __name__ == "__main__":
     # Test XPWS Weekly Tracking
     xpws_tracker = XPWSWeeklyTracker()
@@ -310,4 +323,6 @@ if __name__ == "__main__":
             
         mt5.shutdown()
     else:
-        print("ERROR: Failed to initialize MT5")
\ No newline at end of file
+        print("ERROR: Failed to initialize MT5")
+    
+    xpws_tracker.close()
\ No newline at end of file